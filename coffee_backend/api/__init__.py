@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 
-from coffee_backend.api import health
+from coffee_backend.api import health, signed_images
 from coffee_backend.api.security import VerifyToken
 from coffee_backend.api.v1 import router as api_router
 from coffee_backend.settings import settings
@@ -12,10 +12,23 @@ auth = VerifyToken(
     client_id=settings.keykloak_client_id,
     issuer_hostname=settings.keycloak_issuer_host,
     issuer_protocoll=settings.keykloak_issuer_protocol,
+    jwks_refresh_interval=settings.jwks_refresh_interval_seconds,
+    jwks_min_refetch_interval=settings.jwks_min_refetch_interval_seconds,
+    token_cache_max_size=settings.token_cache_max_size,
+    token_cache_revalidate_interval=(
+        settings.token_cache_revalidate_interval_seconds
+    ),
+    mode=settings.auth_mode,
+    online_latency_budget=settings.auth_online_latency_budget_seconds,
+    breaker_failure_threshold=settings.auth_breaker_failure_threshold,
+    breaker_reset_timeout=settings.auth_breaker_reset_timeout_seconds,
 )
 
 router = APIRouter()
 router.include_router(health.router, prefix="/health", tags=["health"])
+router.include_router(
+    signed_images.router, prefix="/images", tags=["signed_images"]
+)
 router.include_router(
     api_router, prefix="/api/v1", dependencies=[Depends(auth.verify)]
 )
@@ -0,0 +1,96 @@
+import logging
+import time
+from enum import Enum
+from typing import Optional
+
+from coffee_backend.metrics import TokenValidationMetric
+
+
+class CircuitState(Enum):
+    """Describe the state of a circuit breaker."""
+
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class CircuitBreaker:
+    """Circuit breaker guarding requests to the identity provider.
+
+    After a number of consecutive failures the breaker opens and requests are
+    skipped. Once the reset timeout passed a single trial request is allowed
+    (half open), which either closes the breaker again or reopens it.
+    """
+
+    def __init__(
+        self,
+        metric: TokenValidationMetric,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+    ) -> None:
+        """Initializes a CircuitBreaker instance.
+
+        Args:
+            metric (TokenValidationMetric): The metric exporting the state.
+            failure_threshold (int): Consecutive failures opening the breaker.
+            reset_timeout (float): Seconds the breaker stays open before a
+                trial request is allowed.
+
+        """
+        self.metric = metric
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.state = CircuitState.CLOSED
+        self.metric.set_breaker_state(self.state.value)
+
+    def allow_request(self) -> bool:
+        """Return whether a request to the guarded service may be sent."""
+        if (
+            self.state == CircuitState.OPEN
+            and self.opened_at is not None
+            and time.monotonic() - self.opened_at >= self.reset_timeout
+        ):
+            self._set_state(CircuitState.HALF_OPEN)
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self.trial_in_flight:
+                return False
+            self.trial_in_flight = True
+            return True
+
+        return self.state == CircuitState.CLOSED
+
+    def record_success(self) -> None:
+        """Record a successful request and close the breaker."""
+        self.failures = 0
+        self.trial_in_flight = False
+        if self.state != CircuitState.CLOSED:
+            self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed request and open the breaker if necessary."""
+        self.failures += 1
+        self.trial_in_flight = False
+
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            self.opened_at = time.monotonic()
+            self._set_state(CircuitState.OPEN)
+
+    def release_trial(self) -> None:
+        """Give up a trial request without outcome, e.g. when it was
+        cancelled, so the next request is allowed as trial instead."""
+        self.trial_in_flight = False
+
+    def _set_state(self, state: CircuitState) -> None:
+        """Switch the state and export it."""
+        logging.info(
+            "Circuit breaker changed from %s to %s", self.state.name, state.name
+        )
+        self.state = state
+        self.metric.set_breaker_state(state.value)
@@ -0,0 +1,50 @@
+import base64
+import binascii
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException, Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: UUID) -> str:
+    """Encode the id of the last item of a page as opaque cursor.
+
+    Args:
+        last_id (UUID): The id of the last item of the page.
+
+    Returns:
+        str: The cursor of the next page.
+    """
+    return base64.urlsafe_b64encode(last_id.bytes).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> UUID:
+    """Decode a cursor to the id the next page starts after.
+
+    Args:
+        cursor (str): The cursor returned with the previous page.
+
+    Returns:
+        UUID: The id of the last item of the previous page.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+    """
+    try:
+        return UUID(bytes=base64.urlsafe_b64decode(cursor + "=="))
+    except (binascii.Error, ValueError) as error:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from error
+
+
+async def get_cursor(
+    cursor: Optional[str] = Query(
+        default=None,
+        max_length=32,
+        description=f"Cursor of the page, returned in the {NEXT_CURSOR_HEADER}"
+        + " header of the previous page",
+    ),
+) -> Optional[UUID]:
+    """Extract the id the requested page starts after from the query."""
+    return decode_cursor(cursor) if cursor else None
@@ -1,7 +1,16 @@
-from fastapi import Request
+from typing import Optional
 
+from fastapi import Header, Request
+
+from coffee_backend.api.image_response import (
+    ImageRequestHeaders,
+    accepted_image_formats,
+)
+from coffee_backend.api.image_url_signer import ImageUrlSigner
+from coffee_backend.api.rate_limit import RateLimiter
 from coffee_backend.metrics import DailyActiveUsersMetric
 from coffee_backend.s3.object import ObjectCRUD
+from coffee_backend.s3.types.byte_range import ByteRange
 from coffee_backend.services.coffee import CoffeeService
 from coffee_backend.services.drink import DrinkService
 from coffee_backend.services.image_service import ImageService
@@ -33,9 +42,41 @@ async def get_coffee_images_service(request: Request) -> ImageService:
     return coffee_images_service
 
 
+async def get_image_url_signer(request: Request) -> Optional[ImageUrlSigner]:
+    """Extract image url signer from app state if signed urls are enabled."""
+    image_url_signer: Optional[ImageUrlSigner] = (
+        request.app.state.image_url_signer
+    )
+    return image_url_signer
+
+
+async def get_image_request_headers(
+    range_header: Optional[str] = Header(default=None, alias="Range"),
+    if_range: Optional[str] = Header(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+    if_modified_since: Optional[str] = Header(default=None),
+    accept: Optional[str] = Header(default=None),
+) -> ImageRequestHeaders:
+    """Extract range, conditional and content negotiation headers of an image
+    request."""
+    return ImageRequestHeaders(
+        byte_range=ByteRange.from_header(range_header),
+        if_range=if_range,
+        if_none_match=if_none_match,
+        if_modified_since=if_modified_since,
+        accepted_formats=accepted_image_formats(accept),
+    )
+
+
 async def get_unique_user_metric(request: Request) -> DailyActiveUsersMetric:
     """Extract unique user metric from app state."""
     unique_user_metric: DailyActiveUsersMetric = (
         request.app.state.daily_active_users_metric
     )
     return unique_user_metric
+
+
+async def get_search_rate_limiter(request: Request) -> RateLimiter:
+    """Extract the rate limiter of coffee searches from app state."""
+    search_rate_limiter: RateLimiter = request.app.state.search_rate_limiter
+    return search_rate_limiter
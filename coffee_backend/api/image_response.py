@@ -0,0 +1,374 @@
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from fastapi.responses import (
+    FileResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
+from motor.core import AgnosticClientSession
+from starlette.background import BackgroundTask
+from starlette.types import Receive, Scope, Send
+
+from coffee_backend.s3.types.byte_range import ByteRange
+from coffee_backend.s3.types.object_info import ObjectInfo
+from coffee_backend.s3.types.object_stream import ObjectStream
+from coffee_backend.schemas import SMALL_FORMAT_VARIANTS, ImageType
+from coffee_backend.services.image_cache import CachedImage
+from coffee_backend.services.image_service import ImageService
+
+IMAGE_CACHE_CONTROL = "private, no-cache"
+
+
+@dataclass
+class ImageRequestHeaders:
+    """Describes the range, conditional and content negotiation headers of an
+    image request."""
+
+    byte_range: Optional[ByteRange] = None
+    if_range: Optional[str] = None
+    if_none_match: Optional[str] = None
+    if_modified_since: Optional[str] = None
+    accepted_formats: Tuple[str, ...] = ()
+
+
+def accepted_image_formats(accept: Optional[str]) -> Tuple[str, ...]:
+    """Return the alternative image formats accepted by the client.
+
+    Only formats explicitly listed in the Accept header with a non zero
+    quality are accepted, as wildcards like image/* are also sent by clients
+    not able to decode them.
+
+    Args:
+        accept (Optional[str]): The Accept header value.
+
+    Returns:
+        Tuple[str, ...]: The accepted file types, e.g. ("avif", "webp").
+    """
+    if accept is None:
+        return ()
+
+    accepted = set()
+
+    for media_range in accept.split(","):
+        media_type, *parameters = media_range.split(";")
+        media_type = media_type.strip().lower()
+
+        if not media_type.startswith("image/"):
+            continue
+
+        quality = 1.0
+
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0
+
+        if quality > 0:
+            accepted.add(media_type.removeprefix("image/"))
+
+    return tuple(
+        file_type
+        for file_type in SMALL_FORMAT_VARIANTS
+        if file_type in accepted
+    )
+
+
+async def image_response(
+    image_service: ImageService,
+    db_session: AgnosticClientSession,
+    object_id: UUID,
+    image_type: ImageType,
+    request_headers: ImageRequestHeaders,
+    cache_control: str = IMAGE_CACHE_CONTROL,
+    width: Optional[int] = None,
+) -> Response:
+    """Answer an image request with 304 Not Modified, the image or a redirect.
+
+    If the image service redirects images, the request is answered with a
+    temporary redirect to a presigned S3 URL, which also evaluates range and
+    conditional headers. Redirects are not cached beyond the request, as the
+    presigned URL expires. Otherwise images in the image cache are answered
+    without contacting S3, byte range requests always read from S3.
+    Conditional requests are evaluated against the recorded image metadata,
+    which spares reading the image if the client already has the current
+    version. The format of the image is negotiated with the Accept header, so
+    all responses vary on it.
+
+    Args:
+        image_service (ImageService): The image service to read the image.
+        db_session (AgnosticClientSession): The database session.
+        object_id (UUID): The id of the object the image belongs to.
+        image_type (ImageType): The type of the image.
+        request_headers (ImageRequestHeaders): The range, conditional and
+            content negotiation headers of the request.
+        cache_control (str): The Cache-Control header of the response.
+        width (Optional[int]): The width to resize the image to.
+
+    Returns:
+        Response: A 304 response, the cached or the streamed image or a 307
+            redirect.
+
+    Raises:
+        HTTPException: If the image is not found, the width is not allowed or
+            the range is not satisfiable.
+    """
+    headers = {"Cache-Control": cache_control, "Vary": "Accept"}
+
+    if image_service.redirect_url_ttl:
+        return RedirectResponse(
+            await image_service.presign_image(
+                db_session=db_session,
+                object_id=object_id,
+                image_type=image_type,
+                accepted_formats=request_headers.accepted_formats,
+                width=width,
+            ),
+            status_code=307,
+            headers={"Cache-Control": IMAGE_CACHE_CONTROL, "Vary": "Accept"},
+        )
+
+    cached = (
+        image_service.get_cached_image(
+            object_id=object_id,
+            image_type=image_type,
+            accepted_formats=request_headers.accepted_formats,
+            width=width,
+        )
+        if request_headers.byte_range is None
+        else None
+    )
+
+    if cached is not None:
+        if is_not_modified(
+            cached.info,
+            if_none_match=request_headers.if_none_match,
+            if_modified_since=request_headers.if_modified_since,
+        ):
+            cached.close()
+            return not_modified_response(cached.info, headers)
+
+        return cached_image_response(
+            cached, filename=str(object_id), headers=headers
+        )
+
+    if (
+        request_headers.if_none_match is not None
+        or request_headers.if_modified_since is not None
+    ):
+        info = await image_service.stat_image(
+            db_session=db_session,
+            object_id=object_id,
+            image_type=image_type,
+            accepted_formats=request_headers.accepted_formats,
+            width=width,
+        )
+
+        if is_not_modified(
+            info,
+            if_none_match=request_headers.if_none_match,
+            if_modified_since=request_headers.if_modified_since,
+        ):
+            return not_modified_response(info, headers)
+
+    image = await image_service.stream_image(
+        db_session=db_session,
+        object_id=object_id,
+        image_type=image_type,
+        byte_range=request_headers.byte_range,
+        if_range=request_headers.if_range,
+        accepted_formats=request_headers.accepted_formats,
+        width=width,
+    )
+
+    return streaming_image_response(
+        image, filename=str(object_id), headers=headers
+    )
+
+
+def is_not_modified(
+    info: ObjectInfo,
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> bool:
+    """Evaluate the conditional headers of a GET request against an image.
+
+    As defined in RFC 9110, If-None-Match takes precedence over
+    If-Modified-Since and entity tags are compared weakly.
+
+    Args:
+        info (ObjectInfo): The metadata of the current image.
+        if_none_match (Optional[str]): The If-None-Match header value.
+        if_modified_since (Optional[str]): The If-Modified-Since header value.
+
+    Returns:
+        bool: True if the client already has the current image.
+    """
+    if if_none_match is not None:
+        etags = [etag.strip() for etag in if_none_match.split(",")]
+        return "*" in etags or any(
+            etag.removeprefix("W/").strip('"') == info.etag for etag in etags
+        )
+
+    if if_modified_since is not None and info.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+        if since.tzinfo is None:
+            return False
+
+        return info.last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def not_modified_response(
+    info: ObjectInfo, headers: Optional[dict[str, str]] = None
+) -> Response:
+    """Return a 304 Not Modified response for an image.
+
+    Args:
+        info (ObjectInfo): The metadata of the current image.
+        headers (Optional[dict[str, str]]): Additional response headers.
+
+    Returns:
+        Response: The response without body.
+    """
+    return Response(
+        status_code=304,
+        headers={
+            **validator_headers(info.etag, info.last_modified),
+            **(headers or {}),
+        },
+    )
+
+
+def validator_headers(
+    etag: str, last_modified: Optional[datetime]
+) -> dict[str, str]:
+    """Return the ETag and Last-Modified headers of an image.
+
+    Args:
+        etag (str): The unquoted entity tag of the image.
+        last_modified (Optional[datetime]): The last modification time.
+
+    Returns:
+        dict[str, str]: The validator headers.
+    """
+    headers = {}
+
+    if etag:
+        headers["ETag"] = f'"{etag}"'
+
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    return headers
+
+
+def streaming_image_response(
+    image: ObjectStream,
+    filename: str,
+    headers: Optional[dict[str, str]] = None,
+) -> StreamingResponse:
+    """Stream an image from S3 to the client without buffering it.
+
+    The S3 connection is released in a background task, which also runs if
+    the client disconnects before the image was sent completely. A streamed
+    byte range is answered with 206 Partial Content.
+
+    Args:
+        image (ObjectStream): The image opened for streaming.
+        filename (str): The filename without extension offered for download.
+        headers (Optional[dict[str, str]]): Additional response headers.
+
+    Returns:
+        StreamingResponse: The response streaming the image.
+    """
+    response_headers = {
+        "Content-Length": str(image.size),
+        "Content-Disposition": "attachment; "
+        + f"filename={filename}.{image.file_type}",
+        "Accept-Ranges": "bytes",
+        **validator_headers(image.etag, image.last_modified),
+        **(headers or {}),
+    }
+
+    if image.content_range is not None:
+        response_headers["Content-Range"] = image.content_range
+
+    return StreamingResponse(
+        content=image.chunks,
+        status_code=206 if image.content_range is not None else 200,
+        media_type=f"image/{image.file_type}",
+        headers=response_headers,
+        background=BackgroundTask(image.close),
+    )
+
+
+class CachedFileResponse(FileResponse):
+    """Sends the file of an image of the disk tier of the image cache and
+    releases the image afterwards, also if the client disconnected."""
+
+    def __init__(
+        self, image: CachedImage, media_type: str, headers: dict[str, str]
+    ) -> None:
+        assert image.path is not None
+        super().__init__(image.path, media_type=media_type, headers=headers)
+        self.image = image
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.image.close()
+
+
+def cached_image_response(
+    image: CachedImage,
+    filename: str,
+    headers: Optional[dict[str, str]] = None,
+) -> Response:
+    """Send an image from the image cache.
+
+    Images of the disk tier are sent as file, which the server can transfer
+    without copying it through the application. The cache keeps the file
+    until the image was released once the response was sent.
+
+    Args:
+        image (CachedImage): The cached image.
+        filename (str): The filename without extension offered for download.
+        headers (Optional[dict[str, str]]): Additional response headers.
+
+    Returns:
+        Response: The response containing the image.
+    """
+    response_headers = {
+        "Content-Disposition": "attachment; "
+        + f"filename={filename}.{image.info.file_type}",
+        "Accept-Ranges": "bytes",
+        **validator_headers(image.info.etag, image.info.last_modified),
+        **(headers or {}),
+    }
+    media_type = f"image/{image.info.file_type}"
+
+    if image.path is not None:
+        return CachedFileResponse(
+            image, media_type=media_type, headers=response_headers
+        )
+
+    return Response(
+        content=image.data, media_type=media_type, headers=response_headers
+    )
@@ -0,0 +1,134 @@
+import hashlib
+import hmac
+import time
+from typing import Dict, Optional
+from urllib.parse import quote
+from uuid import UUID
+
+from coffee_backend.schemas import ImageType, ImageVariant
+from coffee_backend.schemas.image_metadata import StoredImageVariant
+
+
+def image_version(
+    variants: Optional[Dict[str, StoredImageVariant]]
+) -> Optional[str]:
+    """Return the version of an image signed into its URL.
+
+    Args:
+        variants (Optional[Dict[str, StoredImageVariant]]): The recorded
+            variants of the image.
+
+    Returns:
+        Optional[str]: The SHA-256 digest or entity tag of the original
+            variant, None if the original variant is not recorded.
+    """
+    original = (variants or {}).get(ImageVariant.ORIGINAL.value)
+
+    if original is None:
+        return None
+
+    return original.sha256 or original.etag
+
+
+class ImageUrlSigner:
+    """Creates and verifies short-lived HMAC signed image URLs.
+
+    Signed URLs allow fetching an image without a bearer token. The expiry
+    is rounded up to the next full lifetime window, so the URL of an image
+    stays stable within a window and can be cached by browsers and proxies.
+    URLs signed for a version of the image change when it is replaced.
+    """
+
+    def __init__(
+        self, secret: str, ttl: int = 3600, base_path: str = "/images"
+    ) -> None:
+        """Initializes an ImageUrlSigner instance.
+
+        Args:
+            secret (str): The key used for the HMAC signatures.
+            ttl (int): Minimal lifetime of a signed URL in seconds.
+            base_path (str): The path the signed image route is mounted on.
+
+        """
+        self.secret = secret.encode()
+        self.ttl = ttl
+        self.base_path = base_path
+
+    def sign(
+        self,
+        image_type: ImageType,
+        object_id: UUID,
+        version: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> str:
+        """Return the signed URL path of an image.
+
+        Args:
+            image_type (ImageType): The type of the image.
+            object_id (UUID): The id of the object the image belongs to.
+            version (Optional[str]): The version of the image, see
+                image_version.
+            now (Optional[float]): The current unix time, defaults to now.
+
+        Returns:
+            str: The URL path including expiry and signature query
+                parameters.
+
+        """
+        current_time = time.time() if now is None else now
+        expires = (int(current_time) // self.ttl + 2) * self.ttl
+
+        signature = self._signature(image_type, object_id, expires, version)
+        query = f"expires={expires}&signature={signature}"
+
+        if version is not None:
+            query = f"version={quote(version, safe='')}&{query}"
+
+        return f"{self.base_path}/{image_type.value}/{object_id}?{query}"
+
+    def verify(
+        self,
+        image_type: ImageType,
+        object_id: UUID,
+        expires: int,
+        signature: str,
+        version: Optional[str] = None,
+    ) -> bool:
+        """Check that a signed URL is authentic and not expired.
+
+        Args:
+            image_type (ImageType): The type of the image.
+            object_id (UUID): The id of the object the image belongs to.
+            expires (int): The unix time the URL expires at.
+            signature (str): The signature of the URL.
+            version (Optional[str]): The version of the image the URL was
+                signed for.
+
+        Returns:
+            bool: True if the signature matches and the URL is not expired.
+
+        """
+        if expires <= time.time():
+            return False
+
+        return hmac.compare_digest(
+            self._signature(image_type, object_id, expires, version),
+            signature,
+        )
+
+    def _signature(
+        self,
+        image_type: ImageType,
+        object_id: UUID,
+        expires: int,
+        version: Optional[str],
+    ) -> str:
+        """Return the hex encoded HMAC of the signed URL parts."""
+        message = f"{image_type.value}:{object_id}:{expires}"
+
+        if version is not None:
+            message += f":{version}"
+
+        return hmac.new(
+            self.secret, message.encode(), hashlib.sha256
+        ).hexdigest()
@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from typing import Optional
+
+import aiohttp
+import jwt
+
+from coffee_backend.http_client.session import shared_or_temporary_session
+
+JWKS_FETCH_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+
+class JWKSCache:  # pylint: disable=too-many-instance-attributes
+    """Asynchronous in-memory store for the signing keys of the token issuer.
+
+    The keys are fetched from the JWKS endpoint of the identity provider once
+    on startup and refreshed in the background afterwards. Keys are kept as
+    parsed public key objects, so verifying a token signature never requires
+    a network round trip. Only when a token references an unknown key id the
+    key set is fetched again, at most once per minimal refetch interval.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        refresh_interval: float = 300,
+        min_refetch_interval: float = 30,
+    ) -> None:
+        """Initializes a JWKSCache instance.
+
+        Args:
+            jwks_url (str): The url of the JWKS endpoint of the issuer.
+            refresh_interval (float): Seconds between two background
+                refreshes of the key set.
+            min_refetch_interval (float): Minimal seconds between two fetches
+                of the key set triggered by unknown key ids.
+
+        """
+        self.jwks_url = jwks_url
+        self.refresh_interval = refresh_interval
+        self.min_refetch_interval = min_refetch_interval
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self.keys: dict[str, jwt.PyJWK] = {}
+        self.last_fetch_attempt: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def start(
+        self, http_session: Optional[aiohttp.ClientSession] = None
+    ) -> None:
+        """Load the key set and start refreshing it in the background.
+
+        A failing initial load is only logged, the keys are fetched again on
+        the first token verification in that case.
+
+        Args:
+            http_session (Optional[aiohttp.ClientSession]): The shared HTTP
+                client session used to fetch the key set.
+        """
+        self.http_session = http_session
+
+        try:
+            await self.refresh()
+        except (
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+            jwt.PyJWTError,
+        ) as error:
+            logging.warning(
+                "Initial JWKS load from %s failed: %s", self.jwks_url, error
+            )
+
+        self._refresh_task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        """Stop the background refresh of the key set."""
+        if self._refresh_task is None:
+            return
+
+        self._refresh_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._refresh_task
+        self._refresh_task = None
+
+    async def refresh(self) -> None:
+        """Fetch the key set from the issuer and replace the cached keys.
+
+        Raises:
+            aiohttp.ClientError: If the JWKS endpoint is not reachable or
+                responds with an error status.
+            jwt.PyJWKSetError: If the response contains no usable keys.
+
+        """
+        self.last_fetch_attempt = time.monotonic()
+
+        async with shared_or_temporary_session(self.http_session) as session:
+            async with session.get(
+                self.jwks_url, timeout=JWKS_FETCH_TIMEOUT
+            ) as response:
+                response.raise_for_status()
+                jwks = await response.json()
+
+        key_set = jwt.PyJWKSet.from_dict(jwks)
+
+        self.keys = {
+            key.key_id: key
+            for key in key_set.keys
+            if key.public_key_use in ["sig", None] and key.key_id
+        }
+
+        logging.debug(
+            "Loaded %s signing keys from %s", len(self.keys), self.jwks_url
+        )
+
+    async def get_signing_key(self, kid: str) -> jwt.PyJWK:
+        """Return the signing key for a key id.
+
+        Args:
+            kid (str): The key id referenced in the token header.
+
+        Returns:
+            jwt.PyJWK: The parsed signing key.
+
+        Raises:
+            jwt.PyJWKClientError: If no key exists for the key id, even after
+                refetching the key set.
+
+        """
+        if kid not in self.keys:
+            await self._refetch_for_unknown_kid(kid)
+
+        try:
+            return self.keys[kid]
+        except KeyError as error:
+            raise jwt.PyJWKClientError(
+                f'Unable to find a signing key that matches: "{kid}"'
+            ) from error
+
+    async def get_signing_key_from_jwt(self, token: str) -> jwt.PyJWK:
+        """Return the signing key for the key id referenced in a token.
+
+        Args:
+            token (str): The encoded JWT.
+
+        Returns:
+            jwt.PyJWK: The parsed signing key.
+
+        Raises:
+            jwt.PyJWKClientError: If the token references no or an unknown key
+                id.
+
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+
+        if not kid:
+            raise jwt.PyJWKClientError("Token header does not contain a kid")
+
+        return await self.get_signing_key(kid)
+
+    async def _refetch_for_unknown_kid(self, kid: str) -> None:
+        """Refetch the key set once for an unknown key id if not rate limited.
+
+        Concurrent callers wait for a single fetch. Failing fetches are only
+        logged, the caller handles the still missing key.
+
+        Args:
+            kid (str): The unknown key id.
+
+        """
+        async with self._lock:
+            if kid in self.keys:
+                return
+
+            if (
+                self.last_fetch_attempt is not None
+                and time.monotonic() - self.last_fetch_attempt
+                < self.min_refetch_interval
+            ):
+                logging.debug(
+                    "Skipping JWKS refetch for unknown kid %s, rate limited",
+                    kid,
+                )
+                return
+
+            logging.debug("Refetching JWKS for unknown kid %s", kid)
+
+            try:
+                await self.refresh()
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                jwt.PyJWTError,
+            ) as error:
+                logging.warning(
+                    "Refetching JWKS from %s failed: %s", self.jwks_url, error
+                )
+
+    async def _refresh_periodically(self) -> None:
+        """Refresh the key set every refresh interval until cancelled."""
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+
+            try:
+                await self.refresh()
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                jwt.PyJWTError,
+            ) as error:
+                logging.warning(
+                    "Refreshing JWKS from %s failed: %s", self.jwks_url, error
+                )
@@ -0,0 +1,186 @@
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi import HTTPException, Request
+from multipart.multipart import (  # type: ignore
+    MultipartParser,
+    parse_options_header,
+)
+
+from coffee_backend.schemas import UploadStream
+
+MULTIPART_FILE_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "file": {
+                            "type": "string",
+                            "format": "binary",
+                            "description": "The image file to upload.",
+                        }
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+class MultipartFileStream:  # pylint: disable=too-many-instance-attributes
+    """Streams a file field of a multipart request body.
+
+    The request body is parsed while it is received, the content of the file
+    is handed out chunk by chunk instead of being spooled to a temporary file
+    first. Parts before the file are skipped, parts after it are not read.
+    """
+
+    def __init__(self, request: Request, field_name: str) -> None:
+        """Initialize a MultipartFileStream instance.
+
+        Args:
+            request (Request): The request with a multipart body.
+            field_name (str): The name of the file field.
+
+        Raises:
+            HTTPException: If the body is no multipart form data.
+
+        """
+        content_type, params = parse_options_header(
+            request.headers.get("content-type", "")
+        )
+
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise HTTPException(
+                status_code=400, detail="Multipart form data expected"
+            )
+
+        self.field_name = field_name
+        self.body = request.stream()
+        self.parser = MultipartParser(
+            params[b"boundary"],
+            {
+                "on_part_begin": self._on_part_begin,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+            },
+        )
+        self.header_field = b""
+        self.header_value = b""
+        self.part_headers: Dict[bytes, bytes] = {}
+        self.in_file = False
+        self.file_found = False
+        self.file_finished = False
+        self.body_finished = False
+        self.content_type: Optional[str] = None
+        self.pending: List[bytes] = []
+
+    async def open(self) -> UploadStream:
+        """Read the body up to the headers of the file.
+
+        Returns:
+            UploadStream: The content type and the chunks of the file.
+
+        Raises:
+            HTTPException: If the body contains no such file.
+
+        """
+        while not self.file_found and not self.body_finished:
+            await self._feed()
+
+        if not self.file_found:
+            raise HTTPException(status_code=400, detail="No file provided")
+
+        return UploadStream(
+            content_type=self.content_type, chunks=self._iterate_chunks()
+        )
+
+    async def _iterate_chunks(self) -> AsyncIterator[bytes]:
+        """Yield the content of the file while the body is received."""
+        while True:
+            while self.pending:
+                yield self.pending.pop(0)
+
+            if self.file_finished or self.body_finished:
+                return
+
+            await self._feed()
+
+    async def _feed(self) -> None:
+        """Parse the next received chunk of the body."""
+        try:
+            chunk = await anext(self.body)
+        except StopAsyncIteration:
+            self.body_finished = True
+            self.parser.finalize()
+            return
+
+        self.parser.write(chunk)
+
+    def _on_part_begin(self) -> None:
+        self.part_headers = {}
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self.in_file:
+            self.pending.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        if self.in_file:
+            self.in_file = False
+            self.file_finished = True
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self.header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self.header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self.part_headers[self.header_field.lower()] = self.header_value
+        self.header_field = b""
+        self.header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(
+            self.part_headers.get(b"content-disposition", b"")
+        )
+
+        if self.file_found or options.get(b"name") != (
+            self.field_name.encode()
+        ):
+            return
+
+        content_type = self.part_headers.get(b"content-type")
+
+        self.in_file = True
+        self.file_found = True
+        self.content_type = (
+            content_type.decode("latin-1") if content_type else None
+        )
+
+
+async def stream_multipart_file(
+    request: Request, field_name: str = "file"
+) -> UploadStream:
+    """Open a file field of a multipart request body for streaming.
+
+    Args:
+        request (Request): The request with a multipart body.
+        field_name (str): The name of the file field.
+
+    Returns:
+        UploadStream: The content type and the chunks of the file.
+
+    Raises:
+        HTTPException: If the body is no multipart form data or contains no
+            such file.
+
+    """
+    return await MultipartFileStream(request, field_name).open()
@@ -0,0 +1,89 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass
+class Bucket:
+    """Describes the tokens left to a key of the rate limiter."""
+
+    tokens: float
+    updated_at: float
+
+
+class RateLimiter:
+    """Token bucket rate limiter per key, e.g. per user.
+
+    Every key may take burst requests at once and rate requests per second
+    on average. Buckets of the least recently seen keys are dropped beyond
+    max_keys, which only lets those keys start over with a full bucket.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_keys: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initializes a RateLimiter instance.
+
+        Args:
+            rate (float): Requests per second refilled to each bucket. A rate
+                of 0 disables the limit.
+            burst (int): Maximal number of tokens of a bucket.
+            max_keys (int): Maximal number of tracked keys.
+            clock (Callable[[], float]): Returns the current time in seconds.
+
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.clock = clock
+        self.buckets: OrderedDict[str, Bucket] = OrderedDict()
+
+    def acquire(self, key: str) -> Optional[float]:
+        """Take a token of the bucket of a key.
+
+        Args:
+            key (str): The key to limit.
+
+        Returns:
+            Optional[float]: None if the request is allowed, otherwise the
+                seconds until the next token is available.
+
+        """
+        if self.rate <= 0:
+            return None
+
+        now = self.clock()
+        bucket = self.buckets.get(key)
+
+        if bucket is None:
+            bucket = Bucket(tokens=self.burst, updated_at=now)
+            self.buckets[key] = bucket
+
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+            bucket.tokens = min(
+                self.burst,
+                bucket.tokens + (now - bucket.updated_at) * self.rate,
+            )
+            bucket.updated_at = now
+
+        if bucket.tokens < 1:
+            logging.debug("Rate limit of %s exceeded", key)
+            return (1 - bucket.tokens) / self.rate
+
+        bucket.tokens -= 1
+        return None
+
+    @staticmethod
+    def retry_after(wait: float) -> str:
+        """Format the seconds to wait as Retry-After header value."""
+        return str(max(1, math.ceil(wait)))
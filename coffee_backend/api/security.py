@@ -1,23 +1,38 @@
+import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Optional
 
 import aiohttp
 import jwt
 from fastapi import Depends, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from coffee_backend.exceptions.exceptions import UnauthenticatedException
+from coffee_backend.api.circuit_breaker import CircuitBreaker
+from coffee_backend.api.jwks import JWKSCache
+from coffee_backend.api.single_flight import SingleFlight
+from coffee_backend.api.token_cache import TokenCache
+from coffee_backend.exceptions.exceptions import (
+    IdentityProviderUnavailableError,
+    UnauthenticatedException,
+)
+from coffee_backend.http_client.session import shared_or_temporary_session
+from coffee_backend.metrics import token_cache_metric, token_validation_metric
 
 
-class VerifyToken:
+class VerifyToken:  # pylint: disable=too-many-instance-attributes
     """Does all the token verification using PyJWT.
 
     This class provides functionality for verifying tokens using PyJWT and
     performing additional checks for token validity and claims.
+
+    The mode defines whether a token is additionally validated against the
+    userinfo endpoint of the issuer: "online" always does so, "offline" only
+    checks signature and claims locally and "hybrid" validates online but
+    falls back to the local validation when the issuer is slow or failing.
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-locals
         self,
         protocol: str,
         hostname: str,
@@ -25,6 +40,14 @@ class VerifyToken:
         client_id: str,
         issuer_hostname: str,
         issuer_protocoll: str,
+        jwks_refresh_interval: float = 300,
+        jwks_min_refetch_interval: float = 30,
+        token_cache_max_size: int = 1024,
+        token_cache_revalidate_interval: float = 60,
+        mode: str = "online",
+        online_latency_budget: float = 0.5,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_timeout: float = 30,
     ) -> None:
         """Initializes a VerifyToken instance.
 
@@ -33,6 +56,22 @@ class VerifyToken:
             hostname (str): The hostname of the token issuer.
             realm_name (str): The name of the token realm.
             client_id (str): The client identifier.
+            jwks_refresh_interval (float): Seconds between two background
+                refreshes of the issuer signing keys.
+            jwks_min_refetch_interval (float): Minimal seconds between two
+                signing key fetches triggered by unknown key ids.
+            token_cache_max_size (int): Maximal number of verified tokens
+                kept in memory.
+            token_cache_revalidate_interval (float): Seconds after which a
+                cached token is validated against the issuer again.
+            mode (str): The validation mode, one of "online", "offline" and
+                "hybrid".
+            online_latency_budget (float): Seconds the userinfo request may
+                take in hybrid mode before falling back to local validation.
+            breaker_failure_threshold (int): Consecutive issuer failures in
+                hybrid mode opening the circuit breaker.
+            breaker_reset_timeout (float): Seconds the circuit breaker stays
+                open before the issuer is tried again.
 
         """
         base_url = f"{protocol}://{hostname}/realms/{realm_name}"
@@ -41,8 +80,43 @@ class VerifyToken:
         self.issuer_url: str = (
             f"{issuer_protocoll}://{issuer_hostname}/realms/{realm_name}"
         )
-        self.jwks_client = jwt.PyJWKClient(jwks_url)
+        self.jwks_cache = JWKSCache(
+            jwks_url,
+            refresh_interval=jwks_refresh_interval,
+            min_refetch_interval=jwks_min_refetch_interval,
+        )
         self.client_id = client_id
+        self.token_cache = TokenCache(
+            metric=token_cache_metric,
+            max_size=token_cache_max_size,
+            revalidate_interval=token_cache_revalidate_interval,
+        )
+        self.single_flight: SingleFlight[dict[str, Any]] = SingleFlight(
+            metric=token_validation_metric
+        )
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self.mode = mode
+        self.online_latency_budget = online_latency_budget
+        self.breaker = CircuitBreaker(
+            metric=token_validation_metric,
+            failure_threshold=breaker_failure_threshold,
+            reset_timeout=breaker_reset_timeout,
+        )
+
+    async def start(self, http_session: aiohttp.ClientSession) -> None:
+        """Attach the shared HTTP client session and load the signing keys.
+
+        Args:
+            http_session (aiohttp.ClientSession): The pooled client session
+                used for all requests to the token issuer.
+        """
+        self.http_session = http_session
+        await self.jwks_cache.start(http_session=http_session)
+
+    async def stop(self) -> None:
+        """Stop background work and detach the shared HTTP client session."""
+        await self.jwks_cache.stop()
+        self.http_session = None
 
     async def verify(
         self,
@@ -61,15 +135,52 @@ class VerifyToken:
             logging.debug("No token provided in request")
             raise UnauthenticatedException
 
-        try:
-            signing_key = self.jwks_client.get_signing_key_from_jwt(
-                token.credentials
-            ).key
+        cached_payload = self.token_cache.get(token.credentials)
 
+        if cached_payload is not None:
             logging.debug(
-                "Time now: %s", datetime.now(tz=timezone.utc).timestamp()
+                "Authenticated user %s from token cache",
+                cached_payload.get("preferred_username"),
             )
+            request.state.token = cached_payload
+            return
+
+        try:
+            payload = await self.single_flight.run(
+                TokenCache.hash_token(token.credentials),
+                lambda: self._validate(token),
+            )
+        except Exception as error:
+            logging.debug("Token verification failed with error %s", error)
+            raise UnauthenticatedException() from error
+
+        request.state.token = payload
+
+    async def _validate(
+        self, token: HTTPAuthorizationCredentials
+    ) -> dict[str, Any]:
+        """Decode the token, validate it against the issuer and cache it.
+
+        Concurrent requests with the same token share one execution of this
+        method via the single flight.
+
+        Args:
+            token (HTTPAuthorizationCredentials): The bearer token.
+
+        Returns:
+            dict[str, Any]: The decoded token payload.
 
+        """
+        with token_validation_metric.time_stage("signing_key"):
+            signing_key = (
+                await self.jwks_cache.get_signing_key_from_jwt(
+                    token.credentials
+                )
+            ).key
+
+        logging.debug("Time now: %s", datetime.now(tz=timezone.utc).timestamp())
+
+        with token_validation_metric.time_stage("decode"):
             payload: dict[str, Any] = jwt.decode(
                 token.credentials,
                 signing_key,
@@ -86,14 +197,18 @@ class VerifyToken:
                 },
             )
 
-            logging.debug("Decoded token payload: %s", payload)
+        logging.debug("Decoded token payload: %s", payload)
 
-            # Use userinfo endpoint for token validation
-            await self._check_token_validity(token)
+        validated_by_issuer = True
 
-        except Exception as error:
-            logging.debug("Token verification failed with error %s", error)
-            raise UnauthenticatedException() from error
+        if self.mode == "online":
+            with token_validation_metric.time_stage("userinfo"):
+                await self._check_token_validity(token)
+        elif self.mode == "hybrid":
+            with token_validation_metric.time_stage("userinfo"):
+                validated_by_issuer = await self._check_token_validity_hybrid(
+                    token
+                )
 
         logging.debug(
             "Authenticated user %s with scopes %s with token iat %s",
@@ -102,7 +217,62 @@ class VerifyToken:
             payload["iat"],
         )
 
-        request.state.token = payload
+        # Locally validated tokens are checked against the issuer again as
+        # soon as it is available, so they are not cached in hybrid mode.
+        if validated_by_issuer:
+            self.token_cache.put(token.credentials, payload)
+
+        return payload
+
+    async def _check_token_validity_hybrid(
+        self, token: HTTPAuthorizationCredentials
+    ) -> bool:
+        """Check the token against the issuer guarded by the circuit breaker.
+
+        Args:
+            token (HTTPAuthorizationCredentials): The token to check.
+
+        Returns:
+            bool: True if the issuer confirmed the token, False if the check
+                fell back to the local validation.
+
+        Raises:
+            UnauthenticatedException: If the issuer rejects the token.
+
+        """
+        if not self.breaker.allow_request():
+            logging.debug("Circuit breaker is open, validating token locally")
+            token_validation_metric.record_local_fallback()
+            return False
+
+        try:
+            await asyncio.wait_for(
+                self._check_token_validity(token),
+                timeout=self.online_latency_budget,
+            )
+        except UnauthenticatedException:
+            self.breaker.record_success()
+            raise
+        except (
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+            IdentityProviderUnavailableError,
+        ) as error:
+            logging.warning(
+                "Userinfo request failed, validating token locally: %r", error
+            )
+            self.breaker.record_failure()
+            token_validation_metric.record_local_fallback()
+            return False
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.release_trial()
+            raise
+
+        self.breaker.record_success()
+        return True
 
     async def _check_token_validity(
         self, token: HTTPAuthorizationCredentials
@@ -115,9 +285,11 @@ class VerifyToken:
 
         Raises:
             UnauthenticatedException: If the response status is not 200.
+            IdentityProviderUnavailableError: If the issuer responds with a
+                server error.
 
         """
-        async with aiohttp.ClientSession() as session:
+        async with shared_or_temporary_session(self.http_session) as session:
             headers = {
                 "Accept": "application/json",
                 "Content-Type": "application/x-www-form-urlencoded",
@@ -131,6 +303,11 @@ class VerifyToken:
             async with session.get(
                 self.userinfo_endpoint, headers=headers
             ) as response:
+                if response.status >= 500:
+                    raise IdentityProviderUnavailableError(
+                        f"Userinfo endpoint responded with {response.status}"
+                    )
+
                 if response.status != 200:
                     logging.debug(
                         "Token validation failed with status %s from %s",
@@ -0,0 +1,101 @@
+import time
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
+from motor.core import AgnosticClientSession
+
+from coffee_backend.api.deps import (
+    get_coffee_images_service,
+    get_image_request_headers,
+    get_image_url_signer,
+)
+from coffee_backend.api.image_response import (
+    ImageRequestHeaders,
+    image_response,
+)
+from coffee_backend.api.image_url_signer import ImageUrlSigner
+from coffee_backend.exceptions.exceptions import UnauthorizedException
+from coffee_backend.mongo.database import get_db
+from coffee_backend.schemas import ImageType
+from coffee_backend.services.image_service import ImageService
+
+router = APIRouter()
+
+
+@router.get(
+    "/{image_type}/{object_id}",
+    response_class=Response,
+    response_model=bytes,
+    responses={
+        200: {"content": {"image/png": {}}},
+        206: {"description": "Requested byte range of the image"},
+        304: {"description": "Image not modified"},
+        307: {"description": "Redirect to a presigned image URL"},
+        403: {"description": "Invalid or expired signature"},
+        404: {"description": "Image not found"},
+        416: {"description": "Requested range not satisfiable"},
+    },
+)
+async def _get_signed_image(
+    image_type: ImageType,
+    object_id: UUID,
+    expires: int = Query(..., description="Unix time the URL expires at"),
+    signature: str = Query(..., description="HMAC signature of the URL"),
+    version: Optional[str] = Query(
+        default=None, description="Version of the image the URL is signed for"
+    ),
+    image_url_signer: Optional[ImageUrlSigner] = Depends(get_image_url_signer),
+    image_service: ImageService = Depends(get_coffee_images_service),
+    request_headers: ImageRequestHeaders = Depends(get_image_request_headers),
+    db_session: AgnosticClientSession = Depends(get_db),
+) -> Response:
+    """Retrieve an image via a signed URL without bearer authentication.
+
+    The signature is checked locally, so no identity provider round trip is
+    needed. As a URL signed for a version of the image changes when the image
+    is replaced, its response may be cached by browsers and proxies until the
+    URL expires. Responses of unversioned URLs have to be revalidated.
+
+    Args:
+        image_type (ImageType): The type of the image.
+        object_id (UUID): The id of the object the image belongs to.
+        expires (int): The unix time the URL expires at.
+        signature (str): The HMAC signature of the URL.
+        version (Optional[str]): The version of the image the URL is signed
+            for.
+        request_headers (ImageRequestHeaders): The range and conditional
+            headers of the request.
+        db_session (AgnosticClientSession): The database session
+            object loaded via fastapi depends
+
+    Returns:
+        Response: A response containing the image.
+
+    Raises:
+        HTTPException: If signed URLs are disabled or the image is not found.
+        UnauthorizedException: If the signature is invalid or expired.
+    """
+    if image_url_signer is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    if not image_url_signer.verify(
+        image_type, object_id, expires, signature, version=version
+    ):
+        raise UnauthorizedException(detail="Invalid or expired image URL")
+
+    cache_control = "public, no-cache"
+
+    if version is not None:
+        max_age = max(int(expires - time.time()), 0)
+        cache_control = f"public, max-age={max_age}, immutable"
+
+    return await image_response(
+        image_service,
+        db_session=db_session,
+        object_id=object_id,
+        image_type=image_type,
+        request_headers=request_headers,
+        cache_control=cache_control,
+    )
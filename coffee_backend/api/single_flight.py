@@ -0,0 +1,61 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from coffee_backend.metrics import TokenValidationMetric
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent executions for the same key into a single one.
+
+    The first caller for a key starts the execution, every caller arriving
+    while it is still running awaits the same result or exception. The
+    execution is shielded, so a cancelled caller (e.g. a disconnected client)
+    does not cancel it for the others.
+    """
+
+    def __init__(self, metric: TokenValidationMetric) -> None:
+        """Initializes a SingleFlight instance.
+
+        Args:
+            metric (TokenValidationMetric): The metric counting coalesced
+                executions.
+
+        """
+        self.metric = metric
+        self.in_flight: dict[str, asyncio.Task[T]] = {}
+
+    async def run(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Run func for key or join an in-flight execution for key.
+
+        Args:
+            key (str): The key identifying equal executions.
+            func (Callable[[], Awaitable[T]]): Creates the awaitable to
+                execute if no execution for key is in flight.
+
+        Returns:
+            T: The result of the shared execution.
+
+        """
+        task = self.in_flight.get(key)
+
+        if task is not None:
+            logging.debug("Joining in-flight execution for %s", key)
+            self.metric.record_coalesced()
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(func())
+        self.in_flight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task[T]) -> None:
+        """Remove a finished execution and mark its exception as retrieved."""
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,113 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from coffee_backend.metrics import TokenCacheMetric
+
+
+@dataclass
+class CachedToken:
+    """Describes a verified token kept in the token cache."""
+
+    payload: dict[str, Any]
+    validated_at: float
+    expires_at: float
+
+
+class TokenCache:
+    """Bounded LRU cache of verified token payloads.
+
+    Tokens are stored by a hash of the encoded token, so the cache never keeps
+    raw credentials. An entry is served until it was validated longer than the
+    revalidation interval ago and never after the expiry of the token.
+    """
+
+    def __init__(
+        self,
+        metric: TokenCacheMetric,
+        max_size: int = 1024,
+        revalidate_interval: float = 60,
+    ) -> None:
+        """Initializes a TokenCache instance.
+
+        Args:
+            metric (TokenCacheMetric): The metric recording hits and misses.
+            max_size (int): Maximal number of cached tokens. A size of 0
+                disables the cache.
+            revalidate_interval (float): Seconds after which a cached token
+                has to be validated again.
+
+        """
+        self.metric = metric
+        self.max_size = max_size
+        self.revalidate_interval = revalidate_interval
+        self.entries: OrderedDict[str, CachedToken] = OrderedDict()
+
+    @staticmethod
+    def hash_token(token: str) -> str:
+        """Return the cache key of an encoded token."""
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[dict[str, Any]]:
+        """Return the cached payload of a token if it is still valid.
+
+        Args:
+            token (str): The encoded token.
+
+        Returns:
+            Optional[dict[str, Any]]: The decoded payload or None if the token
+                is not cached, expired or due for revalidation.
+
+        """
+        key = self.hash_token(token)
+        entry = self.entries.get(key)
+
+        if entry is None:
+            self.metric.record_miss()
+            return None
+
+        now = time.time()
+
+        if (
+            now >= entry.expires_at
+            or now - entry.validated_at >= self.revalidate_interval
+        ):
+            logging.debug("Evicting stale token %s from token cache", key)
+            del self.entries[key]
+            self.metric.set_size(len(self.entries))
+            self.metric.record_miss()
+            return None
+
+        self.entries.move_to_end(key)
+        self.metric.record_hit()
+        return entry.payload
+
+    def put(self, token: str, payload: dict[str, Any]) -> None:
+        """Store the payload of a successfully validated token.
+
+        Tokens without an expiry claim are not cached.
+
+        Args:
+            token (str): The encoded token.
+            payload (dict[str, Any]): The decoded and validated payload.
+
+        """
+        if self.max_size <= 0 or "exp" not in payload:
+            return
+
+        key = self.hash_token(token)
+
+        self.entries[key] = CachedToken(
+            payload=payload,
+            validated_at=time.time(),
+            expires_at=float(payload["exp"]),
+        )
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+        self.metric.set_size(len(self.entries))
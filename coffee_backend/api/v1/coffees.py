@@ -1,21 +1,31 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from fastapi.security import OAuth2PasswordBearer
 from motor.core import AgnosticClientSession
 
 from coffee_backend.api.authorization import authorize_coffee_edit_delete
+from coffee_backend.api.cursor import (
+    NEXT_CURSOR_HEADER,
+    encode_cursor,
+    get_cursor,
+)
 from coffee_backend.api.deps import (
     get_coffee_images_service,
     get_coffee_service,
     get_drink_service,
+    get_image_url_signer,
+    get_search_rate_limiter,
 )
+from coffee_backend.api.image_url_signer import ImageUrlSigner, image_version
+from coffee_backend.api.rate_limit import RateLimiter
 from coffee_backend.mongo.database import get_db
 from coffee_backend.schemas import Coffee, CreateCoffee, ImageType, UpdateCoffee
 from coffee_backend.services.coffee import CoffeeService
 from coffee_backend.services.drink import DrinkService
 from coffee_backend.services.image_service import ImageService
+from coffee_backend.settings import settings
 
 router = APIRouter()
 
@@ -50,24 +60,87 @@ async def _post_coffee(
     description="""Get list of coffees including rating summary""",
     response_model=List[Coffee],
 )
-async def _list_coffees_with_rating_summary(
+async def _list_coffees_with_rating_summary(  # pylint: disable=too-many-locals
+    request: Request,
+    response: Response,
     db_session: AgnosticClientSession = Depends(get_db),
     coffee_service: CoffeeService = Depends(get_coffee_service),
-    page: int = Query(default=1, ge=1, description="Page number"),
-    page_size: int = Query(default=10, ge=1, description="Page size"),
+    page: int = Query(
+        default=1,
+        ge=1,
+        description="Page number, use the cursor instead",
+        deprecated=True,
+    ),
+    page_size: int = Query(
+        default=10,
+        ge=1,
+        le=settings.list_max_page_size,
+        description="Page size",
+    ),
+    after_id: Optional[UUID] = Depends(get_cursor),
     owner_id: Optional[UUID] = None,
-    first_id: Optional[UUID] = None,
-    search_query: Optional[str] = None,
+    first_id: Optional[UUID] = Query(default=None, deprecated=True),
+    search_query: Optional[str] = Query(
+        default=None,
+        max_length=settings.search_query_max_length,
+        description="Words to search for in name, roasting company and owner "
+        + "name, results are ordered by relevance and paged by page number",
+    ),
+    search_rate_limiter: RateLimiter = Depends(get_search_rate_limiter),
+    signed_image_urls: bool = Query(
+        default=False, description="Add signed image URLs to the coffees"
+    ),
+    image_url_signer: Optional[ImageUrlSigner] = Depends(get_image_url_signer),
+    image_service: ImageService = Depends(get_coffee_images_service),
 ) -> List[Coffee]:
-    return await coffee_service.list_coffees_with_rating_summary(
+    search_query = search_query.strip() if search_query else None
+
+    if search_query:
+        wait = search_rate_limiter.acquire(request.state.token["sub"])
+
+        if wait is not None:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many search requests",
+                headers={"Retry-After": RateLimiter.retry_after(wait)},
+            )
+
+    coffee_page = await coffee_service.list_coffees_with_rating_summary(
         db_session=db_session,
         page=page,
         page_size=page_size,
         owner_id=owner_id,
         first_id=first_id,
         search_query=search_query,
+        after_id=after_id,
+    )
+    coffees = coffee_page.items
+
+    if coffee_page.next_id:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            coffee_page.next_id
+        )
+
+    image_variants = await image_service.list_image_variants(
+        db_session=db_session,
+        object_ids=[coffee.id for coffee in coffees],
+        image_type=ImageType.COFFEE_BEAN,
     )
 
+    for coffee in coffees:
+        variants = image_variants.get(coffee.id)
+        coffee.image_variants = list(variants) if variants is not None else None
+
+    if signed_image_urls and image_url_signer:
+        for coffee in coffees:
+            coffee.image_url = image_url_signer.sign(
+                ImageType.COFFEE_BEAN,
+                coffee.id,
+                version=image_version(image_variants.get(coffee.id)),
+            )
+
+    return coffees
+
 
 @router.get(
     "/coffees/ids",
@@ -183,8 +256,10 @@ async def _delete_coffee_by_id(
         db_session=db_session, coffee_bean_id=coffee_id
     )
 
-    image_service.delete_image(
-        object_id=coffee_id, image_type=ImageType.COFFEE_BEAN
+    await image_service.delete_image(
+        db_session=db_session,
+        object_id=coffee_id,
+        image_type=ImageType.COFFEE_BEAN,
     )
 
     await coffee_service.delete_coffee(
@@ -1,25 +1,37 @@
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import Response
 from motor.core import AgnosticClientSession
 
-from coffee_backend.api.deps import get_coffee_images_service, get_drink_service
+from coffee_backend.api.deps import (
+    get_coffee_images_service,
+    get_drink_service,
+    get_image_request_headers,
+)
+from coffee_backend.api.image_response import (
+    ImageRequestHeaders,
+    image_response,
+)
+from coffee_backend.api.multipart import (
+    MULTIPART_FILE_REQUEST_BODY,
+    stream_multipart_file,
+)
 from coffee_backend.mongo.database import get_db
-from coffee_backend.schemas import CoffeeDrinkImage, ImageType
+from coffee_backend.schemas import CoffeeDrinkImage, ImageType, ImageUpload
 from coffee_backend.services.drink import DrinkService
 from coffee_backend.services.image_service import ImageService
 
 router = APIRouter()
 
 
-@router.post("/drinks/{drink_id}/image")
+@router.post(
+    "/drinks/{drink_id}/image", openapi_extra=MULTIPART_FILE_REQUEST_BODY
+)
 async def _create_image(
     drink_id: UUID,
-    file: UploadFile = File(
-        description='<img src="https://placebear.com/cache/395-205.jpg"'
-        + ' alt="bear">'
-    ),
+    request: Request,
     db_session: AgnosticClientSession = Depends(get_db),
     image_service: ImageService = Depends(get_coffee_images_service),
     coffee_drink_service: DrinkService = Depends(get_drink_service),
@@ -29,17 +41,84 @@ async def _create_image(
     Args:
         drink_id (UUID): The ID of the drink associated with the
             image.
-        file (UploadFile): The image file to upload.
+        request (Request): The request with the image file to upload as
+            multipart form field file, streamed into the S3 bucket.
+
+    Returns:
+        Response: A response indicating a successful upload (status code 201).
+
+    Raises:
+        HTTPException: If no file is provided, the file is no image of a
+            supported format or exceeds the maximal size.
+    """
+
+    await coffee_drink_service.get_by_id(db_session, drink_id)
+    await image_service.add_image(
+        db_session=db_session,
+        s3_object=CoffeeDrinkImage(
+            file=await stream_multipart_file(request), key=drink_id
+        ),
+    )
+
+    return Response(status_code=201)
+
+
+@router.post("/drinks/{drink_id}/image/upload", response_model=ImageUpload)
+async def _create_image_upload(
+    drink_id: UUID,
+    db_session: AgnosticClientSession = Depends(get_db),
+    image_service: ImageService = Depends(get_coffee_images_service),
+    coffee_drink_service: DrinkService = Depends(get_drink_service),
+) -> ImageUpload:
+    """Create a presigned upload to post an image directly to the S3 bucket.
+
+    The image is stored once the upload is completed.
+
+    Args:
+        drink_id (UUID): The ID of the drink associated with the image.
+
+    Returns:
+        ImageUpload: The URL and form fields to post the image with.
+    """
+
+    await coffee_drink_service.get_by_id(db_session, drink_id)
+
+    return await image_service.create_upload(
+        object_id=drink_id, image_type=ImageType.COFFEE_DRINK
+    )
+
+
+@router.post(
+    "/drinks/{drink_id}/image/upload/complete",
+    responses={
+        400: {"description": "Uploaded file is no image or too large"},
+        404: {"description": "No uploaded image found"},
+    },
+)
+async def _complete_image_upload(
+    drink_id: UUID,
+    db_session: AgnosticClientSession = Depends(get_db),
+    image_service: ImageService = Depends(get_coffee_images_service),
+    coffee_drink_service: DrinkService = Depends(get_drink_service),
+) -> Response:
+    """Store an image posted directly to the S3 bucket.
+
+    Args:
+        drink_id (UUID): The ID of the drink associated with the image.
 
     Returns:
         Response: A response indicating a successful upload (status code 201).
 
     Raises:
-        HTTPException: If no file name is provided in the uploaded file.
+        HTTPException: If no image was uploaded or the upload is invalid.
     """
 
     await coffee_drink_service.get_by_id(db_session, drink_id)
-    image_service.add_image(CoffeeDrinkImage(file=file, key=drink_id))
+    await image_service.complete_upload(
+        db_session=db_session,
+        object_id=drink_id,
+        image_type=ImageType.COFFEE_DRINK,
+    )
 
     return Response(status_code=201)
 
@@ -54,35 +133,50 @@ async def _create_image(
             "description": '<img src="https://placebear.com/cache/395-205.jpg"'
             + ' alt="bear">',
         },
+        206: {"description": "Requested byte range of the image"},
+        400: {"description": "Width not allowed"},
+        304: {"description": "Image not modified"},
+        307: {"description": "Redirect to a presigned image URL"},
         404: {"description": "Coffee image not found"},
+        416: {"description": "Requested range not satisfiable"},
     },
 )
 async def _get_image(
     drink_id: UUID,
     image_service: ImageService = Depends(get_coffee_images_service),
+    request_headers: ImageRequestHeaders = Depends(get_image_request_headers),
+    db_session: AgnosticClientSession = Depends(get_db),
+    width: Optional[int] = Query(
+        default=None,
+        alias="w",
+        gt=0,
+        description="Width to resize the image to, one of the allowed sizes",
+    ),
 ) -> Response:
     """Retrieve a coffee drink image associated with a coffee drink.
 
     Args:
         drink_id (UUID): The ID of the drink associated with the
             image.
+        request_headers (ImageRequestHeaders): The range and conditional
+            headers of the request.
+        db_session (AgnosticClientSession): The database session
+            object loaded via fastapi depends
+        width (Optional[int]): The width to resize the image to.
 
     Returns:
-        Response: A response containing the coffee image.
+        Response: A response containing the coffee image or the
+            requested range of it, 304 if the client's copy is current.
 
     Raises:
         HTTPException: If the coffee image is not found in the S3 bucket.
     """
 
-    image_bytes, filetype = image_service.get_image(
-        object_id=drink_id, image_type=ImageType.COFFEE_DRINK
-    )
-
-    return Response(
-        content=image_bytes,
-        media_type=f"image/{filetype}",
-        headers={
-            "Content-Disposition": "attachment; "
-            + f"filename={drink_id}.{filetype}"
-        },
+    return await image_response(
+        image_service,
+        db_session=db_session,
+        object_id=drink_id,
+        image_type=ImageType.COFFEE_DRINK,
+        request_headers=request_headers,
+        width=width,
     )
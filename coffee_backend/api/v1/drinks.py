@@ -4,16 +4,26 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Query, Request, Response
 from motor.core import AgnosticClientSession
 
+from coffee_backend.api.cursor import (
+    NEXT_CURSOR_HEADER,
+    encode_cursor,
+    get_cursor,
+)
 from coffee_backend.api.deps import (
+    get_coffee_images_service,
     get_coffee_service,
     get_drink_service,
+    get_image_url_signer,
     get_unique_user_metric,
 )
+from coffee_backend.api.image_url_signer import ImageUrlSigner, image_version
 from coffee_backend.metrics import DailyActiveUsersMetric
 from coffee_backend.mongo.database import get_db
-from coffee_backend.schemas import CreateDrink, Drink
+from coffee_backend.schemas import CreateDrink, Drink, ImageType
 from coffee_backend.services.coffee import CoffeeService
 from coffee_backend.services.drink import DrinkService
+from coffee_backend.services.image_service import ImageService
+from coffee_backend.settings import settings
 
 router = APIRouter()
 
@@ -25,28 +35,68 @@ router = APIRouter()
     description="""Get list of all drinks""",
     response_model=List[Drink],
 )
-async def _list_drinks(
+async def _list_drinks(  # pylint: disable=too-many-locals
     request: Request,
+    response: Response,
     db_session: AgnosticClientSession = Depends(get_db),
     drink_service: DrinkService = Depends(get_drink_service),
     unique_user_metric: DailyActiveUsersMetric = Depends(
         get_unique_user_metric
     ),
-    page: int = Query(default=1, ge=1, description="Page number"),
-    page_size: int = Query(default=5, ge=1, description="Page size"),
-    first_drink_id: Optional[UUID] = None,
+    page: int = Query(
+        default=1,
+        ge=1,
+        description="Page number, use the cursor instead",
+        deprecated=True,
+    ),
+    page_size: int = Query(
+        default=5, ge=1, le=settings.list_max_page_size, description="Page size"
+    ),
+    after_id: Optional[UUID] = Depends(get_cursor),
+    first_drink_id: Optional[UUID] = Query(default=None, deprecated=True),
     coffee_id: Optional[UUID] = None,
+    signed_image_urls: bool = Query(
+        default=False, description="Add signed image URLs to the drinks"
+    ),
+    image_url_signer: Optional[ImageUrlSigner] = Depends(get_image_url_signer),
+    image_service: ImageService = Depends(get_coffee_images_service),
 ) -> List[Drink]:
     unique_user_metric.add_user(
         user_id=request.state.token["preferred_username"]
     )
-    return await drink_service.list_drinks_with_coffee_bean_information(
+    drink_page = await drink_service.list_drinks_with_coffee_bean_information(
         db_session=db_session,
         page_size=page_size,
         page=page,
         first_id=first_drink_id,
         coffee_bean_id=coffee_id,
+        after_id=after_id,
     )
+    drinks = drink_page.items
+
+    if drink_page.next_id:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(drink_page.next_id)
+
+    image_variants = await image_service.list_image_variants(
+        db_session=db_session,
+        object_ids=[drink.id for drink in drinks if drink.image_exists],
+        image_type=ImageType.COFFEE_DRINK,
+    )
+
+    for drink in drinks:
+        variants = image_variants.get(drink.id)
+        drink.image_variants = list(variants) if variants is not None else None
+
+    if signed_image_urls and image_url_signer:
+        for drink in drinks:
+            if drink.image_exists:
+                drink.image_url = image_url_signer.sign(
+                    ImageType.COFFEE_DRINK,
+                    drink.id,
+                    version=image_version(image_variants.get(drink.id)),
+                )
+
+    return drinks
 
 
 @router.post(
@@ -1,27 +1,80 @@
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
 import motor.motor_asyncio
+import urllib3
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from minio import Minio  # type: ignore
 from prometheus_client import make_asgi_app
+from pymongo.errors import PyMongoError
 
-from coffee_backend.api import router
+from coffee_backend.api import auth, router
+from coffee_backend.api.cursor import NEXT_CURSOR_HEADER
+from coffee_backend.api.image_url_signer import ImageUrlSigner
+from coffee_backend.api.rate_limit import RateLimiter
 from coffee_backend.config.log_filter import HealthCheckFilter
 from coffee_backend.config.log_levels import log_levels
-from coffee_backend.metrics import daily_active_users_metric
+from coffee_backend.http_client.session import create_client_session
+from coffee_backend.metrics import (
+    daily_active_users_metric,
+    http_client_metric,
+    image_cache_metric,
+    thumbnail_metric,
+)
+from coffee_backend.mongo.coffee import coffee_crud
+from coffee_backend.mongo.image_blob import image_blob_crud
+from coffee_backend.mongo.image_metadata import image_metadata_crud
+from coffee_backend.mongo.indexes import INDEXES, ensure_indexes
+from coffee_backend.mongo.search_terms import MISSING_SEARCH_TERMS
+from coffee_backend.repair_ratings import MISSING_RATINGS, repair_ratings
 from coffee_backend.s3.object import ObjectCRUD
 from coffee_backend.services.coffee import coffee_service
 from coffee_backend.services.drink import drink_service
+from coffee_backend.services.image_cache import ImageCache
 from coffee_backend.services.image_service import ImageService
+from coffee_backend.services.thumbnail import (
+    ThumbnailGenerator,
+    supported_formats,
+    thumbnails_available,
+)
 from coffee_backend.settings import settings
 
 logging.basicConfig(level=log_levels.get(settings.log_level, logging.INFO))
 logging.getLogger("uvicorn.access").addFilter(HealthCheckFilter())
 
 
+def create_thumbnail_generator() -> Optional[ThumbnailGenerator]:
+    """Create the thumbnail generator and its process pool if enabled.
+
+    Returns:
+        Optional[ThumbnailGenerator]: The thumbnail generator or None if
+            thumbnails are disabled or Pillow is not installed.
+    """
+    if not settings.image_thumbnails_enabled:
+        return None
+
+    if not thumbnails_available():
+        logging.warning("Thumbnails are enabled, but Pillow is not installed")
+        return None
+
+    return ThumbnailGenerator(
+        executor=ProcessPoolExecutor(
+            max_workers=settings.image_thumbnail_workers or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        ),
+        metric=thumbnail_metric,
+        max_size=settings.image_thumbnail_max_size,
+        quality=settings.image_thumbnail_quality,
+        max_pending=settings.image_thumbnail_max_pending,
+        formats=supported_formats(settings.image_thumbnail_formats),
+    )
+
+
 @asynccontextmanager
 async def lifespan(application: FastAPI) -> AsyncGenerator[None, None]:
     """Initializes the application and its processes."""
@@ -35,6 +88,50 @@ async def lifespan(application: FastAPI) -> AsyncGenerator[None, None]:
         uuidRepresentation="standard",
     )
 
+    await ensure_indexes(
+        database=application.state.database_client[settings.mongodb_database],
+        indexes=INDEXES,
+    )
+
+    try:
+        await repair_ratings(
+            client=application.state.database_client, query=MISSING_RATINGS
+        )
+    except PyMongoError as error:
+        logging.error("Unable to repair missing rating summaries: %s", error)
+
+    try:
+        async with await application.state.database_client.start_session() as (
+            db_session
+        ):
+            await coffee_crud.update_search_terms(
+                db_session=db_session, query=MISSING_SEARCH_TERMS
+            )
+    except PyMongoError as error:
+        logging.error("Unable to store missing search terms: %s", error)
+
+    application.state.minio_executor = ThreadPoolExecutor(
+        max_workers=settings.minio_thread_pool_size,
+        thread_name_prefix="minio",
+    )
+    application.state.minio_upload_executor = ThreadPoolExecutor(
+        max_workers=settings.minio_upload_thread_pool_size,
+        thread_name_prefix="minio-upload",
+    )
+
+    application.state.image_cache = ImageCache(
+        metric=image_cache_metric,
+        directory=settings.image_cache_directory,
+        memory_max_bytes=settings.image_cache_memory_max_bytes,
+        disk_max_bytes=settings.image_cache_disk_max_bytes,
+        memory_max_item_bytes=settings.image_cache_memory_max_item_bytes,
+        disk_max_item_bytes=settings.image_cache_disk_max_item_bytes,
+        ttl=settings.image_cache_ttl_seconds,
+    )
+    application.state.image_cache.clear()
+
+    application.state.thumbnail_generator = create_thumbnail_generator()
+
     application.state.coffee_images_service = ImageService(
         object_crud=ObjectCRUD(
             minio_client=Minio(
@@ -42,19 +139,96 @@ async def lifespan(application: FastAPI) -> AsyncGenerator[None, None]:
                 settings.minio_access_key,
                 settings.minio_secret_key,
                 secure=False,
+                http_client=urllib3.PoolManager(
+                    maxsize=settings.minio_thread_pool_size
+                    + settings.minio_upload_thread_pool_size,
+                    retries=urllib3.Retry(
+                        total=5,
+                        backoff_factor=0.2,
+                        status_forcelist=[500, 502, 503, 504],
+                    ),
+                ),
             ),
             bucket_name=settings.minio_coffee_images_bucket,
+            executor=application.state.minio_executor,
+            upload_executor=application.state.minio_upload_executor,
+            upload_chunk_timeout=settings.image_upload_chunk_timeout_seconds,
+            presign_client=(
+                Minio(
+                    settings.minio_public_endpoint,
+                    settings.minio_access_key,
+                    settings.minio_secret_key,
+                    secure=settings.minio_public_secure,
+                    region=settings.minio_region,
+                )
+                if settings.minio_public_endpoint
+                else None
+            ),
+            bucket_url=(
+                f"{'https' if settings.minio_public_secure else 'http'}://"
+                + f"{settings.minio_public_endpoint}/"
+                if settings.minio_public_endpoint
+                else f"http://{settings.minio_host}:{settings.minio_port}/"
+            )
+            + settings.minio_coffee_images_bucket,
+        ),
+        image_metadata_crud=image_metadata_crud,
+        image_cache=application.state.image_cache,
+        small_recheck_interval=settings.image_small_variant_recheck_seconds,
+        thumbnail_generator=application.state.thumbnail_generator,
+        resize_widths=tuple(settings.image_resize_widths),
+        redirect_url_ttl=settings.image_redirect_url_ttl_seconds,
+        upload_url_ttl=settings.image_upload_url_ttl_seconds,
+        upload_max_size=settings.image_upload_max_bytes,
+        upload_formats=tuple(settings.image_upload_formats),
+        image_blob_crud=(
+            image_blob_crud if settings.image_deduplication_enabled else None
+        ),
+    )
+    application.state.image_url_signer = (
+        ImageUrlSigner(
+            secret=settings.image_url_signing_key,
+            ttl=settings.image_url_ttl_seconds,
         )
+        if settings.image_url_signing_key
+        else None
     )
     application.state.coffee_service = coffee_service
+    application.state.search_rate_limiter = RateLimiter(
+        rate=settings.search_rate_per_second,
+        burst=settings.search_rate_burst,
+        max_keys=settings.search_rate_max_users,
+    )
     application.state.drink_service = drink_service
 
     application.state.daily_active_users_metric = daily_active_users_metric
 
+    application.state.http_session = create_client_session(
+        metric=http_client_metric,
+        pool_limit=settings.http_pool_limit,
+        pool_limit_per_host=settings.http_pool_limit_per_host,
+        keepalive_timeout=settings.http_keepalive_timeout_seconds,
+        dns_cache_ttl=settings.http_dns_cache_ttl_seconds,
+        connect_timeout=settings.http_connect_timeout_seconds,
+        read_timeout=settings.http_read_timeout_seconds,
+    )
+
+    await auth.start(http_session=application.state.http_session)
+
     yield
 
     logging.info("Shutting down...")
 
+    await auth.stop()
+    await application.state.http_session.close()
+    if application.state.thumbnail_generator is not None:
+        await application.state.thumbnail_generator.stop()
+        application.state.thumbnail_generator.executor.shutdown(wait=True)
+
+    application.state.minio_upload_executor.shutdown(wait=True)
+    application.state.minio_executor.shutdown(wait=True)
+    application.state.image_cache.clear()
+
 
 # Initialize app
 app = FastAPI(
@@ -82,4 +256,5 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
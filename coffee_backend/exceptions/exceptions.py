@@ -8,6 +8,13 @@ class ObjectNotFoundError(Exception):
         super().__init__(message)
 
 
+class RangeNotSatisfiableError(Exception):
+    """Custom exception for a byte range outside of the requested object."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
 class UnauthorizedException(HTTPException):
     """Custom exception for Unauthorized access requests."""
 
@@ -24,3 +31,25 @@ class UnauthenticatedException(HTTPException):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Requires authentication",
         )
+
+
+class IdentityProviderUnavailableError(Exception):
+    """Custom exception for an identity provider that fails to answer."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class UploadTooLargeError(Exception):
+    """Custom exception for an upload exceeding the maximal size."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class UploadTimeoutError(Exception):
+    """Custom exception for an upload whose next chunk did not arrive in
+    time."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
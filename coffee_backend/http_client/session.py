@@ -0,0 +1,76 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import aiohttp
+
+from coffee_backend.metrics import HttpClientMetric
+
+
+def create_client_session(
+    metric: HttpClientMetric,
+    pool_limit: int = 100,
+    pool_limit_per_host: int = 20,
+    keepalive_timeout: float = 30,
+    dns_cache_ttl: int = 300,
+    connect_timeout: float = 2,
+    read_timeout: float = 5,
+) -> aiohttp.ClientSession:
+    """Create the long-lived HTTP client session shared by the application.
+
+    The session keeps a pool of keep-alive connections, so outgoing requests
+    to the same host reuse established TCP and TLS connections.
+
+    Args:
+        metric (HttpClientMetric): The metric recording the pool usage.
+        pool_limit (int): Maximal number of open connections.
+        pool_limit_per_host (int): Maximal number of open connections to one
+            host.
+        keepalive_timeout (float): Seconds an idle connection is kept open.
+        dns_cache_ttl (int): Seconds resolved host names are cached.
+        connect_timeout (float): Timeout in seconds for opening a connection.
+        read_timeout (float): Timeout in seconds for reading from a connection.
+
+    Returns:
+        aiohttp.ClientSession: The pooled client session. Must be closed on
+            shutdown.
+
+    """
+    connector = aiohttp.TCPConnector(
+        limit=pool_limit,
+        limit_per_host=pool_limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        use_dns_cache=True,
+        ttl_dns_cache=dns_cache_ttl,
+    )
+
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(
+            sock_connect=connect_timeout, sock_read=read_timeout
+        ),
+        trace_configs=[metric.trace_config(pool_limit=pool_limit)],
+    )
+
+
+@asynccontextmanager
+async def shared_or_temporary_session(
+    session: Optional[aiohttp.ClientSession],
+) -> AsyncIterator[aiohttp.ClientSession]:
+    """Yield the shared session or a temporary one if none is available.
+
+    A temporary session is only used as long as the application has not
+    created the shared session, e.g. outside of the application lifespan.
+
+    Args:
+        session (Optional[aiohttp.ClientSession]): The shared session.
+
+    Yields:
+        aiohttp.ClientSession: A usable client session.
+
+    """
+    if session is not None and not session.closed:
+        yield session
+        return
+
+    async with aiohttp.ClientSession() as temporary_session:
+        yield temporary_session
@@ -1,5 +1,22 @@
 from .daily_active_users import DailyActiveUsersMetric
+from .http_client import HttpClientMetric
+from .image_cache import ImageCacheMetric
+from .thumbnail import ThumbnailMetric
+from .token_cache import TokenCacheMetric
+from .token_validation import TokenValidationMetric
 
 daily_active_users_metric = DailyActiveUsersMetric()
+http_client_metric = HttpClientMetric()
+image_cache_metric = ImageCacheMetric()
+thumbnail_metric = ThumbnailMetric()
+token_cache_metric = TokenCacheMetric()
+token_validation_metric = TokenValidationMetric()
 
-__all__ = ["daily_active_users_metric"]
+__all__ = [
+    "daily_active_users_metric",
+    "http_client_metric",
+    "image_cache_metric",
+    "thumbnail_metric",
+    "token_cache_metric",
+    "token_validation_metric",
+]
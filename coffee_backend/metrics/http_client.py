@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from prometheus_client import Counter, Gauge
+
+
+class HttpClientMetric:
+    """Class to keep track of the usage of the shared HTTP connection pool."""
+
+    def __init__(self) -> None:
+        """Initialize the HTTP connection pool prometheus metrics."""
+        self.pool_limit = Gauge(
+            "http_client_pool_limit",
+            "Maximal number of connections of the shared HTTP client",
+        )
+        self.requests_in_flight = Gauge(
+            "http_client_requests_in_flight",
+            "Requests currently sent by the shared HTTP client",
+        )
+        self.connections_created = Counter(
+            "http_client_connections_created",
+            "New connections opened by the shared HTTP client",
+        )
+        self.connections_reused = Counter(
+            "http_client_connections_reused",
+            "Pooled connections reused by the shared HTTP client",
+        )
+        self.connections_queued = Counter(
+            "http_client_connections_queued",
+            "Requests that waited for a free connection of the pool",
+        )
+
+    def trace_config(self, pool_limit: int) -> aiohttp.TraceConfig:
+        """Create a trace config recording the pool usage of a client session.
+
+        Args:
+            pool_limit (int): The connection limit of the traced session.
+
+        Returns:
+            aiohttp.TraceConfig: The trace config to pass to the session.
+
+        """
+        self.pool_limit.set(pool_limit)
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_request_end.append(self._on_request_finished)
+        trace_config.on_request_exception.append(self._on_request_finished)
+        trace_config.on_connection_create_end.append(
+            self._on_connection_created
+        )
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+        trace_config.on_connection_queued_start.append(
+            self._on_connection_queued
+        )
+        return trace_config
+
+    async def _on_request_start(
+        self, _session: aiohttp.ClientSession, _ctx: SimpleNamespace, _: Any
+    ) -> None:
+        self.requests_in_flight.inc()
+
+    async def _on_request_finished(
+        self, _session: aiohttp.ClientSession, _ctx: SimpleNamespace, _: Any
+    ) -> None:
+        self.requests_in_flight.dec()
+
+    async def _on_connection_created(
+        self, _session: aiohttp.ClientSession, _ctx: SimpleNamespace, _: Any
+    ) -> None:
+        self.connections_created.inc()
+
+    async def _on_connection_reused(
+        self, _session: aiohttp.ClientSession, _ctx: SimpleNamespace, _: Any
+    ) -> None:
+        self.connections_reused.inc()
+
+    async def _on_connection_queued(
+        self, _session: aiohttp.ClientSession, _ctx: SimpleNamespace, _: Any
+    ) -> None:
+        self.connections_queued.inc()
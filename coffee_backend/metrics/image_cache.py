@@ -0,0 +1,43 @@
+from prometheus_client import Counter, Gauge
+
+
+class ImageCacheMetric:
+    """Class to keep track of the image cache efficiency.
+
+    The hit ratio is hits / (hits + misses), the bytes served are labelled by
+    the cache tier or the origin storage they were read from.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the image cache prometheus metrics."""
+        self.hits = Counter(
+            "image_cache_hits", "Image cache hits counter", ["tier"]
+        )
+        self.misses = Counter(
+            "image_cache_misses", "Image cache misses counter"
+        )
+        self.bytes_served = Counter(
+            "image_cache_bytes_served",
+            "Image bytes served by cache tier or origin",
+            ["source"],
+        )
+        self.size = Gauge(
+            "image_cache_size_bytes", "Bytes held by image cache tier", ["tier"]
+        )
+
+    def record_hit(self, tier: str, size: int) -> None:
+        """Count an image of the given size served from a cache tier."""
+        self.hits.labels(tier).inc()
+        self.bytes_served.labels(tier).inc(size)
+
+    def record_miss(self) -> None:
+        """Count an image that had to be read from the object storage."""
+        self.misses.inc()
+
+    def record_origin_bytes(self, size: int) -> None:
+        """Count image bytes served from the object storage."""
+        self.bytes_served.labels("origin").inc(size)
+
+    def set_size(self, tier: str, size: int) -> None:
+        """Set the current number of bytes held by a cache tier."""
+        self.size.labels(tier).set(size)
@@ -0,0 +1,38 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+
+class ThumbnailMetric:
+    """Class to keep track of the in-process thumbnail generation.
+
+    Jobs are counted by result, the stages are queue wait, decode, resize,
+    encode and upload of the created thumbnail.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the thumbnail prometheus metrics."""
+        self.jobs = Counter(
+            "image_thumbnail_jobs",
+            "Thumbnail jobs by result (created, rejected, failed)",
+            ["result"],
+        )
+        self.queue_depth = Gauge(
+            "image_thumbnail_queue_depth",
+            "Thumbnail jobs waiting for or running in the process pool",
+        )
+        self.stage_duration = Histogram(
+            "image_thumbnail_stage_duration_seconds",
+            "Duration of the thumbnail generation stages",
+            ["stage"],
+        )
+
+    def record_job(self, result: str) -> None:
+        """Count a finished or rejected thumbnail job."""
+        self.jobs.labels(result).inc()
+
+    def set_queue_depth(self, depth: int) -> None:
+        """Set the current number of pending thumbnail jobs."""
+        self.queue_depth.set(depth)
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        """Observe the duration of a thumbnail generation stage."""
+        self.stage_duration.labels(stage=stage).observe(seconds)
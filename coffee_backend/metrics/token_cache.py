@@ -0,0 +1,29 @@
+from prometheus_client import Counter, Gauge
+
+
+class TokenCacheMetric:
+    """Class to keep track of the verified token cache efficiency."""
+
+    def __init__(self) -> None:
+        """Initialize the verified token cache prometheus metrics."""
+        self.hits = Counter(
+            "auth_token_cache_hits", "Verified token cache hits counter"
+        )
+        self.misses = Counter(
+            "auth_token_cache_misses", "Verified token cache misses counter"
+        )
+        self.size = Gauge(
+            "auth_token_cache_size", "Number of cached verified tokens"
+        )
+
+    def record_hit(self) -> None:
+        """Count a token served from the cache."""
+        self.hits.inc()
+
+    def record_miss(self) -> None:
+        """Count a token that had to be validated."""
+        self.misses.inc()
+
+    def set_size(self, size: int) -> None:
+        """Set the current number of cached tokens."""
+        self.size.set(size)
@@ -0,0 +1,47 @@
+from contextlib import AbstractContextManager
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+
+
+class TokenValidationMetric:
+    """Class to keep track of how bearer tokens are validated."""
+
+    def __init__(self) -> None:
+        """Initialize the token validation prometheus metrics."""
+        self.coalesced = Counter(
+            "auth_token_validations_coalesced",
+            "Token validations served by an in-flight validation of the same"
+            " token",
+        )
+        self.local_fallbacks = Counter(
+            "auth_token_validations_local_fallback",
+            "Token validations that fell back to local validation because"
+            " the identity provider was unavailable",
+        )
+        self.breaker_state = Gauge(
+            "auth_identity_provider_circuit_breaker_state",
+            "State of the identity provider circuit breaker"
+            " (0 closed, 1 half open, 2 open)",
+        )
+        self.stage_duration = Histogram(
+            "auth_stage_duration_seconds",
+            "Duration of the token validation stages",
+            ["stage"],
+        )
+
+    def record_coalesced(self) -> None:
+        """Count a validation that joined an in-flight validation."""
+        self.coalesced.inc()
+
+    def record_local_fallback(self) -> None:
+        """Count a validation that skipped the identity provider."""
+        self.local_fallbacks.inc()
+
+    def set_breaker_state(self, state: int) -> None:
+        """Set the current state of the circuit breaker."""
+        self.breaker_state.set(state)
+
+    def time_stage(self, stage: str) -> AbstractContextManager[Any]:
+        """Return a context manager observing the duration of a stage."""
+        return self.stage_duration.labels(stage=stage).time()
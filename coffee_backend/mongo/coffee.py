@@ -1,11 +1,13 @@
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from motor.core import AgnosticClientSession
+from pymongo import UpdateOne
 from pymongo.errors import DuplicateKeyError, OperationFailure
 
 from coffee_backend.exceptions.exceptions import ObjectNotFoundError
+from coffee_backend.mongo.search_terms import search_terms
 from coffee_backend.schemas.coffee import Coffee
 from coffee_backend.settings import settings
 
@@ -37,7 +39,13 @@ class CoffeeCRUD:
             ValueError: If a key duplication error occurs when inserting the
                 document.
         """
-        document = coffee.model_dump(by_alias=True)
+        document = coffee.model_dump(
+            by_alias=True,
+            exclude={"image_url", "image_variants", "rating_average"},
+        )
+        document["rating_count"] = coffee.rating_count or 0
+        document["rating_sum"] = coffee.rating_sum or 0
+        document["search_terms"] = self._search_terms(document)
         try:
             await db_session.client[self.database][
                 self.coffee_collection
@@ -54,16 +62,22 @@ class CoffeeCRUD:
         self,
         db_session: AgnosticClientSession,
         query: Dict[str, Any],
+        limit: int = 0,
+        skip: int = 0,
         projection: Optional[Dict[str, int]] = None,
+        sort: Optional[List[Tuple[str, Any]]] = None,
     ) -> List[Coffee]:
         """Find coffees based on mongo search query.
 
         Args:
             db_session (AgnosticClientSession): The MongoDB client session.
-            coffee_id (UUID): The ID of the coffee document to retrieve.
-            max_results (int): max number of entries retrieved from db
+            query (Dict[str, Any]): The mongo search query.
+            limit (int): max number of entries retrieved from db, 0 for all
+            skip (int): number of entries to skip
             projection (Optional[Dict[str, int]]): Selection of columns to
                 include or exclude in result
+            sort (Optional[List[Tuple[str, Any]]]): Sort order of the
+                entries, newest first if not set
 
         Returns:
             Coffee: A `Coffee` instance representing the retrieved document.
@@ -75,7 +89,9 @@ class CoffeeCRUD:
                 self.coffee_collection
             ]
             .find(filter=query, projection=projection)
-            .sort("_id", -1)
+            .sort(sort or [("_id", -1)])
+            .skip(skip)
+            .limit(limit)
         ]
 
         if documents:
@@ -146,12 +162,21 @@ class CoffeeCRUD:
                 with the specified ID.
             ValidationError: If the provided coffee data is invalid.
         """
+        update = coffee.model_dump(
+            by_alias=True,
+            exclude={
+                "id",
+                "image_url",
+                "image_variants",
+                "rating_count",
+                "rating_average",
+            },
+        )
+        update["search_terms"] = self._search_terms(update)
+
         result = await db_session.client[self.database][
             self.coffee_collection
-        ].update_one(
-            {"_id": coffee_id},
-            {"$set": coffee.model_dump(by_alias=True, exclude={"id"})},
-        )
+        ].update_one({"_id": coffee_id}, {"$set": update})
         if result.matched_count == 0:
             raise ObjectNotFoundError(
                 f"Coffee with id {coffee_id} not found in collection"
@@ -196,6 +221,124 @@ class CoffeeCRUD:
 
         return True
 
+    async def increment_rating(
+        self,
+        db_session: AgnosticClientSession,
+        coffee_id: UUID,
+        count: int,
+        rating: float,
+    ) -> None:
+        """Atomically add ratings to the rating summary of a coffee.
+
+        Args:
+            db_session (AgnosticClientSession): The MongoDB client session.
+            coffee_id (UUID): The ID of the rated coffee.
+            count (int): Number of added ratings, negative for removed ones.
+            rating (float): Sum of the added ratings, negative for removed
+                ones.
+        """
+        result = await db_session.client[self.database][
+            self.coffee_collection
+        ].update_one(
+            {"_id": coffee_id},
+            {"$inc": {"rating_count": count, "rating_sum": rating}},
+        )
+
+        if result.matched_count == 0:
+            logging.debug(
+                "Rating summary of unknown coffee %s not updated", coffee_id
+            )
+
+    async def recompute_ratings(
+        self,
+        db_session: AgnosticClientSession,
+        drink_collection: str,
+        query: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Recompute the rating summaries of coffees from their drinks.
+
+        Args:
+            db_session (AgnosticClientSession): The MongoDB client session.
+            drink_collection (str): Name of the collection of the drinks.
+            query (Optional[Dict[str, Any]]): Query selecting the coffees to
+                recompute, all coffees if not set.
+        """
+        pipeline: List[dict[str, Any]] = [
+            {
+                "$lookup": {
+                    "from": drink_collection,
+                    "localField": "_id",
+                    "foreignField": "coffee_bean_id",
+                    "pipeline": [{"$project": {"_id": 0, "rating": 1}}],
+                    "as": "drinks",
+                }
+            },
+            {
+                "$project": {
+                    "rating_count": {"$size": "$drinks"},
+                    "rating_sum": {"$sum": "$drinks.rating"},
+                }
+            },
+            {
+                "$merge": {
+                    "into": self.coffee_collection,
+                    "on": "_id",
+                    "whenMatched": "merge",
+                    "whenNotMatched": "discard",
+                }
+            },
+        ]
+
+        if query:
+            pipeline.insert(0, {"$match": query})
+
+        async for _ in db_session.client[self.database][
+            self.coffee_collection
+        ].aggregate(pipeline):
+            pass
+
+        logging.info("Recomputed rating summaries of coffees for %s", query)
+
+    async def update_search_terms(
+        self,
+        db_session: AgnosticClientSession,
+        query: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Store the search terms of coffees, e.g. of coffees created before
+        search terms were stored.
+
+        Args:
+            db_session (AgnosticClientSession): The MongoDB client session.
+            query (Optional[Dict[str, Any]]): Query selecting the coffees to
+                update, all coffees if not set.
+        """
+        collection = db_session.client[self.database][self.coffee_collection]
+
+        updates = [
+            UpdateOne(
+                {"_id": document["_id"]},
+                {"$set": {"search_terms": self._search_terms(document)}},
+            )
+            async for document in collection.find(
+                query or {},
+                projection={"name": 1, "roasting_company": 1, "owner_name": 1},
+            )
+        ]
+
+        if updates:
+            await collection.bulk_write(updates, ordered=False)
+
+        logging.info("Updated search terms of %s coffees", len(updates))
+
+    @staticmethod
+    def _search_terms(document: Dict[str, Any]) -> List[str]:
+        """Return the search terms of a coffee document."""
+        return search_terms(
+            document.get("name", ""),
+            document.get("roasting_company", ""),
+            document.get("owner_name", ""),
+        )
+
 
 coffee_crud = CoffeeCRUD(
     database=settings.mongodb_database,
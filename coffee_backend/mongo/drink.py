@@ -20,7 +20,6 @@ class DrinkCRUD:
     def __init__(self, database: str, drink_collection: str) -> None:
         self.database = database
         self.drink_collection = drink_collection
-        self.first_drink = True
 
     async def create(
         self, db_session: AgnosticClientSession, drink: Drink
@@ -38,20 +37,13 @@ class DrinkCRUD:
             ValueError: If a key duplication error occurs when inserting the
                 document.
         """
-        document = drink.model_dump(by_alias=True)
+        document = drink.model_dump(
+            by_alias=True, exclude={"image_url", "image_variants"}
+        )
         try:
             await db_session.client[self.database][
                 self.drink_collection
             ].insert_one(document)
-
-            if self.first_drink:
-                logging.debug("Ensuring index for coffee_id attribute exists")
-                await db_session.client[self.database][
-                    self.drink_collection
-                ].create_index("coffee_id")
-
-                self.first_drink = False
-
         except DuplicateKeyError:
             raise ValueError(  # pylint: disable=raise-missing-from
                 "Unable to store entry in database due to key duplication"
@@ -164,7 +156,11 @@ class DrinkCRUD:
             self.drink_collection
         ].update_one(
             {"_id": drink_id},
-            {"$set": drink.model_dump(by_alias=True, exclude={"id"})},
+            {
+                "$set": drink.model_dump(
+                    by_alias=True, exclude={"id", "image_url", "image_variants"}
+                )
+            },
         )
         if result.matched_count == 0:
             raise ObjectNotFoundError(
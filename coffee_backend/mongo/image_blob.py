@@ -0,0 +1,123 @@
+import logging
+
+from motor.core import AgnosticClientSession
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from coffee_backend.settings import settings
+
+
+class ImageBlobCRUD:
+    """CRUD class for the references of content addressed image blobs.
+
+    Each blob is stored once under its SHA-256 digest, its document lists the
+    keys of the images referencing it. Adding the same reference twice has no
+    effect, so the number of references is always the number of images.
+
+    Once the last reference is removed, the document is marked as deleting
+    until the blob is deleted from S3. No reference can be added to a blob
+    marked as deleting, so a concurrent upload of the same content never
+    points at a blob which is about to be deleted.
+
+    Args:
+        database(str): Name of the database to use for collection transactions.
+
+    """
+
+    def __init__(self, database: str, image_blob_collection: str) -> None:
+        self.database = database
+        self.image_blob_collection = image_blob_collection
+
+    async def add_reference(
+        self, db_session: AgnosticClientSession, sha256: str, key: str
+    ) -> bool:
+        """Record that an image references a blob.
+
+        Args:
+            db_session (AgnosticClientSession): The MongoDB client session.
+            sha256 (str): The SHA-256 digest of the blob.
+            key (str): The key of the image.
+
+        Returns:
+            bool: Whether the reference was added, False if the blob is being
+                deleted.
+        """
+        try:
+            await db_session.client[self.database][
+                self.image_blob_collection
+            ].update_one(
+                {"_id": sha256, "deleting": {"$ne": True}},
+                {"$addToSet": {"references": key}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            logging.debug("Image blob %s is being deleted", sha256)
+            return False
+
+        logging.debug("Added reference of %s to image blob %s", key, sha256)
+
+        return True
+
+    async def remove_reference(
+        self, db_session: AgnosticClientSession, sha256: str, key: str
+    ) -> bool:
+        """Remove the reference of an image to a blob.
+
+        The record of the blob is marked as deleting with its last reference,
+        it has to be deleted once the blob is deleted.
+
+        Args:
+            db_session (AgnosticClientSession): The MongoDB client session.
+            sha256 (str): The SHA-256 digest of the blob.
+            key (str): The key of the image.
+
+        Returns:
+            bool: Whether the blob is not referenced anymore and was marked
+                as deleting by this call.
+        """
+        collection = db_session.client[self.database][
+            self.image_blob_collection
+        ]
+
+        document = await collection.find_one_and_update(
+            {"_id": sha256},
+            {"$pull": {"references": key}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if document is None or document["references"]:
+            logging.debug(
+                "Removed reference of %s to image blob %s", key, sha256
+            )
+            return False
+
+        # Only mark the record if no reference was added in the meantime.
+        result = await collection.update_one(
+            {"_id": sha256, "references": {"$size": 0}},
+            {"$set": {"deleting": True}},
+        )
+
+        logging.debug("Removed last reference to image blob %s", sha256)
+
+        return result.modified_count == 1
+
+    async def delete(
+        self, db_session: AgnosticClientSession, sha256: str
+    ) -> None:
+        """Delete the record of a blob marked as deleting.
+
+        Args:
+            db_session (AgnosticClientSession): The MongoDB client session.
+            sha256 (str): The SHA-256 digest of the deleted blob.
+        """
+        await db_session.client[self.database][
+            self.image_blob_collection
+        ].delete_one({"_id": sha256, "deleting": True})
+
+        logging.debug("Deleted record of image blob %s", sha256)
+
+
+image_blob_crud = ImageBlobCRUD(
+    database=settings.mongodb_database,
+    image_blob_collection=settings.mongodb_image_blob_collection,
+)
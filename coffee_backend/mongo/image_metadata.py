@@ -0,0 +1,169 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from motor.core import AgnosticClientSession
+
+from coffee_backend.exceptions.exceptions import ObjectNotFoundError
+from coffee_backend.schemas import ImageMetadata, StoredImageVariant
+from coffee_backend.settings import settings
+
+
+class ImageMetadataCRUD:
+    """CRUD class for image metadata schema.
+    Args:
+        database(str): Name of the database to use for collection transactions.
+
+    """
+
+    def __init__(self, database: str, image_metadata_collection: str) -> None:
+        self.database = database
+        self.image_metadata_collection = image_metadata_collection
+
+    async def read(
+        self, db_session: AgnosticClientSession, key: str
+    ) -> ImageMetadata:
+        """Find the metadata of an image by its key.
+
+        Args:
+            db_session (AgnosticClientSession): The MongoDB client session.
+            key (str): The key of the image.
+
+        Returns:
+            ImageMetadata: The stored variants of the image.
+
+        Raises:
+            ObjectNotFoundError: If no metadata is stored for the image.
+        """
+        document = await db_session.client[self.database][
+            self.image_metadata_collection
+        ].find_one({"_id": key})
+
+        if document is None:
+            raise ObjectNotFoundError(f"No image metadata found for {key}")
+
+        return ImageMetadata.model_validate(document)
+
+    async def read_many(
+        self, db_session: AgnosticClientSession, keys: List[str]
+    ) -> List[ImageMetadata]:
+        """Find the metadata of several images with a single query.
+
+        Args:
+            db_session (AgnosticClientSession): The MongoDB client session.
+            keys (List[str]): The keys of the images.
+
+        Returns:
+            List[ImageMetadata]: The metadata of the images having metadata.
+        """
+        documents = [
+            doc
+            async for doc in db_session.client[self.database][
+                self.image_metadata_collection
+            ].find({"_id": {"$in": keys}})
+        ]
+
+        logging.debug("Received %s image metadata entries", len(documents))
+
+        return [
+            ImageMetadata.model_validate(document) for document in documents
+        ]
+
+    async def replace(
+        self, db_session: AgnosticClientSession, metadata: ImageMetadata
+    ) -> None:
+        """Create or replace the metadata of an image.
+
+        Args:
+            db_session (AgnosticClientSession): The MongoDB client session.
+            metadata (ImageMetadata): The new metadata of the image.
+        """
+        await db_session.client[self.database][
+            self.image_metadata_collection
+        ].replace_one(
+            {"_id": metadata.id},
+            metadata.model_dump(by_alias=True),
+            upsert=True,
+        )
+
+        logging.debug("Stored image metadata for %s", metadata.id)
+
+    async def update_variants(
+        self,
+        db_session: AgnosticClientSession,
+        key: str,
+        variants: Dict[str, StoredImageVariant],
+        small_checked_at: Optional[datetime] = None,
+        original_etag: Optional[str] = None,
+    ) -> None:
+        """Record variants found in S3 without touching other variants.
+
+        If the variants were derived from an original, they are only recorded
+        while that original is still the recorded one.
+
+        Args:
+            db_session (AgnosticClientSession): The MongoDB client session.
+            key (str): The key of the image.
+            variants (Dict[str, StoredImageVariant]): The found variants by
+                their name.
+            small_checked_at (Optional[datetime]): The time S3 was checked for
+                the small variant, kept unchanged if not set.
+            original_etag (Optional[str]): The entity tag of the original the
+                variants were derived from.
+        """
+        query: Dict[str, Any] = {"_id": key}
+        update: Dict[str, Any] = {
+            f"variants.{name}": variant.model_dump()
+            for name, variant in variants.items()
+        }
+
+        if small_checked_at is not None:
+            update["small_checked_at"] = small_checked_at
+
+        if original_etag is not None:
+            query["variants.original.etag"] = original_etag
+
+        await db_session.client[self.database][
+            self.image_metadata_collection
+        ].update_one(
+            query,
+            {"$set": update},
+            upsert=original_etag is None,
+        )
+
+        logging.debug("Recorded image variants %s for %s", list(variants), key)
+
+    async def remove_variant(
+        self, db_session: AgnosticClientSession, key: str, variant: str
+    ) -> None:
+        """Remove the record of a single variant of an image.
+
+        Args:
+            db_session (AgnosticClientSession): The MongoDB client session.
+            key (str): The key of the image.
+            variant (str): The name of the variant.
+        """
+        await db_session.client[self.database][
+            self.image_metadata_collection
+        ].update_one({"_id": key}, {"$unset": {f"variants.{variant}": ""}})
+
+        logging.debug("Removed image variant %s of %s", variant, key)
+
+    async def delete(self, db_session: AgnosticClientSession, key: str) -> None:
+        """Delete the metadata of an image if present.
+
+        Args:
+            db_session (AgnosticClientSession): The MongoDB client session.
+            key (str): The key of the image.
+        """
+        await db_session.client[self.database][
+            self.image_metadata_collection
+        ].delete_one({"_id": key})
+
+        logging.debug("Deleted image metadata for %s", key)
+
+
+image_metadata_crud = ImageMetadataCRUD(
+    database=settings.mongodb_database,
+    image_metadata_collection=settings.mongodb_image_metadata_collection,
+)
@@ -0,0 +1,216 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from motor.core import AgnosticCollection, AgnosticDatabase
+from pymongo.errors import OperationFailure, PyMongoError
+
+from coffee_backend.settings import settings
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """Declaration of an index managed by the application.
+
+    Args:
+        name (str): Name of the index in the collection.
+        keys (Tuple[Tuple[str, Union[int, str]], ...]): Indexed fields and
+            their directions or index types.
+        unique (bool): Whether the index enforces unique values.
+        weights (Optional[Tuple[Tuple[str, int], ...]]): Weights of the
+            fields of a text index.
+        default_language (Optional[str]): Language of a text index, "none"
+            indexes words without stemming and stop words.
+
+    """
+
+    name: str
+    keys: Tuple[Tuple[str, Union[int, str]], ...]
+    unique: bool = False
+    weights: Optional[Tuple[Tuple[str, int], ...]] = None
+    default_language: Optional[str] = None
+
+    def options(self) -> Dict[str, Any]:
+        """Return the options to create the index with."""
+        options: Dict[str, Any] = {"name": self.name, "unique": self.unique}
+
+        if self.weights:
+            options["weights"] = dict(self.weights)
+
+        if self.default_language:
+            options["default_language"] = self.default_language
+
+        return options
+
+
+@dataclass
+class IndexReport:
+    """Result of reconciling the indexes of a collection.
+
+    Args:
+        created (List[str]): Names of created indexes.
+        drifted (List[str]): Names of declared indexes existing with other
+            keys or options.
+        unused (List[str]): Names of existing declared indexes which were
+            not used since the server started.
+        unmanaged (Dict[str, int]): Names of existing indexes which are not
+            declared and the number of operations that used them since the
+            server started, -1 if unknown.
+
+    """
+
+    created: List[str] = field(default_factory=list)
+    drifted: List[str] = field(default_factory=list)
+    unused: List[str] = field(default_factory=list)
+    unmanaged: Dict[str, int] = field(default_factory=dict)
+
+
+COFFEE_INDEXES = (
+    IndexSpec(name="name", keys=(("name", 1),)),
+    IndexSpec(name="owner_id_id", keys=(("owner_id", 1), ("_id", -1))),
+    IndexSpec(name="search_terms", keys=(("search_terms", 1),)),
+    IndexSpec(
+        name="search",
+        keys=(
+            ("name", "text"),
+            ("roasting_company", "text"),
+            ("owner_name", "text"),
+        ),
+        weights=(("name", 10), ("roasting_company", 5), ("owner_name", 1)),
+        default_language="none",
+    ),
+)
+
+DRINK_INDEXES = (
+    IndexSpec(
+        name="coffee_bean_id_id", keys=(("coffee_bean_id", 1), ("_id", -1))
+    ),
+    IndexSpec(name="user_id_id", keys=(("user_id", 1), ("_id", -1))),
+)
+
+INDEXES: Dict[str, Sequence[IndexSpec]] = {
+    settings.mongodb_coffee_collection: COFFEE_INDEXES,
+    settings.mongodb_drink_collection: DRINK_INDEXES,
+}
+
+
+def _matches(spec: IndexSpec, info: Dict[str, Any]) -> bool:
+    if bool(info.get("unique", False)) != spec.unique:
+        return False
+
+    if spec.weights:
+        # Text indexes list their fields as weights instead of keys.
+        return info.get("weights") == dict(spec.weights) and info.get(
+            "default_language", "english"
+        ) == (spec.default_language or "english")
+
+    return (
+        tuple(
+            (key, direction if isinstance(direction, str) else int(direction))
+            for key, direction in info["key"]
+        )
+        == spec.keys
+    )
+
+
+async def _index_usage(collection: AgnosticCollection) -> Dict[str, int]:
+    try:
+        return {
+            stats["name"]: int(stats["accesses"]["ops"])
+            async for stats in collection.aggregate([{"$indexStats": {}}])
+        }
+    except OperationFailure as error:
+        logging.debug("Unable to read index usage: %s", error)
+        return {}
+
+
+async def reconcile_indexes(
+    collection: AgnosticCollection, specs: Sequence[IndexSpec]
+) -> IndexReport:
+    """Create the missing declared indexes of a collection.
+
+    Declared indexes existing with other keys or options are reported as
+    drifted and left untouched, as are indexes which are not declared. The
+    usage of existing indexes is read to report unused declared indexes.
+
+    Args:
+        collection (AgnosticCollection): The collection to reconcile.
+        specs (Sequence[IndexSpec]): The declared indexes of the collection.
+
+    Returns:
+        IndexReport: The created, drifted, unused and unmanaged indexes.
+
+    """
+    report = IndexReport()
+    existing = await collection.index_information()
+
+    for spec in specs:
+        if spec.name not in existing:
+            await collection.create_index(list(spec.keys), **spec.options())
+            report.created.append(spec.name)
+        elif not _matches(spec, existing[spec.name]):
+            report.drifted.append(spec.name)
+
+    declared = [spec.name for spec in specs if spec.name in existing]
+    unmanaged = [
+        name
+        for name in existing
+        if name != "_id_" and name not in {spec.name for spec in specs}
+    ]
+
+    if declared or unmanaged:
+        usage = await _index_usage(collection)
+        report.unused = [name for name in declared if usage.get(name) == 0]
+        report.unmanaged = {name: usage.get(name, -1) for name in unmanaged}
+
+    return report
+
+
+async def ensure_indexes(
+    database: AgnosticDatabase,
+    indexes: Dict[str, Sequence[IndexSpec]],
+) -> None:
+    """Reconcile the declared indexes of all collections of a database.
+
+    Failures are logged and do not prevent the application from starting.
+
+    Args:
+        database (AgnosticDatabase): The database holding the collections.
+        indexes (Dict[str, Sequence[IndexSpec]]): The declared indexes by
+            collection name.
+
+    """
+    for collection_name, specs in indexes.items():
+        try:
+            report = await reconcile_indexes(database[collection_name], specs)
+        except PyMongoError as error:
+            logging.error(
+                "Unable to reconcile indexes of %s: %s", collection_name, error
+            )
+            continue
+
+        for name in report.created:
+            logging.info("Created index %s on %s", name, collection_name)
+
+        for name in report.drifted:
+            logging.warning(
+                "Index %s on %s differs from its declaration, drop it to "
+                "recreate it",
+                name,
+                collection_name,
+            )
+
+        for name in report.unused:
+            logging.info(
+                "Index %s on %s was not used since the server started",
+                name,
+                collection_name,
+            )
+
+        for name, ops in report.unmanaged.items():
+            logging.warning(
+                "Index %s on %s is not declared and was used %s times",
+                name,
+                collection_name,
+                ops if ops >= 0 else "unknown",
+            )
@@ -0,0 +1,37 @@
+import re
+import unicodedata
+from typing import List
+
+WORD_PATTERN = re.compile(r"\w+")
+
+MISSING_SEARCH_TERMS = {"search_terms": {"$exists": False}}
+
+
+def search_words(text: str) -> List[str]:
+    """Split a text into lowercase words without diacritics.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        List[str]: The words of the text in their order.
+    """
+    folded = "".join(
+        char
+        for char in unicodedata.normalize("NFKD", text.casefold())
+        if not unicodedata.combining(char)
+    )
+
+    return WORD_PATTERN.findall(folded)
+
+
+def search_terms(*texts: str) -> List[str]:
+    """Return the distinct words of texts, stored to be searched by prefix.
+
+    Args:
+        *texts (str): The searchable texts of a document.
+
+    Returns:
+        List[str]: The sorted distinct words of the texts.
+    """
+    return sorted({word for text in texts for word in search_words(text)})
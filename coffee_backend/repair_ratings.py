@@ -0,0 +1,64 @@
+"""Recompute the stored rating summaries of coffees from their drinks.
+
+The rating count and sum of each coffee are kept up to date with every added
+or deleted drink. This command repairs them in bulk, e.g. after drinks were
+changed directly in the database:
+
+    python -m coffee_backend.repair_ratings
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+import motor.motor_asyncio
+from motor.core import AgnosticClient
+
+from coffee_backend.config.log_levels import log_levels
+from coffee_backend.mongo.coffee import coffee_crud
+from coffee_backend.settings import settings
+
+MISSING_RATINGS = {"rating_sum": {"$exists": False}}
+
+
+async def repair_ratings(
+    client: AgnosticClient, query: Optional[Dict[str, Any]] = None
+) -> None:
+    """Recompute the rating summaries of coffees.
+
+    Args:
+        client (AgnosticClient): The MongoDB client.
+        query (Optional[Dict[str, Any]]): Query selecting the coffees to
+            repair, all coffees if not set.
+    """
+    async with await client.start_session() as db_session:
+        await coffee_crud.recompute_ratings(
+            db_session=db_session,
+            drink_collection=settings.mongodb_drink_collection,
+            query=query,
+        )
+
+
+async def _repair_all() -> None:
+    client: AgnosticClient = motor.motor_asyncio.AsyncIOMotorClient(
+        f"mongodb://{settings.mongodb_username}"
+        f":{settings.mongodb_password}"
+        f"@{settings.mongodb_host}:{settings.mongodb_port}",
+        serverSelectionTimeoutMS=5000,
+        uuidRepresentation="standard",
+    )
+
+    try:
+        await repair_ratings(client)
+    finally:
+        client.close()
+
+
+def main() -> None:
+    """Repair the rating summaries of all coffees."""
+    logging.basicConfig(level=log_levels.get(settings.log_level, logging.INFO))
+    asyncio.run(_repair_all())
+
+
+if __name__ == "__main__":
+    main()
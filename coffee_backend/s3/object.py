@@ -1,29 +1,89 @@
-from typing import Tuple
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple, TypeVar
 
 from minio import Minio  # type: ignore
 from minio import S3Error  # type: ignore
+from minio.commonconfig import REPLACE, CopySource  # type: ignore
+from minio.datatypes import PostPolicy  # type: ignore
 from minio.deleteobjects import DeleteObject  # type: ignore
+from minio.helpers import DictType  # type: ignore
+from urllib3 import BaseHTTPResponse
 
-from coffee_backend.exceptions.exceptions import ObjectNotFoundError
+from coffee_backend.exceptions.exceptions import (
+    ObjectNotFoundError,
+    RangeNotSatisfiableError,
+)
+from coffee_backend.s3.types.byte_range import ByteRange
+from coffee_backend.s3.types.chunk_reader import ChunkReader
+from coffee_backend.s3.types.object_info import ObjectInfo
+from coffee_backend.s3.types.object_stream import ObjectStream
 from coffee_backend.s3.types.readable import Readable
+from coffee_backend.s3.types.upload_result import UploadResult
 
+T = TypeVar("T")
 
-class ObjectCRUD:
-    """Class for performing CRUD operations on objects in an S3 bucket."""
+STREAM_CHUNK_SIZE = 64 * 1024
 
-    def __init__(self, minio_client: Minio, bucket_name: str) -> None:
+PRESIGNED_URL_CACHE_SIZE = 10000
+
+UPLOAD_PART_SIZE = 10 * 1024 * 1024
+
+
+class ObjectCRUD:  # pylint: disable=too-many-instance-attributes
+    """Class for performing CRUD operations on objects in an S3 bucket.
+
+    The Minio client is blocking, therefore all operations are executed in a
+    thread pool and awaited, so they do not block the event loop. Streamed
+    uploads hold their thread while the client sends its body, they run in a
+    separate thread pool so slow uploads cannot starve the other operations.
+    """
+
+    def __init__(
+        self,
+        minio_client: Minio,
+        bucket_name: str,
+        executor: Optional[ThreadPoolExecutor] = None,
+        presign_client: Optional[Minio] = None,
+        bucket_url: str = "",
+        upload_executor: Optional[ThreadPoolExecutor] = None,
+        upload_chunk_timeout: Optional[float] = None,
+    ) -> None:
         """Initialize ObjectCRUD operations.
 
         Args:
             minio_client (Minio): The Minio client instance.
             bucket_name (str): The name of the S3 bucket to use for CRUD
                 operations.
+            executor (Optional[ThreadPoolExecutor]): The thread pool running
+                the blocking Minio calls. Defaults to the event loop's default
+                executor.
+            presign_client (Optional[Minio]): The Minio client presigning
+                URLs, configured with the endpoint reachable by clients.
+                Defaults to the Minio client.
+            bucket_url (str): The URL of the bucket as reachable by clients,
+                which presigned uploads are posted to.
+            upload_executor (Optional[ThreadPoolExecutor]): The thread pool
+                running streamed uploads. Defaults to the executor.
+            upload_chunk_timeout (Optional[float]): Seconds to wait for each
+                chunk of a streamed upload, no limit if not set.
 
         """
         self.client = minio_client
         self.bucket_name = bucket_name
+        self.executor = executor
+        self.presign_client = presign_client or minio_client
+        self.bucket_url = bucket_url
+        self.upload_executor = upload_executor or executor
+        self.upload_chunk_timeout = upload_chunk_timeout
+        self.presigned_urls: OrderedDict[str, Tuple[str, float]] = OrderedDict()
 
-    def create(
+    async def create(
         self, filepath: str, filename: str, file: Readable, file_type: str
     ) -> None:
         """Create an object in the S3 bucket.
@@ -31,26 +91,61 @@ class ObjectCRUD:
         Args:
             filename (str): The name of the object to be created.
             file (Readable): The content of the object to be uploaded.
-            file_type (str): The type of the file, used as metadata.
+            file_type (str): The type of the file, used as metadata and
+                content type.
 
         Returns:
             None
 
         """
-        result = self.client.put_object(
-            bucket_name=self.bucket_name,
-            object_name=f"{filepath}/{filename}",
-            data=file,
-            length=-1,
-            part_size=10 * 1024 * 1024,
-            metadata={"filetype": file_type},
+        await self._run(self._create, filepath, filename, file, file_type)
+
+    async def create_stream(  # pylint: disable=too-many-arguments
+        self,
+        filepath: str,
+        filename: str,
+        chunks: AsyncIterator[bytes],
+        file_type: str,
+        max_size: int,
+    ) -> UploadResult:
+        """Create an object in the S3 bucket from a stream of chunks.
+
+        The chunks are uploaded as they arrive, at most one part of a
+        multipart upload is held in memory. The content is hashed and its size
+        enforced on the fly, an upload exceeding the maximal size is aborted.
+
+        Args:
+            filepath (str): The filepath inside s3 of the object.
+            filename (str): The name of the object to be created.
+            chunks (AsyncIterator[bytes]): The content of the object.
+            file_type (str): The type of the file, used as metadata and
+                content type.
+            max_size (int): Maximal size of the object in bytes.
+
+        Returns:
+            UploadResult: The size and SHA-256 digest of the content.
+
+        Raises:
+            UploadTooLargeError: If the content exceeds the maximal size.
+            UploadTimeoutError: If a chunk did not arrive within the upload
+                chunk timeout.
+
+        """
+        loop = asyncio.get_running_loop()
+        reader = ChunkReader(
+            chunks, loop, max_size, timeout=self.upload_chunk_timeout
         )
-        print(
-            f"created {result.object_name} object; etag: {result.etag}, "
-            + f"version-id: {result.version_id}"
+
+        await loop.run_in_executor(
+            self.upload_executor,
+            functools.partial(
+                self._create, filepath, filename, reader, file_type
+            ),
         )
 
-    def read(self, filepath: str, filename: str) -> Tuple[bytes, str]:
+        return UploadResult(size=reader.size, sha256=reader.sha256.hexdigest())
+
+    async def read(self, filepath: str, filename: str) -> Tuple[bytes, str]:
         """Read an object from the S3 bucket.
 
         Args:
@@ -67,21 +162,190 @@ class ObjectCRUD:
             Exception: If an error occurs while interacting with the S3 bucket.
 
         """
-        try:
-            result = self.client.get_object(
+        return await self._run(self._read, filepath, filename)
+
+    async def stream(
+        self,
+        filepath: str,
+        filename: str,
+        byte_range: Optional[ByteRange] = None,
+        if_range: Optional[str] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> ObjectStream:
+        """Open an object or a byte range of it in the S3 bucket for streaming.
+
+        Only the response headers are read, the body is fetched chunk by chunk
+        while iterating the returned stream. The connection is released once
+        the stream is exhausted or closed.
+
+        The If-Range validator is sent to S3 as If-Match for an entity tag or
+        If-Unmodified-Since for a date. If the object changed, the whole object
+        is streamed instead of the range.
+
+        Args:
+            filepath (str): The filepath inside s3 of the object
+            filename (str): The name of the object to be streamed.
+            byte_range (Optional[ByteRange]): The byte range to stream. The
+                whole object is streamed if not set.
+            if_range (Optional[str]): The value of the If-Range header the
+                range is conditional on.
+            chunk_size (int): Maximal number of bytes per chunk.
+
+        Returns:
+            ObjectStream: The chunks of the object with its size, etag, file
+                type and the content range if a range was streamed.
+
+        Raises:
+            ObjectNotFoundError: If the specified object does not exist.
+            RangeNotSatisfiableError: If the range lies outside the object.
+            Exception: If an error occurs while interacting with the S3 bucket.
+
+        """
+        response = await self._run(
+            self._get_object, filepath, filename, byte_range, if_range
+        )
+
+        return ObjectStream(
+            chunks=self._iterate_chunks(response, chunk_size),
+            size=int(response.headers.get("content-length", 0)),
+            etag=response.headers.get("etag", "").strip('"'),
+            file_type=response.headers.get("x-amz-meta-filetype", ""),
+            response=response,
+            content_range=response.headers.get("content-range"),
+            last_modified=(
+                parsedate_to_datetime(response.headers["last-modified"])
+                if "last-modified" in response.headers
+                else None
+            ),
+        )
+
+    async def stat(self, filepath: str, filename: str) -> ObjectInfo:
+        """Read the metadata of an object in the S3 bucket without its content.
+
+        Args:
+            filepath (str): The filepath inside s3 of the object
+            filename (str): The name of the object.
+
+        Returns:
+            ObjectInfo: The size, etag, last modification time and file type of
+                the object.
+
+        Raises:
+            ObjectNotFoundError: If the specified object does not exist.
+            Exception: If an error occurs while interacting with the S3 bucket.
+
+        """
+        return await self._run(self._stat, filepath, filename)
+
+    async def copy(  # pylint: disable=too-many-arguments
+        self,
+        source_filepath: str,
+        filepath: str,
+        filename: str,
+        file_type: str,
+        source_filename: Optional[str] = None,
+    ) -> None:
+        """Copy an object within the S3 bucket without transferring its
+        content through the application.
+
+        Args:
+            source_filepath (str): The filepath inside s3 of the source.
+            filepath (str): The filepath inside s3 of the copy.
+            filename (str): The name of the copy.
+            file_type (str): The type of the file, used as metadata and
+                content type.
+            source_filename (Optional[str]): The name of the source, the
+                name of the copy if not set.
+
+        Raises:
+            ObjectNotFoundError: If the source object does not exist.
+
+        """
+        await self._run(
+            self._copy,
+            source_filepath,
+            filepath,
+            filename,
+            file_type,
+            source_filename or filename,
+        )
+
+    async def presign_upload(
+        self, filepath: str, filename: str, expires: int, max_size: int
+    ) -> Tuple[str, Dict[str, str]]:
+        """Return a presigned POST policy to upload an image directly to the
+        S3 bucket.
+
+        The policy restricts the upload to the object, image content types
+        and the maximal size, S3 rejects all other uploads.
+
+        Args:
+            filepath (str): The filepath inside s3 of the object.
+            filename (str): The name of the object.
+            expires (int): Seconds the policy is valid for.
+            max_size (int): Maximal size of the uploaded image in bytes.
+
+        Returns:
+            Tuple[str, Dict[str, str]]: The URL to post the upload to and the
+                form fields to send with it.
+
+        """
+        object_name = f"{filepath}/{filename}"
+        policy = PostPolicy(
+            self.bucket_name,
+            datetime.now(timezone.utc) + timedelta(seconds=expires),
+        )
+        policy.add_equals_condition("key", object_name)
+        policy.add_starts_with_condition("Content-Type", "image/")
+        policy.add_content_length_range_condition(1, max_size)
+
+        fields = await self._run(
+            self.presign_client.presigned_post_policy, policy
+        )
+
+        return self.bucket_url, {"key": object_name, **fields}
+
+    async def presign(self, filepath: str, filename: str, expires: int) -> str:
+        """Return a presigned URL to download an object from the S3 bucket.
+
+        Presigned URLs are reused per object until a fifth of their lifetime
+        is left, so repeated requests of an object are not signed again.
+
+        Args:
+            filepath (str): The filepath inside s3 of the object
+            filename (str): The name of the object.
+            expires (int): Seconds the URL is valid for.
+
+        Returns:
+            str: The presigned URL.
+
+        """
+        object_name = f"{filepath}/{filename}"
+        cached = self.presigned_urls.get(object_name)
+
+        if cached is not None and cached[1] - time.monotonic() > expires / 5:
+            self.presigned_urls.move_to_end(object_name)
+            return cached[0]
+
+        expires_at = time.monotonic() + expires
+        url = await self._run(
+            functools.partial(
+                self.presign_client.presigned_get_object,
                 bucket_name=self.bucket_name,
-                object_name=f"{filepath}/" + filename,
+                object_name=object_name,
+                expires=timedelta(seconds=expires),
             )
-        except S3Error as error:
-            if error.code == "NoSuchKey":
-                raise ObjectNotFoundError("Object not found") from error
-            raise error
+        )
+
+        self.presigned_urls[object_name] = (url, expires_at)
+        self.presigned_urls.move_to_end(object_name)
 
-        filetype = result.headers.get("x-amz-meta-filetype", "")
+        if len(self.presigned_urls) > PRESIGNED_URL_CACHE_SIZE:
+            self.presigned_urls.popitem(last=False)
 
-        return result.data, filetype
+        return url
 
-    def delete(
+    async def delete(
         self,
         filepath: str,
         filename: str,
@@ -96,7 +360,146 @@ class ObjectCRUD:
             None
 
         """
+        await self._run(self._delete, filepath, filename)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking function in the thread pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args)
+        )
+
+    def _create(
+        self, filepath: str, filename: str, file: Readable, file_type: str
+    ) -> None:
+        """Blocking implementation of create."""
+        result = self.client.put_object(
+            bucket_name=self.bucket_name,
+            object_name=f"{filepath}/{filename}",
+            data=file,
+            length=-1,
+            part_size=UPLOAD_PART_SIZE,
+            content_type=f"image/{file_type}",
+            metadata={"filetype": file_type},
+        )
+        print(
+            f"created {result.object_name} object; etag: {result.etag}, "
+            + f"version-id: {result.version_id}"
+        )
+
+    async def _iterate_chunks(
+        self, response: BaseHTTPResponse, chunk_size: int
+    ) -> AsyncIterator[bytes]:
+        """Read the body of a response chunk by chunk in the thread pool."""
+        chunks = response.stream(chunk_size)
+
+        try:
+            while chunk := await self._run(next, chunks, b""):
+                yield chunk
+        finally:
+            response.close()
+            response.release_conn()
+
+    def _get_object(
+        self,
+        filepath: str,
+        filename: str,
+        byte_range: Optional[ByteRange] = None,
+        if_range: Optional[str] = None,
+    ) -> BaseHTTPResponse:
+        """Blocking request of an object without reading its body."""
+        headers: DictType = {}
+
+        if byte_range is not None and if_range is not None:
+            if if_range.startswith('"'):
+                headers["If-Match"] = if_range
+            elif if_range.startswith("W/"):
+                # Weak entity tags never match for If-Range.
+                byte_range = None
+            else:
+                headers["If-Unmodified-Since"] = if_range
+
+        if byte_range is not None:
+            headers["Range"] = byte_range.header
+
+        try:
+            return self.client.get_object(
+                bucket_name=self.bucket_name,
+                object_name=f"{filepath}/" + filename,
+                request_headers=headers,
+            )
+        except S3Error as error:
+            if error.code == "NoSuchKey":
+                raise ObjectNotFoundError("Object not found") from error
+            if error.code == "PreconditionFailed":
+                return self._get_object(filepath, filename)
+            if error.code == "InvalidRange":
+                raise RangeNotSatisfiableError(
+                    "Requested range not satisfiable"
+                ) from error
+            raise error
+
+    def _stat(self, filepath: str, filename: str) -> ObjectInfo:
+        """Blocking implementation of stat."""
+        try:
+            result = self.client.stat_object(
+                bucket_name=self.bucket_name,
+                object_name=f"{filepath}/" + filename,
+            )
+        except S3Error as error:
+            if error.code == "NoSuchKey":
+                raise ObjectNotFoundError("Object not found") from error
+            raise error
+
+        return ObjectInfo(
+            size=result.size or 0,
+            etag=result.etag or "",
+            last_modified=result.last_modified,
+            file_type=(result.metadata or {}).get("x-amz-meta-filetype")
+            or (result.content_type or "").removeprefix("image/"),
+        )
+
+    def _copy(  # pylint: disable=too-many-arguments
+        self,
+        source_filepath: str,
+        filepath: str,
+        filename: str,
+        file_type: str,
+        source_filename: str,
+    ) -> None:
+        """Blocking implementation of copy."""
+        try:
+            self.client.copy_object(
+                bucket_name=self.bucket_name,
+                object_name=f"{filepath}/{filename}",
+                source=CopySource(
+                    self.bucket_name, f"{source_filepath}/{source_filename}"
+                ),
+                metadata={
+                    "Content-Type": f"image/{file_type}",
+                    "filetype": file_type,
+                },
+                metadata_directive=REPLACE,
+            )
+        except S3Error as error:
+            if error.code == "NoSuchKey":
+                raise ObjectNotFoundError("Object not found") from error
+            raise error
+
+    def _read(self, filepath: str, filename: str) -> Tuple[bytes, str]:
+        """Blocking implementation of read."""
+        result = self._get_object(filepath, filename)
+
+        try:
+            filetype = result.headers.get("x-amz-meta-filetype", "")
+
+            return result.data, filetype
+        finally:
+            result.close()
+            result.release_conn()
 
+    def _delete(self, filepath: str, filename: str) -> None:
+        """Blocking implementation of delete."""
         delete_object_list = [
             DeleteObject(object.object_name, object.version_id)
             for object in self.client.list_objects(
@@ -0,0 +1,55 @@
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+@dataclass(frozen=True)
+class ByteRange:
+    """Describes a single byte range of an object.
+
+    A missing start selects the last `end` bytes of the object, a missing end
+    selects everything from `start` until the end of the object.
+    """
+
+    start: Optional[int]
+    end: Optional[int]
+
+    @classmethod
+    def from_header(cls, header: Optional[str]) -> Optional["ByteRange"]:
+        """Parse the value of a HTTP Range header.
+
+        Multiple ranges and malformed values are not supported and yield None,
+        so the whole object is served as permitted by RFC 9110.
+
+        Args:
+            header (Optional[str]): The value of the Range header.
+
+        Returns:
+            Optional[ByteRange]: The requested range or None.
+        """
+        if not header:
+            return None
+
+        match = RANGE_PATTERN.match(header.strip())
+
+        if not match:
+            return None
+
+        start, end = (int(value) if value else None for value in match.groups())
+
+        if start is None and end is None:
+            return None
+
+        if start is not None and end is not None and end < start:
+            return None
+
+        return cls(start=start, end=end)
+
+    @property
+    def header(self) -> str:
+        """The value of the Range header requesting this range."""
+        start = "" if self.start is None else self.start
+        end = "" if self.end is None else self.end
+        return f"bytes={start}-{end}"
@@ -0,0 +1,101 @@
+import asyncio
+import concurrent.futures
+import hashlib
+from typing import AsyncIterator, Optional
+
+from coffee_backend.exceptions.exceptions import (
+    UploadTimeoutError,
+    UploadTooLargeError,
+)
+
+
+class ChunkReader:
+    """Blocking reader of chunks produced on an event loop.
+
+    The Minio client reads uploads in a worker thread, so each chunk is
+    awaited on the event loop from that thread instead of buffering the whole
+    upload first. The read content is hashed and counted on the fly and
+    reading fails once it exceeds the maximal size or the next chunk does not
+    arrive within the timeout, so a stalled client cannot block the thread
+    forever.
+    """
+
+    def __init__(
+        self,
+        chunks: AsyncIterator[bytes],
+        loop: asyncio.AbstractEventLoop,
+        max_size: int,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Initialize a ChunkReader instance.
+
+        Args:
+            chunks (AsyncIterator[bytes]): The chunks of the content.
+            loop (asyncio.AbstractEventLoop): The event loop iterating the
+                chunks.
+            max_size (int): Maximal size of the content in bytes.
+            timeout (Optional[float]): Seconds to wait for each chunk, no
+                limit if not set.
+
+        """
+        self.chunks = chunks
+        self.loop = loop
+        self.max_size = max_size
+        self.timeout = timeout
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+        self.pending = b""
+
+    def read(self, size: int = -1) -> bytes:
+        """Read at most size bytes, blocking until the next chunk arrived.
+
+        Args:
+            size (int): Maximal number of bytes to read, the rest of the
+                current chunk if negative.
+
+        Returns:
+            bytes: The read bytes, empty once all chunks were read.
+
+        Raises:
+            UploadTooLargeError: If the content exceeds the maximal size.
+            UploadTimeoutError: If the next chunk did not arrive in time.
+
+        """
+        if not self.pending:
+            future = asyncio.run_coroutine_threadsafe(
+                self._next_chunk(), self.loop
+            )
+
+            try:
+                self.pending = future.result(timeout=self.timeout)
+            except concurrent.futures.TimeoutError as error:
+                future.cancel()
+                raise UploadTimeoutError(
+                    f"No upload chunk received within {self.timeout} seconds"
+                ) from error
+
+        if size < 0:
+            size = len(self.pending)
+
+        data, self.pending = self.pending[:size], self.pending[size:]
+
+        return data
+
+    async def _next_chunk(self) -> bytes:
+        """Await the next non-empty chunk and account for its content."""
+        async for chunk in self.chunks:
+            if not chunk:
+                continue
+
+            self.size += len(chunk)
+
+            if self.size > self.max_size:
+                raise UploadTooLargeError(
+                    f"Upload exceeds the maximal size of {self.max_size} bytes"
+                )
+
+            self.sha256.update(chunk)
+
+            return chunk
+
+        return b""
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class ObjectInfo:
+    """Describes the metadata of an object in S3 without its content."""
+
+    size: int
+    etag: str
+    last_modified: Optional[datetime]
+    file_type: str
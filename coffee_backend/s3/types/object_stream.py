@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from urllib3 import BaseHTTPResponse
+
+
+@dataclass
+class ObjectStream:
+    """Describes an object read from S3 as a stream of chunks.
+
+    If only a range of the object was requested, size is the length of the
+    range and content_range the matching Content-Range header value.
+    """
+
+    chunks: AsyncIterator[bytes]
+    size: int
+    etag: str
+    file_type: str
+    response: BaseHTTPResponse
+    content_range: Optional[str] = None
+    last_modified: Optional[datetime] = None
+
+    def close(self) -> None:
+        """Close the S3 response and release its connection to the pool.
+
+        Safe to call multiple times, e.g. after the stream was consumed and
+        again once the client disconnected.
+        """
+        self.response.close()
+        self.response.release_conn()
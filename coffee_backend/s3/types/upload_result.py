@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class UploadResult:
+    """Describes the content of an object uploaded as a stream of chunks."""
+
+    size: int
+    sha256: str
@@ -1,6 +1,19 @@
 from .coffee import Coffee, CreateCoffee, UpdateCoffee
 from .drink import BrewingMethod, CreateDrink, Drink
-from .image import CoffeeBeanImage, CoffeeDrinkImage, ImageType, S3Object
+from .image import (
+    SMALL_FORMAT_VARIANTS,
+    CoffeeBeanImage,
+    CoffeeDrinkImage,
+    ImageType,
+    ImageVariant,
+    S3Object,
+    UploadStream,
+    image_key,
+    resized_variant,
+)
+from .image_metadata import ImageMetadata, StoredImageVariant
+from .image_upload import ImageUpload
+from .page import Page
 
 __all__ = [
     "Coffee",
@@ -10,7 +23,16 @@ __all__ = [
     "CoffeeDrinkImage",
     "CoffeeBeanImage",
     "S3Object",
+    "UploadStream",
     "ImageType",
+    "ImageVariant",
+    "ImageMetadata",
+    "StoredImageVariant",
+    "ImageUpload",
+    "image_key",
+    "resized_variant",
+    "SMALL_FORMAT_VARIANTS",
     "Drink",
     "CreateDrink",
+    "Page",
 ]
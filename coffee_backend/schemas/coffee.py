@@ -1,7 +1,7 @@
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class Coffee(BaseModel):
@@ -34,6 +34,37 @@ class Coffee(BaseModel):
         description="The average rating for the coffee",
         examples=[4.5],
     )
+    rating_sum: Optional[float] = Field(
+        default=None,
+        exclude=True,
+        description="The sum of all ratings for the coffee, stored to derive "
+        + "the average rating",
+    )
+    image_url: Optional[str] = Field(
+        default=None,
+        description="Signed URL of the coffee image, only set if requested",
+    )
+    image_variants: Optional[List[str]] = Field(
+        default=None,
+        description="Stored variants of the coffee image, e.g. small and "
+        + "original. Not set if no variant is known",
+        examples=[["small", "original"]],
+    )
+
+    @model_validator(mode="after")
+    def derive_rating_average(self) -> "Coffee":
+        """Derive the average rating from the stored rating sum.
+
+        Returns:
+            Coffee: The coffee with its average rating, None if not rated.
+        """
+        if self.rating_sum is not None:
+            self.rating_average = (
+                round(self.rating_sum / self.rating_count, 2)
+                if self.rating_count
+                else None
+            )
+        return self
 
 
 class UpdateCoffee(BaseModel):
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -66,6 +66,16 @@ class Drink(BaseModel):
         default=None,
         description="Location where the drink was consumed",
     )
+    image_url: Optional[str] = Field(
+        default=None,
+        description="Signed URL of the drink image, only set if requested",
+    )
+    image_variants: Optional[List[str]] = Field(
+        default=None,
+        description="Stored variants of the drink image, e.g. small and "
+        + "original. Not set if no variant is known",
+        examples=[["small", "original"]],
+    )
 
 
 class CreateDrink(BaseModel):
@@ -1,10 +1,9 @@
 from abc import ABC
 from dataclasses import dataclass, field
 from enum import Enum
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
-from fastapi import UploadFile
-
 
 class ImageType(Enum):
     """Describe the type of image."""
@@ -13,12 +12,45 @@ class ImageType(Enum):
     COFFEE_BEAN = "coffee_bean"
 
 
+class ImageVariant(Enum):
+    """Describe the stored variants of an image."""
+
+    SMALL = "small"
+    SMALL_WEBP = "small_webp"
+    SMALL_AVIF = "small_avif"
+    ORIGINAL = "original"
+
+
+SMALL_FORMAT_VARIANTS = {
+    "webp": ImageVariant.SMALL_WEBP,
+    "avif": ImageVariant.SMALL_AVIF,
+}
+
+
+def image_key(object_id: UUID, image_type: ImageType) -> str:
+    """Return the key identifying the image of an object."""
+    return f"{image_type.value}/{object_id}"
+
+
+def resized_variant(width: int) -> str:
+    """Return the name of the variant of an image resized to a width."""
+    return f"w{width}"
+
+
+@dataclass
+class UploadStream:
+    """Describes an uploaded file read chunk by chunk from the request."""
+
+    content_type: Optional[str]
+    chunks: AsyncIterator[bytes]
+
+
 @dataclass
 class S3Object(ABC):
     """Describes the object to be stored in S3."""
 
     key: UUID
-    file: UploadFile
+    file: UploadStream
     type: ImageType = field(init=False)
     context_path: str = field(init=False)
 
@@ -28,7 +60,7 @@ class CoffeeDrinkImage(S3Object):
     """Describes a coffee drink image to be stored in S3."""
 
     key: UUID
-    file: UploadFile
+    file: UploadStream
 
     def __post_init__(self) -> None:
         self.context_path = "coffee_drink"
@@ -40,7 +72,7 @@ class CoffeeBeanImage(S3Object):
     """Describes a coffee bean image to be stored in S3."""
 
     key: UUID
-    file: UploadFile
+    file: UploadStream
 
     def __post_init__(self) -> None:
         self.context_path = "coffee_bean"
@@ -0,0 +1,91 @@
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from coffee_backend.s3.types.object_info import ObjectInfo
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Attach UTC to a naive datetime."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class StoredImageVariant(BaseModel):
+    """Describes a variant of an image stored in S3."""
+
+    size: int = Field(..., description="Size of the variant in bytes")
+    etag: str = Field(..., description="Entity tag of the variant")
+    last_modified: Optional[datetime] = Field(
+        default=None, description="Last modification time of the variant"
+    )
+    file_type: str = Field(..., description="File type of the variant")
+    sha256: Optional[str] = Field(
+        default=None,
+        description="SHA-256 digest of the variant if computed on upload",
+    )
+    blob: bool = Field(
+        default=False,
+        description="Whether the variant is stored once as content addressed "
+        + "blob named by its SHA-256 digest",
+    )
+
+    @field_validator("last_modified")
+    @classmethod
+    def _last_modified_as_utc(
+        cls, value: Optional[datetime]
+    ) -> Optional[datetime]:
+        """Attach UTC to the naive datetimes returned by MongoDB."""
+        return _as_utc(value)
+
+    @classmethod
+    def from_object_info(cls, info: ObjectInfo) -> "StoredImageVariant":
+        """Create a variant from the metadata of an S3 object."""
+        return cls(
+            size=info.size,
+            etag=info.etag,
+            last_modified=info.last_modified,
+            file_type=info.file_type,
+        )
+
+    def to_object_info(self) -> ObjectInfo:
+        """Return the variant as metadata of an S3 object."""
+        return ObjectInfo(
+            size=self.size,
+            etag=self.etag,
+            last_modified=self.last_modified,
+            file_type=self.file_type,
+        )
+
+
+class ImageMetadata(BaseModel):
+    """Describes which variants of an image are stored in S3.
+
+    Small variants are created asynchronously by the image resizer, hence an
+    image may be known to only have an original variant so far.
+    """
+
+    id: str = Field(
+        ...,
+        alias="_id",
+        description="The key of the image, <image type>/<object id>",
+        examples=["coffee_bean/123e4567-e89b-12d3-a456-426655440000"],
+    )
+    variants: Dict[str, StoredImageVariant] = Field(
+        default_factory=dict,
+        description="The stored variants by their name",
+    )
+    small_checked_at: Optional[datetime] = Field(
+        default=None,
+        description="Last time S3 was checked for the small variant",
+    )
+
+    @field_validator("small_checked_at")
+    @classmethod
+    def _small_checked_at_as_utc(
+        cls, value: Optional[datetime]
+    ) -> Optional[datetime]:
+        """Attach UTC to the naive datetimes returned by MongoDB."""
+        return _as_utc(value)
@@ -0,0 +1,18 @@
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+
+class ImageUpload(BaseModel):
+    """Describes a presigned upload of an image directly to S3.
+
+    The image is posted as multipart form to the url with all fields and a
+    Content-Type field holding the media type of the image, followed by the
+    file field. Afterwards the upload has to be completed.
+    """
+
+    url: str = Field(..., description="URL to post the image to")
+    fields: Dict[str, str] = Field(
+        ..., description="Form fields to send along with the image"
+    )
+    max_size: int = Field(..., description="Maximal image size in bytes")
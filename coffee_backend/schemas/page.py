@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+from typing import Generic, List, Optional, TypeVar
+from uuid import UUID
+
+from .coffee import Coffee
+from .drink import Drink
+
+T = TypeVar("T", Coffee, Drink)
+
+
+@dataclass
+class Page(Generic[T]):
+    """Describes one page of a list ordered by descending id.
+
+    Args:
+        items (List[T]): The items of the page.
+        next_id (Optional[UUID]): The id of the last item if more items
+            follow, the next page starts after it.
+    """
+
+    items: List[T]
+    next_id: Optional[UUID] = None
+
+    @classmethod
+    def from_items(cls, items: List[T], page_size: int) -> "Page[T]":
+        """Create a page from the items read with one extra item.
+
+        Args:
+            items (List[T]): Up to page_size + 1 items, the extra item only
+                tells that a next page exists.
+            page_size (int): The number of items per page.
+
+        Returns:
+            Page[T]: The page with at most page_size items.
+        """
+        if len(items) > page_size:
+            return cls(items=items[:page_size], next_id=items[page_size - 1].id)
+        return cls(items=items)
@@ -1,5 +1,6 @@
 import logging
-from typing import Any, List, Optional
+import re
+from typing import Any, List, Optional, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException
@@ -8,7 +9,17 @@ from motor.core import AgnosticClientSession
 from coffee_backend.exceptions.exceptions import ObjectNotFoundError
 from coffee_backend.mongo.coffee import CoffeeCRUD
 from coffee_backend.mongo.coffee import coffee_crud as coffee_crud_instance
+from coffee_backend.mongo.search_terms import search_words
+from coffee_backend.schemas import Page
 from coffee_backend.schemas.coffee import Coffee, UpdateCoffee
+from coffee_backend.services.pagination import id_range
+
+LIST_SORT: List[Tuple[str, Any]] = [("_id", -1)]
+
+SEARCH_SORT: List[Tuple[str, Any]] = [
+    ("score", {"$meta": "textScore"}),
+    ("_id", -1),
+]
 
 
 class CoffeeService:
@@ -92,114 +103,95 @@ class CoffeeService:
         page_size: int = 10,
         first_id: Optional[UUID] = None,
         search_query: Optional[str] = None,
-    ) -> List[Coffee]:
-        """Retrieve a list of coffee objects from the database with rating
+        after_id: Optional[UUID] = None,
+    ) -> Page[Coffee]:
+        """Retrieve a page of coffee objects from the database with rating
             summary.
 
+        Pages following a cursor are read as range on the id, page numbers
+        are only skipped without cursor. Search results are only paged by
+        number, as they are ordered by relevance if they are matched by the
+        text index.
+
         Args:
             db_session (AgnosticClientSession): The database session object.
+            search_query (Optional[str]): Words to search for in the name,
+                roasting company and owner name of the coffees.
+            after_id (Optional[UUID]): The id of the last coffee of the
+                previous page.
 
 
         Returns:
-            List[Coffee]: A list of coffee objects retrieved from the crud
+            Page[Coffee]: A page of coffee objects retrieved from the crud
                 class.
 
         """
+        if search_query:
+            after_id = None
 
-        pipeline = self._create_pipeline(
+            if not search_words(search_query):
+                return Page(items=[])
+
+        query = self._create_query(
             owner_id=owner_id,
-            page=page,
-            page_size=page_size,
             first_id=first_id,
             search_query=search_query,
+            after_id=after_id,
         )
 
         try:
-            coffees = await self.coffee_crud.aggregate_read(
-                db_session=db_session, pipeline=pipeline
+            coffees = await self.coffee_crud.read(
+                db_session=db_session,
+                query=query,
+                limit=page_size + 1,
+                skip=0 if after_id else (page - 1) * page_size,
+                sort=SEARCH_SORT if "$text" in query else LIST_SORT,
             )
 
         except ObjectNotFoundError:
-            return []
+            return Page(items=[])
 
-        return coffees
+        if search_query:
+            return Page(items=coffees[:page_size])
 
-    def _create_pipeline(
+        return Page.from_items(coffees, page_size)
+
+    def _create_query(
         self,
         owner_id: Optional[UUID] = None,
-        page: int = 1,
-        page_size: int = 10,
         first_id: Optional[UUID] = None,
         search_query: Optional[str] = None,
-    ) -> List[dict]:
-        pipeline: List[dict[str, Any]] = [{"$sort": {"_id": -1}}]
+        after_id: Optional[UUID] = None,
+    ) -> dict[str, Any]:
+        """Create the query to list coffees with their stored rating summary.
+
+        Searches match regardless of case and diacritics. The last word of a
+        search may be incomplete while it is typed, it is matched as prefix
+        of the stored search terms of the coffees. The words before are
+        matched by the weighted text index, which orders the coffees by
+        relevance.
+        """
+
+        query: dict[str, Any] = {}
 
         if owner_id:
-            pipeline.append({"$match": {"owner_id": owner_id}})
+            query["owner_id"] = owner_id
 
-        if first_id:
-            pipeline.append({"$match": {"_id": {"$lte": first_id}}})
+        if first_id or after_id:
+            query["_id"] = id_range(first_id=first_id, after_id=after_id)
 
-        if search_query:
-            pipeline.append(
-                {
-                    "$match": {
-                        "$or": [
-                            {"name": {"$regex": search_query, "$options": "i"}},
-                            {
-                                "roasting_company": {
-                                    "$regex": search_query,
-                                    "$options": "i",
-                                }
-                            },
-                            {
-                                "owner_name": {
-                                    "$regex": search_query,
-                                    "$options": "i",
-                                }
-                            },
-                        ]
-                    }
-                }
-            )
+        words = search_words(search_query) if search_query else []
 
-        pipeline.extend(
-            [
-                {
-                    "$lookup": {
-                        "from": "drink",
-                        "localField": "_id",
-                        "foreignField": "coffee_bean_id",
-                        "as": "rating",
-                    }
-                },
-                {
-                    "$addFields": {
-                        "rating_count": {"$size": "$rating"},
-                        "rating_average": {
-                            "$round": [{"$avg": "$rating.rating"}, 2]
-                        },
-                    }
-                },
-                {
-                    "$project": {
-                        "_id": 1,
-                        "name": 1,
-                        "roasting_company": 1,
-                        "owner_id": 1,
-                        "owner_name": 1,
-                        "rating_count": 1,
-                        "rating_average": 1,
-                    }
-                },
-                {"$limit": page_size * page},
-                {"$skip": (page - 1) * page_size},
-            ]
-        )
+        if words:
+            *complete, prefix = words
+            query["search_terms"] = {"$regex": f"^{re.escape(prefix)}"}
+
+            if complete:
+                query["$text"] = {"$search": " ".join(complete)}
 
-        logging.debug("Executing pipeline: %s", pipeline)
+        logging.debug("Executing query: %s", query)
 
-        return pipeline
+        return query
 
     async def get_by_id(
         self, db_session: AgnosticClientSession, coffee_id: UUID
@@ -6,9 +6,45 @@ from fastapi import HTTPException
 from motor.core import AgnosticClientSession
 
 from coffee_backend.exceptions.exceptions import ObjectNotFoundError
+from coffee_backend.mongo.coffee import CoffeeCRUD
+from coffee_backend.mongo.coffee import coffee_crud as coffee_crud_instance
 from coffee_backend.mongo.drink import DrinkCRUD
 from coffee_backend.mongo.drink import drink_crud as drink_crud_instance
-from coffee_backend.schemas import Drink
+from coffee_backend.schemas import Drink, Page
+from coffee_backend.services.pagination import id_range
+from coffee_backend.services.query_plan import Lookup, QueryPlan
+from coffee_backend.settings import settings
+
+DRINKS_WITH_COFFEE_BEAN = QueryPlan(
+    sort={"_id": -1},
+    lookups=[
+        Lookup(
+            from_collection=settings.mongodb_coffee_collection,
+            local_field="coffee_bean_id",
+            foreign_field="_id",
+            as_field="drink",
+            fields=["name", "roasting_company"],
+        )
+    ],
+    add_fields={
+        "coffee_bean_name": {"$arrayElemAt": ["$drink.name", 0]},
+        "coffee_bean_roasting_company": {
+            "$arrayElemAt": ["$drink.roasting_company", 0]
+        },
+    },
+    project=[
+        "_id",
+        "brewing_method",
+        "rating",
+        "coffee_bean_id",
+        "user_id",
+        "user_name",
+        "image_exists",
+        "coffee_bean_name",
+        "coffee_bean_roasting_company",
+        "coordinate",
+    ],
+)
 
 
 class DrinkService:
@@ -16,15 +52,18 @@ class DrinkService:
     operations.
     """
 
-    def __init__(self, drink_crud: DrinkCRUD):
+    def __init__(self, drink_crud: DrinkCRUD, coffee_crud: CoffeeCRUD):
         """
         Initializes a new instance of the DrinkService class.
 
         Args:
             drink_crud (CoffeeCRUD): An instance of the DrinkCRUD class for
             performing CRUD operations.
+            coffee_crud (CoffeeCRUD): An instance of the CoffeeCRUD class for
+            updating the rating summary of coffees.
         """
         self.drink_crud = drink_crud
+        self.coffee_crud = coffee_crud
 
     async def add_drink(
         self, db_session: AgnosticClientSession, drink: Drink
@@ -43,7 +82,19 @@ class DrinkService:
             Exception: If an error occurs while creating the coffee.
         """
 
-        return await self.drink_crud.create(drink=drink, db_session=db_session)
+        created_drink = await self.drink_crud.create(
+            drink=drink, db_session=db_session
+        )
+
+        if drink.coffee_bean_id:
+            await self.coffee_crud.increment_rating(
+                db_session=db_session,
+                coffee_id=drink.coffee_bean_id,
+                count=1,
+                rating=drink.rating,
+            )
+
+        return created_drink
 
     async def list(
         self,
@@ -91,16 +142,22 @@ class DrinkService:
         page_size: int = 10,
         first_id: Optional[UUID] = None,
         coffee_bean_id: Optional[UUID] = None,
-    ) -> List[Drink]:
-        """Retrieve a list of drinks objects from the database with coffee bean
+        after_id: Optional[UUID] = None,
+    ) -> Page[Drink]:
+        """Retrieve a page of drinks objects from the database with coffee bean
         information.
 
+        Pages following a cursor are read as range on the id, page numbers
+        are only skipped without cursor.
+
         Args:
             db_session (AgnosticClientSession): The database session object.
+            after_id (Optional[UUID]): The id of the last drink of the
+                previous page.
 
 
         Returns:
-            List[Coffee]: A list of coffee objects retrieved from the crud
+            Page[Drink]: A page of drink objects retrieved from the crud
                 class.
 
         """
@@ -111,17 +168,18 @@ class DrinkService:
             page_size=page_size,
             first_id=first_id,
             coffee_bean_id=coffee_bean_id,
+            after_id=after_id,
         )
 
         try:
-            coffees = await self.drink_crud.aggregate_read(
+            drinks = await self.drink_crud.aggregate_read(
                 db_session=db_session, pipeline=pipeline
             )
 
         except ObjectNotFoundError:
-            return []
+            return Page(items=[])
 
-        return coffees
+        return Page.from_items(drinks, page_size)
 
     async def get_by_id(
         self, db_session: AgnosticClientSession, drink_id: UUID
@@ -166,6 +224,8 @@ class DrinkService:
         Returns:
             None
         """
+        drink = await self.get_by_id(db_session=db_session, drink_id=drink_id)
+
         try:
             await self.drink_crud.delete(
                 db_session=db_session, drink_id=drink_id
@@ -175,6 +235,14 @@ class DrinkService:
                 status_code=404, detail="No drink found for given id"
             ) from error
 
+        if drink.coffee_bean_id:
+            await self.coffee_crud.increment_rating(
+                db_session=db_session,
+                coffee_id=drink.coffee_bean_id,
+                count=-1,
+                rating=-drink.rating,
+            )
+
     async def delete_by_coffee_bean_id(
         self,
         db_session: AgnosticClientSession,
@@ -194,11 +262,27 @@ class DrinkService:
             None
         """
         try:
+            drinks = await self.drink_crud.read(
+                db_session=db_session,
+                query={"coffee_bean_id": coffee_bean_id},
+                limit=0,
+            )
             await self.drink_crud.delete_many(
-                db_session=db_session, query={"coffee_bean_id": coffee_bean_id}
+                db_session=db_session,
+                query={"_id": {"$in": [drink.id for drink in drinks]}},
             )
         except ObjectNotFoundError:
-            return None
+            logging.debug(
+                "No drinks found for coffee bean id %s", coffee_bean_id
+            )
+            return
+
+        await self.coffee_crud.increment_rating(
+            db_session=db_session,
+            coffee_id=coffee_bean_id,
+            count=-len(drinks),
+            rating=-sum(drink.rating for drink in drinks),
+        )
 
     def _create_pipeline(
         self,
@@ -207,57 +291,29 @@ class DrinkService:
         page_size: int = 10,
         first_id: Optional[UUID] = None,
         coffee_bean_id: Optional[UUID] = None,
+        after_id: Optional[UUID] = None,
     ) -> List[dict]:
-        """Create a pipeline to retrieve drinks with coffee bean information."""
+        """Create a pipeline to retrieve drinks with coffee bean information.
 
-        pipeline: List[dict[str, Any]] = [{"$sort": {"_id": -1}}]
+        One drink more than the page size is read to tell whether a next page
+        exists. Only the drinks of the page are joined with their coffee.
+        """
 
-        if user_id:
-            pipeline.append({"$match": {"user_id": user_id}})
+        match: dict[str, Any] = {}
 
-        if first_id:
-            pipeline.append({"$match": {"_id": {"$lte": first_id}}})
+        if user_id:
+            match["user_id"] = user_id
 
         if coffee_bean_id:
-            pipeline.append({"$match": {"coffee_bean_id": coffee_bean_id}})
-
-        pipeline.extend(
-            [
-                {
-                    "$lookup": {
-                        "from": "coffee",
-                        "localField": "coffee_bean_id",
-                        "foreignField": "_id",
-                        "as": "drink",
-                    }
-                },
-                {
-                    "$addFields": {
-                        "coffee_bean_name": {
-                            "$arrayElemAt": ["$drink.name", 0]
-                        },
-                        "coffee_bean_roasting_company": {
-                            "$arrayElemAt": ["$drink.roasting_company", 0]
-                        },
-                    }
-                },
-                {
-                    "$project": {
-                        "_id": 1,
-                        "brewing_method": 1,
-                        "rating": 1,
-                        "coffee_bean_id": 1,
-                        "user_id": 1,
-                        "user_name": 1,
-                        "image_exists": 1,
-                        "coffee_bean_name": 1,
-                        "coffee_bean_roasting_company": 1,
-                        "coordinate": 1,
-                    }
-                },
-                {"$limit": page_size * page},
-                {"$skip": (page - 1) * page_size},
-            ]
+            match["coffee_bean_id"] = coffee_bean_id
+
+        if first_id or after_id:
+            match["_id"] = id_range(first_id=first_id, after_id=after_id)
+
+        pipeline = DRINKS_WITH_COFFEE_BEAN.build(
+            match=match,
+            limit=page_size + 1,
+            skip=0 if after_id else (page - 1) * page_size,
         )
 
         logging.debug("Executing pipeline: %s", pipeline)
@@ -265,4 +321,6 @@ class DrinkService:
         return pipeline
 
 
-drink_service = DrinkService(drink_crud=drink_crud_instance)
+drink_service = DrinkService(
+    drink_crud=drink_crud_instance, coffee_crud=coffee_crud_instance
+)
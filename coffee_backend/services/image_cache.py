@@ -0,0 +1,370 @@
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import logging
+import os
+import shutil
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Set
+
+from coffee_backend.metrics import ImageCacheMetric
+from coffee_backend.s3.types.object_info import ObjectInfo
+
+
+@dataclass
+class CachedImage:
+    """Describes an image kept in the image cache.
+
+    Images of the memory tier hold their content in data, images of the disk
+    tier the path of the file containing it. The file of an image of the
+    disk tier returned by the cache is kept until the image is closed.
+    """
+
+    info: ObjectInfo
+    cached_at: float
+    data: Optional[bytes] = None
+    path: Optional[str] = None
+    release: Optional[Callable[[], None]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def close(self) -> None:
+        """Release the file of an image of the disk tier, so the cache may
+        delete it. Safe to call multiple times."""
+        if self.release is not None:
+            self.release()
+            self.release = None
+
+
+class CacheTier:
+    """Least recently used images of one cache tier within a byte budget."""
+
+    def __init__(self, name: str, max_bytes: int, max_item_bytes: int) -> None:
+        """Initializes a CacheTier instance.
+
+        Args:
+            name (str): The name of the tier used in metrics.
+            max_bytes (int): Byte budget of the tier.
+            max_item_bytes (int): Maximal size of an image in the tier.
+
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self.entries: OrderedDict[str, CachedImage] = OrderedDict()
+        self.size = 0
+
+    def fits(self, size: int) -> bool:
+        """Return whether an image of the given size may be kept in the tier."""
+        return size <= min(self.max_item_bytes, self.max_bytes)
+
+    def get(self, key: str) -> Optional[CachedImage]:
+        """Return an image and mark it as most recently used."""
+        entry = self.entries.get(key)
+
+        if entry is not None:
+            self.entries.move_to_end(key)
+
+        return entry
+
+    def add(self, key: str, entry: CachedImage) -> list[CachedImage]:
+        """Add an image and evict least recently used images over budget.
+
+        Returns:
+            list[CachedImage]: The evicted images.
+
+        """
+        self.entries[key] = entry
+        self.size += entry.info.size
+
+        evicted = []
+
+        while self.size > self.max_bytes:
+            evicted_key, evicted_entry = self.entries.popitem(last=False)
+            self.size -= evicted_entry.info.size
+            evicted.append(evicted_entry)
+            logging.debug("Evicting image %s from %s", evicted_key, self.name)
+
+        return evicted
+
+    def remove(self, key: str) -> Optional[CachedImage]:
+        """Remove an image from the tier if present."""
+        entry = self.entries.pop(key, None)
+
+        if entry is not None:
+            self.size -= entry.info.size
+
+        return entry
+
+    def clear(self) -> None:
+        """Remove all images from the tier."""
+        self.entries.clear()
+        self.size = 0
+
+
+class ImageCache:  # pylint: disable=too-many-instance-attributes
+    """Byte budgeted two tier LRU cache of images.
+
+    Small images such as thumbnails are kept in memory, larger ones in files
+    of a local directory which can be sent without copying them through the
+    application. Each tier evicts its least recently used images once its
+    byte budget is exceeded. Files of images which are being sent are only
+    deleted once they were sent.
+
+    Every worker process keeps its own cache in a directory named after its
+    process id. Entries are therefore only served for a limited time, so
+    images changed through another worker are picked up again. The
+    directories of exited processes are removed when a cache is cleared.
+    """
+
+    def __init__(
+        self,
+        metric: ImageCacheMetric,
+        directory: str,
+        memory_max_bytes: int = 32 * 1024 * 1024,
+        disk_max_bytes: int = 512 * 1024 * 1024,
+        memory_max_item_bytes: int = 256 * 1024,
+        disk_max_item_bytes: int = 8 * 1024 * 1024,
+        ttl: float = 60,
+    ) -> None:
+        """Initializes an ImageCache instance.
+
+        Args:
+            metric (ImageCacheMetric): The metric recording the efficiency.
+            directory (str): The directory of the disk tier. A subdirectory
+                per process is used.
+            memory_max_bytes (int): Byte budget of the memory tier.
+            disk_max_bytes (int): Byte budget of the disk tier.
+            memory_max_item_bytes (int): Maximal size of an image kept in
+                memory, larger images are kept on disk.
+            disk_max_item_bytes (int): Maximal size of a cached image.
+            ttl (float): Seconds an image is served from the cache.
+
+        """
+        self.metric = metric
+        self.base_directory = directory
+        self.directory = os.path.join(directory, str(os.getpid()))
+        self.memory = CacheTier(
+            "memory", memory_max_bytes, memory_max_item_bytes
+        )
+        self.disk = CacheTier("disk", disk_max_bytes, disk_max_item_bytes)
+        self.ttl = ttl
+        self.generation = 0
+        self.readers: Dict[str, int] = {}
+        self.deferred_deletes: Set[str] = set()
+
+    def fits(self, size: int) -> bool:
+        """Return whether an image of the given size may be cached."""
+        return self.memory.fits(size) or self.disk.fits(size)
+
+    def clear(self) -> None:
+        """Remove all cached images and recreate the disk tier directory.
+
+        The disk tier directories left behind by exited processes are removed
+        as well.
+        """
+        self.memory.clear()
+        self.disk.clear()
+        self.deferred_deletes.clear()
+        self.generation += 1
+
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._remove_stale_directories()
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._update_size_metrics()
+
+    def get(self, key: str) -> Optional[CachedImage]:
+        """Return a cached image if it is still valid.
+
+        The file of a returned image of the disk tier is not deleted until
+        the image is closed, e.g. on expiry or eviction while it is sent. The
+        caller has to close the returned image.
+
+        Args:
+            key (str): The cache key of the image.
+
+        Returns:
+            Optional[CachedImage]: The cached image or None.
+
+        """
+        for tier in [self.memory, self.disk]:
+            entry = tier.get(key)
+
+            if entry is None:
+                continue
+
+            if time.monotonic() - entry.cached_at >= self.ttl:
+                logging.debug("Evicting expired image %s", key)
+                self.invalidate(key)
+                break
+
+            if entry.path is not None:
+                self.readers[entry.path] = self.readers.get(entry.path, 0) + 1
+                entry = dataclasses.replace(
+                    entry, release=functools.partial(self._release, entry.path)
+                )
+
+            self.metric.record_hit(tier.name, entry.info.size)
+            return entry
+
+        self.metric.record_miss()
+        return None
+
+    async def put(
+        self, key: str, info: ObjectInfo, data: bytes, generation: int
+    ) -> None:
+        """Store an image read from the object storage.
+
+        The image is dropped if the cache was invalidated since the image was
+        read, as it might be outdated already.
+
+        Args:
+            key (str): The cache key of the image.
+            info (ObjectInfo): The metadata of the image.
+            data (bytes): The content of the image.
+            generation (int): The cache generation before reading the image.
+
+        """
+        if self.memory.fits(len(data)):
+            if generation != self.generation:
+                return
+
+            self._remove(key)
+            self.memory.add(
+                key,
+                CachedImage(info=info, cached_at=time.monotonic(), data=data),
+            )
+
+        elif self.disk.fits(len(data)):
+            key_hash = hashlib.sha256(key.encode()).hexdigest()
+            path = os.path.join(
+                self.directory, f"{key_hash}-{uuid.uuid4().hex}"
+            )
+
+            await asyncio.to_thread(self._write_file, path, data)
+
+            if generation != self.generation:
+                self._delete_file(path)
+                return
+
+            self._remove(key)
+            self._delete_files(
+                self.disk.add(
+                    key,
+                    CachedImage(
+                        info=info, cached_at=time.monotonic(), path=path
+                    ),
+                )
+            )
+
+        self._update_size_metrics()
+
+    def invalidate(self, key: str, prefix: bool = False) -> None:
+        """Remove an image from all tiers, e.g. after it was changed.
+
+        Args:
+            key (str): The cache key of the image.
+            prefix (bool): Whether to also remove the images whose key is
+                derived from the key, e.g. other formats of the image.
+
+        """
+        self.generation += 1
+        self._remove(key)
+
+        if prefix:
+            for derived_key in [
+                cached_key
+                for tier in [self.memory, self.disk]
+                for cached_key in tier.entries
+                if cached_key.startswith(f"{key}/")
+            ]:
+                self._remove(derived_key)
+
+        self._update_size_metrics()
+
+    def _remove(self, key: str) -> None:
+        """Remove an image from both tiers and delete its file."""
+        self.memory.remove(key)
+
+        entry = self.disk.remove(key)
+
+        if entry is not None:
+            self._delete_files([entry])
+
+    def _update_size_metrics(self) -> None:
+        """Publish the number of bytes held by each tier."""
+        for tier in [self.memory, self.disk]:
+            self.metric.set_size(tier.name, tier.size)
+
+    def _delete_files(self, entries: list[CachedImage]) -> None:
+        """Delete the files of removed disk tier images, the files of images
+        which are being sent once they were sent."""
+        for entry in entries:
+            if entry.path is None:
+                continue
+
+            if entry.path in self.readers:
+                self.deferred_deletes.add(entry.path)
+            else:
+                self._delete_file(entry.path)
+
+    def _release(self, path: str) -> None:
+        """Release the file of a returned image and delete it if it was
+        removed from the cache while it was sent."""
+        readers = self.readers.pop(path, 0) - 1
+
+        if readers > 0:
+            self.readers[path] = readers
+        elif path in self.deferred_deletes:
+            self.deferred_deletes.discard(path)
+            self._delete_file(path)
+
+    def _remove_stale_directories(self) -> None:
+        """Remove the disk tier directories of exited processes."""
+        try:
+            names = os.listdir(self.base_directory)
+        except FileNotFoundError:
+            return
+
+        for name in names:
+            if not name.isdigit() or self._is_running(int(name)):
+                continue
+
+            logging.info("Removing stale image cache directory %s", name)
+            shutil.rmtree(
+                os.path.join(self.base_directory, name), ignore_errors=True
+            )
+
+    @staticmethod
+    def _is_running(pid: int) -> bool:
+        """Return whether a process with the given id is running."""
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            # The process is running as another user.
+            pass
+
+        return True
+
+    @staticmethod
+    def _write_file(path: str, data: bytes) -> None:
+        """Blocking write of an image into the disk tier."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, "wb") as file:
+            file.write(data)
+
+    @staticmethod
+    def _delete_file(path: str) -> None:
+        """Delete a file of the disk tier if it still exists."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
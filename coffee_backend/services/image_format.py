@@ -0,0 +1,64 @@
+from typing import AsyncIterator, List, Optional, Tuple
+
+SNIFF_LENGTH = 32
+
+
+def sniff_image_format(head: bytes) -> Optional[str]:
+    """Detect the format of an image by the magic bytes of its content.
+
+    Args:
+        head (bytes): At least the first SNIFF_LENGTH bytes of the image, or
+            all of it if shorter.
+
+    Returns:
+        Optional[str]: The file type of the image, None if it is no image of
+            a known format.
+
+    """
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[4:8] == b"ftyp" and head[8:12] in (b"avif", b"avis"):
+        return "avif"
+    return None
+
+
+async def read_head(
+    chunks: AsyncIterator[bytes], size: int = SNIFF_LENGTH
+) -> Tuple[bytes, AsyncIterator[bytes]]:
+    """Read the first bytes of a stream of chunks without consuming them.
+
+    Only as many chunks are received as needed for the head.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The chunks of the content.
+        size (int): Number of bytes to read.
+
+    Returns:
+        Tuple[bytes, AsyncIterator[bytes]]: The first size bytes, fewer if the
+            content is shorter, and the chunks of the whole content.
+
+    """
+    received: List[bytes] = []
+    length = 0
+
+    async for chunk in chunks:
+        received.append(chunk)
+        length += len(chunk)
+
+        if length >= size:
+            break
+
+    async def iterate() -> AsyncIterator[bytes]:
+        for chunk in received:
+            yield chunk
+
+        async for chunk in chunks:
+            yield chunk
+
+    return b"".join(received)[:size], iterate()
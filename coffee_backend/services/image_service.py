@@ -1,69 +1,650 @@
+# pylint: disable=too-many-lines
+import asyncio
+import io
 import logging
-from typing import Tuple
+import time
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from uuid import UUID
 
 from fastapi import HTTPException
+from motor.core import AgnosticClient, AgnosticClientSession
 
-from coffee_backend.exceptions.exceptions import ObjectNotFoundError
+from coffee_backend.exceptions.exceptions import (
+    ObjectNotFoundError,
+    RangeNotSatisfiableError,
+    UploadTimeoutError,
+    UploadTooLargeError,
+)
+from coffee_backend.mongo.image_blob import ImageBlobCRUD
+from coffee_backend.mongo.image_metadata import ImageMetadataCRUD
 from coffee_backend.s3.object import ObjectCRUD
-from coffee_backend.schemas import ImageType, S3Object
+from coffee_backend.s3.types.byte_range import ByteRange
+from coffee_backend.s3.types.object_info import ObjectInfo
+from coffee_backend.s3.types.object_stream import ObjectStream
+from coffee_backend.schemas import (
+    SMALL_FORMAT_VARIANTS,
+    ImageMetadata,
+    ImageType,
+    ImageUpload,
+    ImageVariant,
+    S3Object,
+    StoredImageVariant,
+    image_key,
+    resized_variant,
+)
+from coffee_backend.services.image_cache import CachedImage, ImageCache
+from coffee_backend.services.image_format import (
+    SNIFF_LENGTH,
+    read_head,
+    sniff_image_format,
+)
+from coffee_backend.services.thumbnail import ThumbnailGenerator
 
+T = TypeVar("T")
 
-class ImageService:
+UPLOAD_PATH = "upload"
+
+UPLOAD_FORMATS = ("jpeg", "png", "gif", "webp", "avif")
+
+BLOB_PATH = "blobs"
+
+# Resolving once more after a missing small or resized variant was removed
+# falls back to the original.
+READ_VARIANT_ATTEMPTS = 2
+
+
+class ImageService:  # pylint: disable=too-many-instance-attributes
     """Service layer between the API and CRUD layer for handling all image
     related operations.
+
+    The stored variants of each image are recorded in MongoDB, so the variant
+    to serve is resolved with a single lookup instead of probing S3 for the
+    small variant first. As small variants are created asynchronously by the
+    image resizer, S3 is checked for a missing small variant at most once per
+    recheck interval. Images uploaded before their metadata was recorded are
+    probed once and recorded afterwards.
+
+    Images requested in one of the allowed widths are resized from the
+    original once and stored as further variant, so later requests read them
+    like any other variant.
+
+    Instead of uploading images through the application, clients can post
+    them directly to S3 with a presigned upload and complete the upload
+    afterwards.
+
+    If an image blob CRUD is set, uploaded originals are stored once per
+    content under their SHA-256 digest and shared by all images with the same
+    content. A blob is deleted with the last image referencing it.
     """
 
-    def __init__(self, object_crud: ObjectCRUD):
+    def __init__(
+        self,
+        object_crud: ObjectCRUD,
+        image_metadata_crud: ImageMetadataCRUD,
+        image_cache: Optional[ImageCache] = None,
+        small_recheck_interval: float = 60,
+        thumbnail_generator: Optional[ThumbnailGenerator] = None,
+        resize_widths: Tuple[int, ...] = (),
+        redirect_url_ttl: int = 0,
+        upload_url_ttl: int = 600,
+        upload_max_size: int = 10 * 1024 * 1024,
+        upload_formats: Tuple[str, ...] = UPLOAD_FORMATS,
+        image_blob_crud: Optional[ImageBlobCRUD] = None,
+    ):
         """Initialize the ImageService.
 
         Args:
             object_crud (ObjectCRUD): An instance of the ObjectCRUD
                 class for managing image objects.
+            image_metadata_crud (ImageMetadataCRUD): The CRUD of the records
+                of stored image variants.
+            image_cache (Optional[ImageCache]): The cache of streamed images.
+                Images are always read from S3 if not set.
+            small_recheck_interval (float): Minimal seconds between two checks
+                of S3 for a missing small variant.
+            thumbnail_generator (Optional[ThumbnailGenerator]): Creates the
+                small variant of uploaded images and resizes images to
+                requested widths. Small variants are left to the external
+                image resizer and widths are ignored if not set.
+            resize_widths (Tuple[int, ...]): The widths images may be
+                requested in.
+            redirect_url_ttl (int): Seconds the presigned URLs images are
+                redirected to are valid for. Images are streamed if 0.
+            upload_url_ttl (int): Seconds presigned uploads are valid for.
+            upload_max_size (int): Maximal size of uploaded images in bytes.
+            upload_formats (Tuple[str, ...]): File types uploaded images may
+                have, detected from their content.
+            image_blob_crud (Optional[ImageBlobCRUD]): The CRUD of the
+                references to content addressed originals. Originals are
+                stored per image if not set.
 
         """
         self.object_crud = object_crud
+        self.image_metadata_crud = image_metadata_crud
+        self.image_cache = image_cache
+        self.small_recheck_interval = small_recheck_interval
+        self.thumbnail_generator = thumbnail_generator
+        self.resize_widths = resize_widths
+        self.redirect_url_ttl = redirect_url_ttl
+        self.upload_url_ttl = upload_url_ttl
+        self.upload_max_size = upload_max_size
+        self.upload_formats = upload_formats
+        self.image_blob_crud = image_blob_crud
+        self.resizing: Dict[str, asyncio.Task] = {}
 
-    def add_image(self, s3_object: S3Object) -> None:
+    async def add_image(
+        self, db_session: AgnosticClientSession, s3_object: S3Object
+    ) -> None:
         """Add a coffee image to the S3 bucket associated with a coffee.
 
+        The format of the image is detected from its first bytes, the content
+        type declared by the client is not trusted. Images of other formats
+        are rejected before anything is sent to S3. The image is streamed from
+        the request into S3 while it is received, its size is limited and its
+        content hashed on the fly. With an image blob CRUD, the image is
+        streamed to a staging object and only copied to its blob if no image
+        with the same content is stored yet.
+
+        The uploaded image is recorded as the only variant, an outdated small
+        variant is not served anymore. If a thumbnail generator is set, the
+        small variant is created in the background.
+
         Args:
-            coffee_image (UploadFile): The coffee image to be added.
-            coffee_id (UUID): The ID of the coffee associated with the image.
+            db_session (AgnosticClientSession): The database session.
+            s3_object (S3Object): The image to be added.
 
         Raises:
-            HTTPException: If no file name is provided in the coffee_image.
+            HTTPException: If the image has no supported format or exceeds
+                the maximal size.
 
         """
 
-        if not s3_object.file.content_type:
+        head, chunks = await read_head(s3_object.file.chunks)
+        filetype = sniff_image_format(head)
+
+        if filetype is None or filetype not in self.upload_formats:
             raise HTTPException(
-                status_code=400, detail="No content type provided"
+                status_code=415,
+                detail="Unsupported image format, supported are "
+                + ", ".join(self.upload_formats),
             )
 
-        filetype = s3_object.file.content_type.split("/")[1]
+        filepath = (
+            f"{UPLOAD_PATH}/{s3_object.type.value}"
+            if self.image_blob_crud is not None
+            else s3_object.context_path + "/" + "original"
+        )
+
+        try:
+            upload = await self.object_crud.create_stream(
+                filepath=filepath,
+                filename=str(s3_object.key),
+                chunks=chunks,
+                file_type=filetype,
+                max_size=self.upload_max_size,
+            )
+        except UploadTooLargeError as exception:
+            raise HTTPException(
+                status_code=413,
+                detail="Image exceeds the maximal size of "
+                + f"{self.upload_max_size} bytes",
+            ) from exception
+        except UploadTimeoutError as exception:
+            raise HTTPException(
+                status_code=408, detail="Image upload timed out"
+            ) from exception
 
-        self.object_crud.create(
-            filepath=s3_object.context_path + "/" + "original",
-            filename=str(s3_object.key),
-            file=s3_object.file.file,
-            file_type=filetype,
+        if self.image_blob_crud is not None:
+            original = await self._store_blob(
+                db_session,
+                self.image_blob_crud,
+                s3_object.key,
+                s3_object.type,
+                upload.sha256,
+                filetype,
+            )
+        else:
+            original = StoredImageVariant.from_object_info(
+                await self.object_crud.stat(
+                    filepath=filepath, filename=str(s3_object.key)
+                )
+            ).model_copy(update={"sha256": upload.sha256})
+
+        await self._record_original(
+            db_session, s3_object.key, s3_object.type, original
         )
 
         logging.debug(
             "Added object %s with key %s", s3_object.type.value, s3_object.key
         )
 
-    def get_image(
+    async def create_upload(
         self, object_id: UUID, image_type: ImageType
+    ) -> ImageUpload:
+        """Create a presigned upload of an image directly to S3.
+
+        The image is uploaded to a staging object, the stored image is only
+        replaced once the upload is completed.
+
+        Args:
+            object_id (UUID): The ID of the object associated with the image.
+            image_type (ImageType): The type of the image.
+
+        Returns:
+            ImageUpload: The URL and form fields to post the image with.
+
+        """
+        url, fields = await self.object_crud.presign_upload(
+            filepath=f"{UPLOAD_PATH}/{image_type.value}",
+            filename=str(object_id),
+            expires=self.upload_url_ttl,
+            max_size=self.upload_max_size,
+        )
+
+        return ImageUpload(
+            url=url, fields=fields, max_size=self.upload_max_size
+        )
+
+    async def complete_upload(
+        self,
+        db_session: AgnosticClientSession,
+        object_id: UUID,
+        image_type: ImageType,
+    ) -> None:
+        """Replace an image by its directly uploaded staging object.
+
+        The staging object is verified and copied within S3, only its first
+        bytes are read to detect its format.
+
+        Args:
+            db_session (AgnosticClientSession): The database session.
+            object_id (UUID): The ID of the object associated with the image.
+            image_type (ImageType): The type of the image.
+
+        Raises:
+            HTTPException: If no upload exists or the upload has no supported
+                format or is too large.
+
+        """
+        staging_path = f"{UPLOAD_PATH}/{image_type.value}"
+
+        try:
+            upload = await self.object_crud.stat(
+                filepath=staging_path, filename=str(object_id)
+            )
+        except ObjectNotFoundError as exception:
+            raise HTTPException(
+                status_code=404, detail="No uploaded image found"
+            ) from exception
+
+        file_type = (
+            await self._sniff_object(staging_path, object_id)
+            if 0 < upload.size <= self.upload_max_size
+            else None
+        )
+
+        if file_type is None or file_type not in self.upload_formats:
+            await self.object_crud.delete(
+                filepath=staging_path, filename=str(object_id)
+            )
+            raise HTTPException(status_code=400, detail="Invalid image upload")
+
+        filepath = f"{image_type.value}/{ImageVariant.ORIGINAL.value}"
+
+        await self.object_crud.copy(
+            source_filepath=staging_path,
+            filepath=filepath,
+            filename=str(object_id),
+            file_type=file_type,
+        )
+        await self.object_crud.delete(
+            filepath=staging_path, filename=str(object_id)
+        )
+
+        original = StoredImageVariant.from_object_info(
+            await self.object_crud.stat(
+                filepath=filepath, filename=str(object_id)
+            )
+        )
+
+        await self._record_original(db_session, object_id, image_type, original)
+
+        logging.debug(
+            "Completed upload of %s image with id %s",
+            image_type.value,
+            object_id,
+        )
+
+    async def _sniff_object(
+        self, filepath: str, object_id: UUID
+    ) -> Optional[str]:
+        """Detect the format of an image in S3 from its first bytes."""
+        stream = await self.object_crud.stream(
+            filepath=filepath,
+            filename=str(object_id),
+            byte_range=ByteRange(start=0, end=SNIFF_LENGTH - 1),
+        )
+
+        try:
+            head = b"".join([chunk async for chunk in stream.chunks])
+        finally:
+            stream.close()
+
+        return sniff_image_format(head)
+
+    async def _store_blob(  # pylint: disable=too-many-arguments
+        self,
+        db_session: AgnosticClientSession,
+        image_blob_crud: ImageBlobCRUD,
+        object_id: UUID,
+        image_type: ImageType,
+        sha256: str,
+        file_type: str,
+    ) -> StoredImageVariant:
+        """Store an uploaded staging object as content addressed blob.
+
+        The image is referenced before the blob is looked up, so a concurrent
+        delete of another image does not remove the blob. If the blob already
+        exists, only its metadata is read and the staging object is dropped.
+        If the blob is being deleted, the image is stored per image instead.
+
+        Args:
+            db_session (AgnosticClientSession): The database session.
+            image_blob_crud (ImageBlobCRUD): The CRUD of the blob references.
+            object_id (UUID): The ID of the object associated with the image.
+            image_type (ImageType): The type of the image.
+            sha256 (str): The SHA-256 digest of the uploaded content.
+            file_type (str): The detected file type of the image.
+
+        Returns:
+            StoredImageVariant: The metadata of the stored original.
+
+        """
+        staging_path = f"{UPLOAD_PATH}/{image_type.value}"
+        info: Optional[ObjectInfo] = None
+
+        blob = await image_blob_crud.add_reference(
+            db_session=db_session,
+            sha256=sha256,
+            key=image_key(object_id, image_type),
+        )
+
+        if blob:
+            filepath, filename = BLOB_PATH, sha256
+
+            try:
+                info = await self.object_crud.stat(
+                    filepath=filepath, filename=filename
+                )
+                logging.debug("Image blob %s is already stored", sha256)
+            except ObjectNotFoundError:
+                pass
+        else:
+            logging.debug(
+                "Image blob %s is being deleted, storing %s per image",
+                sha256,
+                object_id,
+            )
+            filepath = f"{image_type.value}/{ImageVariant.ORIGINAL.value}"
+            filename = str(object_id)
+
+        if info is None:
+            await self.object_crud.copy(
+                source_filepath=staging_path,
+                filepath=filepath,
+                filename=filename,
+                file_type=file_type,
+                source_filename=str(object_id),
+            )
+            info = await self.object_crud.stat(
+                filepath=filepath, filename=filename
+            )
+
+        await self.object_crud.delete(
+            filepath=staging_path, filename=str(object_id)
+        )
+
+        return StoredImageVariant.from_object_info(info).model_copy(
+            update={"sha256": sha256, "blob": blob}
+        )
+
+    async def _release_blob(
+        self, db_session: AgnosticClientSession, sha256: str, key: str
+    ) -> None:
+        """Remove the reference of an image to a blob and delete the blob
+        with its last reference.
+
+        The record of the blob is only deleted after the blob, until then
+        uploads of the same content are stored per image.
+        """
+        if self.image_blob_crud is None:
+            return
+
+        if await self.image_blob_crud.remove_reference(
+            db_session=db_session, sha256=sha256, key=key
+        ):
+            await self.object_crud.delete(filepath=BLOB_PATH, filename=sha256)
+            await self.image_blob_crud.delete(
+                db_session=db_session, sha256=sha256
+            )
+
+            logging.debug("Deleted unreferenced image blob %s", sha256)
+
+    async def _read_original(
+        self, db_session: AgnosticClientSession, key: str
+    ) -> Optional[StoredImageVariant]:
+        """Return the recorded original of an image."""
+        try:
+            metadata = await self.image_metadata_crud.read(
+                db_session=db_session, key=key
+            )
+        except ObjectNotFoundError:
+            return None
+
+        return metadata.variants.get(ImageVariant.ORIGINAL.value)
+
+    async def _read_blob_original(
+        self, db_session: AgnosticClientSession, key: str
+    ) -> Optional[StoredImageVariant]:
+        """Return the recorded original of an image if it is a blob."""
+        original = await self._read_original(db_session, key)
+
+        return original if original is not None and original.blob else None
+
+    @staticmethod
+    def _location(
+        object_id: UUID,
+        image_type: ImageType,
+        variant: str,
+        stored: Optional[StoredImageVariant] = None,
+    ) -> Tuple[str, str]:
+        """Return the filepath and filename of a variant of an image in S3."""
+        if stored is not None and stored.blob and stored.sha256:
+            return BLOB_PATH, stored.sha256
+
+        return f"{image_type.value}/{variant}", str(object_id)
+
+    async def _record_original(
+        self,
+        db_session: AgnosticClientSession,
+        object_id: UUID,
+        image_type: ImageType,
+        original: StoredImageVariant,
+    ) -> None:
+        """Record a stored original as the only variant of an image.
+
+        An outdated small variant is not served anymore and a replaced blob is
+        released. An original replaced by a blob is deleted once the blob is
+        recorded. If a thumbnail generator is set, the small variant is
+        created in the background.
+
+        Args:
+            db_session (AgnosticClientSession): The database session.
+            object_id (UUID): The ID of the object associated with the image.
+            image_type (ImageType): The type of the image.
+            original (StoredImageVariant): The metadata of the original.
+
+        """
+        key = image_key(object_id, image_type)
+        replaced = (
+            await self._read_original(db_session, key)
+            if self.image_blob_crud is not None
+            else None
+        )
+
+        await self.image_metadata_crud.replace(
+            db_session=db_session,
+            metadata=ImageMetadata(
+                _id=key,
+                variants={ImageVariant.ORIGINAL.value: original},
+                small_checked_at=datetime.now(timezone.utc),
+            ),
+        )
+
+        if replaced is not None and replaced.blob:
+            if replaced.sha256 is not None and not (
+                original.blob and original.sha256 == replaced.sha256
+            ):
+                await self._release_blob(db_session, replaced.sha256, key)
+        elif replaced is not None and original.blob:
+            await self.object_crud.delete(
+                filepath=f"{image_type.value}/{ImageVariant.ORIGINAL.value}",
+                filename=str(object_id),
+            )
+
+        self._invalidate_cache(object_id, image_type)
+
+        if self.thumbnail_generator is not None:
+            self.thumbnail_generator.submit(
+                self._add_small_variant(
+                    database_client=db_session.client,
+                    thumbnail_generator=self.thumbnail_generator,
+                    object_id=object_id,
+                    image_type=image_type,
+                    original=original,
+                )
+            )
+
+    async def _add_small_variant(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        database_client: AgnosticClient,
+        thumbnail_generator: ThumbnailGenerator,
+        object_id: UUID,
+        image_type: ImageType,
+        original: StoredImageVariant,
+    ) -> None:
+        """Create, store and record the small variant of an uploaded image.
+
+        The small variant is additionally stored in the alternative formats
+        of the thumbnail generator. Failures are only logged, the original is
+        served in that case. The job runs after the upload was answered and
+        the session of its request ended, so it records the variants in a
+        session of its own.
+
+        Args:
+            database_client (AgnosticClient): The database client to start
+                the session of the job with.
+            thumbnail_generator (ThumbnailGenerator): The thumbnail generator.
+            object_id (UUID): The ID of the object associated with the image.
+            image_type (ImageType): The type of the image.
+            original (StoredImageVariant): The metadata of the uploaded
+                original.
+
+        """
+        filepath, filename = self._location(
+            object_id, image_type, ImageVariant.ORIGINAL.value, original
+        )
+
+        try:
+            data, _ = await self.object_crud.read(
+                filepath=filepath, filename=filename
+            )
+
+            thumbnail = await thumbnail_generator.generate(data)
+
+            start = time.perf_counter()
+
+            await self.object_crud.create(
+                filepath=f"{image_type.value}/{ImageVariant.SMALL.value}",
+                filename=str(object_id),
+                file=io.BytesIO(thumbnail.data),
+                file_type=thumbnail.file_type,
+            )
+            variants = {
+                ImageVariant.SMALL.value: await self._stat_variant(
+                    object_id, image_type, ImageVariant.SMALL
+                )
+            }
+
+            for file_type, alternative in thumbnail.alternatives.items():
+                variant = SMALL_FORMAT_VARIANTS[file_type]
+
+                await self.object_crud.create(
+                    filepath=f"{image_type.value}/{variant.value}",
+                    filename=str(object_id),
+                    file=io.BytesIO(alternative),
+                    file_type=file_type,
+                )
+                variants[variant.value] = await self._stat_variant(
+                    object_id, image_type, variant
+                )
+
+            thumbnail_generator.metric.observe_stage(
+                "upload", time.perf_counter() - start
+            )
+
+            async with await database_client.start_session() as db_session:
+                await self.image_metadata_crud.update_variants(
+                    db_session=db_session,
+                    key=image_key(object_id, image_type),
+                    variants=variants,
+                    small_checked_at=datetime.now(timezone.utc),
+                    original_etag=original.etag,
+                )
+        except Exception:  # pylint: disable=broad-exception-caught
+            thumbnail_generator.metric.record_job("failed")
+            logging.exception(
+                "Creating small %s image with id %s failed",
+                image_type.value,
+                object_id,
+            )
+            return
+
+        self._invalidate_cache(object_id, image_type)
+        thumbnail_generator.metric.record_job("created")
+
+        logging.debug(
+            "Added small %s image with id %s", image_type.value, object_id
+        )
+
+    async def get_image(
+        self,
+        db_session: AgnosticClientSession,
+        object_id: UUID,
+        image_type: ImageType,
+        accepted_formats: Tuple[str, ...] = (),
+        width: Optional[int] = None,
     ) -> Tuple[bytes, str]:
         """Retrieve if existing small, otherwise original image from S3.
 
-        Try to get the small version of the image, if it does not exist, get the
-        original version.
-
         Args:
-            coffee_id (UUID): The ID of the coffee associated with the image.
+            db_session (AgnosticClientSession): The database session.
+            object_id (UUID): The ID of the object associated with the image.
+            image_type (ImageType): The type of the image.
+            accepted_formats (Tuple[str, ...]): Alternative file types of the
+                small variant the client accepts.
+            width (Optional[int]): The width to resize the image to.
 
         Returns:
             Tuple[bytes, str]: A tuple containing the coffee image data (bytes)
@@ -73,46 +654,739 @@ class ImageService:
             HTTPException: If the coffee image is not found in the S3 bucket.
 
         """
+        return await self._read_variant(
+            self.object_crud.read,
+            db_session,
+            object_id,
+            image_type,
+            accepted_formats=accepted_formats,
+            width=width,
+        )
+
+    async def stream_image(
+        self,
+        db_session: AgnosticClientSession,
+        object_id: UUID,
+        image_type: ImageType,
+        byte_range: Optional[ByteRange] = None,
+        if_range: Optional[str] = None,
+        accepted_formats: Tuple[str, ...] = (),
+        width: Optional[int] = None,
+    ) -> ObjectStream:
+        """Open if existing small, otherwise original image for streaming.
+
+        Args:
+            db_session (AgnosticClientSession): The database session.
+            object_id (UUID): The ID of the object associated with the image.
+            image_type (ImageType): The type of the image.
+            byte_range (Optional[ByteRange]): The byte range to stream.
+            if_range (Optional[str]): The If-Range validator the range is
+                conditional on.
+            accepted_formats (Tuple[str, ...]): Alternative file types of the
+                small variant the client accepts.
+            width (Optional[int]): The width to resize the image to.
+
+        Returns:
+            ObjectStream: The streamed image with its size, etag and file type.
+                Completely streamed images are added to the image cache.
+
+        Raises:
+            HTTPException: If the image is not found in the S3 bucket, the
+                width is not allowed or the range is not satisfiable.
+
+        """
+        generation = self.image_cache.generation if self.image_cache else 0
+
         try:
-            return self.object_crud.read(
-                filepath=f"{image_type.value}/small", filename=str(object_id)
+            image = await self._read_variant(
+                self.object_crud.stream,
+                db_session,
+                object_id,
+                image_type,
+                accepted_formats=accepted_formats,
+                width=width,
+                byte_range=byte_range,
+                if_range=if_range,
+            )
+        except RangeNotSatisfiableError as exception:
+            raise HTTPException(
+                status_code=416, detail="Requested range not satisfiable"
+            ) from exception
+
+        if self.image_cache is not None:
+            image.chunks = self._cache_chunks(
+                self.image_cache,
+                self._cache_key(object_id, image_type, accepted_formats, width),
+                image,
+                image.chunks,
+                generation,
+            )
+
+        return image
+
+    def get_cached_image(
+        self,
+        object_id: UUID,
+        image_type: ImageType,
+        accepted_formats: Tuple[str, ...] = (),
+        width: Optional[int] = None,
+    ) -> Optional[CachedImage]:
+        """Return the image from the image cache if present.
+
+        The file of an image of the disk tier is opened, the caller has to
+        close the returned image.
+
+        Args:
+            object_id (UUID): The ID of the object associated with the image.
+            image_type (ImageType): The type of the image.
+            accepted_formats (Tuple[str, ...]): Alternative file types of the
+                small variant the client accepts.
+            width (Optional[int]): The width to resize the image to.
+
+        Returns:
+            Optional[CachedImage]: The cached image or None.
+
+        """
+        if self.image_cache is None:
+            return None
+
+        return self.image_cache.get(
+            self._cache_key(object_id, image_type, accepted_formats, width)
+        )
+
+    async def stat_image(
+        self,
+        db_session: AgnosticClientSession,
+        object_id: UUID,
+        image_type: ImageType,
+        accepted_formats: Tuple[str, ...] = (),
+        width: Optional[int] = None,
+    ) -> ObjectInfo:
+        """Read the metadata of the image served by stream_image.
+
+        The metadata is answered from the recorded variants without a request
+        to S3.
+
+        Args:
+            db_session (AgnosticClientSession): The database session.
+            object_id (UUID): The ID of the object associated with the image.
+            image_type (ImageType): The type of the image.
+            accepted_formats (Tuple[str, ...]): Alternative file types of the
+                small variant the client accepts.
+            width (Optional[int]): The width to resize the image to.
+
+        Returns:
+            ObjectInfo: The size, etag, last modification time and file type
+                of the image.
+
+        Raises:
+            HTTPException: If the image is not found in the S3 bucket or the
+                width is not allowed.
+
+        """
+        _, variant = await self._resolve(
+            db_session, object_id, image_type, accepted_formats, width
+        )
+
+        return variant.to_object_info()
+
+    async def presign_image(  # pylint: disable=too-many-arguments
+        self,
+        db_session: AgnosticClientSession,
+        object_id: UUID,
+        image_type: ImageType,
+        accepted_formats: Tuple[str, ...] = (),
+        width: Optional[int] = None,
+    ) -> str:
+        """Return a presigned URL of the image served by stream_image.
+
+        Args:
+            db_session (AgnosticClientSession): The database session.
+            object_id (UUID): The ID of the object associated with the image.
+            image_type (ImageType): The type of the image.
+            accepted_formats (Tuple[str, ...]): Alternative file types of the
+                small variant the client accepts.
+            width (Optional[int]): The width to resize the image to.
+
+        Returns:
+            str: The URL to download the image from S3 directly, valid for
+                the redirect URL ttl.
+
+        Raises:
+            HTTPException: If the image is not found in the S3 bucket or the
+                width is not allowed.
+
+        """
+        variant, stored = await self._resolve(
+            db_session, object_id, image_type, accepted_formats, width
+        )
+        filepath, filename = self._location(
+            object_id, image_type, variant, stored
+        )
+
+        return await self.object_crud.presign(
+            filepath=filepath, filename=filename, expires=self.redirect_url_ttl
+        )
+
+    async def list_image_variants(
+        self,
+        db_session: AgnosticClientSession,
+        object_ids: List[UUID],
+        image_type: ImageType,
+    ) -> Dict[UUID, Dict[str, StoredImageVariant]]:
+        """Return the recorded variants of the images of several objects.
+
+        Args:
+            db_session (AgnosticClientSession): The database session.
+            object_ids (List[UUID]): The IDs of the objects.
+            image_type (ImageType): The type of the images.
+
+        Returns:
+            Dict[UUID, Dict[str, StoredImageVariant]]: The variants by their
+                name by object ID, objects without recorded variants are left
+                out.
+
+        """
+        keys = {
+            image_key(object_id, image_type): object_id
+            for object_id in object_ids
+        }
+
+        return {
+            keys[metadata.id]: metadata.variants
+            for metadata in await self.image_metadata_crud.read_many(
+                db_session=db_session, keys=list(keys)
+            )
+        }
+
+    @staticmethod
+    async def _cache_chunks(
+        image_cache: ImageCache,
+        key: str,
+        image: ObjectStream,
+        chunks: AsyncIterator[bytes],
+        generation: int,
+    ) -> AsyncIterator[bytes]:
+        """Pass through the chunks of a streamed image and cache the image once
+        it was streamed completely.
+
+        Args:
+            image_cache (ImageCache): The image cache.
+            key (str): The cache key of the image.
+            image (ObjectStream): The image streamed from S3.
+            chunks (AsyncIterator[bytes]): The chunks read from S3.
+            generation (int): The cache generation before reading the image.
+
+        """
+        cacheable = image.content_range is None and image_cache.fits(image.size)
+        buffer = []
+
+        async for chunk in chunks:
+            image_cache.metric.record_origin_bytes(len(chunk))
+
+            if cacheable:
+                buffer.append(chunk)
+
+            yield chunk
+
+        data = b"".join(buffer)
+
+        if cacheable and len(data) == image.size:
+            await image_cache.put(
+                key,
+                ObjectInfo(
+                    size=image.size,
+                    etag=image.etag,
+                    last_modified=image.last_modified,
+                    file_type=image.file_type,
+                ),
+                data,
+                generation,
+            )
+
+    def _invalidate_cache(self, object_id: UUID, image_type: ImageType) -> None:
+        """Remove a changed image in all negotiated formats from the image
+        cache."""
+        if self.image_cache is not None:
+            self.image_cache.invalidate(
+                image_key(object_id, image_type), prefix=True
+            )
+
+    @staticmethod
+    def _cache_key(
+        object_id: UUID,
+        image_type: ImageType,
+        accepted_formats: Tuple[str, ...],
+        width: Optional[int],
+    ) -> str:
+        """Return the cache key of an image negotiated for the accepted
+        formats or resized to a width."""
+        key = image_key(object_id, image_type)
+
+        if width is not None:
+            return f"{key}/{resized_variant(width)}"
+
+        if accepted_formats:
+            return f"{key}/{'+'.join(accepted_formats)}"
+
+        return key
+
+    async def _resolve(  # pylint: disable=too-many-arguments
+        self,
+        db_session: AgnosticClientSession,
+        object_id: UUID,
+        image_type: ImageType,
+        accepted_formats: Tuple[str, ...],
+        width: Optional[int],
+    ) -> Tuple[str, StoredImageVariant]:
+        """Resolve the name and metadata of the variant of an image to serve.
+
+        Raises:
+            HTTPException: If no variant of the image exists or the width is
+                not allowed.
+
+        """
+        if width is not None:
+            if width not in self.resize_widths:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Width must be one of "
+                    + ", ".join(str(allowed) for allowed in self.resize_widths),
+                )
+
+            if self.thumbnail_generator is not None:
+                return await self._resolve_resized(
+                    db_session,
+                    self.thumbnail_generator,
+                    object_id,
+                    image_type,
+                    width,
+                )
+
+        variant, stored = await self._resolve_variant(
+            db_session, object_id, image_type, accepted_formats
+        )
+
+        return variant.value, stored
+
+    async def _resolve_resized(  # pylint: disable=too-many-arguments
+        self,
+        db_session: AgnosticClientSession,
+        thumbnail_generator: ThumbnailGenerator,
+        object_id: UUID,
+        image_type: ImageType,
+        width: int,
+    ) -> Tuple[str, StoredImageVariant]:
+        """Resolve the variant of an image resized to a width.
+
+        A missing variant is created from the original. Concurrent requests
+        for the same missing variant wait for a single resize. The resize
+        outlives a cancelled request and records the variant in a session of
+        its own, as the session of the request that started it may end first.
+
+        Raises:
+            HTTPException: If the original of the image does not exist.
+
+        """
+        key = image_key(object_id, image_type)
+        name = resized_variant(width)
+
+        try:
+            metadata = await self.image_metadata_crud.read(
+                db_session=db_session, key=key
+            )
+        except ObjectNotFoundError:
+            metadata = ImageMetadata(_id=key)
+
+        if name in metadata.variants:
+            return name, metadata.variants[name]
+
+        resize_key = f"{key}/{name}"
+        task = self.resizing.get(resize_key)
+
+        if task is None:
+            original = metadata.variants.get(ImageVariant.ORIGINAL.value)
+            task = asyncio.create_task(
+                self._add_resized_variant(
+                    database_client=db_session.client,
+                    thumbnail_generator=thumbnail_generator,
+                    object_id=object_id,
+                    image_type=image_type,
+                    width=width,
+                    original=original,
+                )
+            )
+            self.resizing[resize_key] = task
+            task.add_done_callback(
+                lambda _: self.resizing.pop(resize_key, None)
+            )
+
+        return name, await asyncio.shield(task)
+
+    async def _add_resized_variant(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        database_client: AgnosticClient,
+        thumbnail_generator: ThumbnailGenerator,
+        object_id: UUID,
+        image_type: ImageType,
+        width: int,
+        original: Optional[StoredImageVariant],
+    ) -> StoredImageVariant:
+        """Resize the original of an image, store and record the result.
+
+        Args:
+            database_client (AgnosticClient): The database client to start
+                the session recording the variant with.
+            thumbnail_generator (ThumbnailGenerator): The thumbnail generator.
+            object_id (UUID): The ID of the object associated with the image.
+            image_type (ImageType): The type of the image.
+            width (int): The width to resize the image to.
+            original (Optional[StoredImageVariant]): The metadata of the
+                recorded original.
+
+        Returns:
+            StoredImageVariant: The metadata of the resized variant.
+
+        Raises:
+            HTTPException: If the original of the image does not exist.
+
+        """
+        name = resized_variant(width)
+        filepath, filename = self._location(
+            object_id, image_type, ImageVariant.ORIGINAL.value, original
+        )
+
+        try:
+            data, _ = await self.object_crud.read(
+                filepath=filepath, filename=filename
+            )
+        except ObjectNotFoundError as exception:
+            raise HTTPException(
+                status_code=404, detail=f"{image_type} Image not found"
+            ) from exception
+
+        thumbnail = await thumbnail_generator.generate(data, width=width)
+
+        await self.object_crud.create(
+            filepath=f"{image_type.value}/{name}",
+            filename=str(object_id),
+            file=io.BytesIO(thumbnail.data),
+            file_type=thumbnail.file_type,
+        )
+        info = await self.object_crud.stat(
+            filepath=f"{image_type.value}/{name}", filename=str(object_id)
+        )
+        variant = StoredImageVariant.from_object_info(info)
+
+        async with await database_client.start_session() as db_session:
+            await self.image_metadata_crud.update_variants(
+                db_session=db_session,
+                key=image_key(object_id, image_type),
+                variants={name: variant},
+                original_etag=original.etag if original else None,
+            )
+
+        thumbnail_generator.metric.record_job("resized")
+
+        logging.debug(
+            "Resized %s image with id %s to width %s",
+            image_type.value,
+            object_id,
+            width,
+        )
+
+        return variant
+
+    async def _resolve_variant(
+        self,
+        db_session: AgnosticClientSession,
+        object_id: UUID,
+        image_type: ImageType,
+        accepted_formats: Tuple[str, ...] = (),
+    ) -> Tuple[ImageVariant, StoredImageVariant]:
+        """Resolve the variant of an image to serve.
+
+        The recorded variants are used unless no small variant is known and
+        the last check of S3 for it is older than the recheck interval. In
+        that case S3 is checked for the small variant and its alternative
+        formats and the found variants are recorded. A small variant older
+        than the original is outdated and ignored. Of the small variant and
+        its alternative formats the client accepts, the smallest one is
+        served.
+
+        Args:
+            db_session (AgnosticClientSession): The database session.
+            object_id (UUID): The ID of the object associated with the image.
+            image_type (ImageType): The type of the image.
+            accepted_formats (Tuple[str, ...]): Alternative file types of the
+                small variant the client accepts.
+            width (Optional[int]): The width to resize the image to.
+
+        Returns:
+            Tuple[ImageVariant, StoredImageVariant]: The variant to serve and
+                its metadata.
+
+        Raises:
+            HTTPException: If no variant of the image exists.
+
+        """
+        key = image_key(object_id, image_type)
+
+        try:
+            metadata = await self.image_metadata_crud.read(
+                db_session=db_session, key=key
+            )
+        except ObjectNotFoundError:
+            metadata = ImageMetadata(_id=key)
+
+        small = metadata.variants.get(ImageVariant.SMALL.value)
+        original = metadata.variants.get(ImageVariant.ORIGINAL.value)
+
+        if small is not None:
+            return self._smallest_accepted(metadata.variants, accepted_formats)
+
+        now = datetime.now(timezone.utc)
+
+        if (
+            original is not None
+            and metadata.small_checked_at is not None
+            and (now - metadata.small_checked_at).total_seconds()
+            < self.small_recheck_interval
+        ):
+            return ImageVariant.ORIGINAL, original
+
+        found: Dict[str, StoredImageVariant] = {}
+
+        try:
+            small = await self._stat_variant(
+                object_id, image_type, ImageVariant.SMALL
             )
         except ObjectNotFoundError:
             logging.debug(
                 "No small image found for %s with id %s", image_type, object_id
             )
 
+        if original is None:
             try:
-                return self.object_crud.read(
-                    filepath=f"{image_type.value}/original",
-                    filename=str(object_id),
+                original = await self._stat_variant(
+                    object_id, image_type, ImageVariant.ORIGINAL
                 )
-
-            except ObjectNotFoundError as exception:
+                found[ImageVariant.ORIGINAL.value] = original
+            except ObjectNotFoundError:
                 logging.debug(
                     "No original image found for %s with id %s",
                     image_type,
                     object_id,
                 )
-                raise HTTPException(
-                    status_code=404, detail=f"{image_type} Image not found"
-                ) from exception
 
-    def delete_image(self, object_id: UUID, image_type: ImageType) -> None:
-        """Delete all images from the S3 bucket associated with an object id.
+        resolved: Tuple[ImageVariant, StoredImageVariant]
+
+        if small is not None and not self._is_outdated(small, original):
+            found[ImageVariant.SMALL.value] = small
+            found.update(
+                await self._stat_small_formats(object_id, image_type, original)
+            )
+            resolved = self._smallest_accepted(found, accepted_formats)
+        elif original is not None:
+            resolved = (ImageVariant.ORIGINAL, original)
+        else:
+            raise HTTPException(
+                status_code=404, detail=f"{image_type} Image not found"
+            )
+
+        await self.image_metadata_crud.update_variants(
+            db_session=db_session,
+            key=key,
+            variants=found,
+            small_checked_at=now,
+        )
+
+        return resolved
+
+    @staticmethod
+    def _smallest_accepted(
+        variants: Dict[str, StoredImageVariant],
+        accepted_formats: Tuple[str, ...],
+    ) -> Tuple[ImageVariant, StoredImageVariant]:
+        """Return the smallest of the small variant and its alternative
+        formats the client accepts."""
+        candidates = [
+            (ImageVariant.SMALL, variants[ImageVariant.SMALL.value])
+        ] + [
+            (variant, variants[variant.value])
+            for file_type, variant in SMALL_FORMAT_VARIANTS.items()
+            if file_type in accepted_formats and variant.value in variants
+        ]
 
-        Delete both the small and original versions of the image.
+        return min(candidates, key=lambda candidate: candidate[1].size)
+
+    async def _stat_small_formats(
+        self,
+        object_id: UUID,
+        image_type: ImageType,
+        original: Optional[StoredImageVariant],
+    ) -> Dict[str, StoredImageVariant]:
+        """Read the metadata of the alternative formats of the small variant
+        of an image from S3, outdated ones are ignored."""
+        found: Dict[str, StoredImageVariant] = {}
+
+        for variant in SMALL_FORMAT_VARIANTS.values():
+            try:
+                stored = await self._stat_variant(
+                    object_id, image_type, variant
+                )
+            except ObjectNotFoundError:
+                continue
+
+            if not self._is_outdated(stored, original):
+                found[variant.value] = stored
+
+        return found
+
+    async def _stat_variant(
+        self, object_id: UUID, image_type: ImageType, variant: ImageVariant
+    ) -> StoredImageVariant:
+        """Read the metadata of a variant of an image from S3.
+
+        Raises:
+            ObjectNotFoundError: If the variant does not exist.
+
+        """
+        info = await self.object_crud.stat(
+            filepath=f"{image_type.value}/{variant.value}",
+            filename=str(object_id),
+        )
+
+        return StoredImageVariant.from_object_info(info)
+
+    @staticmethod
+    def _is_outdated(
+        small: StoredImageVariant, original: Optional[StoredImageVariant]
+    ) -> bool:
+        """Return whether a small variant was created from a replaced
+        original."""
+        return (
+            original is not None
+            and small.last_modified is not None
+            and original.last_modified is not None
+            and small.last_modified < original.last_modified
+        )
+
+    async def _read_variant(
+        self,
+        read: Callable[..., Awaitable[T]],
+        db_session: AgnosticClientSession,
+        object_id: UUID,
+        image_type: ImageType,
+        accepted_formats: Tuple[str, ...] = (),
+        width: Optional[int] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Read the resolved variant of an image.
+
+        The record of a variant which is gone from S3 is removed and the
+        image resolved once more, so a missing small or resized variant falls
+        back to the original. The record of a blob original is kept, as it is
+        the only reference to its blob.
 
         Args:
+            read (Callable[..., Awaitable[T]]): The ObjectCRUD method reading
+                the image.
+            db_session (AgnosticClientSession): The database session.
             object_id (UUID): The ID of the object associated with the image.
+            image_type (ImageType): The type of the image.
+            accepted_formats (Tuple[str, ...]): Alternative file types of the
+                small variant the client accepts.
+            width (Optional[int]): The width to resize the image to.
+            **kwargs (Any): Further arguments passed to the read method.
+
+        Returns:
+            T: The result of the read method.
+
+        Raises:
+            HTTPException: If no variant of the image is found or the width
+                is not allowed.
+
         """
-        self.object_crud.delete(
-            filepath=f"{image_type.value}/small", filename=str(object_id)
+        for _ in range(READ_VARIANT_ATTEMPTS):
+            variant, stored = await self._resolve(
+                db_session, object_id, image_type, accepted_formats, width
+            )
+            filepath, filename = self._location(
+                object_id, image_type, variant, stored
+            )
+
+            try:
+                return await read(
+                    filepath=filepath, filename=filename, **kwargs
+                )
+            except ObjectNotFoundError:
+                if stored.blob:
+                    logging.warning(
+                        "Image blob %s of %s with id %s not found",
+                        stored.sha256,
+                        image_type,
+                        object_id,
+                    )
+                    break
+
+                logging.debug(
+                    "Recorded %s image of %s with id %s not found",
+                    variant,
+                    image_type,
+                    object_id,
+                )
+
+                await self.image_metadata_crud.remove_variant(
+                    db_session=db_session,
+                    key=image_key(object_id, image_type),
+                    variant=variant,
+                )
+
+                if variant == ImageVariant.ORIGINAL.value:
+                    break
+
+        raise HTTPException(
+            status_code=404, detail=f"{image_type} Image not found"
         )
-        self.object_crud.delete(
-            filepath=f"{image_type.value}/original", filename=str(object_id)
+
+    async def delete_image(
+        self,
+        db_session: AgnosticClientSession,
+        object_id: UUID,
+        image_type: ImageType,
+    ) -> None:
+        """Delete all images from the S3 bucket associated with an object id.
+
+        Delete all variants of the image and their record. A blob storing the
+        original is only deleted if no other image references it.
+
+        Args:
+            db_session (AgnosticClientSession): The database session.
+            object_id (UUID): The ID of the object associated with the image.
+            image_type (ImageType): The type of the image.
+        """
+        key = image_key(object_id, image_type)
+        blob = (
+            await self._read_blob_original(db_session, key)
+            if self.image_blob_crud is not None
+            else None
         )
 
+        for variant in [variant.value for variant in ImageVariant] + [
+            resized_variant(width) for width in self.resize_widths
+        ]:
+            await self.object_crud.delete(
+                filepath=f"{image_type.value}/{variant}",
+                filename=str(object_id),
+            )
+        await self.image_metadata_crud.delete(db_session=db_session, key=key)
+
+        if blob is not None and blob.sha256 is not None:
+            await self._release_blob(db_session, blob.sha256, key)
+
+        self._invalidate_cache(object_id, image_type)
+
         logging.debug(
             "Deleted all versions for %s image with id %s",
             image_type.value,
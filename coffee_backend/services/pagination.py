@@ -0,0 +1,30 @@
+from typing import Dict, Optional
+from uuid import UUID
+
+
+def id_range(
+    first_id: Optional[UUID] = None, after_id: Optional[UUID] = None
+) -> Dict[str, UUID]:
+    """Create the condition on the id of the items of a page.
+
+    Items are listed by descending id. As ids are UUID7, this is the order in
+    which they were created.
+
+    Args:
+        first_id (Optional[UUID]): The id of the first item of the list, newer
+            items are not listed.
+        after_id (Optional[UUID]): The id of the last item of the previous
+            page.
+
+    Returns:
+        Dict[str, UUID]: The condition on the id.
+    """
+    condition: Dict[str, UUID] = {}
+
+    if first_id:
+        condition["$lte"] = first_id
+
+    if after_id:
+        condition["$lt"] = after_id
+
+    return condition
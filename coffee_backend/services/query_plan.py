@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class Lookup:
+    """Describes the join of one document of another collection.
+
+    Args:
+        from_collection (str): The collection to join.
+        local_field (str): The field of the listed documents.
+        foreign_field (str): The field of the joined documents, which should
+            be indexed.
+        as_field (str): The field to store the joined documents in.
+        fields (Optional[Sequence[str]]): The fields of the joined documents
+            to read, all if not set.
+    """
+
+    from_collection: str
+    local_field: str
+    foreign_field: str
+    as_field: str
+    fields: Optional[Sequence[str]] = None
+
+
+class QueryPlan:
+    """Template of an aggregation pipeline listing documents page by page.
+
+    The stages are always ordered match, sort, paginate, lookup and project.
+    Conditions are matched before sorting, so both can be served by one
+    index, and only the documents of the page are joined and projected. The
+    stages following the pagination do not depend on the request and are
+    built once with the plan.
+
+    Args:
+        sort (Mapping[str, int]): The fields to sort by and their direction.
+        lookups (Sequence[Lookup]): The joins of the documents of the page.
+        add_fields (Optional[Mapping[str, Any]]): Fields derived from the
+            joined documents.
+        project (Optional[Sequence[str]]): The fields to return, all if not
+            set.
+    """
+
+    def __init__(
+        self,
+        sort: Mapping[str, int],
+        lookups: Sequence[Lookup] = (),
+        add_fields: Optional[Mapping[str, Any]] = None,
+        project: Optional[Sequence[str]] = None,
+    ) -> None:
+        self.sort_stage: Dict[str, Any] = {"$sort": dict(sort)}
+
+        tail: List[Dict[str, Any]] = [
+            self._lookup_stage(lookup) for lookup in lookups
+        ]
+
+        if add_fields:
+            tail.append({"$addFields": dict(add_fields)})
+
+        if project:
+            tail.append({"$project": {field: 1 for field in project}})
+
+        self.tail: Tuple[Dict[str, Any], ...] = tuple(tail)
+
+    @staticmethod
+    def _lookup_stage(lookup: Lookup) -> Dict[str, Any]:
+        stage: Dict[str, Any] = {
+            "from": lookup.from_collection,
+            "localField": lookup.local_field,
+            "foreignField": lookup.foreign_field,
+            "as": lookup.as_field,
+        }
+
+        if lookup.fields:
+            stage["pipeline"] = [
+                {"$project": {field: 1 for field in lookup.fields}}
+            ]
+
+        return {"$lookup": stage}
+
+    def build(
+        self, match: Dict[str, Any], limit: int, skip: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Build the pipeline of one page.
+
+        The stages shared by all pages must not be modified.
+
+        Args:
+            match (Dict[str, Any]): The conditions of the listed documents.
+            limit (int): The maximum number of documents of the page.
+            skip (int): The number of matching documents to skip.
+
+        Returns:
+            List[Dict[str, Any]]: The aggregation pipeline.
+        """
+        pipeline: List[Dict[str, Any]] = []
+
+        if match:
+            pipeline.append({"$match": match})
+
+        pipeline.append(self.sort_stage)
+
+        if skip:
+            pipeline.append({"$skip": skip})
+
+        pipeline.append({"$limit": limit})
+        pipeline.extend(self.tail)
+
+        return pipeline
@@ -0,0 +1,256 @@
+import asyncio
+import functools
+import importlib.util
+import io
+import logging
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, Coroutine, Dict, Iterable, Optional, Set, Tuple
+
+from coffee_backend.metrics import ThumbnailMetric
+
+THUMBNAIL_FORMATS = {"PNG": "png", "WEBP": "webp"}
+
+
+@dataclass
+class Thumbnail:
+    """Describes a thumbnail created from an uploaded image.
+
+    Alternatives hold the thumbnail encoded in further formats by file type.
+    The durations of the stages are measured in the worker process and
+    recorded by the caller, as metrics of worker processes are not exported.
+    """
+
+    data: bytes
+    file_type: str
+    alternatives: Dict[str, bytes] = field(default_factory=dict)
+    stage_durations: Dict[str, float] = field(default_factory=dict)
+
+
+def thumbnails_available() -> bool:
+    """Return whether the optional Pillow dependency is installed."""
+    return importlib.util.find_spec("PIL") is not None
+
+
+def supported_formats(formats: Iterable[str]) -> Tuple[str, ...]:
+    """Return the formats Pillow is able to encode.
+
+    Args:
+        formats (Iterable[str]): The file types of the wanted formats.
+
+    Returns:
+        Tuple[str, ...]: The supported file types.
+    """
+    # pylint: disable=import-outside-toplevel
+    from PIL import features
+
+    return tuple(
+        file_type for file_type in formats if features.check(file_type)
+    )
+
+
+def create_thumbnail(  # pylint: disable=too-many-locals
+    data: bytes,
+    max_size: int,
+    quality: int,
+    submitted_at: float,
+    formats: Tuple[str, ...] = (),
+    width: Optional[int] = None,
+) -> Thumbnail:
+    """Decode, downscale and re-encode an image in a worker process.
+
+    PNG and WebP images keep their format to preserve transparency, all other
+    formats are encoded as JPEG. JPEG images are decoded at a reduced scale
+    where possible, which is considerably faster than decoding them in full.
+    Images are never upscaled.
+
+    Args:
+        data (bytes): The content of the uploaded image.
+        max_size (int): The maximal width and height of the thumbnail.
+        quality (int): The quality of lossy encoded thumbnails.
+        submitted_at (float): Wall clock time the job was submitted.
+        formats (Tuple[str, ...]): File types of alternative encodings,
+            e.g. webp and avif.
+        width (Optional[int]): The width to resize the image to regardless
+            of its height. The image is bounded by max_size if not set.
+
+    Returns:
+        Thumbnail: The encoded thumbnail with its stage durations.
+
+    Raises:
+        PIL.UnidentifiedImageError: If the data is no supported image.
+
+    """
+    # pylint: disable=import-outside-toplevel
+    from PIL import Image, ImageOps
+
+    stage_durations = {"queue": max(time.time() - submitted_at, 0)}
+
+    start = time.perf_counter()
+    bound = max_size if width is None else width
+
+    with Image.open(io.BytesIO(data)) as image:
+        file_type = THUMBNAIL_FORMATS.get(image.format or "", "jpeg")
+        image.draft("RGB", (bound, bound))
+        thumbnail = ImageOps.exif_transpose(image)
+        thumbnail.load()
+
+    stage_durations["decode"] = time.perf_counter() - start
+    start = time.perf_counter()
+
+    thumbnail.thumbnail(
+        (bound, bound if width is None else thumbnail.height),
+        Image.Resampling.LANCZOS,
+    )
+
+    stage_durations["resize"] = time.perf_counter() - start
+    start = time.perf_counter()
+
+    output = io.BytesIO()
+    (
+        thumbnail.convert("RGB")
+        if file_type == "jpeg" and thumbnail.mode != "RGB"
+        else thumbnail
+    ).save(output, format=file_type, quality=quality, optimize=True)
+
+    stage_durations["encode"] = time.perf_counter() - start
+
+    alternatives = {}
+    source = (
+        thumbnail
+        if thumbnail.mode in ("RGB", "RGBA")
+        else thumbnail.convert("RGBA")
+    )
+
+    for alternative_type in formats:
+        if alternative_type == file_type:
+            continue
+
+        start = time.perf_counter()
+
+        alternative = io.BytesIO()
+        source.save(alternative, format=alternative_type, quality=quality)
+        alternatives[alternative_type] = alternative.getvalue()
+
+        stage_durations[f"encode_{alternative_type}"] = (
+            time.perf_counter() - start
+        )
+
+    return Thumbnail(
+        data=output.getvalue(),
+        file_type=file_type,
+        alternatives=alternatives,
+        stage_durations=stage_durations,
+    )
+
+
+class ThumbnailGenerator:
+    """Creates the small variants of uploaded images in a process pool.
+
+    Decoding and encoding images is CPU bound, so it runs in worker processes
+    instead of blocking the event loop. Jobs run in the background after the
+    upload was answered. The number of pending jobs is bounded, further jobs
+    are rejected and their images are served as original until a small
+    variant is created by other means. Thumbnails can additionally be encoded
+    in modern formats like WebP and AVIF, which are considerably smaller.
+    Images requested in a certain width are resized in the same pool.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        metric: ThumbnailMetric,
+        max_size: int = 400,
+        quality: int = 80,
+        max_pending: int = 32,
+        formats: Tuple[str, ...] = (),
+    ) -> None:
+        """Initializes a ThumbnailGenerator instance.
+
+        Args:
+            executor (Executor): The process pool running the jobs.
+            metric (ThumbnailMetric): The metric recording the jobs.
+            max_size (int): The maximal width and height of thumbnails.
+            quality (int): The quality of lossy encoded thumbnails.
+            max_pending (int): The maximal number of pending jobs.
+            formats (Tuple[str, ...]): File types the thumbnails are
+                additionally encoded in, e.g. webp and avif.
+
+        """
+        self.executor = executor
+        self.metric = metric
+        self.max_size = max_size
+        self.quality = quality
+        self.max_pending = max_pending
+        self.formats = formats
+        self.tasks: Set[asyncio.Task] = set()
+
+    def submit(self, job: Coroutine[Any, Any, None]) -> bool:
+        """Run a thumbnail job in the background if the queue is not full.
+
+        Args:
+            job (Coroutine[Any, Any, None]): The job creating and storing
+                a thumbnail.
+
+        Returns:
+            bool: Whether the job was accepted.
+
+        """
+        if len(self.tasks) >= self.max_pending:
+            job.close()
+            self.metric.record_job("rejected")
+            logging.warning(
+                "Rejecting thumbnail job, %s jobs pending", len(self.tasks)
+            )
+            return False
+
+        task = asyncio.create_task(job)
+        self.tasks.add(task)
+        task.add_done_callback(self._remove_task)
+        self.metric.set_queue_depth(len(self.tasks))
+
+        return True
+
+    async def generate(
+        self, data: bytes, width: Optional[int] = None
+    ) -> Thumbnail:
+        """Create a thumbnail in the process pool and record its stages.
+
+        Args:
+            data (bytes): The content of the uploaded image.
+            width (Optional[int]): The width to resize the image to. Resized
+                images are not encoded in alternative formats.
+
+        Returns:
+            Thumbnail: The encoded thumbnail.
+
+        """
+        loop = asyncio.get_running_loop()
+
+        thumbnail = await loop.run_in_executor(
+            self.executor,
+            functools.partial(
+                create_thumbnail,
+                data,
+                self.max_size,
+                self.quality,
+                time.time(),
+                self.formats if width is None else (),
+                width,
+            ),
+        )
+
+        for stage, seconds in thumbnail.stage_durations.items():
+            self.metric.observe_stage(stage, seconds)
+
+        return thumbnail
+
+    async def stop(self) -> None:
+        """Wait for all pending thumbnail jobs to finish."""
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    def _remove_task(self, task: asyncio.Task) -> None:
+        """Forget a finished job."""
+        self.tasks.discard(task)
+        self.metric.set_queue_depth(len(self.tasks))
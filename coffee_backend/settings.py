@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -27,6 +29,15 @@ class Settings(BaseSettings):
     mongodb_database: str = "coffee_backend"
     mongodb_coffee_collection: str = "coffee"
     mongodb_drink_collection: str = "drink"
+    mongodb_image_metadata_collection: str = "image_metadata"
+    mongodb_image_blob_collection: str = "image_blob"
+
+    list_max_page_size: int = 100
+
+    search_query_max_length: int = 64
+    search_rate_per_second: float = 2
+    search_rate_burst: int = 10
+    search_rate_max_users: int = 10000
 
     mongodb_host: str = "mongo"
     mongodb_port: int = 27017
@@ -41,6 +52,36 @@ class Settings(BaseSettings):
 
     minio_original_images_prefix: str = "original"
     minio_coffee_images_bucket: str = "coffee-images"
+    minio_thread_pool_size: int = 16
+    minio_upload_thread_pool_size: int = 8
+    minio_public_endpoint: str = ""
+    minio_public_secure: bool = True
+    minio_region: str = "us-east-1"
+
+    image_cache_directory: str = "/tmp/coffee-backend-image-cache"
+    image_cache_memory_max_bytes: int = 32 * 1024 * 1024
+    image_cache_disk_max_bytes: int = 512 * 1024 * 1024
+    image_cache_memory_max_item_bytes: int = 256 * 1024
+    image_cache_disk_max_item_bytes: int = 8 * 1024 * 1024
+    image_cache_ttl_seconds: int = 60
+    image_small_variant_recheck_seconds: int = 60
+
+    image_thumbnails_enabled: bool = False
+    image_thumbnail_workers: int = 0
+    image_thumbnail_max_pending: int = 32
+    image_thumbnail_max_size: int = 400
+    image_thumbnail_quality: int = 80
+    image_thumbnail_formats: list[str] = ["avif", "webp"]
+    image_resize_widths: list[int] = [160, 320, 640, 1280]
+
+    image_url_signing_key: str = ""
+    image_url_ttl_seconds: int = 3600
+    image_redirect_url_ttl_seconds: int = 0
+    image_upload_url_ttl_seconds: int = 600
+    image_upload_chunk_timeout_seconds: float = 30
+    image_upload_max_bytes: int = 10 * 1024 * 1024
+    image_upload_formats: list[str] = ["jpeg", "png", "gif", "webp", "avif"]
+    image_deduplication_enabled: bool = False
 
     keykloak_host: str = "keycloak:8080"
     keykloak_protocol: str = "http"
@@ -49,5 +90,23 @@ class Settings(BaseSettings):
     keykloak_realm: str = "Coffee-App"
     keykloak_client_id: str = "react-app"
 
+    auth_mode: Literal["online", "offline", "hybrid"] = "online"
+    auth_online_latency_budget_seconds: float = 0.5
+    auth_breaker_failure_threshold: int = 5
+    auth_breaker_reset_timeout_seconds: float = 30
+
+    jwks_refresh_interval_seconds: float = 300
+    jwks_min_refetch_interval_seconds: float = 30
+
+    token_cache_max_size: int = 1024
+    token_cache_revalidate_interval_seconds: float = 60
+
+    http_pool_limit: int = 100
+    http_pool_limit_per_host: int = 20
+    http_keepalive_timeout_seconds: float = 30
+    http_dns_cache_ttl_seconds: int = 300
+    http_connect_timeout_seconds: float = 2
+    http_read_timeout_seconds: float = 5
+
 
 settings = Settings()
@@ -0,0 +1,90 @@
+from unittest.mock import MagicMock, patch
+
+from coffee_backend.api.circuit_breaker import CircuitBreaker, CircuitState
+
+
+@patch("coffee_backend.api.circuit_breaker.time")
+def test_circuit_breaker_opens_after_failure_threshold(
+    time_mock: MagicMock,
+) -> None:
+    """Test that the breaker opens after consecutive failures, allows a single
+    trial after the reset timeout and closes on success."""
+
+    time_mock.monotonic.return_value = 100
+    metric_mock = MagicMock()
+
+    breaker = CircuitBreaker(
+        metric=metric_mock, failure_threshold=2, reset_timeout=30
+    )
+
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    time_mock.monotonic.return_value = 130
+
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+    metric_mock.set_breaker_state.assert_called_with(0)
+
+
+@patch("coffee_backend.api.circuit_breaker.time")
+def test_circuit_breaker_reopens_on_failed_trial(time_mock: MagicMock) -> None:
+    """Test that a failing trial request reopens the breaker."""
+
+    time_mock.monotonic.return_value = 100
+    metric_mock = MagicMock()
+
+    breaker = CircuitBreaker(
+        metric=metric_mock, failure_threshold=1, reset_timeout=30
+    )
+
+    breaker.record_failure()
+
+    time_mock.monotonic.return_value = 131
+
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    metric_mock.set_breaker_state.assert_called_with(2)
+
+
+@patch("coffee_backend.api.circuit_breaker.time")
+def test_circuit_breaker_allows_new_trial_after_release(
+    time_mock: MagicMock,
+) -> None:
+    """Test that a released trial keeps the breaker half open and allows the
+    next request as trial."""
+
+    time_mock.monotonic.return_value = 100
+
+    breaker = CircuitBreaker(
+        metric=MagicMock(), failure_threshold=1, reset_timeout=30
+    )
+
+    breaker.record_failure()
+
+    time_mock.monotonic.return_value = 131
+
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.release_trial()
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
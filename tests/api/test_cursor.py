@@ -0,0 +1,25 @@
+import pytest
+from fastapi import HTTPException
+from uuid_extensions.uuid7 import uuid7
+
+from coffee_backend.api.cursor import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip() -> None:
+    """Test that a cursor decodes to the id it was created from."""
+    last_id = uuid7()
+
+    cursor = encode_cursor(last_id)
+
+    assert len(cursor) == 22
+    assert decode_cursor(cursor) == last_id
+
+
+@pytest.mark.parametrize("cursor", ["abc", "not a cursor!", "AAAA"])
+def test_cursor_invalid(cursor: str) -> None:
+    """Test that invalid cursors are rejected."""
+    with pytest.raises(HTTPException) as exception:
+        decode_cursor(cursor)
+
+    assert exception.value.status_code == 400
+    assert exception.value.detail == "Invalid cursor"
@@ -0,0 +1,340 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID
+
+import pytest
+from fastapi.responses import FileResponse
+from starlette.types import Message
+
+from coffee_backend.api.image_response import (
+    ImageRequestHeaders,
+    accepted_image_formats,
+    image_response,
+    is_not_modified,
+)
+from coffee_backend.s3.types.byte_range import ByteRange
+from coffee_backend.s3.types.object_info import ObjectInfo
+from coffee_backend.schemas import ImageType
+from coffee_backend.services.image_cache import CachedImage
+from tests.conftest import create_object_stream
+
+OBJECT_ID = UUID("123e4567-e19b-12d3-a456-426655440000")
+
+IMAGE_INFO = ObjectInfo(
+    size=10,
+    etag="d41d8cd98f00b204e9800998ecf8427e",
+    last_modified=datetime(2024, 5, 1, 12, 0, 0, 500, tzinfo=timezone.utc),
+    file_type="jpeg",
+)
+
+
+def create_image_service_mock() -> AsyncMock:
+    """Create an image service mock streaming instead of redirecting."""
+    image_service_mock = AsyncMock()
+    image_service_mock.redirect_url_ttl = 0
+    return image_service_mock
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, ()),
+        ("*/*", ()),
+        ("image/*", ()),
+        ("image/webp,*/*", ("webp",)),
+        (
+            "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
+            ("webp", "avif"),
+        ),
+        ("IMAGE/WEBP;q=0.5, image/avif;q=0", ("webp",)),
+        ("image/avif;q=invalid", ()),
+    ],
+)
+def test_accepted_image_formats(
+    accept: str | None, expected: tuple[str, ...]
+) -> None:
+    """Test that only explicitly accepted alternative formats are negotiated."""
+
+    assert accepted_image_formats(accept) == expected
+
+
+@pytest.mark.parametrize(
+    "if_none_match, if_modified_since, expected",
+    [
+        ('"d41d8cd98f00b204e9800998ecf8427e"', None, True),
+        ('W/"d41d8cd98f00b204e9800998ecf8427e"', None, True),
+        ('"other", "d41d8cd98f00b204e9800998ecf8427e"', None, True),
+        ("*", None, True),
+        ('"other"', None, False),
+        ('"other"', "Wed, 01 May 2024 12:00:00 GMT", False),
+        (None, "Wed, 01 May 2024 12:00:00 GMT", True),
+        (None, "Wed, 01 May 2024 11:59:59 GMT", False),
+        (None, "not a date", False),
+        (None, None, False),
+    ],
+)
+def test_is_not_modified(
+    if_none_match: str | None, if_modified_since: str | None, expected: bool
+) -> None:
+    """Test evaluating If-None-Match before If-Modified-Since."""
+
+    assert (
+        is_not_modified(
+            IMAGE_INFO,
+            if_none_match=if_none_match,
+            if_modified_since=if_modified_since,
+        )
+        is expected
+    )
+
+
+@pytest.mark.asyncio
+async def test_image_response_not_modified() -> None:
+    """Test that a current client copy is answered with 304 without reading
+    the image."""
+
+    image_service_mock = create_image_service_mock()
+    image_service_mock.get_cached_image = MagicMock(return_value=None)
+    image_service_mock.stat_image.return_value = IMAGE_INFO
+
+    response = await image_response(
+        image_service_mock,
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        request_headers=ImageRequestHeaders(
+            if_none_match='"d41d8cd98f00b204e9800998ecf8427e"'
+        ),
+    )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"d41d8cd98f00b204e9800998ecf8427e"'
+    assert response.headers["Last-Modified"] == "Wed, 01 May 2024 12:00:00 GMT"
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert response.headers["Vary"] == "Accept"
+
+    image_service_mock.stream_image.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_image_response_streams_modified_image() -> None:
+    """Test that unconditional requests stream the image without a stat and
+    with validator headers."""
+
+    image_service_mock = create_image_service_mock()
+    image_service_mock.get_cached_image = MagicMock(return_value=None)
+    image_service_mock.stream_image.return_value = create_object_stream(
+        b"0123456789", "jpeg"
+    )
+    db_session = MagicMock()
+
+    response = await image_response(
+        image_service_mock,
+        db_session=db_session,
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        request_headers=ImageRequestHeaders(
+            byte_range=ByteRange(start=0, end=None)
+        ),
+    )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"etag"'
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert response.headers["Vary"] == "Accept"
+
+    image_service_mock.stat_image.assert_not_called()
+    image_service_mock.get_cached_image.assert_not_called()
+    image_service_mock.stream_image.assert_called_once_with(
+        db_session=db_session,
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        byte_range=ByteRange(start=0, end=None),
+        if_range=None,
+        accepted_formats=(),
+        width=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_image_response_memory_cache_hit() -> None:
+    """Test that images of the memory tier are answered without S3 and that
+    conditional requests are evaluated against the cached image."""
+
+    image_service_mock = create_image_service_mock()
+    image_service_mock.get_cached_image = MagicMock(
+        return_value=CachedImage(info=IMAGE_INFO, cached_at=0, data=b"image")
+    )
+
+    response = await image_response(
+        image_service_mock,
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        request_headers=ImageRequestHeaders(),
+    )
+
+    assert response.status_code == 200
+    assert response.body == b"image"
+    assert response.headers["ETag"] == '"d41d8cd98f00b204e9800998ecf8427e"'
+
+    response = await image_response(
+        image_service_mock,
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        request_headers=ImageRequestHeaders(
+            if_modified_since="Wed, 01 May 2024 12:00:00 GMT"
+        ),
+    )
+
+    assert response.status_code == 304
+
+    image_service_mock.stat_image.assert_not_called()
+    image_service_mock.stream_image.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_image_response_negotiates_accepted_formats() -> None:
+    """Test that the accepted formats are passed on to the image service and
+    that the response varies on the Accept header."""
+
+    image_service_mock = create_image_service_mock()
+    image_service_mock.get_cached_image = MagicMock(
+        return_value=CachedImage(info=IMAGE_INFO, cached_at=0, data=b"image")
+    )
+
+    response = await image_response(
+        image_service_mock,
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        request_headers=ImageRequestHeaders(accepted_formats=("webp",)),
+    )
+
+    assert response.status_code == 200
+    assert response.headers["Vary"] == "Accept"
+
+    image_service_mock.get_cached_image.assert_called_once_with(
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        accepted_formats=("webp",),
+        width=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_image_response_disk_cache_hit(tmp_path: Path) -> None:
+    """Test that images of the disk tier are sent as file and released once
+    sent."""
+
+    path = tmp_path / "image"
+    path.write_bytes(b"0123456789")
+    release = MagicMock()
+
+    image_service_mock = create_image_service_mock()
+    image_service_mock.get_cached_image = MagicMock(
+        return_value=CachedImage(
+            info=IMAGE_INFO, cached_at=0, path=str(path), release=release
+        )
+    )
+
+    response = await image_response(
+        image_service_mock,
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        request_headers=ImageRequestHeaders(),
+    )
+
+    assert isinstance(response, FileResponse)
+    assert response.headers["ETag"] == '"d41d8cd98f00b204e9800998ecf8427e"'
+    assert response.headers["Content-Disposition"] == (
+        f"attachment; filename={OBJECT_ID}.jpeg"
+    )
+    release.assert_not_called()
+
+    messages: list[Message] = []
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await response({"type": "http", "method": "GET"}, AsyncMock(), send)
+
+    assert b"".join(m.get("body", b"") for m in messages) == b"0123456789"
+    release.assert_called_once()
+
+    image_service_mock.stream_image.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_image_response_disk_cache_not_modified(tmp_path: Path) -> None:
+    """Test that a cached image is released if the client already has the
+    image."""
+
+    path = tmp_path / "image"
+    path.write_bytes(b"image")
+    release = MagicMock()
+
+    image_service_mock = create_image_service_mock()
+    image_service_mock.get_cached_image = MagicMock(
+        return_value=CachedImage(
+            info=IMAGE_INFO, cached_at=0, path=str(path), release=release
+        )
+    )
+
+    response = await image_response(
+        image_service_mock,
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        request_headers=ImageRequestHeaders(
+            if_modified_since="Wed, 01 May 2024 12:00:00 GMT"
+        ),
+    )
+
+    assert response.status_code == 304
+    release.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_image_response_redirects_to_presigned_url() -> None:
+    """Test that images are answered with a temporary redirect to a
+    presigned URL without reading them if redirects are enabled."""
+
+    image_service_mock = AsyncMock()
+    image_service_mock.redirect_url_ttl = 300
+    image_service_mock.presign_image.return_value = (
+        "http://minio/coffee-images/coffee_bean/small/image?X-Amz-Signature=1"
+    )
+    db_session = MagicMock()
+
+    response = await image_response(
+        image_service_mock,
+        db_session=db_session,
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        request_headers=ImageRequestHeaders(
+            byte_range=ByteRange(start=0, end=None),
+            accepted_formats=("webp",),
+        ),
+        cache_control="public, max-age=3600, immutable",
+        width=320,
+    )
+
+    assert response.status_code == 307
+    assert response.headers["Location"] == (
+        "http://minio/coffee-images/coffee_bean/small/image?X-Amz-Signature=1"
+    )
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert response.headers["Vary"] == "Accept"
+
+    image_service_mock.presign_image.assert_called_once_with(
+        db_session=db_session,
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        accepted_formats=("webp",),
+        width=320,
+    )
+    image_service_mock.stream_image.assert_not_called()
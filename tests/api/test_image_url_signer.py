@@ -0,0 +1,114 @@
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlsplit
+from uuid import UUID
+
+from coffee_backend.api.image_url_signer import ImageUrlSigner, image_version
+from coffee_backend.schemas import ImageType
+from coffee_backend.schemas.image_metadata import StoredImageVariant
+
+OBJECT_ID = UUID("123e4567-e19b-12d3-a456-426655440000")
+
+
+def split_signed_url(url: str) -> tuple[str, int, str]:
+    """Split a signed url into path, expiry and signature."""
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    return parts.path, int(query["expires"][0]), query["signature"][0]
+
+
+def test_image_url_signer_sign_and_verify() -> None:
+    """Test that a signed url verifies and is stable within a ttl window."""
+
+    image_url_signer = ImageUrlSigner(secret="secret", ttl=3600)
+
+    url = image_url_signer.sign(ImageType.COFFEE_BEAN, OBJECT_ID, now=7200)
+    path, expires, signature = split_signed_url(url)
+
+    assert path == f"/images/coffee_bean/{OBJECT_ID}"
+    assert expires == 14400
+    assert url == image_url_signer.sign(
+        ImageType.COFFEE_BEAN, OBJECT_ID, now=10799
+    )
+
+    with patch("coffee_backend.api.image_url_signer.time") as time_mock:
+        time_mock.time.return_value = 10000
+
+        assert image_url_signer.verify(
+            ImageType.COFFEE_BEAN, OBJECT_ID, expires, signature
+        )
+
+
+@patch("coffee_backend.api.image_url_signer.time")
+def test_image_url_signer_rejects_tampered_urls(time_mock: MagicMock) -> None:
+    """Test that signatures are bound to image, object, expiry and key."""
+
+    time_mock.time.return_value = 10000
+
+    image_url_signer = ImageUrlSigner(secret="secret", ttl=3600)
+    url = image_url_signer.sign(ImageType.COFFEE_BEAN, OBJECT_ID)
+    _, expires, signature = split_signed_url(url)
+
+    assert not image_url_signer.verify(
+        ImageType.COFFEE_DRINK, OBJECT_ID, expires, signature
+    )
+    assert not image_url_signer.verify(
+        ImageType.COFFEE_BEAN,
+        UUID("123e4567-e59b-12d3-a456-426655440000"),
+        expires,
+        signature,
+    )
+    assert not image_url_signer.verify(
+        ImageType.COFFEE_BEAN, OBJECT_ID, expires + 3600, signature
+    )
+    assert not ImageUrlSigner(secret="other", ttl=3600).verify(
+        ImageType.COFFEE_BEAN, OBJECT_ID, expires, signature
+    )
+
+    time_mock.time.return_value = expires
+
+    assert not image_url_signer.verify(
+        ImageType.COFFEE_BEAN, OBJECT_ID, expires, signature
+    )
+
+
+@patch("coffee_backend.api.image_url_signer.time")
+def test_image_url_signer_binds_version(time_mock: MagicMock) -> None:
+    """Test that the URL of an image changes with its version and that the
+    signature is bound to the version."""
+
+    time_mock.time.return_value = 10000
+
+    image_url_signer = ImageUrlSigner(secret="secret", ttl=3600)
+    url = image_url_signer.sign(ImageType.COFFEE_BEAN, OBJECT_ID, version="v1")
+    _, expires, signature = split_signed_url(url)
+
+    assert parse_qs(urlsplit(url).query)["version"] == ["v1"]
+    assert url != image_url_signer.sign(
+        ImageType.COFFEE_BEAN, OBJECT_ID, version="v2"
+    )
+    assert image_url_signer.verify(
+        ImageType.COFFEE_BEAN, OBJECT_ID, expires, signature, version="v1"
+    )
+    assert not image_url_signer.verify(
+        ImageType.COFFEE_BEAN, OBJECT_ID, expires, signature, version="v2"
+    )
+    assert not image_url_signer.verify(
+        ImageType.COFFEE_BEAN, OBJECT_ID, expires, signature
+    )
+
+
+def test_image_version() -> None:
+    """Test that the version of an image is the digest or entity tag of its
+    original variant."""
+
+    original = StoredImageVariant(size=1, etag="etag", file_type="jpeg")
+
+    assert image_version(None) is None
+    assert image_version({"small": original}) is None
+    assert image_version({"original": original}) == "etag"
+    assert (
+        image_version(
+            {"original": original.model_copy(update={"sha256": "sha"})}
+        )
+        == "sha"
+    )
@@ -0,0 +1,128 @@
+import asyncio
+import json
+from typing import Any
+
+import jwt
+import pytest
+from aioresponses import aioresponses
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+from yarl import URL
+
+from coffee_backend.api.jwks import JWKSCache
+
+JWKS_URL = "http://localhost/realms/Coffee-App/protocol/openid-connect/certs"
+JWKS_REQUEST_KEY = ("GET", URL(JWKS_URL))
+
+
+def create_jwk(kid: str) -> tuple[dict[str, Any], rsa.RSAPrivateKey]:
+    """Create a RSA signing key and its public JWK representation.
+
+    Args:
+        kid (str): The key id of the JWK.
+
+    Returns:
+        tuple[dict[str, Any], rsa.RSAPrivateKey]: The public JWK and the
+            matching private key.
+    """
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    public_jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return public_jwk, private_key
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_refresh_loads_parsed_keys() -> None:
+    """Test that refresh stores the parsed public keys by key id and skips
+    encryption keys."""
+
+    signing_jwk, private_key = create_jwk("signing-key")
+    encryption_jwk, _ = create_jwk("encryption-key")
+    encryption_jwk.update({"use": "enc", "alg": "RSA-OAEP"})
+
+    jwks_cache = JWKSCache(JWKS_URL)
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.get(
+            JWKS_URL, payload={"keys": [signing_jwk, encryption_jwk]}
+        )
+        await jwks_cache.refresh()
+
+    assert list(jwks_cache.keys) == ["signing-key"]
+
+    token = jwt.encode(
+        {"sub": "test"},
+        private_key,
+        algorithm="RS256",
+        headers={"kid": "signing-key"},
+    )
+
+    signing_key = await jwks_cache.get_signing_key_from_jwt(token)
+
+    assert jwt.decode(token, signing_key.key, algorithms=["RS256"]) == {
+        "sub": "test"
+    }
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_refetches_unknown_kid_once() -> None:
+    """Test that an unknown key id triggers a single refetch which picks up
+    rotated keys."""
+
+    old_jwk, _ = create_jwk("old-key")
+    new_jwk, _ = create_jwk("new-key")
+
+    jwks_cache = JWKSCache(JWKS_URL, min_refetch_interval=0)
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.get(JWKS_URL, payload={"keys": [old_jwk]})
+        mocked_responses.get(JWKS_URL, payload={"keys": [old_jwk, new_jwk]})
+
+        await jwks_cache.refresh()
+
+        results = await asyncio.gather(
+            jwks_cache.get_signing_key("new-key"),
+            jwks_cache.get_signing_key("new-key"),
+        )
+
+        assert len(mocked_responses.requests[JWKS_REQUEST_KEY]) == 2
+
+    assert all(result.key_id == "new-key" for result in results)
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_rate_limits_unknown_kid_refetch() -> None:
+    """Test that unknown key ids do not trigger a refetch within the minimal
+    refetch interval."""
+
+    jwk, _ = create_jwk("known-key")
+
+    jwks_cache = JWKSCache(JWKS_URL, min_refetch_interval=60)
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.get(JWKS_URL, payload={"keys": [jwk]})
+        await jwks_cache.refresh()
+
+        with pytest.raises(jwt.PyJWKClientError):
+            await jwks_cache.get_signing_key("unknown-key")
+
+        assert len(mocked_responses.requests[JWKS_REQUEST_KEY]) == 1
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_start_survives_unreachable_issuer() -> None:
+    """Test that a failing initial load does not prevent the startup and that
+    the background refresh is stopped again."""
+
+    jwks_cache = JWKSCache(JWKS_URL, refresh_interval=60)
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.get(JWKS_URL, status=503)
+        await jwks_cache.start()
+
+    assert not jwks_cache.keys
+    assert jwks_cache._refresh_task is not None  # pylint: disable=W0212
+
+    await jwks_cache.stop()
+
+    assert jwks_cache._refresh_task is None  # pylint: disable=W0212
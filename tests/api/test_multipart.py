@@ -0,0 +1,97 @@
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import HTTPException, Request
+
+from coffee_backend.api.multipart import stream_multipart_file
+
+BOUNDARY = "coffee-boundary"
+
+
+def create_body(*parts: bytes) -> bytes:
+    """Join multipart parts with the test boundary."""
+    return (
+        b"".join(
+            f"--{BOUNDARY}\r\n".encode() + part + b"\r\n" for part in parts
+        )
+        + f"--{BOUNDARY}--\r\n".encode()
+    )
+
+
+def create_request(
+    body: bytes,
+    chunk_size: int = 7,
+    content_type: str = f"multipart/form-data; boundary={BOUNDARY}",
+) -> Request:
+    """Create a request receiving its body in small chunks."""
+    messages: List[Dict[str, Any]] = [
+        {
+            "type": "http.request",
+            "body": body[start : start + chunk_size],
+            "more_body": start + chunk_size < len(body),
+        }
+        for start in range(0, len(body), chunk_size)
+    ]
+
+    async def receive() -> Dict[str, Any]:
+        return messages.pop(0)
+
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "headers": [(b"content-type", content_type.encode())],
+        },
+        receive,
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_multipart_file() -> None:
+    """Test that the file field is streamed with its content type while
+    other fields are skipped."""
+    image = b"\xff\xd8image-content\r\n--not-a-boundary\xff\xd9" * 10
+    request = create_request(
+        create_body(
+            b'Content-Disposition: form-data; name="title"\r\n\r\nCoffee',
+            b'Content-Disposition: form-data; name="file"; '
+            + b'filename="coffee.jpeg"\r\nContent-Type: image/jpeg\r\n\r\n'
+            + image,
+        )
+    )
+
+    upload = await stream_multipart_file(request)
+
+    chunks = [chunk async for chunk in upload.chunks]
+
+    assert upload.content_type == "image/jpeg"
+    assert b"".join(chunks) == image
+    assert len(chunks) > 1
+
+
+@pytest.mark.asyncio
+async def test_stream_multipart_file_missing() -> None:
+    """Test that a body without the file field is rejected."""
+    request = create_request(
+        create_body(
+            b'Content-Disposition: form-data; name="title"\r\n\r\nCoffee'
+        )
+    )
+
+    with pytest.raises(HTTPException) as exception:
+        await stream_multipart_file(request)
+
+    assert exception.value.status_code == 400
+    assert exception.value.detail == "No file provided"
+
+
+@pytest.mark.asyncio
+async def test_stream_multipart_file_no_multipart() -> None:
+    """Test that bodies which are no multipart form data are rejected."""
+    request = create_request(b"{}", content_type="application/json")
+
+    with pytest.raises(HTTPException) as exception:
+        await stream_multipart_file(request)
+
+    assert exception.value.status_code == 400
+    assert exception.value.detail == "Multipart form data expected"
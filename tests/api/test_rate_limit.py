@@ -0,0 +1,56 @@
+from typing import List
+
+from coffee_backend.api.rate_limit import RateLimiter
+
+
+class FakeClock:
+    """Clock returning a manually advanced time."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rate_limiter_burst_and_refill() -> None:
+    """Test that a key may take its burst at once and is then limited to the
+    rate."""
+    clock = FakeClock()
+    limiter = RateLimiter(rate=2, burst=3, clock=clock)
+
+    results: List[object] = [limiter.acquire("user") for _ in range(3)]
+    assert results == [None, None, None]
+    assert limiter.acquire("user") == 0.5
+
+    clock.now = 0.5
+
+    assert limiter.acquire("user") is None
+    assert limiter.acquire("user") is not None
+    assert limiter.acquire("other") is None
+
+
+def test_rate_limiter_drops_least_recent_keys() -> None:
+    """Test that the buckets of the least recently seen keys are dropped
+    beyond the maximal number of keys."""
+    limiter = RateLimiter(rate=1, burst=1, max_keys=2, clock=FakeClock())
+
+    limiter.acquire("a")
+    limiter.acquire("b")
+    limiter.acquire("a")
+    limiter.acquire("c")
+
+    assert list(limiter.buckets) == ["a", "c"]
+
+
+def test_rate_limiter_disabled() -> None:
+    """Test that a rate of 0 disables the limit."""
+    limiter = RateLimiter(rate=0, burst=0)
+
+    assert all(limiter.acquire("user") is None for _ in range(100))
+
+
+def test_rate_limiter_retry_after() -> None:
+    """Test that the wait is rounded up to whole seconds."""
+    assert RateLimiter.retry_after(0.2) == "1"
+    assert RateLimiter.retry_after(2.5) == "3"
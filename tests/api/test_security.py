@@ -1,10 +1,14 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
 import pytest
 from aioresponses import aioresponses
 from fastapi import Request
 from fastapi.security import HTTPAuthorizationCredentials
+from yarl import URL
 
+from coffee_backend.api.circuit_breaker import CircuitState
 from coffee_backend.api.security import VerifyToken
 from coffee_backend.exceptions.exceptions import UnauthenticatedException
 
@@ -63,7 +67,7 @@ async def test_verify_token_verify_successfull_case(
         jwt_decode_mock (MagicMock): Mock for the jwt.decode function.
         caplog (pytest.LogCaptureFixture): Fixture for capturing log messages.
     """
-    jwks_client_mock = MagicMock()
+    jwks_cache_mock = AsyncMock()
     singing_key_mock = MagicMock()
 
     jwt_decode_mock.return_value = {
@@ -72,9 +76,9 @@ async def test_verify_token_verify_successfull_case(
         "iat": 1701676597,
     }
 
-    jwks_client_mock.get_signing_key_from_jwt.return_value = singing_key_mock
+    jwks_cache_mock.get_signing_key_from_jwt.return_value = singing_key_mock
 
-    verify_token_test_class.jwks_client = jwks_client_mock
+    verify_token_test_class.jwks_cache = jwks_cache_mock
 
     with aioresponses() as mocked_responses:
         mocked_responses.get(
@@ -119,12 +123,12 @@ async def test_verify_token_verify_unsucessfull_decode(
         jwt_decode_mock (MagicMock): Mock object for jwt.decode.
     """
 
-    jwks_client_mock = MagicMock()
+    jwks_cache_mock = AsyncMock()
     singing_key_mock = MagicMock()
     _check_token_validity_mock = AsyncMock()
 
-    jwks_client_mock.get_signing_key_from_jwt.return_value = singing_key_mock
-    verify_token_test_class.jwks_client = jwks_client_mock
+    jwks_cache_mock.get_signing_key_from_jwt.return_value = singing_key_mock
+    verify_token_test_class.jwks_cache = jwks_cache_mock
     # pylint: disable=W0212
     # pylint: disable=C0301
     verify_token_test_class._check_token_validity = _check_token_validity_mock  # type: ignore
@@ -167,11 +171,11 @@ async def test_verify_token_verify_deleted_session_on_idp(
 
     """
 
-    jwks_client_mock = MagicMock()
+    jwks_cache_mock = AsyncMock()
     singing_key_mock = MagicMock()
 
-    jwks_client_mock.get_signing_key_from_jwt.return_value = singing_key_mock
-    verify_token_test_class.jwks_client = jwks_client_mock
+    jwks_cache_mock.get_signing_key_from_jwt.return_value = singing_key_mock
+    verify_token_test_class.jwks_cache = jwks_cache_mock
 
     with aioresponses() as mocked_responses:
         mocked_responses.get(
@@ -218,3 +222,291 @@ async def test_verify_token_verify_no_token(
         # pylint: disable=C0301
         await verify_token_test_class.verify(request=fake_request, token=None)  # type: ignore
         # pylint: enable=C0301
+
+
+@patch("jwt.decode")
+@pytest.mark.asyncio
+async def test_verify_token_verify_uses_token_cache(
+    jwt_decode_mock: MagicMock, verify_token_test_class: VerifyToken
+) -> None:
+    """Test that a second verification of the same token is served from the
+    token cache without decoding or calling the userinfo endpoint.
+
+    Args:
+        jwt_decode_mock (MagicMock): Mock for the jwt.decode function.
+    """
+    jwks_cache_mock = AsyncMock()
+    verify_token_test_class.jwks_cache = jwks_cache_mock
+
+    jwt_decode_mock.return_value = {
+        "scope": "openid profile email address roles",
+        "preferred_username": "test",
+        "iat": 1701676597,
+        "exp": 9999999999,
+    }
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.get(
+            verify_token_test_class.userinfo_endpoint, status=200
+        )
+
+        await verify_token_test_class.verify(request=fake_request, token=token)
+        await verify_token_test_class.verify(request=fake_request, token=token)
+
+        assert (
+            len(
+                mocked_responses.requests[
+                    ("GET", URL(verify_token_test_class.userinfo_endpoint))
+                ]
+            )
+            == 1
+        )
+
+    jwt_decode_mock.assert_called_once()
+    jwks_cache_mock.get_signing_key_from_jwt.assert_awaited_once()
+    assert fake_request.state.token["preferred_username"] == "test"
+
+
+@patch("jwt.decode")
+@pytest.mark.asyncio
+async def test_verify_token_verify_uses_shared_http_session(
+    jwt_decode_mock: MagicMock, verify_token_test_class: VerifyToken
+) -> None:
+    """Test that the userinfo request uses the shared HTTP client session
+    attached on startup and keeps it open.
+
+    Args:
+        jwt_decode_mock (MagicMock): Mock for the jwt.decode function.
+    """
+    jwt_decode_mock.return_value = {
+        "scope": "openid profile email address roles",
+        "preferred_username": "test",
+        "iat": 1701676597,
+    }
+
+    jwks_cache_mock = AsyncMock()
+    verify_token_test_class.jwks_cache = jwks_cache_mock
+
+    http_session = aiohttp.ClientSession()
+
+    await verify_token_test_class.start(http_session=http_session)
+
+    jwks_cache_mock.start.assert_awaited_once_with(http_session=http_session)
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.get(
+            verify_token_test_class.userinfo_endpoint, status=200
+        )
+
+        await verify_token_test_class.verify(request=fake_request, token=token)
+
+    assert not http_session.closed
+
+    await verify_token_test_class.stop()
+
+    assert verify_token_test_class.http_session is None
+    jwks_cache_mock.stop.assert_awaited_once()
+
+    await http_session.close()
+
+
+@patch("jwt.decode")
+@pytest.mark.asyncio
+async def test_verify_token_verify_coalesces_concurrent_validations(
+    jwt_decode_mock: MagicMock, verify_token_test_class: VerifyToken
+) -> None:
+    """Test that concurrent verifications of the same token share one JWT
+    decode and one userinfo request.
+
+    Args:
+        jwt_decode_mock (MagicMock): Mock for the jwt.decode function.
+    """
+    jwt_decode_mock.return_value = {
+        "scope": "openid profile email address roles",
+        "preferred_username": "test",
+        "iat": 1701676597,
+    }
+
+    verify_token_test_class.jwks_cache = AsyncMock()
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.get(
+            verify_token_test_class.userinfo_endpoint, status=200
+        )
+
+        await asyncio.gather(
+            *[
+                verify_token_test_class.verify(
+                    request=fake_request, token=token
+                )
+                for _ in range(5)
+            ]
+        )
+
+        assert (
+            len(
+                mocked_responses.requests[
+                    ("GET", URL(verify_token_test_class.userinfo_endpoint))
+                ]
+            )
+            == 1
+        )
+
+    jwt_decode_mock.assert_called_once()
+
+
+@patch("jwt.decode")
+@pytest.mark.asyncio
+async def test_verify_token_verify_offline_mode(
+    jwt_decode_mock: MagicMock, verify_token_test_class: VerifyToken
+) -> None:
+    """Test that the offline mode validates tokens without the userinfo
+    endpoint.
+
+    Args:
+        jwt_decode_mock (MagicMock): Mock for the jwt.decode function.
+    """
+    jwt_decode_mock.return_value = {
+        "scope": "openid profile email address roles",
+        "preferred_username": "test",
+        "iat": 1701676597,
+    }
+
+    verify_token_test_class.jwks_cache = AsyncMock()
+    verify_token_test_class.mode = "offline"
+
+    with aioresponses() as mocked_responses:
+        await verify_token_test_class.verify(request=fake_request, token=token)
+
+        assert not mocked_responses.requests
+
+    assert fake_request.state.token["preferred_username"] == "test"
+
+
+@patch("jwt.decode")
+@pytest.mark.asyncio
+async def test_verify_token_verify_hybrid_mode_falls_back_locally(
+    jwt_decode_mock: MagicMock, verify_token_test_class: VerifyToken
+) -> None:
+    """Test that the hybrid mode falls back to the local validation when the
+    issuer fails and stops calling it once the circuit breaker is open.
+
+    Args:
+        jwt_decode_mock (MagicMock): Mock for the jwt.decode function.
+    """
+    jwt_decode_mock.return_value = {
+        "scope": "openid profile email address roles",
+        "preferred_username": "test",
+        "iat": 1701676597,
+        "exp": 9999999999,
+    }
+
+    verify_token_test_class.jwks_cache = AsyncMock()
+    verify_token_test_class.mode = "hybrid"
+    verify_token_test_class.breaker.failure_threshold = 1
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.get(
+            verify_token_test_class.userinfo_endpoint, status=503, repeat=True
+        )
+
+        await verify_token_test_class.verify(request=fake_request, token=token)
+        await verify_token_test_class.verify(request=fake_request, token=token)
+
+        assert (
+            len(
+                mocked_responses.requests[
+                    ("GET", URL(verify_token_test_class.userinfo_endpoint))
+                ]
+            )
+            == 1
+        )
+
+    assert not verify_token_test_class.breaker.allow_request()
+    assert not verify_token_test_class.token_cache.entries
+    assert jwt_decode_mock.call_count == 2
+
+
+@patch("jwt.decode")
+@pytest.mark.asyncio
+async def test_verify_token_verify_hybrid_mode_rejects_revoked_token(
+    jwt_decode_mock: MagicMock, verify_token_test_class: VerifyToken
+) -> None:
+    """Test that the hybrid mode still rejects tokens the issuer declines.
+
+    Args:
+        jwt_decode_mock (MagicMock): Mock for the jwt.decode function.
+    """
+    verify_token_test_class.jwks_cache = AsyncMock()
+    verify_token_test_class.mode = "hybrid"
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.get(
+            verify_token_test_class.userinfo_endpoint, status=401
+        )
+
+        with pytest.raises(UnauthenticatedException):
+            await verify_token_test_class.verify(
+                request=fake_request, token=token
+            )
+
+    jwt_decode_mock.assert_called_once()
+    assert verify_token_test_class.breaker.failures == 0
+
+
+@pytest.mark.parametrize(
+    "error, raised, state",
+    [
+        (
+            ValueError("Unexpected userinfo"),
+            UnauthenticatedException,
+            CircuitState.OPEN,
+        ),
+        (
+            asyncio.CancelledError(),
+            asyncio.CancelledError,
+            CircuitState.HALF_OPEN,
+        ),
+    ],
+)
+@patch("jwt.decode")
+@pytest.mark.asyncio
+async def test_verify_token_verify_hybrid_mode_ends_trial_on_other_errors(
+    jwt_decode_mock: MagicMock,
+    verify_token_test_class: VerifyToken,
+    error: BaseException,
+    raised: type[BaseException],
+    state: CircuitState,
+) -> None:
+    """Test that a trial request ending with an unexpected error reopens the
+    breaker and a cancelled trial allows the next request as trial, instead
+    of leaving the breaker half open without trials forever.
+
+    Args:
+        jwt_decode_mock (MagicMock): Mock for the jwt.decode function.
+    """
+    jwt_decode_mock.return_value = {
+        "scope": "openid profile email address roles",
+        "preferred_username": "test",
+        "iat": 1701676597,
+        "exp": 9999999999,
+    }
+
+    verify_token_test_class.jwks_cache = AsyncMock()
+    verify_token_test_class.mode = "hybrid"
+    verify_token_test_class.breaker.reset_timeout = 0
+    verify_token_test_class.breaker.failure_threshold = 1
+    verify_token_test_class.breaker.record_failure()
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.get(
+            verify_token_test_class.userinfo_endpoint, exception=error
+        )
+
+        with pytest.raises(raised):
+            await verify_token_test_class.verify(
+                request=fake_request, token=token
+            )
+
+    assert verify_token_test_class.breaker.state == state
+    assert not verify_token_test_class.breaker.trial_in_flight
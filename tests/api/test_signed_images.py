@@ -0,0 +1,100 @@
+from unittest.mock import MagicMock, patch
+from uuid import UUID
+
+import pytest
+
+from coffee_backend.api.image_url_signer import ImageUrlSigner
+from coffee_backend.schemas import ImageType
+from tests.conftest import DummyImages, TestApp, create_object_stream
+
+OBJECT_ID = UUID("123e4567-e19b-12d3-a456-426655440000")
+
+
+@patch("coffee_backend.services.image_service.ImageService.stream_image")
+@pytest.mark.asyncio
+async def test_api_get_signed_image(
+    image_service_mock: MagicMock,
+    test_app: TestApp,
+    dummy_coffee_images: DummyImages,
+) -> None:
+    """Test that a signed image url is served without bearer token and that
+    unversioned URLs have to be revalidated.
+
+    Args:
+        image_service_mock (MagicMock): A mock object for the ImageService.
+        test_app (TestApp): An instance of the TestApp for testing.
+        dummy_coffee_images (DummyImages): A fixture providing dummy images.
+    """
+    image_url_signer = ImageUrlSigner(secret="secret")
+    test_app.state.image_url_signer = image_url_signer
+
+    image_service_mock.return_value = create_object_stream(
+        dummy_coffee_images.image_1_bytes, "jpg"
+    )
+
+    response = await test_app.client.get(
+        image_url_signer.sign(ImageType.COFFEE_BEAN, OBJECT_ID)
+    )
+
+    assert response.status_code == 200
+    assert response.content == dummy_coffee_images.image_1_bytes
+    assert response.headers["Cache-Control"] == "public, no-cache"
+
+    image_service_mock.assert_called_once()
+
+
+@patch("coffee_backend.services.image_service.ImageService.stream_image")
+@pytest.mark.asyncio
+async def test_api_get_signed_image_versioned(
+    image_service_mock: MagicMock,
+    test_app: TestApp,
+    dummy_coffee_images: DummyImages,
+) -> None:
+    """Test that the response of a URL signed for an image version may be
+    cached until the URL expires.
+
+    Args:
+        image_service_mock (MagicMock): A mock object for the ImageService.
+        test_app (TestApp): An instance of the TestApp for testing.
+        dummy_coffee_images (DummyImages): A fixture providing dummy images.
+    """
+    image_url_signer = ImageUrlSigner(secret="secret")
+    test_app.state.image_url_signer = image_url_signer
+
+    image_service_mock.return_value = create_object_stream(
+        dummy_coffee_images.image_1_bytes, "jpg"
+    )
+
+    url = image_url_signer.sign(ImageType.COFFEE_BEAN, OBJECT_ID, version="v1")
+    response = await test_app.client.get(url)
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
+    assert response.headers["Cache-Control"].endswith(", immutable")
+
+    response = await test_app.client.get(url.replace("v1", "v2"))
+
+    assert response.status_code == 403
+
+
+@patch("coffee_backend.services.image_service.ImageService.stream_image")
+@pytest.mark.asyncio
+async def test_api_get_signed_image_invalid_signature(
+    image_service_mock: MagicMock,
+    test_app: TestApp,
+) -> None:
+    """Test that an invalid signature is rejected before reading the image.
+
+    Args:
+        image_service_mock (MagicMock): A mock object for the ImageService.
+        test_app (TestApp): An instance of the TestApp for testing.
+    """
+    test_app.state.image_url_signer = ImageUrlSigner(secret="secret")
+
+    response = await test_app.client.get(
+        f"/images/coffee_bean/{OBJECT_ID}?expires=9999999999&signature=abc"
+    )
+
+    assert response.status_code == 403
+
+    image_service_mock.assert_not_called()
@@ -0,0 +1,75 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from coffee_backend.api.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls() -> None:
+    """Test that concurrent calls for the same key share one execution."""
+
+    metric_mock = MagicMock()
+    single_flight: SingleFlight[int] = SingleFlight(metric=metric_mock)
+    executions = 0
+
+    async def execute() -> int:
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(
+        *[single_flight.run("key", execute) for _ in range(5)]
+    )
+
+    assert results == [42] * 5
+    assert executions == 1
+    assert metric_mock.record_coalesced.call_count == 4
+    assert not single_flight.in_flight
+
+    await single_flight.run("key", execute)
+
+    assert executions == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_exceptions() -> None:
+    """Test that all joined callers receive the exception of the execution."""
+
+    single_flight: SingleFlight[int] = SingleFlight(metric=MagicMock())
+
+    async def execute() -> int:
+        await asyncio.sleep(0.01)
+        raise ValueError("invalid")
+
+    results = await asyncio.gather(
+        single_flight.run("key", execute),
+        single_flight.run("key", execute),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert not single_flight.in_flight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_cancelled_caller() -> None:
+    """Test that cancelling the first caller does not cancel the execution
+    for callers that joined it."""
+
+    single_flight: SingleFlight[int] = SingleFlight(metric=MagicMock())
+
+    async def execute() -> int:
+        await asyncio.sleep(0.05)
+        return 42
+
+    first_caller = asyncio.ensure_future(single_flight.run("key", execute))
+    await asyncio.sleep(0)
+    second_caller = asyncio.ensure_future(single_flight.run("key", execute))
+    await asyncio.sleep(0)
+
+    first_caller.cancel()
+
+    assert await second_caller == 42
@@ -0,0 +1,80 @@
+from unittest.mock import MagicMock, patch
+
+from coffee_backend.api.token_cache import TokenCache
+
+TOKEN = "header.payload.signature"
+
+
+@patch("coffee_backend.api.token_cache.time")
+def test_token_cache_returns_cached_payload(time_mock: MagicMock) -> None:
+    """Test that a stored token is served from the cache and counted as hit."""
+
+    time_mock.time.return_value = 1000
+    metric_mock = MagicMock()
+    payload = {"sub": "user", "exp": 2000}
+
+    token_cache = TokenCache(metric=metric_mock, revalidate_interval=60)
+
+    assert token_cache.get(TOKEN) is None
+
+    token_cache.put(TOKEN, payload)
+
+    time_mock.time.return_value = 1059
+
+    assert token_cache.get(TOKEN) == payload
+    assert TOKEN not in "".join(token_cache.entries)
+
+    metric_mock.record_miss.assert_called_once()
+    metric_mock.record_hit.assert_called_once()
+    metric_mock.set_size.assert_called_with(1)
+
+
+@patch("coffee_backend.api.token_cache.time")
+def test_token_cache_revalidation_interval(time_mock: MagicMock) -> None:
+    """Test that tokens are evicted once the revalidation interval passed."""
+
+    time_mock.time.return_value = 1000
+
+    token_cache = TokenCache(metric=MagicMock(), revalidate_interval=60)
+    token_cache.put(TOKEN, {"sub": "user", "exp": 2000})
+
+    time_mock.time.return_value = 1060
+
+    assert token_cache.get(TOKEN) is None
+    assert not token_cache.entries
+
+
+@patch("coffee_backend.api.token_cache.time")
+def test_token_cache_never_outlives_token_expiry(time_mock: MagicMock) -> None:
+    """Test that tokens are evicted on expiry even within the revalidation
+    interval and that tokens without expiry are not cached."""
+
+    time_mock.time.return_value = 1000
+
+    token_cache = TokenCache(metric=MagicMock(), revalidate_interval=600)
+    token_cache.put(TOKEN, {"sub": "user", "exp": 1010})
+    token_cache.put("token.without.exp", {"sub": "user"})
+
+    assert len(token_cache.entries) == 1
+
+    time_mock.time.return_value = 1010
+
+    assert token_cache.get(TOKEN) is None
+
+
+def test_token_cache_evicts_least_recently_used() -> None:
+    """Test that the cache is bounded and evicts the least recently used
+    token first."""
+
+    token_cache = TokenCache(metric=MagicMock(), max_size=2)
+
+    token_cache.put("token-1", {"sub": "1", "exp": 9999999999})
+    token_cache.put("token-2", {"sub": "2", "exp": 9999999999})
+
+    assert token_cache.get("token-1") is not None
+
+    token_cache.put("token-3", {"sub": "3", "exp": 9999999999})
+
+    assert token_cache.get("token-2") is None
+    assert token_cache.get("token-1") == {"sub": "1", "exp": 9999999999}
+    assert token_cache.get("token-3") == {"sub": "3", "exp": 9999999999}
@@ -1,5 +1,5 @@
 from typing import Generator
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import HTTPException
@@ -69,7 +69,9 @@ async def test_api_delete_coffee_by_id(
     )
 
     image_service_mock.assert_called_once_with(
-        object_id=dummy_coffees.coffee_1.id, image_type=ImageType.COFFEE_BEAN
+        db_session=ANY,
+        object_id=dummy_coffees.coffee_1.id,
+        image_type=ImageType.COFFEE_BEAN,
     )
 
     coffee_service_mock.assert_awaited_once_with(
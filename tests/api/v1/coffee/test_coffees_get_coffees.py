@@ -6,8 +6,11 @@ import pytest
 from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
 
+from coffee_backend.api.deps import get_search_rate_limiter
+from coffee_backend.api.rate_limit import RateLimiter
 from coffee_backend.application import app
 from coffee_backend.mongo.database import get_db
+from coffee_backend.schemas import Page
 from tests.conftest import DummyCoffees, TestApp
 
 
@@ -25,10 +28,9 @@ async def test_api_get_coffees(
 
     app.dependency_overrides[get_db] = lambda: get_db_mock
 
-    coffee_service_mock.return_value = [
-        dummy_coffees.coffee_1.model_dump(by_alias=True),
-        dummy_coffees.coffee_2.model_dump(by_alias=True),
-    ]
+    coffee_service_mock.return_value = Page(
+        items=[dummy_coffees.coffee_1, dummy_coffees.coffee_2]
+    )
 
     response = await test_app.client.get(
         "/api/v1/coffees",
@@ -48,6 +50,7 @@ async def test_api_get_coffees(
         owner_id=None,
         first_id=None,
         search_query=None,
+        after_id=None,
     )
 
     app.dependency_overrides = {}
@@ -85,6 +88,7 @@ async def test_api_get_coffees_with_emtpy_crud_response(
         owner_id=None,
         first_id=None,
         search_query=None,
+        after_id=None,
     )
 
     app.dependency_overrides = {}
@@ -104,10 +108,9 @@ async def test_api_get_coffees_with_query_params(
 
     app.dependency_overrides[get_db] = lambda: get_db_mock
 
-    coffee_service_mock.return_value = [
-        dummy_coffees.coffee_1.model_dump(by_alias=True),
-        dummy_coffees.coffee_2.model_dump(by_alias=True),
-    ]
+    coffee_service_mock.return_value = Page(
+        items=[dummy_coffees.coffee_1, dummy_coffees.coffee_2]
+    )
 
     response = await test_app.client.get(
         "/api/v1/coffees?page=1&page_size=10&owner_id=12345678-1234-5678-1234-567812345678&first_id=123e4567-e19b-12d3-a456-426655440000&search_query=test",
@@ -127,6 +130,78 @@ async def test_api_get_coffees_with_query_params(
         owner_id=UUID("12345678-1234-5678-1234-567812345678"),
         first_id=UUID("123e4567-e19b-12d3-a456-426655440000"),
         search_query="test",
+        after_id=None,
+    )
+
+    app.dependency_overrides = {}
+
+
+@patch(
+    "coffee_backend.services.coffee.CoffeeService.list_coffees_with_rating_summary"
+)
+@pytest.mark.asyncio
+async def test_api_get_coffees_search_limits(
+    coffee_service_mock: AsyncMock,
+    test_app: TestApp,
+    mock_security_dependency: Generator,
+) -> None:
+    """Test that too long search queries are rejected and searches beyond
+    the rate limit are answered with 429."""
+    app.dependency_overrides[get_db] = AsyncMock
+    coffee_service_mock.return_value = Page(items=[])
+
+    response = await test_app.client.get(
+        "/api/v1/coffees", params={"search_query": "a" * 65}
+    )
+
+    assert response.status_code == 422
+
+    limiter = RateLimiter(rate=1, burst=1)
+    app.dependency_overrides[get_search_rate_limiter] = lambda: limiter
+
+    response = await test_app.client.get(
+        "/api/v1/coffees", params={"search_query": "gold"}
     )
+    assert response.status_code == 200
+
+    response = await test_app.client.get(
+        "/api/v1/coffees", params={"search_query": "gold"}
+    )
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+    response = await test_app.client.get("/api/v1/coffees")
+    assert response.status_code == 200
+
+    assert coffee_service_mock.await_count == 2
 
     app.dependency_overrides = {}
+
+
+@pytest.mark.asyncio
+async def test_api_get_coffees_search_partial_word(
+    insert_coffees_with_matching_drinks: None,
+    test_app: TestApp,
+    mock_security_dependency: Generator,
+) -> None:
+    """Test that a search for a partially typed word finds the coffees with
+    words starting with it, regardless of case and diacritics."""
+    response = await test_app.client.get(
+        "/api/v1/coffees", params={"search_query": "MARTERMU"}
+    )
+
+    assert response.status_code == 200
+    assert [coffee["_id"] for coffee in response.json()] == [
+        "0664ddeb-3b5e-716d-8000-907336604f50",
+        "0664ddeb-3b5e-7093-8000-fb7c6d7c12fb",
+        "0664ddeb-3b5d-7f76-8000-d5667ae65996",
+    ]
+
+    response = await test_app.client.get(
+        "/api/v1/coffees", params={"search_query": "test coffee 5 marter"}
+    )
+
+    assert response.status_code == 200
+    assert [coffee["_id"] for coffee in response.json()][0] == (
+        "0664ddeb-3b5e-716d-8000-907336604f50"
+    )
@@ -1,5 +1,6 @@
+from datetime import datetime, timezone
 from typing import Generator
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 from uuid import UUID
 
 import pytest
@@ -9,10 +10,18 @@ from uuid_extensions.uuid7 import uuid7
 
 from coffee_backend.application import app
 from coffee_backend.mongo.database import get_db
-from tests.conftest import DummyCoffees, DummyImages, TestApp
-
-
-@patch("coffee_backend.services.image_service.ImageService.get_image")
+from coffee_backend.s3.types.byte_range import ByteRange
+from coffee_backend.s3.types.object_info import ObjectInfo
+from coffee_backend.schemas import ImageType
+from tests.conftest import (
+    DummyCoffees,
+    DummyImages,
+    TestApp,
+    create_object_stream,
+)
+
+
+@patch("coffee_backend.services.image_service.ImageService.stream_image")
 @pytest.mark.asyncio
 async def test_api_get_coffee_image_by_id(
     image_service_mock: MagicMock,
@@ -33,9 +42,8 @@ async def test_api_get_coffee_image_by_id(
 
     app.dependency_overrides[get_db] = lambda: get_db_mock
 
-    image_service_mock.return_value = (
-        dummy_coffee_images.image_1_bytes,
-        "jpg",
+    image_service_mock.return_value = create_object_stream(
+        dummy_coffee_images.image_1_bytes, "jpg"
     )
 
     coffee_id = UUID("123e4567-e19b-12d3-a456-426655440000")
@@ -49,6 +57,9 @@ async def test_api_get_coffee_image_by_id(
     assert response.content == dummy_coffee_images.image_1_bytes
 
     assert response.headers["Content-Type"] == "image/jpg"
+    assert response.headers["Content-Length"] == str(
+        len(dummy_coffee_images.image_1_bytes)
+    )
 
     assert (
         response.headers["Content-Disposition"]
@@ -60,7 +71,7 @@ async def test_api_get_coffee_image_by_id(
     app.dependency_overrides = {}
 
 
-@patch("coffee_backend.services.image_service.ImageService.get_image")
+@patch("coffee_backend.services.image_service.ImageService.stream_image")
 @pytest.mark.asyncio
 async def test_api_get_coffee_image_by_id_nonexisting(
     image_service_mock: MagicMock,
@@ -99,3 +110,136 @@ async def test_api_get_coffee_image_by_id_nonexisting(
     image_service_mock.assert_called_once()
 
     app.dependency_overrides = {}
+
+
+@patch("coffee_backend.services.image_service.ImageService.stream_image")
+@pytest.mark.asyncio
+async def test_api_get_coffee_image_by_id_range(
+    image_service_mock: MagicMock,
+    test_app: TestApp,
+    dummy_coffee_images: DummyImages,
+    mock_security_dependency: Generator,
+) -> None:
+    """Test that a Range request is answered with 206 Partial Content.
+
+    Args:
+        image_service_mock (MagicMock): A mock object for the ImageService.
+        test_app (TestApp): An instance of the TestApp for testing.
+        dummy_coffee_images (DummyImages): A fixture providing dummy images.
+        mock_security_dependency (Generator): Fixture to mock the authentication
+            and authorization check within api to always return True
+    """
+    image_size = len(dummy_coffee_images.image_1_bytes)
+
+    image_service_mock.return_value = create_object_stream(
+        dummy_coffee_images.image_1_bytes[:100],
+        "jpg",
+        content_range=f"bytes 0-99/{image_size}",
+    )
+
+    coffee_id = UUID("123e4567-e19b-12d3-a456-426655440000")
+
+    response = await test_app.client.get(
+        f"/api/v1/coffees/{coffee_id}/image",
+        headers={"Range": "bytes=0-99", "If-Range": '"etag"'},
+    )
+
+    assert response.status_code == 206
+    assert response.content == dummy_coffee_images.image_1_bytes[:100]
+    assert response.headers["Content-Length"] == "100"
+    assert response.headers["Content-Range"] == f"bytes 0-99/{image_size}"
+    assert response.headers["Accept-Ranges"] == "bytes"
+
+    image_service_mock.assert_called_once_with(
+        db_session=ANY,
+        object_id=coffee_id,
+        image_type=ImageType.COFFEE_BEAN,
+        byte_range=ByteRange(start=0, end=99),
+        if_range='"etag"',
+        accepted_formats=(),
+        width=None,
+    )
+
+
+@patch("coffee_backend.services.image_service.ImageService.stream_image")
+@pytest.mark.asyncio
+async def test_api_get_coffee_image_by_id_width(
+    image_service_mock: MagicMock,
+    test_app: TestApp,
+    dummy_coffee_images: DummyImages,
+    mock_security_dependency: Generator,
+) -> None:
+    """Test that the requested width and accepted formats are passed on to
+    the image service and that the response varies on the Accept header.
+
+    Args:
+        image_service_mock (MagicMock): A mock object for the ImageService.
+        test_app (TestApp): An instance of the TestApp for testing.
+        dummy_coffee_images (DummyImages): A fixture providing dummy images.
+        mock_security_dependency (Generator): Fixture to mock the authentication
+            and authorization check within api to always return True
+    """
+    image_service_mock.return_value = create_object_stream(
+        dummy_coffee_images.image_1_bytes, "jpg"
+    )
+
+    coffee_id = UUID("123e4567-e19b-12d3-a456-426655440000")
+
+    response = await test_app.client.get(
+        f"/api/v1/coffees/{coffee_id}/image?w=320",
+        headers={"Accept": "image/webp,*/*"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["Vary"] == "Accept"
+
+    image_service_mock.assert_called_once_with(
+        db_session=ANY,
+        object_id=coffee_id,
+        image_type=ImageType.COFFEE_BEAN,
+        byte_range=None,
+        if_range=None,
+        accepted_formats=("webp",),
+        width=320,
+    )
+
+
+@patch("coffee_backend.services.image_service.ImageService.stream_image")
+@patch("coffee_backend.services.image_service.ImageService.stat_image")
+@pytest.mark.asyncio
+async def test_api_get_coffee_image_by_id_not_modified(
+    stat_image_mock: MagicMock,
+    stream_image_mock: MagicMock,
+    test_app: TestApp,
+    mock_security_dependency: Generator,
+) -> None:
+    """Test that a matching If-None-Match is answered with 304 Not Modified
+    without streaming the image.
+
+    Args:
+        stat_image_mock (MagicMock): A mock for ImageService.stat_image.
+        stream_image_mock (MagicMock): A mock for ImageService.stream_image.
+        test_app (TestApp): An instance of the TestApp for testing.
+        mock_security_dependency (Generator): Fixture to mock the authentication
+            and authorization check within api to always return True
+    """
+    stat_image_mock.return_value = ObjectInfo(
+        size=100,
+        etag="etag",
+        last_modified=datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc),
+        file_type="jpg",
+    )
+
+    coffee_id = UUID("123e4567-e19b-12d3-a456-426655440000")
+
+    response = await test_app.client.get(
+        f"/api/v1/coffees/{coffee_id}/image",
+        headers={"If-None-Match": '"etag"'},
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == '"etag"'
+    assert response.headers["Last-Modified"] == "Wed, 01 May 2024 12:00:00 GMT"
+
+    stream_image_mock.assert_not_called()
@@ -0,0 +1,171 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Generator, Optional, Tuple
+from unittest.mock import MagicMock
+
+import pytest
+
+from coffee_backend.api.deps import get_coffee_images_service
+from coffee_backend.application import app
+from coffee_backend.exceptions.exceptions import ObjectNotFoundError
+from coffee_backend.mongo.image_metadata import image_metadata_crud
+from coffee_backend.s3.object import ObjectCRUD
+from coffee_backend.s3.types.byte_range import ByteRange
+from coffee_backend.s3.types.object_info import ObjectInfo
+from coffee_backend.s3.types.object_stream import ObjectStream
+from coffee_backend.s3.types.readable import Readable
+from coffee_backend.s3.types.upload_result import UploadResult
+from coffee_backend.services.image_service import ImageService
+from coffee_backend.services.thumbnail import (
+    ThumbnailGenerator,
+    supported_formats,
+)
+from coffee_backend.settings import settings
+from tests.conftest import DummyCoffees, DummyImages, TestApp, TestDBSessions
+
+
+class MemoryObjectCRUD(ObjectCRUD):
+    """Object CRUD keeping the objects in memory instead of S3."""
+
+    def __init__(self) -> None:
+        super().__init__(minio_client=MagicMock(), bucket_name="test")
+        self.objects: Dict[str, Tuple[bytes, ObjectInfo]] = {}
+
+    async def create(
+        self, filepath: str, filename: str, file: Readable, file_type: str
+    ) -> None:
+        data = file.read(-1)
+        assert isinstance(data, bytes)
+
+        self._put(f"{filepath}/{filename}", data, file_type)
+
+    async def create_stream(  # pylint: disable=too-many-arguments
+        self,
+        filepath: str,
+        filename: str,
+        chunks: AsyncIterator[bytes],
+        file_type: str,
+        max_size: int,
+    ) -> UploadResult:
+        data = b"".join([chunk async for chunk in chunks])
+        self._put(f"{filepath}/{filename}", data, file_type)
+
+        return UploadResult(size=len(data), sha256="")
+
+    async def read(self, filepath: str, filename: str) -> Tuple[bytes, str]:
+        data, info = self._get(f"{filepath}/{filename}")
+
+        return data, info.file_type
+
+    async def stream(  # pylint: disable=too-many-arguments
+        self,
+        filepath: str,
+        filename: str,
+        byte_range: Optional[ByteRange] = None,
+        if_range: Optional[str] = None,
+        chunk_size: int = 0,
+    ) -> ObjectStream:
+        data, info = self._get(f"{filepath}/{filename}")
+
+        async def chunks() -> AsyncIterator[bytes]:
+            yield data
+
+        return ObjectStream(
+            chunks=chunks(),
+            size=info.size,
+            etag=info.etag,
+            file_type=info.file_type,
+            response=MagicMock(),
+            last_modified=info.last_modified,
+        )
+
+    async def stat(self, filepath: str, filename: str) -> ObjectInfo:
+        return self._get(f"{filepath}/{filename}")[1]
+
+    def _put(self, name: str, data: bytes, file_type: str) -> None:
+        self.objects[name] = (
+            data,
+            ObjectInfo(
+                size=len(data),
+                etag=f"{name}-{len(data)}",
+                last_modified=datetime.now(timezone.utc),
+                file_type=file_type,
+            ),
+        )
+
+    def _get(self, name: str) -> Tuple[bytes, ObjectInfo]:
+        if name not in self.objects:
+            raise ObjectNotFoundError("Object not found")
+
+        return self.objects[name]
+
+
+@pytest.mark.asyncio
+async def test_api_get_coffee_image_negotiates_created_small_formats(
+    test_app: TestApp,
+    init_mongo: TestDBSessions,
+    dummy_coffees: DummyCoffees,
+    dummy_coffee_images: DummyImages,
+    mock_security_dependency: Generator,
+) -> None:
+    """Test that the alternative formats of the small variant created after
+    an upload are recorded and served to clients accepting them."""
+    if supported_formats(("webp", "avif")) != ("webp", "avif"):
+        pytest.skip("Pillow cannot encode WebP and AVIF")
+
+    coffee = dummy_coffees.coffee_1
+
+    with init_mongo.sync_probe_session.start_session() as session:
+        session.client[settings.mongodb_database][
+            settings.mongodb_coffee_collection
+        ].insert_one(coffee.model_dump(by_alias=True))
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    thumbnail_generator = ThumbnailGenerator(
+        executor=executor, metric=MagicMock(), formats=("webp", "avif")
+    )
+    object_crud = MemoryObjectCRUD()
+    image_service = ImageService(
+        object_crud=object_crud,
+        image_metadata_crud=image_metadata_crud,
+        thumbnail_generator=thumbnail_generator,
+    )
+    app.dependency_overrides[get_coffee_images_service] = lambda: (
+        image_service
+    )
+
+    response = await test_app.client.post(
+        f"/api/v1/coffees/{coffee.id}/image",
+        files={
+            "file": (
+                "coffee.jpeg",
+                io.BytesIO(dummy_coffee_images.image_1_bytes),
+                "image/jpeg",
+            )
+        },
+    )
+
+    assert response.status_code == 201
+
+    await thumbnail_generator.stop()
+    executor.shutdown(wait=True)
+
+    sizes = {
+        name.split("/")[1]: info.size
+        for name, (_, info) in object_crud.objects.items()
+    }
+    assert sizes["small_webp"] < sizes["small_avif"] < sizes["small"]
+
+    for accept, content_type in [
+        (None, "image/jpeg"),
+        ("image/avif,image/*", "image/avif"),
+        ("image/avif,image/webp,*/*", "image/webp"),
+    ]:
+        response = await test_app.client.get(
+            f"/api/v1/coffees/{coffee.id}/image",
+            headers={"Accept": accept} if accept else {},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == content_type
@@ -0,0 +1,98 @@
+from typing import Generator
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+from uuid import UUID
+
+import pytest
+
+from coffee_backend.application import app
+from coffee_backend.mongo.database import get_db
+from coffee_backend.schemas import ImageType, ImageUpload
+from tests.conftest import TestApp
+
+
+@patch("coffee_backend.services.coffee.CoffeeService.get_by_id")
+@patch("coffee_backend.services.image_service.ImageService.create_upload")
+@pytest.mark.asyncio
+async def test_api_create_coffee_image_upload(
+    create_upload_mock: AsyncMock,
+    coffee_service_mock: AsyncMock,
+    test_app: TestApp,
+    mock_security_dependency: Generator,
+) -> None:
+    """Test the API endpoint creating a presigned upload of a coffee image.
+
+    Args:
+        create_upload_mock (AsyncMock): A mock of ImageService.create_upload.
+        coffee_service_mock (AsyncMock): A mock of the CoffeeService.
+        test_app (TestApp): A FastAPI test client.
+        mock_security_dependency (Generator): Fixture to mock the authentication
+            and authorization check within api to always return True
+    """
+    get_db_mock = MagicMock()
+
+    app.dependency_overrides[get_db] = lambda: get_db_mock
+
+    create_upload_mock.return_value = ImageUpload(
+        url="http://minio:9000/coffee-images",
+        fields={"key": "upload/coffee_bean/id", "policy": "policy"},
+        max_size=100,
+    )
+
+    coffee_id = UUID("123e4567-e19b-12d3-a456-426655440000")
+
+    response = await test_app.client.post(
+        f"/api/v1/coffees/{coffee_id}/image/upload"
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "url": "http://minio:9000/coffee-images",
+        "fields": {"key": "upload/coffee_bean/id", "policy": "policy"},
+        "max_size": 100,
+    }
+
+    coffee_service_mock.assert_called_once()
+    create_upload_mock.assert_called_once_with(
+        object_id=coffee_id, image_type=ImageType.COFFEE_BEAN
+    )
+
+    app.dependency_overrides = {}
+
+
+@patch("coffee_backend.services.coffee.CoffeeService.get_by_id")
+@patch("coffee_backend.services.image_service.ImageService.complete_upload")
+@pytest.mark.asyncio
+async def test_api_complete_coffee_image_upload(
+    complete_upload_mock: AsyncMock,
+    coffee_service_mock: AsyncMock,
+    test_app: TestApp,
+    mock_security_dependency: Generator,
+) -> None:
+    """Test the API endpoint completing a presigned upload of a coffee image.
+
+    Args:
+        complete_upload_mock (AsyncMock): A mock of
+            ImageService.complete_upload.
+        coffee_service_mock (AsyncMock): A mock of the CoffeeService.
+        test_app (TestApp): A FastAPI test client.
+        mock_security_dependency (Generator): Fixture to mock the authentication
+            and authorization check within api to always return True
+    """
+    get_db_mock = MagicMock()
+
+    app.dependency_overrides[get_db] = lambda: get_db_mock
+
+    coffee_id = UUID("123e4567-e19b-12d3-a456-426655440000")
+
+    response = await test_app.client.post(
+        f"/api/v1/coffees/{coffee_id}/image/upload/complete"
+    )
+
+    assert response.status_code == 201
+
+    coffee_service_mock.assert_called_once()
+    complete_upload_mock.assert_called_once_with(
+        db_session=ANY, object_id=coffee_id, image_type=ImageType.COFFEE_BEAN
+    )
+
+    app.dependency_overrides = {}
@@ -7,10 +7,10 @@ from fastapi import HTTPException
 
 from coffee_backend.application import app
 from coffee_backend.mongo.database import get_db
-from tests.conftest import DummyImages, TestApp
+from tests.conftest import DummyImages, TestApp, create_object_stream
 
 
-@patch("coffee_backend.services.image_service.ImageService.get_image")
+@patch("coffee_backend.services.image_service.ImageService.stream_image")
 @pytest.mark.asyncio
 async def test_api_get_drink_image_by_id(
     image_service_mock: MagicMock,
@@ -31,9 +31,8 @@ async def test_api_get_drink_image_by_id(
 
     app.dependency_overrides[get_db] = lambda: get_db_mock
 
-    image_service_mock.return_value = (
-        dummy_coffee_images.image_1_bytes,
-        "jpg",
+    image_service_mock.return_value = create_object_stream(
+        dummy_coffee_images.image_1_bytes, "jpg"
     )
 
     drink_id = UUID("123e4567-e19b-12d3-a456-426655440000")
@@ -47,6 +46,9 @@ async def test_api_get_drink_image_by_id(
     assert response.content == dummy_coffee_images.image_1_bytes
 
     assert response.headers["Content-Type"] == "image/jpg"
+    assert response.headers["Content-Length"] == str(
+        len(dummy_coffee_images.image_1_bytes)
+    )
 
     assert (
         response.headers["Content-Disposition"]
@@ -58,7 +60,7 @@ async def test_api_get_drink_image_by_id(
     app.dependency_overrides = {}
 
 
-@patch("coffee_backend.services.image_service.ImageService.get_image")
+@patch("coffee_backend.services.image_service.ImageService.stream_image")
 @pytest.mark.asyncio
 async def test_api_get_drink_image_by_id_nonexisting(
     image_service_mock: MagicMock,
@@ -6,8 +6,11 @@ import pytest
 from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
 
+from coffee_backend.api.cursor import NEXT_CURSOR_HEADER, encode_cursor
 from coffee_backend.application import app
 from coffee_backend.mongo.database import get_db
+from coffee_backend.schemas import Page
+from coffee_backend.settings import settings
 from tests.conftest import DummyDrinks, TestApp
 
 
@@ -36,10 +39,9 @@ async def test_api_get_drinks(
 
     app.dependency_overrides[get_db] = lambda: get_db_mock
 
-    drink_service_mock.return_value = [
-        dummy_drinks.drink_1,
-        dummy_drinks.drink_2,
-    ]
+    drink_service_mock.return_value = Page(
+        items=[dummy_drinks.drink_1, dummy_drinks.drink_2]
+    )
 
     response = await test_app.client.get(
         "/api/v1/drinks",
@@ -58,6 +60,7 @@ async def test_api_get_drinks(
         page=1,
         first_id=None,
         coffee_bean_id=None,
+        after_id=None,
     )
 
     app.dependency_overrides = {}
@@ -77,10 +80,9 @@ async def test_api_get_drinks_with_query_params(
 
     app.dependency_overrides[get_db] = lambda: get_db_mock
 
-    drink_service_mock.return_value = [
-        dummy_drinks.drink_1,
-        dummy_drinks.drink_2,
-    ]
+    drink_service_mock.return_value = Page(
+        items=[dummy_drinks.drink_1, dummy_drinks.drink_2]
+    )
 
     response = await test_app.client.get(
         "/api/v1/drinks?coffee_bean_id=0668fdc6-cf0d-7855-8000-24d389e2cbb7&page=1&page_size=5&first_drink_id=0668fdc7-5d12-7ddb-8000-53ff75679f05",
@@ -99,6 +101,7 @@ async def test_api_get_drinks_with_query_params(
         page=1,
         first_id=UUID("0668fdc7-5d12-7ddb-8000-53ff75679f05"),
         coffee_bean_id=None,
+        after_id=None,
     )
 
     app.dependency_overrides = {}
@@ -127,7 +130,7 @@ async def test_api_get_drinks_with_emtpy_crud_response(
 
     app.dependency_overrides[get_db] = lambda: get_db_mock
 
-    drink_service_mock.return_value = []
+    drink_service_mock.return_value = Page(items=[])
 
     response = await test_app.client.get(
         "/api/v1/drinks",
@@ -143,6 +146,67 @@ async def test_api_get_drinks_with_emtpy_crud_response(
         page=1,
         first_id=None,
         coffee_bean_id=None,
+        after_id=None,
     )
 
     app.dependency_overrides = {}
+
+
+@patch(
+    "coffee_backend.services.drink.DrinkService.list_drinks_with_coffee_bean_information"
+)
+@pytest.mark.asyncio
+async def test_api_get_drinks_with_cursor(
+    drink_service_mock: AsyncMock,
+    test_app: TestApp,
+    dummy_drinks: DummyDrinks,
+    mock_security_dependency: Generator,
+) -> None:
+    """Test that the cursor is passed as id the page starts after and the
+    cursor of the next page is returned in a header."""
+    get_db_mock = AsyncMock()
+
+    app.dependency_overrides[get_db] = lambda: get_db_mock
+
+    drink_service_mock.return_value = Page(
+        items=[dummy_drinks.drink_1], next_id=dummy_drinks.drink_1.id
+    )
+
+    response = await test_app.client.get(
+        "/api/v1/drinks",
+        params={
+            "page_size": 1,
+            "cursor": encode_cursor(dummy_drinks.drink_2.id),
+        },
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers[NEXT_CURSOR_HEADER] == encode_cursor(
+        dummy_drinks.drink_1.id
+    )
+
+    drink_service_mock.assert_awaited_once_with(
+        db_session=get_db_mock,
+        page_size=1,
+        page=1,
+        first_id=None,
+        coffee_bean_id=None,
+        after_id=dummy_drinks.drink_2.id,
+    )
+
+    app.dependency_overrides = {}
+
+
+@pytest.mark.asyncio
+async def test_api_get_drinks_page_size_limit(
+    test_app: TestApp,
+    mock_security_dependency: Generator,
+) -> None:
+    """Test that page sizes above the limit are rejected."""
+    response = await test_app.client.get(
+        f"/api/v1/drinks?page_size={settings.list_max_page_size + 1}",
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 422
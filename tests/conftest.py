@@ -1,6 +1,7 @@
 import logging
 from dataclasses import dataclass
-from typing import AsyncGenerator, Generator
+from typing import AsyncGenerator, AsyncIterator, Generator, Optional
+from unittest.mock import AsyncMock, MagicMock
 from uuid import UUID
 
 import motor.motor_asyncio
@@ -20,7 +21,16 @@ from testcontainers.mongodb import MongoDbContainer  # type: ignore
 
 from coffee_backend.api import auth
 from coffee_backend.application import app, lifespan
-from coffee_backend.schemas import BrewingMethod, Coffee, Drink
+from coffee_backend.exceptions.exceptions import ObjectNotFoundError
+from coffee_backend.mongo.search_terms import search_terms
+from coffee_backend.s3.types.object_stream import ObjectStream
+from coffee_backend.schemas import (
+    BrewingMethod,
+    Coffee,
+    Drink,
+    ImageMetadata,
+    UploadStream,
+)
 from coffee_backend.settings import settings
 
 logging.getLogger().setLevel(logging.DEBUG)
@@ -355,6 +365,97 @@ def mock_user_token_payload(request: Request) -> None:
     }
 
 
+def create_object_stream(
+    data: bytes, file_type: str, content_range: Optional[str] = None
+) -> ObjectStream:
+    """Create an object stream serving the given bytes in two chunks.
+
+    Args:
+        data (bytes): The content of the streamed object.
+        file_type (str): The file type of the streamed object.
+        content_range (Optional[str]): The content range if data is only a
+            range of the object.
+
+    Returns:
+        ObjectStream: The object stream with a mocked S3 response.
+    """
+
+    async def chunks() -> AsyncIterator[bytes]:
+        middle = len(data) // 2
+        yield data[:middle]
+        yield data[middle:]
+
+    return ObjectStream(
+        chunks=chunks(),
+        size=len(data),
+        etag="etag",
+        file_type=file_type,
+        response=MagicMock(),
+        content_range=content_range,
+    )
+
+
+def create_upload_stream(
+    data: bytes, content_type: Optional[str] = "image/jpeg"
+) -> UploadStream:
+    """Create an upload stream of the given bytes in two chunks.
+
+    Args:
+        data (bytes): The content of the uploaded file.
+        content_type (Optional[str]): The content type of the uploaded file.
+
+    Returns:
+        UploadStream: The upload stream.
+    """
+
+    async def chunks() -> AsyncIterator[bytes]:
+        middle = len(data) // 2
+        yield data[:middle]
+        yield data[middle:]
+
+    return UploadStream(content_type=content_type, chunks=chunks())
+
+
+def create_db_session() -> MagicMock:
+    """Create a database session mock whose client starts further session
+    mocks, like the sessions of background jobs.
+
+    Returns:
+        MagicMock: The database session mock. The session started by its
+            client is the return value of its client's start_session.
+    """
+    db_session = MagicMock()
+    started_session = MagicMock()
+    started_session.__aenter__.return_value = started_session
+    db_session.client.start_session = AsyncMock(return_value=started_session)
+
+    return db_session
+
+
+def create_image_metadata_crud(
+    metadata: Optional[ImageMetadata] = None,
+) -> AsyncMock:
+    """Create an image metadata CRUD mock reading the given metadata.
+
+    Args:
+        metadata (Optional[ImageMetadata]): The recorded image metadata. If
+            not set, no metadata is recorded for the image.
+
+    Returns:
+        AsyncMock: The image metadata CRUD mock.
+    """
+    image_metadata_crud = AsyncMock()
+
+    if metadata is None:
+        image_metadata_crud.read.side_effect = ObjectNotFoundError(
+            message="No image metadata found"
+        )
+    else:
+        image_metadata_crud.read.return_value = metadata
+
+    return image_metadata_crud
+
+
 @pytest_asyncio.fixture()
 async def insert_coffees_with_matching_drinks(
     init_mongo: TestDBSessions,
@@ -595,7 +696,12 @@ async def insert_coffees_with_matching_drinks(
             settings.mongodb_coffee_collection
         ].insert_many(
             [
-                coffee.model_dump(by_alias=True, exclude_none=True)
+                {
+                    **coffee.model_dump(by_alias=True, exclude_none=True),
+                    "search_terms": search_terms(
+                        coffee.name, coffee.roasting_company, coffee.owner_name
+                    ),
+                }
                 for coffee in dummy_coffees
             ]
         )
@@ -0,0 +1,69 @@
+from unittest.mock import MagicMock
+
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+
+from coffee_backend.http_client.session import (
+    create_client_session,
+    shared_or_temporary_session,
+)
+
+
+@pytest.mark.asyncio
+async def test_create_client_session_configures_pool() -> None:
+    """Test that the shared session is created with the configured connection
+    pool and timeouts."""
+
+    metric_mock = MagicMock()
+    metric_mock.trace_config.return_value = aiohttp.TraceConfig()
+
+    session = create_client_session(
+        metric=metric_mock,
+        pool_limit=42,
+        pool_limit_per_host=7,
+        keepalive_timeout=12,
+        dns_cache_ttl=60,
+        connect_timeout=1.5,
+        read_timeout=3,
+    )
+
+    try:
+        connector = session.connector
+
+        assert isinstance(connector, aiohttp.TCPConnector)
+        assert connector.limit == 42
+        assert connector.limit_per_host == 7
+        assert connector.use_dns_cache
+        assert session.timeout.sock_connect == 1.5
+        assert session.timeout.sock_read == 3
+
+        metric_mock.trace_config.assert_called_once_with(pool_limit=42)
+    finally:
+        await session.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_or_temporary_session() -> None:
+    """Test that the shared session is reused and kept open, while a temporary
+    session is used and closed when no shared session exists."""
+
+    shared_session = aiohttp.ClientSession()
+
+    async with shared_or_temporary_session(shared_session) as session:
+        assert session is shared_session
+
+    assert not shared_session.closed
+
+    await shared_session.close()
+
+    with aioresponses() as mocked_responses:
+        mocked_responses.get("http://localhost/test", status=200)
+
+        async with shared_or_temporary_session(shared_session) as session:
+            assert session is not shared_session
+
+            async with session.get("http://localhost/test") as response:
+                assert response.status == 200
+
+    assert session.closed
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from coffee_backend.metrics.http_client import HttpClientMetric
+
+
+@patch("coffee_backend.metrics.http_client.Counter")
+@patch("coffee_backend.metrics.http_client.Gauge")
+@pytest.mark.asyncio
+async def test_http_client_metric_trace_config(
+    gauge_mock: MagicMock, counter_mock: MagicMock
+) -> None:
+    """Test that the trace config hooks record the connection pool usage."""
+
+    gauges = {
+        "http_client_pool_limit": MagicMock(),
+        "http_client_requests_in_flight": MagicMock(),
+    }
+    counters = {
+        "http_client_connections_created": MagicMock(),
+        "http_client_connections_reused": MagicMock(),
+        "http_client_connections_queued": MagicMock(),
+    }
+    gauge_mock.side_effect = lambda name, _: gauges[name]
+    counter_mock.side_effect = lambda name, _: counters[name]
+
+    http_client_metric = HttpClientMetric()
+    trace_config = http_client_metric.trace_config(pool_limit=10)
+
+    gauges["http_client_pool_limit"].set.assert_called_once_with(10)
+
+    session = MagicMock()
+    ctx = SimpleNamespace()
+
+    await trace_config.on_request_start[0](session, ctx, MagicMock())
+    await trace_config.on_connection_queued_start[0](session, ctx, MagicMock())
+    await trace_config.on_connection_create_end[0](session, ctx, MagicMock())
+    await trace_config.on_connection_reuseconn[0](session, ctx, MagicMock())
+    await trace_config.on_request_end[0](session, ctx, MagicMock())
+
+    gauges["http_client_requests_in_flight"].inc.assert_called_once()
+    gauges["http_client_requests_in_flight"].dec.assert_called_once()
+    counters["http_client_connections_created"].inc.assert_called_once()
+    counters["http_client_connections_reused"].inc.assert_called_once()
+    counters["http_client_connections_queued"].inc.assert_called_once()
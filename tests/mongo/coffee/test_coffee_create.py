@@ -29,8 +29,6 @@ async def test_mongo_coffee_create(
         await test_crud.create(db_session=session, coffee=dummy_coffee)
 
     assert "Stored new entry in database" in caplog.messages
-    assert f"Entry: {dummy_coffee.model_dump(by_alias=True)}" in caplog.messages
-
     with init_mongo.sync_probe_session.start_session() as session:
         result = list(
             session.client[settings.mongodb_database][
@@ -44,8 +42,9 @@ async def test_mongo_coffee_create(
             "roasting_company": "Starbucks",
             "owner_id": UUID("018ee105-66b3-7f89-b6f3-807782e40350"),
             "owner_name": "Jdoe",
-            "rating_count": None,
-            "rating_average": None,
+            "rating_count": 0,
+            "rating_sum": 0,
+            "search_terms": ["colombian", "jdoe", "starbucks"],
         }
 
 
@@ -0,0 +1,85 @@
+import pytest
+
+from coffee_backend.mongo.coffee import CoffeeCRUD
+from coffee_backend.settings import settings
+from tests.conftest import DummyCoffees, DummyDrinks, TestDBSessions
+
+
+@pytest.mark.asyncio
+async def test_mongo_coffee_increment_rating(
+    init_mongo: TestDBSessions, dummy_coffees: DummyCoffees
+) -> None:
+    """Test that ratings are added to and removed from the stored rating
+    summary."""
+    coffee_1 = dummy_coffees.coffee_1
+
+    test_crud = CoffeeCRUD(
+        settings.mongodb_database, settings.mongodb_coffee_collection
+    )
+
+    async with await init_mongo.asncy_session.start_session() as session:
+        await test_crud.create(db_session=session, coffee=coffee_1)
+
+        for count, rating in [(1, 5.0), (1, 4.0), (1, 2.5), (-1, -5.0)]:
+            await test_crud.increment_rating(
+                db_session=session,
+                coffee_id=coffee_1.id,
+                count=count,
+                rating=rating,
+            )
+
+        result = await test_crud.read(
+            db_session=session, query={"_id": coffee_1.id}
+        )
+
+    assert result[0].rating_count == 2
+    assert result[0].rating_average == 3.25
+
+
+@pytest.mark.asyncio
+async def test_mongo_coffee_recompute_ratings(
+    init_mongo: TestDBSessions,
+    dummy_coffees: DummyCoffees,
+    dummy_drinks: DummyDrinks,
+) -> None:
+    """Test that rating summaries are recomputed from the stored drinks."""
+    coffee_1 = dummy_coffees.coffee_1
+    coffee_2 = dummy_coffees.coffee_2
+
+    with init_mongo.sync_probe_session.start_session() as session:
+        session.client[settings.mongodb_database][
+            settings.mongodb_coffee_collection
+        ].insert_many(
+            [
+                {**coffee_1.model_dump(by_alias=True), "rating_count": 7},
+                {**coffee_2.model_dump(by_alias=True), "rating_sum": 3},
+            ]
+        )
+        session.client[settings.mongodb_database][
+            settings.mongodb_drink_collection
+        ].insert_many(
+            [
+                dummy_drinks.drink_1.model_dump(by_alias=True),
+                dummy_drinks.drink_2.model_dump(by_alias=True),
+            ]
+        )
+
+    test_crud = CoffeeCRUD(
+        settings.mongodb_database, settings.mongodb_coffee_collection
+    )
+
+    async with await init_mongo.asncy_session.start_session() as session:
+        await test_crud.recompute_ratings(
+            db_session=session,
+            drink_collection=settings.mongodb_drink_collection,
+        )
+
+    with init_mongo.sync_probe_session.start_session() as session:
+        result = {
+            document["_id"]: (document["rating_count"], document["rating_sum"])
+            for document in session.client[settings.mongodb_database][
+                settings.mongodb_coffee_collection
+            ].find()
+        }
+
+    assert result == {coffee_1.id: (1, 5), coffee_2.id: (0, 0)}
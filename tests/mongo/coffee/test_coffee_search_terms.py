@@ -0,0 +1,51 @@
+import pytest
+
+from coffee_backend.mongo.coffee import CoffeeCRUD
+from coffee_backend.mongo.search_terms import MISSING_SEARCH_TERMS
+from coffee_backend.settings import settings
+from tests.conftest import DummyCoffees, TestDBSessions
+
+
+@pytest.mark.asyncio
+async def test_mongo_coffee_update_search_terms(
+    init_mongo: TestDBSessions, dummy_coffees: DummyCoffees
+) -> None:
+    """Test that missing search terms are stored and stored search terms are
+    kept."""
+    coffee_1 = dummy_coffees.coffee_1
+    coffee_2 = dummy_coffees.coffee_2
+
+    with init_mongo.sync_probe_session.start_session() as session:
+        session.client[settings.mongodb_database][
+            settings.mongodb_coffee_collection
+        ].insert_many(
+            [
+                coffee_1.model_dump(by_alias=True),
+                {
+                    **coffee_2.model_dump(by_alias=True),
+                    "search_terms": ["kept"],
+                },
+            ]
+        )
+
+    test_crud = CoffeeCRUD(
+        settings.mongodb_database, settings.mongodb_coffee_collection
+    )
+
+    async with await init_mongo.asncy_session.start_session() as session:
+        await test_crud.update_search_terms(
+            db_session=session, query=MISSING_SEARCH_TERMS
+        )
+
+    with init_mongo.sync_probe_session.start_session() as session:
+        result = {
+            document["_id"]: document["search_terms"]
+            for document in session.client[settings.mongodb_database][
+                settings.mongodb_coffee_collection
+            ].find()
+        }
+
+    assert result == {
+        coffee_1.id: ["colombian", "jdoe", "starbucks"],
+        coffee_2.id: ["kept"],
+    }
@@ -113,3 +113,14 @@ async def test_mongo_coffee_update_verify_other_data_is_unchanged(
         ].find_one({"_id": coffe_1_backup.id})
 
         assert coffee_1_check == coffe_1_backup.model_dump(by_alias=True)
+
+        updated_coffee = session.client[settings.mongodb_database][
+            settings.mongodb_coffee_collection
+        ].find_one({"_id": coffee_2.id})
+
+        assert updated_coffee is not None
+        assert updated_coffee["search_terms"] == [
+            "colombian",
+            "jdoe",
+            "starbucks",
+        ]
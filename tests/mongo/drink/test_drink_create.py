@@ -30,11 +30,8 @@ async def test_mongo_drink_create(
         await test_crud.create(db_session=session, drink=dummy_drink)
 
     assert "Stored new entry in database" in caplog.messages
-    assert "Ensuring index for coffee_id attribute exists" in caplog.messages
     assert f"Entry: {dummy_drink.model_dump(by_alias=True)}" in caplog.messages
 
-    assert test_crud.first_drink is False
-
     with init_mongo.sync_probe_session.start_session() as session:
         result = list(
             session.client[settings.mongodb_database][
@@ -87,30 +84,22 @@ async def test_mongo_drink_create_duplicate(
 
 
 @pytest.mark.asyncio
-async def test_mongo_drink_not_create_index_after_first_add(
+async def test_mongo_drink_create_does_not_build_index(
     dummy_drinks: DummyDrinks,
 ) -> None:
-    """Test that the index is not created after the first drink is added."""
+    """Test that adding a drink does not build indexes in the request path."""
 
     test_db_session = AsyncMock()
 
-    insert_one_mock = AsyncMock()
-
-    create_index_mock = AsyncMock()
-
     test_crud = DrinkCRUD(
         settings.mongodb_database, settings.mongodb_drink_collection
     )
 
-    test_db_session.client[settings.mongodb_database][
+    collection = test_db_session.client[settings.mongodb_database][
         settings.mongodb_drink_collection
-    ].insert_one = insert_one_mock
-
-    test_db_session.client[settings.mongodb_database][
-        settings.mongodb_drink_collection
-    ].create_index = create_index_mock
-
-    test_crud.first_drink = False
+    ]
+    collection.insert_one = AsyncMock()
+    collection.create_index = AsyncMock()
 
     drink = await test_crud.create(
         db_session=test_db_session, drink=dummy_drinks.drink_2
@@ -118,6 +107,6 @@ async def test_mongo_drink_not_create_index_after_first_add(
 
     assert drink == dummy_drinks.drink_2
 
-    assert insert_one_mock.call_count == 1
+    assert collection.insert_one.call_count == 1
 
-    assert create_index_mock.call_count == 0
+    assert collection.create_index.call_count == 0
@@ -0,0 +1,85 @@
+import pytest
+
+from coffee_backend.mongo.image_blob import ImageBlobCRUD
+from coffee_backend.settings import settings
+from tests.conftest import TestDBSessions
+
+SHA256 = "a" * 64
+
+KEY_1 = "coffee_drink/123e4567-e19b-12d3-a456-426655440000"
+
+KEY_2 = "coffee_drink/123e4567-e19b-12d3-a456-426655440001"
+
+
+@pytest.mark.asyncio
+async def test_mongo_image_blob_references(
+    init_mongo: TestDBSessions,
+) -> None:
+    """Test that a blob is only released with its last reference, its record
+    kept until deleted, and that adding a reference twice counts once."""
+
+    test_crud = ImageBlobCRUD(
+        settings.mongodb_database, settings.mongodb_image_blob_collection
+    )
+
+    async with await init_mongo.asncy_session.start_session() as session:
+        await test_crud.add_reference(session, SHA256, KEY_1)
+        await test_crud.add_reference(session, SHA256, KEY_1)
+        await test_crud.add_reference(session, SHA256, KEY_2)
+
+        assert await test_crud.remove_reference(session, SHA256, KEY_1) is False
+        assert await test_crud.remove_reference(session, SHA256, KEY_2) is True
+
+        collection = session.client[settings.mongodb_database][
+            settings.mongodb_image_blob_collection
+        ]
+
+        assert await collection.find_one({"_id": SHA256}) == {
+            "_id": SHA256,
+            "references": [],
+            "deleting": True,
+        }
+
+        await test_crud.delete(session, SHA256)
+
+        assert await collection.find_one({"_id": SHA256}) is None
+
+
+@pytest.mark.asyncio
+async def test_mongo_image_blob_remove_unknown_reference(
+    init_mongo: TestDBSessions,
+) -> None:
+    """Test that removing a reference of an unknown blob releases nothing."""
+
+    test_crud = ImageBlobCRUD(
+        settings.mongodb_database, settings.mongodb_image_blob_collection
+    )
+
+    async with await init_mongo.asncy_session.start_session() as session:
+        assert await test_crud.remove_reference(session, SHA256, KEY_1) is False
+
+
+@pytest.mark.asyncio
+async def test_mongo_image_blob_no_reference_while_deleting(
+    init_mongo: TestDBSessions,
+) -> None:
+    """Test that no reference can be added to a blob between the removal of
+    its last reference and the deletion of its record."""
+
+    test_crud = ImageBlobCRUD(
+        settings.mongodb_database, settings.mongodb_image_blob_collection
+    )
+
+    async with await init_mongo.asncy_session.start_session() as session:
+        assert await test_crud.add_reference(session, SHA256, KEY_1) is True
+        assert await test_crud.remove_reference(session, SHA256, KEY_1) is True
+
+        assert await test_crud.add_reference(session, SHA256, KEY_2) is False
+        assert await test_crud.remove_reference(session, SHA256, KEY_2) is False
+
+        await test_crud.delete(session, SHA256)
+
+        assert await test_crud.add_reference(session, SHA256, KEY_2) is True
+        assert await session.client[settings.mongodb_database][
+            settings.mongodb_image_blob_collection
+        ].find_one({"_id": SHA256}) == {"_id": SHA256, "references": [KEY_2]}
@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from coffee_backend.exceptions.exceptions import ObjectNotFoundError
+from coffee_backend.mongo.image_metadata import ImageMetadataCRUD
+from coffee_backend.schemas import ImageMetadata, StoredImageVariant
+from coffee_backend.settings import settings
+from tests.conftest import TestDBSessions
+
+KEY = "coffee_bean/123e4567-e19b-12d3-a456-426655440000"
+
+ORIGINAL = StoredImageVariant(
+    size=100,
+    etag="original-etag",
+    last_modified=datetime(2024, 5, 1, 12, 0, 0, tzinfo=timezone.utc),
+    file_type="jpeg",
+)
+
+SMALL = StoredImageVariant(
+    size=10,
+    etag="small-etag",
+    last_modified=datetime(2024, 5, 1, 12, 0, 5, tzinfo=timezone.utc),
+    file_type="jpeg",
+)
+
+
+@pytest.mark.asyncio
+async def test_mongo_image_metadata_replace_and_update(
+    init_mongo: TestDBSessions,
+) -> None:
+    """Test that recorded variants are added to replaced metadata and read
+    back with timezone aware datetimes."""
+
+    test_crud = ImageMetadataCRUD(
+        settings.mongodb_database, settings.mongodb_image_metadata_collection
+    )
+    checked_at = datetime(2024, 5, 1, 12, 1, 0, tzinfo=timezone.utc)
+
+    async with await init_mongo.asncy_session.start_session() as session:
+        await test_crud.replace(
+            db_session=session,
+            metadata=ImageMetadata(
+                _id=KEY,
+                variants={"original": ORIGINAL},
+                small_checked_at=checked_at,
+            ),
+        )
+        await test_crud.update_variants(
+            db_session=session,
+            key=KEY,
+            variants={"small": SMALL},
+            small_checked_at=checked_at,
+        )
+
+        result = await test_crud.read(db_session=session, key=KEY)
+
+        assert result == ImageMetadata(
+            _id=KEY,
+            variants={"original": ORIGINAL, "small": SMALL},
+            small_checked_at=checked_at,
+        )
+
+        assert await test_crud.read_many(
+            db_session=session, keys=[KEY, "coffee_bean/unknown"]
+        ) == [result]
+
+
+@pytest.mark.asyncio
+async def test_mongo_image_metadata_delete(
+    init_mongo: TestDBSessions,
+) -> None:
+    """Test that deleted metadata is not found anymore."""
+
+    test_crud = ImageMetadataCRUD(
+        settings.mongodb_database, settings.mongodb_image_metadata_collection
+    )
+
+    async with await init_mongo.asncy_session.start_session() as session:
+        await test_crud.replace(
+            db_session=session,
+            metadata=ImageMetadata(_id=KEY, variants={"original": ORIGINAL}),
+        )
+        await test_crud.delete(db_session=session, key=KEY)
+
+        with pytest.raises(ObjectNotFoundError):
+            await test_crud.read(db_session=session, key=KEY)
+
+
+@pytest.mark.asyncio
+async def test_mongo_image_metadata_remove_variant(
+    init_mongo: TestDBSessions,
+) -> None:
+    """Test that removing a variant keeps the other variants."""
+
+    test_crud = ImageMetadataCRUD(
+        settings.mongodb_database, settings.mongodb_image_metadata_collection
+    )
+
+    async with await init_mongo.asncy_session.start_session() as session:
+        await test_crud.replace(
+            db_session=session,
+            metadata=ImageMetadata(
+                _id=KEY, variants={"original": ORIGINAL, "small": SMALL}
+            ),
+        )
+        await test_crud.remove_variant(
+            db_session=session, key=KEY, variant="small"
+        )
+
+        result = await test_crud.read(db_session=session, key=KEY)
+
+        assert result.variants == {"original": ORIGINAL}
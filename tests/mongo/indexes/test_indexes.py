@@ -0,0 +1,174 @@
+from typing import Any, AsyncIterator, Dict, List
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo.errors import OperationFailure, ServerSelectionTimeoutError
+
+from coffee_backend.mongo.indexes import (
+    COFFEE_INDEXES,
+    DRINK_INDEXES,
+    IndexSpec,
+    ensure_indexes,
+    reconcile_indexes,
+)
+
+SPECS = (
+    IndexSpec(name="owner_id_id", keys=(("owner_id", 1), ("_id", -1))),
+    IndexSpec(name="name", keys=(("name", 1),), unique=True),
+)
+
+
+def create_collection(
+    existing: Dict[str, Dict[str, Any]], stats: List[Dict[str, Any]]
+) -> MagicMock:
+    """Create a collection mock with the given indexes and index stats."""
+    collection = MagicMock()
+    collection.index_information = AsyncMock(return_value=existing)
+    collection.create_index = AsyncMock()
+
+    async def aggregate() -> AsyncIterator[Dict[str, Any]]:
+        for entry in stats:
+            yield entry
+
+    collection.aggregate.side_effect = lambda pipeline: aggregate()
+    return collection
+
+
+@pytest.mark.asyncio
+async def test_reconcile_indexes_creates_missing() -> None:
+    """Test that missing indexes are created with their declared options."""
+    collection = create_collection({"_id_": {"key": [("_id", 1)]}}, [])
+
+    report = await reconcile_indexes(collection, SPECS)
+
+    assert report.created == ["owner_id_id", "name"]
+    assert not report.drifted
+    assert not report.unmanaged
+    collection.create_index.assert_any_await(
+        [("owner_id", 1), ("_id", -1)], name="owner_id_id", unique=False
+    )
+    collection.create_index.assert_any_await(
+        [("name", 1)], name="name", unique=True
+    )
+    collection.aggregate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_indexes_reports_drifted_and_unmanaged() -> None:
+    """Test that drifted, unused and unmanaged indexes are reported but
+    kept."""
+    collection = create_collection(
+        {
+            "_id_": {"key": [("_id", 1)]},
+            "owner_id_id": {"key": [("owner_id", 1), ("_id", -1)]},
+            "name": {"key": [("name", 1)]},
+            "coffee_id_1": {"key": [("coffee_id", 1)]},
+        },
+        [
+            {"name": "coffee_id_1", "accesses": {"ops": 0}},
+            {"name": "owner_id_id", "accesses": {"ops": 12}},
+            {"name": "name", "accesses": {"ops": 0}},
+        ],
+    )
+
+    report = await reconcile_indexes(collection, SPECS)
+
+    assert not report.created
+    assert report.drifted == ["name"]
+    assert report.unused == ["name"]
+    assert report.unmanaged == {"coffee_id_1": 0}
+    collection.create_index.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_indexes_unknown_usage() -> None:
+    """Test that unmanaged indexes are reported without usage and no index
+    is reported unused if index stats are not permitted."""
+    collection = create_collection(
+        {
+            "_id_": {"key": [("_id", 1)]},
+            "owner_id_id": {"key": [("owner_id", 1), ("_id", -1)]},
+            "coffee_id_1": {"key": [("a", 1)]},
+        },
+        [],
+    )
+    collection.aggregate.side_effect = OperationFailure("unauthorized")
+
+    report = await reconcile_indexes(collection, SPECS[:1])
+
+    assert not report.unused
+    assert report.unmanaged == {"coffee_id_1": -1}
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that every collection is reconciled and failures are logged
+    without stopping the others."""
+    failing = MagicMock()
+    failing.index_information = AsyncMock(
+        side_effect=ServerSelectionTimeoutError("timeout")
+    )
+    collections = {
+        "coffee": failing,
+        "drink": create_collection(
+            {"user_id_id": {"key": [("user_id", 1), ("_id", -1)]}},
+            [{"name": "user_id_id", "accesses": {"ops": 0}}],
+        ),
+    }
+    database = MagicMock()
+    database.__getitem__.side_effect = collections.__getitem__
+
+    await ensure_indexes(
+        database=database,
+        indexes={"coffee": COFFEE_INDEXES, "drink": DRINK_INDEXES},
+    )
+
+    assert "Unable to reconcile indexes of coffee: timeout" in caplog.messages
+    assert "Created index coffee_bean_id_id on drink" in caplog.messages
+    assert (
+        "Index user_id_id on drink was not used since the server started"
+        in caplog.messages
+    )
+    assert (
+        collections["drink"].create_index.await_count == len(DRINK_INDEXES) - 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_reconcile_indexes_text_index() -> None:
+    """Test that the text index is created with its weights and compared by
+    its weights and language instead of its keys."""
+    search = next(spec for spec in COFFEE_INDEXES if spec.name == "search")
+    weights = {"name": 10, "roasting_company": 5, "owner_name": 1}
+    collection = create_collection({}, [])
+
+    await reconcile_indexes(collection, (search,))
+
+    collection.create_index.assert_awaited_once_with(
+        [
+            ("name", "text"),
+            ("roasting_company", "text"),
+            ("owner_name", "text"),
+        ],
+        name="search",
+        unique=False,
+        weights=weights,
+        default_language="none",
+    )
+
+    text_key = [("_fts", "text"), ("_ftsx", 1)]
+    existing = {
+        "search": {
+            "key": text_key,
+            "weights": weights,
+            "default_language": "none",
+        }
+    }
+
+    report = await reconcile_indexes(create_collection(existing, []), (search,))
+    assert not report.drifted
+
+    existing["search"]["weights"] = {"name": 1}
+
+    report = await reconcile_indexes(create_collection(existing, []), (search,))
+    assert report.drifted == ["search"]
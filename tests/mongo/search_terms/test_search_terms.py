@@ -0,0 +1,28 @@
+from coffee_backend.mongo.search_terms import search_terms, search_words
+
+
+def test_search_words() -> None:
+    """Test that words are split lowercase and without diacritics."""
+    assert search_words("Martermühle Crème-Brûlée (No. 5)") == [
+        "martermuhle",
+        "creme",
+        "brulee",
+        "no",
+        "5",
+    ]
+
+
+def test_search_words_without_words() -> None:
+    """Test that texts of only punctuation and spaces have no words."""
+    assert not search_words(" - ")
+
+
+def test_search_terms() -> None:
+    """Test that the terms of texts are sorted and distinct."""
+    assert search_terms("Test Coffee 3", "Martermühle", "Peter", "coffee") == [
+        "3",
+        "coffee",
+        "martermuhle",
+        "peter",
+        "test",
+    ]
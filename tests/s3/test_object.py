@@ -1,15 +1,32 @@
-from unittest.mock import MagicMock
+import asyncio
+import hashlib
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Optional
+from unittest.mock import MagicMock, patch
 
 import pytest
 from minio import Minio  # type: ignore
 from minio import S3Error  # type: ignore
-
-from coffee_backend.exceptions.exceptions import ObjectNotFoundError
+from urllib3 import HTTPResponse
+
+from coffee_backend.exceptions.exceptions import (
+    ObjectNotFoundError,
+    RangeNotSatisfiableError,
+    UploadTimeoutError,
+    UploadTooLargeError,
+)
 from coffee_backend.s3.object import ObjectCRUD
+from coffee_backend.s3.types.byte_range import ByteRange
+from coffee_backend.s3.types.readable import Readable
+from coffee_backend.s3.types.upload_result import UploadResult
 from tests.conftest import DummyImages
 
 
-def test_object_create(
+@pytest.mark.asyncio
+async def test_object_create(
     init_minio: Minio, dummy_coffee_images: DummyImages
 ) -> None:
     """Test ObjectCRUD create method for S3 object creation.
@@ -25,7 +42,7 @@ def test_object_create(
 
     assert test_object_crud.bucket_name == "coffee-images"
 
-    test_object_crud.create(
+    await test_object_crud.create(
         filepath="original",
         filename="uploaded_file.jpeg",
         file=dummy_coffee_images.image_1.file,
@@ -39,13 +56,15 @@ def test_object_create(
     file_type_metadata = response.headers.get("x-amz-meta-filetype")
 
     assert file_type_metadata == "jpeg"
+    assert response.headers.get("Content-Type") == "image/jpeg"
 
     returned_object = response.data
 
     assert returned_object == dummy_coffee_images.image_1_bytes
 
 
-def test_object_create_second_version(
+@pytest.mark.asyncio
+async def test_object_create_second_version(
     init_minio: Minio, dummy_coffee_images: DummyImages
 ) -> None:
     """Test the ObjectCRUD create method for uploading multiple S3 objects.
@@ -62,14 +81,14 @@ def test_object_create_second_version(
 
     assert test_object_crud.bucket_name == "coffee-images"
 
-    test_object_crud.create(
+    await test_object_crud.create(
         filepath="original",
         filename="uploaded_file.jpeg",
         file=dummy_coffee_images.image_1.file,
         file_type="jpeg",
     )
 
-    test_object_crud.create(
+    await test_object_crud.create(
         filepath="original",
         filename="uploaded_file.jpeg",
         file=dummy_coffee_images.image_2.file,
@@ -89,7 +108,8 @@ def test_object_create_second_version(
     assert returned_object == dummy_coffee_images.image_2_bytes
 
 
-def test_object_read(
+@pytest.mark.asyncio
+async def test_object_read(
     init_minio: Minio, dummy_coffee_images: DummyImages
 ) -> None:
     """Test the ObjectCRUD read method for retrieving S3 objects.
@@ -105,14 +125,14 @@ def test_object_read(
 
     assert test_object_crud.bucket_name == "coffee-images"
 
-    test_object_crud.create(
+    await test_object_crud.create(
         filepath="original",
         filename="uploaded_file.jpeg",
         file=dummy_coffee_images.image_1.file,
         file_type="jpeg",
     )
 
-    returned_object, filetype = test_object_crud.read(
+    returned_object, filetype = await test_object_crud.read(
         filename="uploaded_file.jpeg", filepath="original"
     )
 
@@ -121,7 +141,8 @@ def test_object_read(
     assert returned_object == dummy_coffee_images.image_1_bytes
 
 
-def test_object_read_nonexisting_image(init_minio: Minio) -> None:
+@pytest.mark.asyncio
+async def test_object_read_nonexisting_image(init_minio: Minio) -> None:
     """Test the ObjectCRUD read method for a non-existing S3 object.
 
     Args:
@@ -134,12 +155,13 @@ def test_object_read_nonexisting_image(init_minio: Minio) -> None:
     assert test_object_crud.bucket_name == "coffee-images"
 
     with pytest.raises(ObjectNotFoundError):
-        test_object_crud.read(
+        await test_object_crud.read(
             filename="nonexisting_object", filepath="original"
         )
 
 
-def test_object_read_uncatched_error(init_minio: Minio) -> None:
+@pytest.mark.asyncio
+async def test_object_read_uncatched_error(init_minio: Minio) -> None:
     """Test the ObjectCRUD read method for an unhandled S3 error.
 
     This test verifies that when the ObjectCRUD read method encounters an
@@ -163,12 +185,13 @@ def test_object_read_uncatched_error(init_minio: Minio) -> None:
     assert test_object_crud.bucket_name == "coffee-images"
 
     with pytest.raises(S3Error, match="^S3 operation failed.*"):
-        test_object_crud.read(
+        await test_object_crud.read(
             filename="nonexisting_object", filepath="original"
         )
 
 
-def test_object_delete(
+@pytest.mark.asyncio
+async def test_object_delete(
     init_minio: Minio, dummy_coffee_images: DummyImages
 ) -> None:
     """Test the ObjectCRUD delete method for deleting S3 objects.
@@ -187,29 +210,32 @@ def test_object_delete(
         minio_client=init_minio, bucket_name="coffee-images"
     )
 
-    test_object_crud.create(
+    await test_object_crud.create(
         filepath="original",
         filename="uploaded_file.jpeg",
         file=dummy_coffee_images.image_1.file,
         file_type="jpeg",
     )
 
-    test_object_crud.create(
+    await test_object_crud.create(
         filepath="original",
         filename="uploaded_file.jpeg",
         file=dummy_coffee_images.image_2.file,
         file_type="jpeg",
     )
 
-    test_object_crud.delete(filename="uploaded_file.jpeg", filepath="original")
+    await test_object_crud.delete(
+        filename="uploaded_file.jpeg", filepath="original"
+    )
 
     with pytest.raises(ObjectNotFoundError):
-        test_object_crud.read(
+        await test_object_crud.read(
             filename="uploaded_file.jpeg", filepath="original"
         )
 
 
-def test_object_delete_verify_other_objects_stay_untouched(
+@pytest.mark.asyncio
+async def test_object_delete_verify_other_objects_stay_untouched(
     init_minio: Minio, dummy_coffee_images: DummyImages
 ) -> None:
     """Test the ObjectCRUD delete method for deleting S3 objects to not
@@ -224,28 +250,30 @@ def test_object_delete_verify_other_objects_stay_untouched(
         minio_client=init_minio, bucket_name="coffee-images"
     )
 
-    test_object_crud.create(
+    await test_object_crud.create(
         filename="uploaded_file.jpeg",
         filepath="original",
         file=dummy_coffee_images.image_1.file,
         file_type="jpeg",
     )
 
-    test_object_crud.create(
+    await test_object_crud.create(
         filename="uploaded_file_2.jpeg",
         filepath="original",
         file=dummy_coffee_images.image_2.file,
         file_type="jpeg",
     )
 
-    test_object_crud.delete(filename="uploaded_file.jpeg", filepath="original")
+    await test_object_crud.delete(
+        filename="uploaded_file.jpeg", filepath="original"
+    )
 
     with pytest.raises(ObjectNotFoundError):
-        test_object_crud.read(
+        await test_object_crud.read(
             filename="uploaded_file.jpeg", filepath="original"
         )
 
-    returned_object, filetype = test_object_crud.read(
+    returned_object, filetype = await test_object_crud.read(
         filename="uploaded_file_2.jpeg", filepath="original"
     )
 
@@ -254,7 +282,8 @@ def test_object_delete_verify_other_objects_stay_untouched(
     assert returned_object == dummy_coffee_images.image_2_bytes
 
 
-def test_object_delete_nonexisting_image(init_minio: Minio) -> None:
+@pytest.mark.asyncio
+async def test_object_delete_nonexisting_image(init_minio: Minio) -> None:
     """Test the ObjectCRUD delete method for a non-existing S3 object.
 
     Make sure that the ObjectCRUD delete method works without an erorr when
@@ -269,4 +298,665 @@ def test_object_delete_nonexisting_image(init_minio: Minio) -> None:
 
     assert test_object_crud.bucket_name == "coffee-images"
 
-    test_object_crud.delete(filename="nonexisting_object", filepath="original")
+    await test_object_crud.delete(
+        filename="nonexisting_object", filepath="original"
+    )
+
+
+@pytest.mark.asyncio
+async def test_object_read_concurrent_requests_do_not_serialize() -> None:
+    """Benchmark concurrent reads against a slow blocking Minio client.
+
+    Each read blocks for 0.2 seconds. Run in the thread pool, ten concurrent
+    reads have to finish in a fraction of the serialized time and must not
+    block the event loop meanwhile.
+    """
+    minio_mock = MagicMock()
+
+    def slow_get_object(  # pylint: disable=unused-argument
+        bucket_name: str, object_name: str, request_headers: dict
+    ) -> MagicMock:
+        time.sleep(0.2)
+        response = MagicMock()
+        response.data = b"image"
+        response.headers = {"x-amz-meta-filetype": "jpeg"}
+        return response
+
+    minio_mock.get_object.side_effect = slow_get_object
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        test_object_crud = ObjectCRUD(
+            minio_client=minio_mock,
+            bucket_name="coffee-images",
+            executor=executor,
+        )
+
+        heartbeats = 0
+
+        async def heartbeat() -> None:
+            nonlocal heartbeats
+            while True:
+                await asyncio.sleep(0.01)
+                heartbeats += 1
+
+        heartbeat_task = asyncio.create_task(heartbeat())
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                test_object_crud.read(
+                    filepath="original", filename=f"image_{index}"
+                )
+                for index in range(10)
+            )
+        )
+        duration = time.perf_counter() - start
+
+        heartbeat_task.cancel()
+
+    assert results == [(b"image", "jpeg")] * 10
+    assert minio_mock.get_object.call_count == 10
+    assert duration < 1.0
+    assert heartbeats > 5
+
+
+def create_minio_response(
+    data: bytes, content_range: Optional[str] = None
+) -> HTTPResponse:
+    """Create an unread Minio get_object response with a tracked release.
+
+    Args:
+        data (bytes): The body of the response.
+        content_range (Optional[str]): The content range header of a ranged
+            response.
+
+    Returns:
+        HTTPResponse: The response with a mocked release_conn method.
+    """
+    headers = {
+        "content-length": str(len(data)),
+        "etag": '"d41d8cd98f00b204e9800998ecf8427e"',
+        "x-amz-meta-filetype": "jpeg",
+        "last-modified": "Wed, 01 May 2024 12:00:00 GMT",
+    }
+
+    if content_range is not None:
+        headers["content-range"] = content_range
+
+    response = HTTPResponse(
+        body=io.BytesIO(data), headers=headers, preload_content=False
+    )
+    response.release_conn = MagicMock()  # type: ignore
+    return response
+
+
+@pytest.mark.asyncio
+async def test_object_stream() -> None:
+    """Test that ObjectCRUD stream yields the object in chunks with its
+    metadata and releases the connection once exhausted."""
+    minio_mock = MagicMock()
+    minio_response = create_minio_response(b"0123456789")
+    minio_mock.get_object.return_value = minio_response
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock, bucket_name="coffee-images"
+    )
+
+    stream = await test_object_crud.stream(
+        filepath="original", filename="uploaded_file.jpeg", chunk_size=4
+    )
+
+    assert stream.size == 10
+    assert stream.etag == "d41d8cd98f00b204e9800998ecf8427e"
+    assert stream.file_type == "jpeg"
+    assert stream.last_modified == datetime(
+        2024, 5, 1, 12, 0, tzinfo=timezone.utc
+    )
+
+    minio_response.release_conn.assert_not_called()  # type: ignore
+
+    chunks = [chunk async for chunk in stream.chunks]
+
+    assert chunks == [b"0123", b"4567", b"89"]
+    minio_response.release_conn.assert_called_once()  # type: ignore
+    minio_mock.get_object.assert_called_once_with(
+        bucket_name="coffee-images",
+        object_name="original/uploaded_file.jpeg",
+        request_headers={},
+    )
+
+
+@pytest.mark.asyncio
+async def test_object_stream_releases_connection_when_aborted() -> None:
+    """Test that the connection is released if the stream is closed before
+    the object was read completely, e.g. on a client disconnect."""
+    minio_mock = MagicMock()
+    minio_response = create_minio_response(b"0123456789")
+    minio_mock.get_object.return_value = minio_response
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock, bucket_name="coffee-images"
+    )
+
+    stream = await test_object_crud.stream(
+        filepath="original", filename="uploaded_file.jpeg", chunk_size=4
+    )
+
+    assert await anext(stream.chunks) == b"0123"
+
+    stream.close()
+
+    assert minio_response.closed
+    minio_response.release_conn.assert_called_once()  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_object_stream_nonexisting_image() -> None:
+    """Test that ObjectCRUD stream raises ObjectNotFoundError for a missing
+    object before any chunk is read."""
+    minio_mock = MagicMock()
+    minio_mock.get_object.side_effect = S3Error(
+        code="NoSuchKey",
+        message="error message",
+        resource="resource",
+        request_id="request_id",
+        host_id="host_id",
+        response=MagicMock(),
+    )
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock, bucket_name="coffee-images"
+    )
+
+    with pytest.raises(ObjectNotFoundError):
+        await test_object_crud.stream(
+            filepath="original", filename="nonexisting_object"
+        )
+
+
+def create_s3_error(code: str) -> S3Error:
+    """Create a S3Error with the given error code."""
+    return S3Error(
+        code=code,
+        message="error message",
+        resource="resource",
+        request_id="request_id",
+        host_id="host_id",
+        response=MagicMock(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_object_stream_byte_range() -> None:
+    """Test that ObjectCRUD stream requests a byte range from S3 and returns
+    its content range, conditional on an If-Range entity tag."""
+    minio_mock = MagicMock()
+    minio_mock.get_object.return_value = create_minio_response(
+        b"2345", content_range="bytes 2-5/10"
+    )
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock, bucket_name="coffee-images"
+    )
+
+    stream = await test_object_crud.stream(
+        filepath="original",
+        filename="uploaded_file.jpeg",
+        byte_range=ByteRange(start=2, end=5),
+        if_range='"d41d8cd98f00b204e9800998ecf8427e"',
+    )
+
+    assert stream.size == 4
+    assert stream.content_range == "bytes 2-5/10"
+    assert [chunk async for chunk in stream.chunks] == [b"2345"]
+
+    minio_mock.get_object.assert_called_once_with(
+        bucket_name="coffee-images",
+        object_name="original/uploaded_file.jpeg",
+        request_headers={
+            "If-Match": '"d41d8cd98f00b204e9800998ecf8427e"',
+            "Range": "bytes=2-5",
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_object_stream_byte_range_outdated_if_range() -> None:
+    """Test that the whole object is streamed if the If-Range validator does
+    not match the object anymore."""
+    minio_mock = MagicMock()
+    minio_mock.get_object.side_effect = [
+        create_s3_error("PreconditionFailed"),
+        create_minio_response(b"0123456789"),
+    ]
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock, bucket_name="coffee-images"
+    )
+
+    stream = await test_object_crud.stream(
+        filepath="original",
+        filename="uploaded_file.jpeg",
+        byte_range=ByteRange(start=2, end=5),
+        if_range="Wed, 21 Oct 2015 07:28:00 GMT",
+    )
+
+    assert stream.size == 10
+    assert stream.content_range is None
+
+    assert minio_mock.get_object.call_args_list[0].kwargs[
+        "request_headers"
+    ] == {
+        "If-Unmodified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+        "Range": "bytes=2-5",
+    }
+    assert (
+        minio_mock.get_object.call_args_list[1].kwargs["request_headers"] == {}
+    )
+
+
+@pytest.mark.asyncio
+async def test_object_stream_byte_range_not_satisfiable() -> None:
+    """Test that a range outside of the object raises
+    RangeNotSatisfiableError."""
+    minio_mock = MagicMock()
+    minio_mock.get_object.side_effect = create_s3_error("InvalidRange")
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock, bucket_name="coffee-images"
+    )
+
+    with pytest.raises(RangeNotSatisfiableError):
+        await test_object_crud.stream(
+            filepath="original",
+            filename="uploaded_file.jpeg",
+            byte_range=ByteRange(start=100, end=None),
+        )
+
+
+@pytest.mark.asyncio
+async def test_object_stat() -> None:
+    """Test that ObjectCRUD stat returns the object metadata without reading
+    its content."""
+    last_modified = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+    minio_mock = MagicMock()
+    minio_mock.stat_object.return_value = MagicMock(
+        size=10,
+        etag="d41d8cd98f00b204e9800998ecf8427e",
+        last_modified=last_modified,
+        metadata={"x-amz-meta-filetype": "jpeg"},
+    )
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock, bucket_name="coffee-images"
+    )
+
+    info = await test_object_crud.stat(
+        filepath="original", filename="uploaded_file.jpeg"
+    )
+
+    assert info.size == 10
+    assert info.etag == "d41d8cd98f00b204e9800998ecf8427e"
+    assert info.last_modified == last_modified
+    assert info.file_type == "jpeg"
+
+    minio_mock.stat_object.assert_called_once_with(
+        bucket_name="coffee-images", object_name="original/uploaded_file.jpeg"
+    )
+    minio_mock.get_object.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_object_stat_nonexisting_image() -> None:
+    """Test that ObjectCRUD stat raises ObjectNotFoundError for a missing
+    object."""
+    minio_mock = MagicMock()
+    minio_mock.stat_object.side_effect = create_s3_error("NoSuchKey")
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock, bucket_name="coffee-images"
+    )
+
+    with pytest.raises(ObjectNotFoundError):
+        await test_object_crud.stat(
+            filepath="original", filename="nonexisting_object"
+        )
+
+
+@patch("coffee_backend.s3.object.time")
+@pytest.mark.asyncio
+async def test_object_presign_caches_urls(time_mock: MagicMock) -> None:
+    """Test that presigned URLs are reused per object until a fifth of their
+    lifetime is left."""
+    time_mock.monotonic.return_value = 1000
+
+    minio_mock = MagicMock()
+    minio_mock.presigned_get_object.side_effect = ["url-1", "url-2", "url-3"]
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock, bucket_name="coffee-images"
+    )
+
+    assert (
+        await test_object_crud.presign(
+            filepath="coffee_bean/small", filename="image", expires=300
+        )
+        == "url-1"
+    )
+
+    minio_mock.presigned_get_object.assert_called_once_with(
+        bucket_name="coffee-images",
+        object_name="coffee_bean/small/image",
+        expires=timedelta(seconds=300),
+    )
+
+    time_mock.monotonic.return_value = 1239
+    assert (
+        await test_object_crud.presign(
+            filepath="coffee_bean/small", filename="image", expires=300
+        )
+        == "url-1"
+    )
+    assert (
+        await test_object_crud.presign(
+            filepath="coffee_bean/original", filename="image", expires=300
+        )
+        == "url-2"
+    )
+
+    time_mock.monotonic.return_value = 1240
+    assert (
+        await test_object_crud.presign(
+            filepath="coffee_bean/small", filename="image", expires=300
+        )
+        == "url-3"
+    )
+
+
+@pytest.mark.asyncio
+async def test_object_presign_uses_presign_client() -> None:
+    """Test that URLs are presigned with the client of the public endpoint."""
+    minio_mock = MagicMock()
+    presign_client_mock = MagicMock()
+    presign_client_mock.presigned_get_object.return_value = "public-url"
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock,
+        bucket_name="coffee-images",
+        presign_client=presign_client_mock,
+    )
+
+    assert (
+        await test_object_crud.presign(
+            filepath="coffee_bean/small", filename="image", expires=300
+        )
+        == "public-url"
+    )
+    minio_mock.presigned_get_object.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_object_presign_upload() -> None:
+    """Test that presigned uploads are restricted to the object, image
+    content types and the maximal size."""
+    presign_client_mock = MagicMock()
+    presign_client_mock.presigned_post_policy.return_value = {
+        "policy": "policy",
+        "x-amz-signature": "signature",
+    }
+
+    test_object_crud = ObjectCRUD(
+        minio_client=MagicMock(),
+        bucket_name="coffee-images",
+        presign_client=presign_client_mock,
+        bucket_url="https://images.example.com/coffee-images",
+    )
+
+    url, fields = await test_object_crud.presign_upload(
+        filepath="upload/coffee_bean",
+        filename="image",
+        expires=60,
+        max_size=100,
+    )
+
+    assert url == "https://images.example.com/coffee-images"
+    assert fields == {
+        "key": "upload/coffee_bean/image",
+        "policy": "policy",
+        "x-amz-signature": "signature",
+    }
+
+    policy = presign_client_mock.presigned_post_policy.call_args.args[0]
+    assert policy.bucket_name == "coffee-images"
+
+
+@pytest.mark.asyncio
+async def test_object_copy() -> None:
+    """Test that objects are copied within the bucket with their file type."""
+    minio_mock = MagicMock()
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock, bucket_name="coffee-images"
+    )
+
+    await test_object_crud.copy(
+        source_filepath="upload/coffee_bean",
+        filepath="coffee_bean/original",
+        filename="image",
+        file_type="png",
+    )
+
+    copy_call = minio_mock.copy_object.call_args
+    assert copy_call.kwargs["object_name"] == "coffee_bean/original/image"
+    assert copy_call.kwargs["source"].object_name == "upload/coffee_bean/image"
+    assert copy_call.kwargs["metadata"] == {
+        "Content-Type": "image/png",
+        "filetype": "png",
+    }
+
+
+@pytest.mark.asyncio
+async def test_object_copy_nonexisting_source() -> None:
+    """Test that copying a missing object raises ObjectNotFoundError."""
+    minio_mock = MagicMock()
+    minio_mock.copy_object.side_effect = create_s3_error("NoSuchKey")
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock, bucket_name="coffee-images"
+    )
+
+    with pytest.raises(ObjectNotFoundError):
+        await test_object_crud.copy(
+            source_filepath="upload/coffee_bean",
+            filepath="coffee_bean/original",
+            filename="image",
+            file_type="png",
+        )
+
+
+async def upload_chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+    """Yield the given chunks like a streamed request body."""
+    for chunk in chunks:
+        yield chunk
+
+
+def read_all(data: Readable, part_size: int = 4) -> bytes:
+    """Read a readable in parts like the Minio client does."""
+    content = b""
+
+    while part := data.read(part_size):
+        assert isinstance(part, bytes)
+        content += part
+
+    return content
+
+
+@pytest.mark.asyncio
+async def test_object_create_stream() -> None:
+    """Test that streamed chunks are uploaded while they arrive and that the
+    size and digest of the content are returned."""
+    minio_mock = MagicMock()
+    uploaded = []
+
+    def put_object(**kwargs: Any) -> MagicMock:
+        uploaded.append(read_all(kwargs["data"]))
+        return MagicMock()
+
+    minio_mock.put_object.side_effect = put_object
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock, bucket_name="coffee-images"
+    )
+
+    result = await test_object_crud.create_stream(
+        filepath="coffee_bean/original",
+        filename="image",
+        chunks=upload_chunks(b"first-", b"", b"second"),
+        file_type="jpeg",
+        max_size=12,
+    )
+
+    assert uploaded == [b"first-second"]
+    assert result == UploadResult(
+        size=12, sha256=hashlib.sha256(b"first-second").hexdigest()
+    )
+    put_call = minio_mock.put_object.call_args
+    assert put_call.kwargs["object_name"] == "coffee_bean/original/image"
+    assert put_call.kwargs["length"] == -1
+    assert put_call.kwargs["metadata"] == {"filetype": "jpeg"}
+    assert put_call.kwargs["content_type"] == "image/jpeg"
+
+
+@pytest.mark.asyncio
+async def test_object_create_stream_too_large() -> None:
+    """Test that reading a stream fails once it exceeds the maximal size."""
+    minio_mock = MagicMock()
+    minio_mock.put_object.side_effect = lambda **kwargs: read_all(
+        kwargs["data"]
+    )
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock, bucket_name="coffee-images"
+    )
+
+    with pytest.raises(UploadTooLargeError):
+        await test_object_crud.create_stream(
+            filepath="coffee_bean/original",
+            filename="image",
+            chunks=upload_chunks(b"first-", b"second"),
+            file_type="jpeg",
+            max_size=11,
+        )
+
+
+@pytest.mark.asyncio
+async def test_object_create_stream_stalled_does_not_block_stream() -> None:
+    """Test that an upload waiting for its client holds a thread of the
+    upload pool only, so objects are still streamed meanwhile."""
+    minio_mock = MagicMock()
+    uploaded = []
+
+    def put_object(**kwargs: Any) -> MagicMock:
+        uploaded.append(read_all(kwargs["data"]))
+        return MagicMock()
+
+    minio_mock.put_object.side_effect = put_object
+    minio_mock.get_object.return_value = create_minio_response(b"image")
+    resume = asyncio.Event()
+
+    async def stalled_chunks() -> AsyncIterator[bytes]:
+        yield b"first"
+        await resume.wait()
+        yield b"second"
+
+    with ThreadPoolExecutor(max_workers=1) as executor, ThreadPoolExecutor(
+        max_workers=1
+    ) as upload_executor:
+        test_object_crud = ObjectCRUD(
+            minio_client=minio_mock,
+            bucket_name="coffee-images",
+            executor=executor,
+            upload_executor=upload_executor,
+        )
+
+        upload = asyncio.create_task(
+            test_object_crud.create_stream(
+                filepath="coffee_bean/original",
+                filename="image",
+                chunks=stalled_chunks(),
+                file_type="jpeg",
+                max_size=100,
+            )
+        )
+        await asyncio.sleep(0.05)
+
+        stream = await asyncio.wait_for(
+            test_object_crud.stream(filepath="original", filename="image"),
+            timeout=1,
+        )
+        chunks = [chunk async for chunk in stream.chunks]
+
+        assert chunks == [b"image"]
+        assert not upload.done()
+
+        resume.set()
+        result = await asyncio.wait_for(upload, timeout=1)
+
+    assert uploaded == [b"firstsecond"]
+    assert result.size == 11
+
+
+@pytest.mark.asyncio
+async def test_object_create_stream_chunk_timeout() -> None:
+    """Test that an upload fails once its next chunk does not arrive within
+    the chunk timeout."""
+    minio_mock = MagicMock()
+    minio_mock.put_object.side_effect = lambda **kwargs: read_all(
+        kwargs["data"]
+    )
+
+    async def stalled_chunks() -> AsyncIterator[bytes]:
+        yield b"first"
+        await asyncio.Event().wait()
+        yield b"never"
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock,
+        bucket_name="coffee-images",
+        upload_chunk_timeout=0.1,
+    )
+
+    with pytest.raises(UploadTimeoutError):
+        await asyncio.wait_for(
+            test_object_crud.create_stream(
+                filepath="coffee_bean/original",
+                filename="image",
+                chunks=stalled_chunks(),
+                file_type="jpeg",
+                max_size=100,
+            ),
+            timeout=1,
+        )
+
+
+@pytest.mark.asyncio
+async def test_object_copy_renamed() -> None:
+    """Test that objects are copied to a different name."""
+    minio_mock = MagicMock()
+
+    test_object_crud = ObjectCRUD(
+        minio_client=minio_mock, bucket_name="coffee-images"
+    )
+
+    await test_object_crud.copy(
+        source_filepath="upload/coffee_bean",
+        filepath="blobs",
+        filename="digest",
+        file_type="png",
+        source_filename="image",
+    )
+
+    copy_call = minio_mock.copy_object.call_args
+    assert copy_call.kwargs["object_name"] == "blobs/digest"
+    assert copy_call.kwargs["source"].object_name == "upload/coffee_bean/image"
@@ -0,0 +1,33 @@
+import pytest
+
+from coffee_backend.s3.types.byte_range import ByteRange
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-99", ByteRange(start=0, end=99)),
+        ("bytes=100-", ByteRange(start=100, end=None)),
+        ("bytes=-500", ByteRange(start=None, end=500)),
+        (None, None),
+        ("", None),
+        ("bytes=-", None),
+        ("bytes=99-0", None),
+        ("bytes=0-10,20-30", None),
+        ("items=0-10", None),
+    ],
+)
+def test_byte_range_from_header(
+    header: str | None, expected: ByteRange | None
+) -> None:
+    """Test parsing single byte ranges and ignoring unsupported values."""
+
+    assert ByteRange.from_header(header) == expected
+
+
+def test_byte_range_header() -> None:
+    """Test that a byte range is serialized to a Range header value."""
+
+    assert ByteRange(start=0, end=99).header == "bytes=0-99"
+    assert ByteRange(start=100, end=None).header == "bytes=100-"
+    assert ByteRange(start=None, end=500).header == "bytes=-500"
@@ -30,6 +30,8 @@ def test_coffee_creation_without_ratings() -> None:
         "owner_name": "Jdoe",
         "rating_count": None,
         "rating_average": None,
+        "image_url": None,
+        "image_variants": None,
     }
 
 
@@ -60,6 +62,8 @@ def test_create_coffee_with_rating_summary() -> None:
         "owner_name": "Jdoe",
         "rating_count": 0,
         "rating_average": 0.0,
+        "image_url": None,
+        "image_variants": None,
     }
 
 
@@ -71,3 +75,30 @@ def test_create_coffee_with_invalid_rating() -> None:
         coffee_name = "Colombian"
         Coffee(_id=coffee_id, name=coffee_name)  # type: ignore
     # pylint: enable=C0301
+
+
+def test_coffee_rating_average_from_rating_sum() -> None:
+    """Test that the average rating is derived from the stored rating sum,
+    which is not part of the dumped coffee."""
+
+    document = {
+        "_id": UUID("123e4567-e89b-12d3-a456-426655440000"),
+        "name": "Decaf",
+        "roasting_company": "Starbucks",
+        "owner_id": UUID("018ee105-66b3-7f89-b6f3-807782e40350"),
+        "owner_name": "Jdoe",
+        "rating_count": 3,
+        "rating_sum": 9.5,
+    }
+
+    coffee = Coffee.model_validate(document)
+
+    assert coffee.rating_average == 3.17
+    assert "rating_sum" not in coffee.model_dump(by_alias=True)
+
+    unrated = Coffee.model_validate(
+        {**document, "rating_count": 0, "rating_sum": 0}
+    )
+
+    assert unrated.rating_count == 0
+    assert unrated.rating_average is None
@@ -35,6 +35,8 @@ from coffee_backend.schemas import CreateDrink, Drink
                 "coffee_bean_name": "test_coffee_bean",
                 "coffee_bean_roasting_company": "test_roasting_company",
                 "coordinate": {"latitude": 1.0, "longitude": 1.0},
+                "image_url": None,
+                "image_variants": None,
             },
         ),
         (
@@ -59,6 +61,8 @@ from coffee_backend.schemas import CreateDrink, Drink
                 "coffee_bean_name": "test_coffee_bean",
                 "coffee_bean_roasting_company": "test_roasting_company",
                 "coordinate": None,
+                "image_url": None,
+                "image_variants": None,
             },
         ),
     ],
@@ -4,7 +4,8 @@ import pytest
 from uuid_extensions.uuid7 import uuid7
 
 from coffee_backend.exceptions.exceptions import ObjectNotFoundError
-from coffee_backend.services.coffee import CoffeeService
+from coffee_backend.schemas import Page
+from coffee_backend.services.coffee import LIST_SORT, SEARCH_SORT, CoffeeService
 from tests.conftest import DummyCoffees
 
 
@@ -18,295 +19,201 @@ async def test_coffee_service_list_coffees_with_rating_summary(
     coffee_2 = dummy_coffees.coffee_2
 
     coffee_crud_mock = AsyncMock()
-    coffee_crud_mock.aggregate_read.return_value = [coffee_1, coffee_2]
+    coffee_crud_mock.read.return_value = [coffee_1, coffee_2]
 
     db_session_mock = AsyncMock()
 
-    pipeline_aggregate_mock = MagicMock()
-    pipeline_aggregate_mock.return_value = [{"$test": "test"}]
+    query_mock = MagicMock()
+    query_mock.return_value = {"test": "test"}
 
     test_coffee_service = CoffeeService(coffee_crud=coffee_crud_mock)
 
-    setattr(test_coffee_service, "_create_pipeline", pipeline_aggregate_mock)
+    setattr(test_coffee_service, "_create_query", query_mock)
 
     result = await test_coffee_service.list_coffees_with_rating_summary(
-        db_session=db_session_mock
+        db_session=db_session_mock, page=3, page_size=20
     )
-    coffee_crud_mock.aggregate_read.assert_awaited_once_with(
-        db_session=db_session_mock, pipeline=[{"$test": "test"}]
+    coffee_crud_mock.read.assert_awaited_once_with(
+        db_session=db_session_mock,
+        query={"test": "test"},
+        limit=21,
+        skip=40,
+        sort=LIST_SORT,
     )
 
-    pipeline_aggregate_mock.assert_called_once_with(
-        owner_id=None, page=1, page_size=10, first_id=None, search_query=None
+    query_mock.assert_called_once_with(
+        owner_id=None, first_id=None, search_query=None, after_id=None
     )
 
-    assert result == [coffee_1, coffee_2]
+    assert result == Page(items=[coffee_1, coffee_2])
+
+
+@pytest.mark.asyncio
+async def test_coffee_service_list_coffees_with_rating_summary_cursor(
+    dummy_coffees: DummyCoffees,
+) -> None:
+    """Test that a page after a cursor is read as range on the id and
+    returns the id of its last coffee if one more coffee was found."""
+    coffee_1 = dummy_coffees.coffee_1
+    coffee_2 = dummy_coffees.coffee_2
+    after_id = uuid7()
+
+    coffee_crud_mock = AsyncMock()
+    coffee_crud_mock.read.return_value = [coffee_1, coffee_2]
+
+    db_session_mock = AsyncMock()
+
+    test_coffee_service = CoffeeService(coffee_crud=coffee_crud_mock)
+
+    result = await test_coffee_service.list_coffees_with_rating_summary(
+        db_session=db_session_mock, page=3, page_size=1, after_id=after_id
+    )
+
+    coffee_crud_mock.read.assert_awaited_once_with(
+        db_session=db_session_mock,
+        query={"_id": {"$lt": after_id}},
+        limit=2,
+        skip=0,
+        sort=LIST_SORT,
+    )
+    assert result == Page(items=[coffee_1], next_id=coffee_1.id)
+
+
+@pytest.mark.asyncio
+async def test_coffee_service_list_coffees_search(
+    dummy_coffees: DummyCoffees,
+) -> None:
+    """Test that search results are ordered by relevance, ignore the cursor
+    and are returned without next id."""
+    coffee_1 = dummy_coffees.coffee_1
+    coffee_2 = dummy_coffees.coffee_2
+
+    coffee_crud_mock = AsyncMock()
+    coffee_crud_mock.read.return_value = [coffee_1, coffee_2]
+
+    db_session_mock = AsyncMock()
+
+    test_coffee_service = CoffeeService(coffee_crud=coffee_crud_mock)
+
+    result = await test_coffee_service.list_coffees_with_rating_summary(
+        db_session=db_session_mock,
+        page=2,
+        page_size=1,
+        search_query="Golden Bea",
+        after_id=uuid7(),
+    )
+
+    coffee_crud_mock.read.assert_awaited_once_with(
+        db_session=db_session_mock,
+        query={
+            "search_terms": {"$regex": "^bea"},
+            "$text": {"$search": "golden"},
+        },
+        limit=2,
+        skip=1,
+        sort=SEARCH_SORT,
+    )
+    assert result == Page(items=[coffee_1])
 
 
 @pytest.mark.asyncio
 async def test_cof_serv_list_cof_with_rating_summary_empty_result() -> None:
     """Test list_coffees_with_rating_summary with empty response.
 
-    Test that a HTTPException is raised when no coffees are found in the
+    Test that an empty list is returned when no coffees are found in the
     database
 
     """
 
     coffee_crud_mock = AsyncMock()
-    coffee_crud_mock.aggregate_read.side_effect = ObjectNotFoundError(
-        "Test message"
-    )
+    coffee_crud_mock.read.side_effect = ObjectNotFoundError("Test message")
 
     db_session_mock = AsyncMock()
 
-    pipeline_aggregate_mock = MagicMock()
-    pipeline_aggregate_mock.return_value = [{"$test": "test"}]
-
     test_coffee_service = CoffeeService(coffee_crud=coffee_crud_mock)
 
-    setattr(test_coffee_service, "_create_pipeline", pipeline_aggregate_mock)
-
     result = await test_coffee_service.list_coffees_with_rating_summary(
         db_session=db_session_mock
     )
 
-    assert result == []
-    coffee_crud_mock.aggregate_read.assert_awaited_once_with(
-        db_session=db_session_mock, pipeline=[{"$test": "test"}]
+    assert result == Page(items=[])
+    coffee_crud_mock.read.assert_awaited_once_with(
+        db_session=db_session_mock, query={}, limit=11, skip=0, sort=LIST_SORT
     )
 
-    pipeline_aggregate_mock.assert_called_once_with(
-        owner_id=None, page=1, page_size=10, first_id=None, search_query=None
-    )
 
+def test_coffee_service_query_create_with_owner_and_first_id() -> None:
+    """Query should filter by owner and the first id."""
 
-def test_coffee_service_pipeline_create_without_owner_id() -> None:
-    """Pipeline should return a pipeline with correct skip and limit values."""
     test_coffee_service = CoffeeService(coffee_crud=AsyncMock())
+
+    owner_id = uuid7()
+    first_id = uuid7()
     # pylint: disable=W0212
-    result = test_coffee_service._create_pipeline(
-        owner_id=None, page=1, page_size=10
+    result = test_coffee_service._create_query(
+        owner_id=owner_id, first_id=first_id
     )
     # pylint: enable=W0212
 
-    assert result == [
-        {"$sort": {"_id": -1}},
-        {
-            "$lookup": {
-                "from": "drink",
-                "localField": "_id",
-                "foreignField": "coffee_bean_id",
-                "as": "rating",
-            }
-        },
-        {
-            "$addFields": {
-                "rating_count": {"$size": "$rating"},
-                "rating_average": {"$round": [{"$avg": "$rating.rating"}, 2]},
-            }
-        },
-        {
-            "$project": {
-                "_id": 1,
-                "name": 1,
-                "roasting_company": 1,
-                "owner_id": 1,
-                "owner_name": 1,
-                "rating_count": 1,
-                "rating_average": 1,
-            }
-        },
-        {"$limit": 10},
-        {"$skip": 0},
-    ]
-
-    # pylint: disable=W0212
-    result_2 = test_coffee_service._create_pipeline(
-        owner_id=None, page=2, page_size=20
-    )
+    assert result == {"owner_id": owner_id, "_id": {"$lte": first_id}}
 
-    # pylint: enable=W0212
 
-    assert result_2 == [
-        {"$sort": {"_id": -1}},
-        {
-            "$lookup": {
-                "from": "drink",
-                "localField": "_id",
-                "foreignField": "coffee_bean_id",
-                "as": "rating",
-            }
-        },
-        {
-            "$addFields": {
-                "rating_count": {"$size": "$rating"},
-                "rating_average": {"$round": [{"$avg": "$rating.rating"}, 2]},
-            }
-        },
-        {
-            "$project": {
-                "_id": 1,
-                "name": 1,
-                "roasting_company": 1,
-                "owner_id": 1,
-                "owner_name": 1,
-                "rating_count": 1,
-                "rating_average": 1,
-            }
-        },
-        {"$limit": 40},
-        {"$skip": 20},
-    ]
+@pytest.mark.asyncio
+async def test_coffee_service_list_coffees_search_prefix(
+    dummy_coffees: DummyCoffees,
+) -> None:
+    """Test that a search of a single partial word is matched by prefix and
+    ordered by id, as the text index only matches whole words."""
+    coffee_crud_mock = AsyncMock()
+    coffee_crud_mock.read.return_value = [dummy_coffees.coffee_1]
 
+    db_session_mock = AsyncMock()
 
-def test_coffee_service_pipeline_create_with_owner_id() -> None:
-    """Pipeline should return a pipeline with a match stage for the
-    owner_id.
-    """
+    test_coffee_service = CoffeeService(coffee_crud=coffee_crud_mock)
 
-    test_coffee_service = CoffeeService(coffee_crud=AsyncMock())
+    result = await test_coffee_service.list_coffees_with_rating_summary(
+        db_session=db_session_mock, search_query="Colom"
+    )
 
-    owner_id = uuid7()
-    # pylint: disable=W0212
-    result = test_coffee_service._create_pipeline(
-        owner_id=owner_id, page=1, page_size=10
+    coffee_crud_mock.read.assert_awaited_once_with(
+        db_session=db_session_mock,
+        query={"search_terms": {"$regex": "^colom"}},
+        limit=11,
+        skip=0,
+        sort=LIST_SORT,
     )
-    # pylint: enable=W0212
-    assert result == [
-        {"$sort": {"_id": -1}},
-        {"$match": {"owner_id": owner_id}},
-        {
-            "$lookup": {
-                "from": "drink",
-                "localField": "_id",
-                "foreignField": "coffee_bean_id",
-                "as": "rating",
-            }
-        },
-        {
-            "$addFields": {
-                "rating_count": {"$size": "$rating"},
-                "rating_average": {"$round": [{"$avg": "$rating.rating"}, 2]},
-            }
-        },
-        {
-            "$project": {
-                "_id": 1,
-                "name": 1,
-                "roasting_company": 1,
-                "owner_id": 1,
-                "owner_name": 1,
-                "rating_count": 1,
-                "rating_average": 1,
-            }
-        },
-        {"$limit": 10},
-        {"$skip": 0},
-    ]
+    assert result == Page(items=[dummy_coffees.coffee_1])
 
 
-def test_coffee_service_pipeline_create_with_first_id() -> None:
-    """Pipeline should return a pipeline with a match stage for the
-    first id.
-    """
+@pytest.mark.asyncio
+async def test_coffee_service_list_coffees_search_without_words() -> None:
+    """Test that a search without any words returns no coffees instead of
+    listing all of them."""
+    coffee_crud_mock = AsyncMock()
 
-    test_coffee_service = CoffeeService(coffee_crud=AsyncMock())
+    test_coffee_service = CoffeeService(coffee_crud=coffee_crud_mock)
 
-    first_id = uuid7()
-    # pylint: disable=W0212
-    result = test_coffee_service._create_pipeline(
-        owner_id=None, page=1, page_size=10, first_id=first_id
+    result = await test_coffee_service.list_coffees_with_rating_summary(
+        db_session=AsyncMock(), search_query=" - "
     )
-    # pylint: enable=W0212
-    assert result == [
-        {"$sort": {"_id": -1}},
-        {"$match": {"_id": {"$lte": first_id}}},
-        {
-            "$lookup": {
-                "from": "drink",
-                "localField": "_id",
-                "foreignField": "coffee_bean_id",
-                "as": "rating",
-            }
-        },
-        {
-            "$addFields": {
-                "rating_count": {"$size": "$rating"},
-                "rating_average": {"$round": [{"$avg": "$rating.rating"}, 2]},
-            }
-        },
-        {
-            "$project": {
-                "_id": 1,
-                "name": 1,
-                "roasting_company": 1,
-                "owner_id": 1,
-                "owner_name": 1,
-                "rating_count": 1,
-                "rating_average": 1,
-            }
-        },
-        {"$limit": 10},
-        {"$skip": 0},
-    ]
 
+    assert result == Page(items=[])
+    coffee_crud_mock.read.assert_not_awaited()
 
-def test_coffee_service_pipeline_create_with_search_query() -> None:
-    """Pipeline should return a pipeline with a match stage for the
-    search query.
-    """
 
-    test_coffee_service = CoffeeService(coffee_crud=AsyncMock())
+def test_coffee_service_query_create_with_search_query() -> None:
+    """Query should match the last word as prefix of the search terms and
+    the words before by the text index of the coffees."""
 
-    search_query = "test"
+    test_coffee_service = CoffeeService(coffee_crud=AsyncMock())
 
     # pylint: disable=W0212
-    result = test_coffee_service._create_pipeline(
-        owner_id=None, page=1, page_size=10, search_query=search_query
+    result = test_coffee_service._create_query(
+        search_query="Martermühle Kaffee (1.5"
     )
     # pylint: enable=W0212
 
-    assert result == [
-        {"$sort": {"_id": -1}},
-        {
-            "$match": {
-                "$or": [
-                    {"name": {"$regex": search_query, "$options": "i"}},
-                    {
-                        "roasting_company": {
-                            "$regex": search_query,
-                            "$options": "i",
-                        }
-                    },
-                    {"owner_name": {"$regex": search_query, "$options": "i"}},
-                ]
-            }
-        },
-        {
-            "$lookup": {
-                "from": "drink",
-                "localField": "_id",
-                "foreignField": "coffee_bean_id",
-                "as": "rating",
-            }
-        },
-        {
-            "$addFields": {
-                "rating_count": {"$size": "$rating"},
-                "rating_average": {"$round": [{"$avg": "$rating.rating"}, 2]},
-            }
-        },
-        {
-            "$project": {
-                "_id": 1,
-                "name": 1,
-                "roasting_company": 1,
-                "owner_id": 1,
-                "owner_name": 1,
-                "rating_count": 1,
-                "rating_average": 1,
-            }
-        },
-        {"$limit": 10},
-        {"$skip": 0},
-    ]
+    assert result == {
+        "search_terms": {"$regex": r"^5"},
+        "$text": {"$search": "martermuhle kaffee 1"},
+    }
@@ -28,7 +28,11 @@ async def test_drink_service_create(
 
     db_session_mock = AsyncMock()
 
-    test_coffee_service = DrinkService(drink_crud=drink_crud_mock)
+    coffee_crud_mock = AsyncMock()
+
+    test_coffee_service = DrinkService(
+        drink_crud=drink_crud_mock, coffee_crud=coffee_crud_mock
+    )
 
     result = await test_coffee_service.add_drink(
         drink=drink_1, db_session=db_session_mock
@@ -38,3 +42,28 @@ async def test_drink_service_create(
     )
 
     assert result == drink_1
+    coffee_crud_mock.increment_rating.assert_awaited_once_with(
+        db_session=db_session_mock,
+        coffee_id=drink_1.coffee_bean_id,
+        count=1,
+        rating=5,
+    )
+
+
+@pytest.mark.asyncio
+async def test_drink_service_create_without_coffee_bean(
+    dummy_drinks: DummyDrinks,
+) -> None:
+    """Test that adding a drink without coffee bean leaves the rating
+    summaries of coffees untouched."""
+    drink_2 = dummy_drinks.drink_2
+
+    coffee_crud_mock = AsyncMock()
+
+    test_drink_service = DrinkService(
+        drink_crud=AsyncMock(), coffee_crud=coffee_crud_mock
+    )
+
+    await test_drink_service.add_drink(drink=drink_2, db_session=AsyncMock())
+
+    coffee_crud_mock.increment_rating.assert_not_awaited()
@@ -22,10 +22,15 @@ async def test_drink_service_delete_by_coffee_bean_id(
     drink_1 = dummy_drinks.drink_1
 
     drink_crud_mock = AsyncMock()
+    drink_crud_mock.read.return_value = [drink_1, drink_1]
+
+    coffee_crud_mock = AsyncMock()
 
     db_session_mock = AsyncMock()
 
-    test_drink_service = DrinkService(drink_crud=drink_crud_mock)
+    test_drink_service = DrinkService(
+        drink_crud=drink_crud_mock, coffee_crud=coffee_crud_mock
+    )
 
     if drink_1.coffee_bean_id is None:
         raise ValueError("Coffee bean ID must not be None for this test")
@@ -33,9 +38,20 @@ async def test_drink_service_delete_by_coffee_bean_id(
     await test_drink_service.delete_by_coffee_bean_id(
         db_session=db_session_mock, coffee_bean_id=drink_1.coffee_bean_id
     )
-    drink_crud_mock.delete_many.assert_awaited_once_with(
+    drink_crud_mock.read.assert_awaited_once_with(
         db_session=db_session_mock,
         query={"coffee_bean_id": drink_1.coffee_bean_id},
+        limit=0,
+    )
+    drink_crud_mock.delete_many.assert_awaited_once_with(
+        db_session=db_session_mock,
+        query={"_id": {"$in": [drink_1.id, drink_1.id]}},
+    )
+    coffee_crud_mock.increment_rating.assert_awaited_once_with(
+        db_session=db_session_mock,
+        coffee_id=drink_1.coffee_bean_id,
+        count=-2,
+        rating=-10,
     )
 
 
@@ -55,18 +71,24 @@ async def test_drink_service_delete_by_coffee_id_with_unknown_id(
     unknown_id = uuid7()
 
     drink_crud_mock = AsyncMock()
-    drink_crud_mock.delete_many.side_effect = ObjectNotFoundError(
-        "Test message"
-    )
+    drink_crud_mock.read.side_effect = ObjectNotFoundError("Test message")
+
+    coffee_crud_mock = AsyncMock()
 
     db_session_mock = AsyncMock()
 
-    test_drink_service = DrinkService(drink_crud=drink_crud_mock)
+    test_drink_service = DrinkService(
+        drink_crud=drink_crud_mock, coffee_crud=coffee_crud_mock
+    )
 
     await test_drink_service.delete_by_coffee_bean_id(
         db_session=db_session_mock, coffee_bean_id=unknown_id
     )
 
-    drink_crud_mock.delete_many.assert_awaited_once_with(
-        db_session=db_session_mock, query={"coffee_bean_id": unknown_id}
+    drink_crud_mock.read.assert_awaited_once_with(
+        db_session=db_session_mock,
+        query={"coffee_bean_id": unknown_id},
+        limit=0,
     )
+    drink_crud_mock.delete_many.assert_not_awaited()
+    coffee_crud_mock.increment_rating.assert_not_awaited()
@@ -23,10 +23,15 @@ async def test_drink_service_delete_by_id(
     drink_1 = dummy_drinks.drink_1
 
     drink_crud_mock = AsyncMock()
+    drink_crud_mock.read.return_value = [drink_1]
+
+    coffee_crud_mock = AsyncMock()
 
     db_session_mock = AsyncMock()
 
-    test_drink_service = DrinkService(drink_crud=drink_crud_mock)
+    test_drink_service = DrinkService(
+        drink_crud=drink_crud_mock, coffee_crud=coffee_crud_mock
+    )
 
     await test_drink_service.delete_drink(
         db_session=db_session_mock, drink_id=drink_1.id
@@ -34,6 +39,12 @@ async def test_drink_service_delete_by_id(
     drink_crud_mock.delete.assert_awaited_once_with(
         db_session=db_session_mock, drink_id=drink_1.id
     )
+    coffee_crud_mock.increment_rating.assert_awaited_once_with(
+        db_session=db_session_mock,
+        coffee_id=drink_1.coffee_bean_id,
+        count=-1,
+        rating=-5,
+    )
 
 
 @pytest.mark.asyncio
@@ -52,11 +63,15 @@ async def test_drink_service_delete_by_id_with_unknown_id(
     unknown_id = uuid7()
 
     drink_crud_mock = AsyncMock()
-    drink_crud_mock.delete.side_effect = ObjectNotFoundError("Test message")
+    drink_crud_mock.read.side_effect = ObjectNotFoundError("Test message")
+
+    coffee_crud_mock = AsyncMock()
 
     db_session_mock = AsyncMock()
 
-    test_drink_service = DrinkService(drink_crud=drink_crud_mock)
+    test_drink_service = DrinkService(
+        drink_crud=drink_crud_mock, coffee_crud=coffee_crud_mock
+    )
 
     with pytest.raises(HTTPException) as http_error:
         await test_drink_service.delete_drink(
@@ -64,3 +79,5 @@ async def test_drink_service_delete_by_id_with_unknown_id(
         )
 
     assert str(http_error.value.detail) == "No drink found for given id"
+    drink_crud_mock.delete.assert_not_awaited()
+    coffee_crud_mock.increment_rating.assert_not_awaited()
@@ -25,7 +25,9 @@ async def test_drink_service_get_by_id(
 
     db_session_mock = AsyncMock()
 
-    test_drink_service = DrinkService(drink_crud=drink_crud_mock)
+    test_drink_service = DrinkService(
+        drink_crud=drink_crud_mock, coffee_crud=AsyncMock()
+    )
 
     result = await test_drink_service.get_by_id(
         db_session=db_session_mock, drink_id=drink_1.id
@@ -55,7 +57,9 @@ async def test_coffee_service_get_by_id_with_unknown_id(
 
     db_session_mock = AsyncMock()
 
-    test_drink_service = DrinkService(drink_crud=drink_crud_mock)
+    test_drink_service = DrinkService(
+        drink_crud=drink_crud_mock, coffee_crud=AsyncMock()
+    )
 
     with pytest.raises(HTTPException) as http_error:
         await test_drink_service.get_by_id(
@@ -26,7 +26,9 @@ async def test_drink_service_read(
 
     db_session_mock = AsyncMock()
 
-    test_drink_service = DrinkService(drink_crud=coffee_crud_mock)
+    test_drink_service = DrinkService(
+        drink_crud=coffee_crud_mock, coffee_crud=AsyncMock()
+    )
 
     result = await test_drink_service.list(
         db_session=db_session_mock,
@@ -56,7 +58,9 @@ async def test_drink_service_read_with_empty_db_coffee_collection(
 
     db_session_mock = AsyncMock()
 
-    test_drink_service = DrinkService(drink_crud=drink_crud_mock)
+    test_drink_service = DrinkService(
+        drink_crud=drink_crud_mock, coffee_crud=AsyncMock()
+    )
 
     result = await test_drink_service.list(
         db_session=db_session_mock,
@@ -25,6 +25,7 @@ async def test_drink_service_list_drinks_with_coffee_bean_information(
 
     test_service = DrinkService(
         drink_crud=test_crud,
+        coffee_crud=AsyncMock(),
     )
 
     async with await init_mongo.asncy_session.start_session() as session:
@@ -32,9 +33,9 @@ async def test_drink_service_list_drinks_with_coffee_bean_information(
         result = await test_service.list_drinks_with_coffee_bean_information(
             db_session=session, page_size=5, page=1
         )
-        assert len(result) == 5
+        assert len(result.items) == 5
 
-        assert result == [
+        assert result.items == [
             Drink(
                 _id=UUID("06635e64-24c0-7e49-8000-7782743d4bb1"),
                 brewing_method=BrewingMethod.ESPRESSO,
@@ -126,6 +127,7 @@ async def test_drink_service_list_drinks_with_coffee_bean_information_first_id_(
 
     test_service = DrinkService(
         drink_crud=test_crud,
+        coffee_crud=AsyncMock(),
     )
 
     async with await init_mongo.asncy_session.start_session() as session:
@@ -136,9 +138,9 @@ async def test_drink_service_list_drinks_with_coffee_bean_information_first_id_(
             page=1,
             first_id=UUID("06635e63-b09f-7633-8000-e99ea17e1de8"),
         )
-        assert len(result) == 5
+        assert len(result.items) == 5
 
-        assert result == [
+        assert result.items == [
             Drink(
                 _id=UUID("06635e63-b09f-7633-8000-e99ea17e1de8"),
                 brewing_method=BrewingMethod.AMERICANO,
@@ -231,6 +233,7 @@ async def test_drink_service_list_drinks_with_coffee_bean_coffee_bean_filter(
 
     test_service = DrinkService(
         drink_crud=test_crud,
+        coffee_crud=AsyncMock(),
     )
 
     async with await init_mongo.asncy_session.start_session() as session:
@@ -241,9 +244,9 @@ async def test_drink_service_list_drinks_with_coffee_bean_coffee_bean_filter(
             page=1,
             coffee_bean_id=UUID("0664ddeb-3b5e-716d-8000-907336604f50"),
         )
-        assert len(result) == 3
+        assert len(result.items) == 3
 
-        assert result == [
+        assert result.items == [
             Drink(
                 _id=UUID("06635e64-24c0-7e49-8000-7782743d4bb1"),
                 brewing_method=BrewingMethod.ESPRESSO,
@@ -305,6 +308,7 @@ async def test_drink_service_list_drinks_with_coffee_bean_information_user(
 
     test_service = DrinkService(
         drink_crud=test_crud,
+        coffee_crud=AsyncMock(),
     )
 
     async with await init_mongo.asncy_session.start_session() as session:
@@ -315,9 +319,9 @@ async def test_drink_service_list_drinks_with_coffee_bean_information_user(
             page=1,
             user_id=UUID("066656b9-479d-7a27-8000-dfecb56faf1a"),
         )
-        assert len(result) == 4
+        assert len(result.items) == 4
 
-        assert result == [
+        assert result.items == [
             Drink(
                 _id=UUID("06635e60-c620-79fe-8000-5ed342f1b972"),
                 brewing_method=BrewingMethod.LATTE,
@@ -395,10 +399,12 @@ async def test_drink_service_list_drinks_with_coffee_bean_empty_db_response(
         "Test message"
     )
 
-    test_drink_service = DrinkService(drink_crud=drink_crud_mock)
+    test_drink_service = DrinkService(
+        drink_crud=drink_crud_mock, coffee_crud=AsyncMock()
+    )
 
     result = await test_drink_service.list_drinks_with_coffee_bean_information(
         db_session=db_session_mock, page_size=5, page=1
     )
 
-    assert result == []
+    assert result.items == []
@@ -0,0 +1,242 @@
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from coffee_backend.s3.types.object_info import ObjectInfo
+from coffee_backend.services.image_cache import ImageCache
+
+
+def create_object_info(size: int) -> ObjectInfo:
+    """Create the metadata of an image of the given size."""
+    return ObjectInfo(
+        size=size,
+        etag="etag",
+        last_modified=datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc),
+        file_type="jpeg",
+    )
+
+
+def create_image_cache(directory: Path, **kwargs: int) -> ImageCache:
+    """Create an image cache with small tiers for testing."""
+    image_cache = ImageCache(
+        metric=MagicMock(),
+        directory=str(directory),
+        memory_max_bytes=kwargs.get("memory_max_bytes", 10),
+        disk_max_bytes=kwargs.get("disk_max_bytes", 100),
+        memory_max_item_bytes=kwargs.get("memory_max_item_bytes", 5),
+        disk_max_item_bytes=kwargs.get("disk_max_item_bytes", 60),
+    )
+    image_cache.clear()
+    return image_cache
+
+
+@pytest.mark.asyncio
+async def test_image_cache_tiers(tmp_path: Path) -> None:
+    """Test that small images are kept in memory and larger images on disk
+    while images exceeding the item size are not cached."""
+
+    image_cache = create_image_cache(tmp_path)
+
+    await image_cache.put(
+        "small", create_object_info(4), b"1234", image_cache.generation
+    )
+    await image_cache.put(
+        "large", create_object_info(50), b"x" * 50, image_cache.generation
+    )
+    await image_cache.put(
+        "huge", create_object_info(70), b"x" * 70, image_cache.generation
+    )
+
+    small = image_cache.get("small")
+    large = image_cache.get("large")
+
+    assert small is not None and small.data == b"1234" and small.path is None
+    assert large is not None and large.data is None and large.path is not None
+    assert Path(str(large.path)).read_bytes() == b"x" * 50
+    large.close()
+    assert image_cache.get("huge") is None
+
+    image_cache.metric.record_hit.assert_any_call("memory", 4)  # type: ignore
+    image_cache.metric.record_hit.assert_any_call("disk", 50)  # type: ignore
+    image_cache.metric.record_miss.assert_called_once()  # type: ignore
+    image_cache.metric.set_size.assert_called_with("disk", 50)  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_image_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Test that a tier over its byte budget evicts the least recently used
+    image and deletes its file."""
+
+    image_cache = create_image_cache(tmp_path)
+
+    await image_cache.put(
+        "image-1", create_object_info(40), b"1" * 40, image_cache.generation
+    )
+    await image_cache.put(
+        "image-2", create_object_info(40), b"2" * 40, image_cache.generation
+    )
+
+    image_1 = image_cache.get("image-1")
+    image_2 = image_cache.get("image-2")
+    assert image_1 is not None and image_2 is not None
+    image_1.close()
+    image_2.close()
+
+    image_1 = image_cache.get("image-1")
+    assert image_1 is not None
+    image_1.close()
+
+    await image_cache.put(
+        "image-3", create_object_info(40), b"3" * 40, image_cache.generation
+    )
+
+    assert image_cache.get("image-2") is None
+    assert not os.path.exists(str(image_2.path))
+    assert image_cache.get("image-1") is not None
+    assert image_cache.get("image-3") is not None
+    assert image_cache.disk.size == 80
+
+
+@pytest.mark.asyncio
+async def test_image_cache_invalidate(tmp_path: Path) -> None:
+    """Test that invalidated images are removed and images read before an
+    invalidation are not cached anymore."""
+
+    image_cache = create_image_cache(tmp_path)
+
+    await image_cache.put(
+        "image", create_object_info(50), b"x" * 50, image_cache.generation
+    )
+    cached = image_cache.get("image")
+    assert cached is not None
+    cached.close()
+
+    generation = image_cache.generation
+    image_cache.invalidate("image")
+
+    assert image_cache.get("image") is None
+    assert not os.path.exists(str(cached.path))
+
+    await image_cache.put("image", create_object_info(4), b"1234", generation)
+
+    assert image_cache.get("image") is None
+    assert image_cache.memory.size == 0
+
+
+@pytest.mark.asyncio
+async def test_image_cache_invalidate_prefix(tmp_path: Path) -> None:
+    """Test that invalidating a prefix removes the images with derived keys
+    from both tiers, but keeps images of other keys."""
+
+    image_cache = create_image_cache(tmp_path)
+
+    for key, size in [
+        ("image", 3),
+        ("image/webp", 50),
+        ("image/avif+webp", 3),
+        ("image2", 3),
+    ]:
+        await image_cache.put(
+            key, create_object_info(size), b"x" * size, image_cache.generation
+        )
+
+    assert image_cache.get("image/avif+webp") is not None
+
+    image_cache.invalidate("image", prefix=True)
+
+    assert image_cache.get("image") is None
+    assert image_cache.get("image/webp") is None
+    assert image_cache.get("image/avif+webp") is None
+    assert image_cache.get("image2") is not None
+
+
+@patch("coffee_backend.services.image_cache.time")
+@pytest.mark.asyncio
+async def test_image_cache_ttl(time_mock: MagicMock, tmp_path: Path) -> None:
+    """Test that images are only served from the cache until their ttl."""
+
+    time_mock.monotonic.return_value = 1000
+
+    image_cache = create_image_cache(tmp_path)
+    await image_cache.put(
+        "image", create_object_info(4), b"1234", image_cache.generation
+    )
+
+    time_mock.monotonic.return_value = 1059
+    assert image_cache.get("image") is not None
+
+    time_mock.monotonic.return_value = 1060
+    assert image_cache.get("image") is None
+
+
+@pytest.mark.asyncio
+async def test_image_cache_returned_file_survives_invalidation(
+    tmp_path: Path,
+) -> None:
+    """Test that the file of an image of the disk tier removed from the cache
+    while it is sent is only deleted once all its readers released it."""
+
+    image_cache = create_image_cache(tmp_path)
+    await image_cache.put(
+        "image", create_object_info(50), b"x" * 50, image_cache.generation
+    )
+
+    first = image_cache.get("image")
+    second = image_cache.get("image")
+    assert first is not None and second is not None
+
+    image_cache.invalidate("image")
+
+    assert image_cache.get("image") is None
+    assert Path(str(first.path)).read_bytes() == b"x" * 50
+
+    first.close()
+    first.close()
+    assert os.path.exists(str(first.path))
+
+    second.close()
+    assert not os.path.exists(str(first.path))
+    assert not image_cache.readers and not image_cache.deferred_deletes
+
+
+@pytest.mark.asyncio
+async def test_image_cache_released_file_is_kept(tmp_path: Path) -> None:
+    """Test that releasing an image still in the cache keeps its file."""
+
+    image_cache = create_image_cache(tmp_path)
+    await image_cache.put(
+        "image", create_object_info(50), b"x" * 50, image_cache.generation
+    )
+
+    cached = image_cache.get("image")
+    assert cached is not None
+    cached.close()
+
+    assert os.path.exists(str(cached.path))
+    assert not image_cache.readers
+
+    image_cache.invalidate("image")
+    assert not os.path.exists(str(cached.path))
+
+
+def test_image_cache_clear_removes_stale_directories(tmp_path: Path) -> None:
+    """Test that clearing the cache removes the directories of exited
+    processes and keeps those of running ones."""
+
+    stale = tmp_path / "999999999"
+    stale.mkdir()
+    (stale / "image").write_bytes(b"image")
+    running = tmp_path / str(os.getppid())
+    running.mkdir()
+    other = tmp_path / "other"
+    other.mkdir()
+
+    image_cache = create_image_cache(tmp_path)
+
+    assert not stale.exists()
+    assert running.exists()
+    assert other.exists()
+    assert Path(image_cache.directory).exists()
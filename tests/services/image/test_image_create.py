@@ -1,12 +1,27 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from uuid import UUID
 
 import pytest
-from fastapi import HTTPException, UploadFile
-
-from coffee_backend.schemas import CoffeeDrinkImage
+from fastapi import HTTPException
+
+from coffee_backend.exceptions.exceptions import (
+    UploadTimeoutError,
+    UploadTooLargeError,
+)
+from coffee_backend.s3.types.object_info import ObjectInfo
+from coffee_backend.s3.types.upload_result import UploadResult
+from coffee_backend.schemas import CoffeeDrinkImage, StoredImageVariant
 from coffee_backend.services.image_service import ImageService
-from tests.conftest import DummyImages
+from tests.conftest import DummyImages, create_upload_stream
+
+ORIGINAL_INFO = ObjectInfo(
+    size=100,
+    etag="original-etag",
+    last_modified=None,
+    file_type="jpeg",
+)
+
+UPLOAD_RESULT = UploadResult(size=100, sha256="sha256-digest")
 
 
 @pytest.mark.asyncio
@@ -15,7 +30,8 @@ async def test_image_service_add_coffee_image(
     caplog: pytest.LogCaptureFixture,
 ) -> None:
     """Test the CoffeeImagesService add_coffee_image method for adding a coffee
-        image.
+        image. The file type is detected from the content instead of the
+        declared content type.
 
 
     Args:
@@ -23,30 +39,53 @@ async def test_image_service_add_coffee_image(
             image data.
         caplog (pytest.LogCaptureFixture): A fixture for capturing log output.
     """
-    image_1 = dummy_coffee_images.image_1
+    upload_stream = create_upload_stream(
+        dummy_coffee_images.image_1_bytes, content_type="image/png"
+    )
 
-    object_image_crud = MagicMock()
-    object_image_crud.create.return_value = None
+    object_image_crud = AsyncMock()
+    object_image_crud.create_stream.return_value = UPLOAD_RESULT
+    object_image_crud.stat.return_value = ORIGINAL_INFO
+    image_metadata_crud = AsyncMock()
+    db_session = MagicMock()
 
     coffe_uuid = UUID("123e4567-e19b-12d3-a456-426655440000")
 
-    test_coffee_service = ImageService(object_crud=object_image_crud)
+    test_coffee_service = ImageService(
+        object_crud=object_image_crud, image_metadata_crud=image_metadata_crud
+    )
 
-    test_coffee_service.add_image(
-        CoffeeDrinkImage(
+    await test_coffee_service.add_image(
+        db_session=db_session,
+        s3_object=CoffeeDrinkImage(
             key=coffe_uuid,
-            file=image_1,
-        )
+            file=upload_stream,
+        ),
     )
 
-    assert object_image_crud.create.call_count == 1
+    create_call = object_image_crud.create_stream.call_args
+    assert create_call.kwargs["filepath"] == "coffee_drink/original"
+    assert create_call.kwargs["filename"] == (
+        "123e4567-e19b-12d3-a456-426655440000"
+    )
+    assert create_call.kwargs["file_type"] == "jpeg"
+    assert create_call.kwargs["max_size"] == 10 * 1024 * 1024
+    assert b"".join(
+        [chunk async for chunk in create_call.kwargs["chunks"]]
+    ) == (dummy_coffee_images.image_1_bytes)
 
-    object_image_crud.create.assert_called_once_with(
-        filepath="coffee_drink/original",
-        filename="123e4567-e19b-12d3-a456-426655440000",
-        file=image_1.file,
-        file_type="jpeg",
+    metadata = image_metadata_crud.replace.call_args.kwargs["metadata"]
+
+    assert image_metadata_crud.replace.call_args.kwargs["db_session"] is (
+        db_session
     )
+    assert metadata.id == "coffee_drink/123e4567-e19b-12d3-a456-426655440000"
+    assert metadata.variants == {
+        "original": StoredImageVariant.from_object_info(
+            ORIGINAL_INFO
+        ).model_copy(update={"sha256": "sha256-digest"})
+    }
+    assert metadata.small_checked_at is not None
 
     assert (
         "Added object coffee_drink with key "
@@ -54,38 +93,140 @@ async def test_image_service_add_coffee_image(
     )
 
 
+@pytest.mark.parametrize(
+    "data",
+    [b"<html><body>no image</body></html>", b"", b"\xff\xd8"],
+)
+@pytest.mark.asyncio
+async def test_image_service_add_image_unsupported_format(data: bytes) -> None:
+    """Test that uploads which are no image of a supported format are
+    rejected before anything is sent to S3, regardless of their declared
+    content type.
+
+    Args:
+        data (bytes): The content of the upload.
+    """
+    object_image_crud = AsyncMock()
+
+    test_coffee_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=AsyncMock(),
+        upload_formats=("jpeg", "png"),
+    )
+
+    with pytest.raises(HTTPException) as exception:
+        await test_coffee_service.add_image(
+            db_session=MagicMock(),
+            s3_object=CoffeeDrinkImage(
+                key=UUID("123e4567-e19b-12d3-a456-426655440000"),
+                file=create_upload_stream(data),
+            ),
+        )
+
+    assert exception.value.status_code == 415
+    assert exception.value.detail == (
+        "Unsupported image format, supported are jpeg, png"
+    )
+    object_image_crud.create_stream.assert_not_called()
+
+
 @pytest.mark.asyncio
-async def test_image_service_add_coffee_without_filename(
+async def test_image_service_add_image_too_large(
     dummy_coffee_images: DummyImages,
 ) -> None:
-    """Test the ImagesService add_object method when no filename
-        is provided.
+    """Test that an image exceeding the maximal size is answered with 413
+    and not recorded.
 
     Args:
         dummy_coffee_images (DummyImages): An instance providing dummy coffee
-        image data.
-
-    Raises:
-        pytest.raises(HTTPException): An HTTPException should be raised when
-        attempting to add a coffee image without a filename.
+            image data.
     """
+    object_image_crud = AsyncMock()
+    object_image_crud.create_stream.side_effect = UploadTooLargeError(
+        "Upload exceeds the maximal size of 10 bytes"
+    )
+    image_metadata_crud = AsyncMock()
 
-    file_without_content_type = UploadFile(
-        filename=None,
-        file=dummy_coffee_images.image_1.file,
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        upload_max_size=10,
     )
 
-    object_image_crud = MagicMock()
-    object_image_crud.create.return_value = None
+    with pytest.raises(HTTPException) as exception:
+        await test_image_service.add_image(
+            db_session=MagicMock(),
+            s3_object=CoffeeDrinkImage(
+                key=UUID("123e4567-e19b-12d3-a456-426655440000"),
+                file=create_upload_stream(dummy_coffee_images.image_1_bytes),
+            ),
+        )
 
-    coffe_uuid = UUID("123e4567-e19b-12d3-a456-426655440000")
+    assert exception.value.status_code == 413
+    assert exception.value.detail == (
+        "Image exceeds the maximal size of 10 bytes"
+    )
+    image_metadata_crud.replace.assert_not_called()
 
-    test_coffee_service = ImageService(object_crud=object_image_crud)
 
-    with pytest.raises(HTTPException):
-        test_coffee_service.add_image(
-            CoffeeDrinkImage(
-                key=coffe_uuid,  #
-                file=file_without_content_type,
-            )
+@pytest.mark.asyncio
+async def test_image_service_add_image_timeout(
+    dummy_coffee_images: DummyImages,
+) -> None:
+    """Test that a stalled upload is answered with 408 and not recorded."""
+    object_image_crud = AsyncMock()
+    object_image_crud.create_stream.side_effect = UploadTimeoutError(
+        "No upload chunk received within 30 seconds"
+    )
+    image_metadata_crud = AsyncMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+    )
+
+    with pytest.raises(HTTPException) as exception:
+        await test_image_service.add_image(
+            db_session=MagicMock(),
+            s3_object=CoffeeDrinkImage(
+                key=UUID("123e4567-e19b-12d3-a456-426655440000"),
+                file=create_upload_stream(dummy_coffee_images.image_1_bytes),
+            ),
         )
+
+    assert exception.value.status_code == 408
+    image_metadata_crud.replace.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_image_service_add_image_invalidates_cache(
+    dummy_coffee_images: DummyImages,
+) -> None:
+    """Test that replacing an image removes the old one from the image cache.
+
+    Args:
+        dummy_coffee_images (DummyImages): An instance providing dummy coffee
+            image data.
+    """
+    image_cache = MagicMock()
+
+    object_image_crud = AsyncMock()
+    object_image_crud.stat.return_value = ORIGINAL_INFO
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=AsyncMock(),
+        image_cache=image_cache,
+    )
+
+    await test_image_service.add_image(
+        db_session=MagicMock(),
+        s3_object=CoffeeDrinkImage(
+            key=UUID("123e4567-e19b-12d3-a456-426655440000"),
+            file=create_upload_stream(dummy_coffee_images.image_1_bytes),
+        ),
+    )
+
+    image_cache.invalidate.assert_called_once_with(
+        "coffee_drink/123e4567-e19b-12d3-a456-426655440000", prefix=True
+    )
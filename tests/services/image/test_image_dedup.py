@@ -0,0 +1,430 @@
+from datetime import datetime, timezone
+from typing import List
+from unittest.mock import AsyncMock, MagicMock, call
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+
+from coffee_backend.exceptions.exceptions import ObjectNotFoundError
+from coffee_backend.s3.types.object_info import ObjectInfo
+from coffee_backend.s3.types.upload_result import UploadResult
+from coffee_backend.schemas import (
+    CoffeeDrinkImage,
+    ImageMetadata,
+    ImageType,
+    StoredImageVariant,
+)
+from coffee_backend.services.image_service import ImageService
+from tests.conftest import (
+    DummyImages,
+    create_image_metadata_crud,
+    create_upload_stream,
+)
+
+OBJECT_ID = UUID("123e4567-e19b-12d3-a456-426655440000")
+
+KEY = f"coffee_drink/{OBJECT_ID}"
+
+SHA256 = "a" * 64
+
+BLOB_INFO = ObjectInfo(
+    size=100, etag="blob-etag", last_modified=None, file_type="jpeg"
+)
+
+BLOB = StoredImageVariant.from_object_info(BLOB_INFO).model_copy(
+    update={"sha256": SHA256, "blob": True}
+)
+
+
+def create_image_blob_crud(added: bool = True) -> AsyncMock:
+    """Create an image blob CRUD mock adding references unless the blob is
+    being deleted."""
+    image_blob_crud = AsyncMock()
+    image_blob_crud.add_reference.return_value = added
+    return image_blob_crud
+
+
+def create_object_crud() -> AsyncMock:
+    """Create an object CRUD mock uploading content with a fixed digest."""
+    object_image_crud = AsyncMock()
+    object_image_crud.create_stream.return_value = UploadResult(
+        size=100, sha256=SHA256
+    )
+    return object_image_crud
+
+
+@pytest.mark.asyncio
+async def test_image_service_add_image_stores_new_blob(
+    dummy_coffee_images: DummyImages,
+) -> None:
+    """Test that new content is streamed to staging, copied to its blob and
+    recorded as blob original."""
+    object_image_crud = create_object_crud()
+    object_image_crud.stat.side_effect = [
+        ObjectNotFoundError("not found"),
+        BLOB_INFO,
+    ]
+    image_metadata_crud = create_image_metadata_crud()
+    image_blob_crud = create_image_blob_crud()
+    db_session = MagicMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        image_blob_crud=image_blob_crud,
+    )
+
+    await test_image_service.add_image(
+        db_session=db_session,
+        s3_object=CoffeeDrinkImage(
+            key=OBJECT_ID,
+            file=create_upload_stream(dummy_coffee_images.image_1_bytes),
+        ),
+    )
+
+    assert object_image_crud.create_stream.call_args.kwargs["filepath"] == (
+        "upload/coffee_drink"
+    )
+    image_blob_crud.add_reference.assert_called_once_with(
+        db_session=db_session, sha256=SHA256, key=KEY
+    )
+    object_image_crud.copy.assert_called_once_with(
+        source_filepath="upload/coffee_drink",
+        filepath="blobs",
+        filename=SHA256,
+        file_type="jpeg",
+        source_filename=str(OBJECT_ID),
+    )
+    object_image_crud.delete.assert_called_once_with(
+        filepath="upload/coffee_drink", filename=str(OBJECT_ID)
+    )
+
+    metadata = image_metadata_crud.replace.call_args.kwargs["metadata"]
+    assert metadata.variants == {"original": BLOB}
+    image_blob_crud.remove_reference.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_image_service_add_image_duplicate_blob(
+    dummy_coffee_images: DummyImages,
+) -> None:
+    """Test that a duplicate upload only looks up the existing blob and drops
+    its staging object."""
+    object_image_crud = create_object_crud()
+    object_image_crud.stat.return_value = BLOB_INFO
+    image_metadata_crud = create_image_metadata_crud()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        image_blob_crud=create_image_blob_crud(),
+    )
+
+    await test_image_service.add_image(
+        db_session=MagicMock(),
+        s3_object=CoffeeDrinkImage(
+            key=OBJECT_ID,
+            file=create_upload_stream(dummy_coffee_images.image_1_bytes),
+        ),
+    )
+
+    object_image_crud.stat.assert_called_once_with(
+        filepath="blobs", filename=SHA256
+    )
+    object_image_crud.copy.assert_not_called()
+    object_image_crud.delete.assert_called_once_with(
+        filepath="upload/coffee_drink", filename=str(OBJECT_ID)
+    )
+    metadata = image_metadata_crud.replace.call_args.kwargs["metadata"]
+    assert metadata.variants == {"original": BLOB}
+
+
+@pytest.mark.asyncio
+async def test_image_service_add_image_releases_replaced_blob(
+    dummy_coffee_images: DummyImages,
+) -> None:
+    """Test that replacing an image with other content releases the blob of
+    the replaced original."""
+    replaced = BLOB.model_copy(update={"sha256": "b" * 64})
+    object_image_crud = create_object_crud()
+    object_image_crud.stat.return_value = BLOB_INFO
+    image_blob_crud = create_image_blob_crud()
+    image_blob_crud.remove_reference.return_value = True
+    db_session = MagicMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=create_image_metadata_crud(
+            ImageMetadata(_id=KEY, variants={"original": replaced})
+        ),
+        image_blob_crud=image_blob_crud,
+    )
+
+    await test_image_service.add_image(
+        db_session=db_session,
+        s3_object=CoffeeDrinkImage(
+            key=OBJECT_ID,
+            file=create_upload_stream(dummy_coffee_images.image_1_bytes),
+        ),
+    )
+
+    image_blob_crud.remove_reference.assert_called_once_with(
+        db_session=db_session, sha256="b" * 64, key=KEY
+    )
+    object_image_crud.delete.assert_has_calls(
+        [
+            call(filepath="upload/coffee_drink", filename=str(OBJECT_ID)),
+            call(filepath="blobs", filename="b" * 64),
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_image_service_add_image_deletes_replaced_per_image_original(
+    dummy_coffee_images: DummyImages,
+) -> None:
+    """Test that an original stored per image is deleted once the image is
+    replaced by a blob."""
+    replaced = BLOB.model_copy(update={"sha256": "b" * 64, "blob": False})
+    object_image_crud = create_object_crud()
+    object_image_crud.stat.return_value = BLOB_INFO
+    image_metadata_crud = create_image_metadata_crud(
+        ImageMetadata(_id=KEY, variants={"original": replaced})
+    )
+    image_blob_crud = create_image_blob_crud()
+    manager = MagicMock()
+    manager.attach_mock(image_metadata_crud.replace, "replace")
+    manager.attach_mock(object_image_crud.delete, "delete")
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        image_blob_crud=image_blob_crud,
+    )
+
+    await test_image_service.add_image(
+        db_session=MagicMock(),
+        s3_object=CoffeeDrinkImage(
+            key=OBJECT_ID,
+            file=create_upload_stream(dummy_coffee_images.image_1_bytes),
+        ),
+    )
+
+    assert [name for name, _, _ in manager.mock_calls] == [
+        "delete",
+        "replace",
+        "delete",
+    ]
+    object_image_crud.delete.assert_called_with(
+        filepath="coffee_drink/original", filename=str(OBJECT_ID)
+    )
+    image_blob_crud.remove_reference.assert_not_called()
+
+
+@pytest.mark.parametrize("last_reference", [True, False])
+@pytest.mark.asyncio
+async def test_image_service_delete_image_blob(last_reference: bool) -> None:
+    """Test that the blob of a deleted image is only deleted with its last
+    reference."""
+    object_image_crud = AsyncMock()
+    image_blob_crud = create_image_blob_crud()
+    image_blob_crud.remove_reference.return_value = last_reference
+    db_session = MagicMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=create_image_metadata_crud(
+            ImageMetadata(_id=KEY, variants={"original": BLOB})
+        ),
+        image_blob_crud=image_blob_crud,
+    )
+
+    await test_image_service.delete_image(
+        db_session=db_session,
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_DRINK,
+    )
+
+    image_blob_crud.remove_reference.assert_called_once_with(
+        db_session=db_session, sha256=SHA256, key=KEY
+    )
+    assert (
+        call(filepath="blobs", filename=SHA256)
+        in object_image_crud.delete.call_args_list
+    ) is last_reference
+    assert image_blob_crud.delete.called is last_reference
+
+
+@pytest.mark.asyncio
+async def test_image_service_add_image_while_blob_is_deleted(
+    dummy_coffee_images: DummyImages,
+) -> None:
+    """Test that an upload of the same content while the last image of a blob
+    is deleted is stored per image, so it does not depend on the blob."""
+    other_id = UUID("123e4567-e19b-12d3-a456-426655440001")
+    object_image_crud = create_object_crud()
+    object_image_crud.stat.return_value = BLOB_INFO
+    image_metadata_crud = AsyncMock()
+
+    async def read_metadata(  # pylint: disable=unused-argument
+        db_session: MagicMock, key: str
+    ) -> ImageMetadata:
+        if key != KEY:
+            raise ObjectNotFoundError("not found")
+        return ImageMetadata(_id=KEY, variants={"original": BLOB})
+
+    image_metadata_crud.read.side_effect = read_metadata
+    image_blob_crud = create_image_blob_crud(added=False)
+    image_blob_crud.remove_reference.return_value = True
+    db_session = MagicMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        image_blob_crud=image_blob_crud,
+    )
+    uploaded: List[StoredImageVariant] = []
+
+    async def delete(  # pylint: disable=unused-argument
+        filepath: str, filename: str
+    ) -> None:
+        # The upload runs after the blob was marked and before its deletion.
+        if filepath == "blobs":
+            await test_image_service.add_image(
+                db_session=db_session,
+                s3_object=CoffeeDrinkImage(
+                    key=other_id,
+                    file=create_upload_stream(
+                        dummy_coffee_images.image_1_bytes
+                    ),
+                ),
+            )
+            uploaded.append(
+                image_metadata_crud.replace.call_args.kwargs[
+                    "metadata"
+                ].variants["original"]
+            )
+            image_blob_crud.delete.assert_not_called()
+
+    object_image_crud.delete.side_effect = delete
+
+    await test_image_service.delete_image(
+        db_session=db_session,
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_DRINK,
+    )
+
+    object_image_crud.copy.assert_called_once_with(
+        source_filepath="upload/coffee_drink",
+        filepath="coffee_drink/original",
+        filename=str(other_id),
+        file_type="jpeg",
+        source_filename=str(other_id),
+    )
+    assert uploaded == [BLOB.model_copy(update={"blob": False})]
+    image_blob_crud.delete.assert_called_once_with(
+        db_session=db_session, sha256=SHA256
+    )
+
+
+@pytest.mark.asyncio
+async def test_image_service_stream_image_blob() -> None:
+    """Test that a blob original is read from its content address."""
+    object_image_crud = AsyncMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=create_image_metadata_crud(
+            ImageMetadata(
+                _id=KEY,
+                variants={"original": BLOB},
+                small_checked_at=datetime.now(timezone.utc),
+            )
+        ),
+    )
+
+    await test_image_service.stream_image(
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_DRINK,
+    )
+
+    object_image_crud.stream.assert_called_once_with(
+        filepath="blobs", filename=SHA256, byte_range=None, if_range=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_image_service_stream_image_small_gone_keeps_blob() -> None:
+    """Test that a missing small variant of a blob original only removes the
+    small variant, so the blob is served and stays referenced."""
+    object_image_crud = AsyncMock()
+    object_image_crud.stream.side_effect = [
+        ObjectNotFoundError("not found"),
+        MagicMock(),
+    ]
+    small = StoredImageVariant.from_object_info(BLOB_INFO)
+    image_metadata_crud = AsyncMock()
+    image_metadata_crud.read.side_effect = [
+        ImageMetadata(
+            _id=KEY,
+            variants={"original": BLOB, "small": small},
+            small_checked_at=datetime.now(timezone.utc),
+        ),
+        ImageMetadata(
+            _id=KEY,
+            variants={"original": BLOB},
+            small_checked_at=datetime.now(timezone.utc),
+        ),
+    ]
+    db_session = MagicMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        image_blob_crud=AsyncMock(),
+    )
+
+    await test_image_service.stream_image(
+        db_session=db_session,
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_DRINK,
+    )
+
+    image_metadata_crud.remove_variant.assert_called_once_with(
+        db_session=db_session, key=KEY, variant="small"
+    )
+    image_metadata_crud.delete.assert_not_called()
+    assert object_image_crud.stream.call_args.kwargs["filename"] == SHA256
+
+
+@pytest.mark.asyncio
+async def test_image_service_stream_image_blob_gone_keeps_record() -> None:
+    """Test that the record of a blob original missing in S3 is kept."""
+    object_image_crud = AsyncMock()
+    object_image_crud.stream.side_effect = ObjectNotFoundError("not found")
+    image_metadata_crud = create_image_metadata_crud(
+        ImageMetadata(
+            _id=KEY,
+            variants={"original": BLOB},
+            small_checked_at=datetime.now(timezone.utc),
+        )
+    )
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        image_blob_crud=AsyncMock(),
+    )
+
+    with pytest.raises(HTTPException) as exception:
+        await test_image_service.stream_image(
+            db_session=MagicMock(),
+            object_id=OBJECT_ID,
+            image_type=ImageType.COFFEE_DRINK,
+        )
+
+    assert exception.value.status_code == 404
+    image_metadata_crud.remove_variant.assert_not_called()
+    image_metadata_crud.delete.assert_not_called()
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, call
+from unittest.mock import AsyncMock, MagicMock, call
 from uuid import UUID
 
 import pytest
@@ -17,18 +17,26 @@ async def test_image_service_delete_coffee_image(
     images for a coffee_drink inside of small and original versions.
 
     """
-    object_image_crud = MagicMock()
+    object_image_crud = AsyncMock()
     object_image_crud.delete.return_value = None
+    image_metadata_crud = AsyncMock()
+    db_session = MagicMock()
 
     coffe_uuid = UUID("123e4567-e19b-12d3-a456-426655440000")
 
-    test_coffee_service = ImageService(object_crud=object_image_crud)
+    test_coffee_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        resize_widths=(320,),
+    )
 
-    test_coffee_service.delete_image(
-        object_id=coffe_uuid, image_type=ImageType.COFFEE_DRINK
+    await test_coffee_service.delete_image(
+        db_session=db_session,
+        object_id=coffe_uuid,
+        image_type=ImageType.COFFEE_DRINK,
     )
 
-    assert object_image_crud.delete.call_count == 2
+    assert object_image_crud.delete.call_count == 5
 
     object_image_crud.delete.assert_has_calls(
         [
@@ -36,14 +44,53 @@ async def test_image_service_delete_coffee_image(
                 filepath="coffee_drink/small",
                 filename="123e4567-e19b-12d3-a456-426655440000",
             ),
+            call(
+                filepath="coffee_drink/small_webp",
+                filename="123e4567-e19b-12d3-a456-426655440000",
+            ),
+            call(
+                filepath="coffee_drink/small_avif",
+                filename="123e4567-e19b-12d3-a456-426655440000",
+            ),
             call(
                 filepath="coffee_drink/original",
                 filename="123e4567-e19b-12d3-a456-426655440000",
             ),
+            call(
+                filepath="coffee_drink/w320",
+                filename="123e4567-e19b-12d3-a456-426655440000",
+            ),
         ]
     )
 
+    image_metadata_crud.delete.assert_called_once_with(
+        db_session=db_session,
+        key="coffee_drink/123e4567-e19b-12d3-a456-426655440000",
+    )
+
     assert (
         "Deleted all versions for coffee_drink image with id "
         "123e4567-e19b-12d3-a456-426655440000" in caplog.text
     )
+
+
+@pytest.mark.asyncio
+async def test_image_service_delete_image_invalidates_cache() -> None:
+    """Test that deleting an image removes it from the image cache."""
+    image_cache = MagicMock()
+
+    test_image_service = ImageService(
+        object_crud=AsyncMock(),
+        image_metadata_crud=AsyncMock(),
+        image_cache=image_cache,
+    )
+
+    await test_image_service.delete_image(
+        db_session=MagicMock(),
+        object_id=UUID("123e4567-e19b-12d3-a456-426655440000"),
+        image_type=ImageType.COFFEE_DRINK,
+    )
+
+    image_cache.invalidate.assert_called_once_with(
+        "coffee_drink/123e4567-e19b-12d3-a456-426655440000", prefix=True
+    )
@@ -0,0 +1,58 @@
+from typing import AsyncIterator, Optional
+
+import pytest
+
+from coffee_backend.services.image_format import read_head, sniff_image_format
+
+
+@pytest.mark.parametrize(
+    "head, expected",
+    [
+        (b"\xff\xd8\xff\xe0\x00\x10JFIF", "jpeg"),
+        (b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR", "png"),
+        (b"GIF89a\x01\x00", "gif"),
+        (b"RIFF\x24\x00\x00\x00WEBPVP8 ", "webp"),
+        (b"\x00\x00\x00\x1cftypavif\x00\x00\x00\x00", "avif"),
+        (b"\x00\x00\x00\x18ftypheic\x00\x00\x00\x00", None),
+        (b"<svg xmlns='http://www.w3.org/2000/svg'/>", None),
+        (b"", None),
+    ],
+)
+def test_sniff_image_format(head: bytes, expected: Optional[str]) -> None:
+    """Test that image formats are detected by their magic bytes."""
+
+    assert sniff_image_format(head) == expected
+
+
+async def chunks_of(*chunks: bytes) -> AsyncIterator[bytes]:
+    """Yield the given chunks."""
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_read_head() -> None:
+    """Test that the head is read from the first chunks and that the
+    returned chunks still contain the whole content."""
+    consumed = []
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for chunk in (b"abc", b"defg", b"hij"):
+            consumed.append(chunk)
+            yield chunk
+
+    head, content = await read_head(chunks(), size=5)
+
+    assert head == b"abcde"
+    assert consumed == [b"abc", b"defg"]
+    assert b"".join([chunk async for chunk in content]) == b"abcdefghij"
+
+
+@pytest.mark.asyncio
+async def test_read_head_short_content() -> None:
+    """Test that content shorter than the head is returned completely."""
+
+    head, content = await read_head(chunks_of(b"ab"), size=5)
+
+    assert head == b"ab"
+    assert [chunk async for chunk in content] == [b"ab"]
@@ -1,83 +1,164 @@
-from unittest.mock import MagicMock, call
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, call
 from uuid import UUID
 
 import pytest
 from fastapi import HTTPException
 
-from coffee_backend.exceptions.exceptions import ObjectNotFoundError
-from coffee_backend.schemas import ImageType
+from coffee_backend.exceptions.exceptions import (
+    ObjectNotFoundError,
+    RangeNotSatisfiableError,
+)
+from coffee_backend.s3.types.byte_range import ByteRange
+from coffee_backend.s3.types.object_info import ObjectInfo
+from coffee_backend.schemas import ImageMetadata, ImageType, StoredImageVariant
+from coffee_backend.services.image_cache import ImageCache
 from coffee_backend.services.image_service import ImageService
-from tests.conftest import DummyImages
+from tests.conftest import (
+    DummyImages,
+    create_image_metadata_crud,
+    create_object_stream,
+)
+
+OBJECT_ID = UUID("123e4567-e19b-12d3-a456-426655440000")
+
+ORIGINAL_INFO = ObjectInfo(
+    size=100,
+    etag="original-etag",
+    last_modified=datetime(2024, 5, 1, 12, 0, 0, tzinfo=timezone.utc),
+    file_type="jpeg",
+)
+
+SMALL_INFO = ObjectInfo(
+    size=10,
+    etag="small-etag",
+    last_modified=datetime(2024, 5, 1, 12, 0, 5, tzinfo=timezone.utc),
+    file_type="jpeg",
+)
+
+
+def stat_variants(**variants: ObjectInfo) -> AsyncMock:
+    """Create a stat mock finding only the given variants in S3."""
+
+    async def stat(filepath: str, filename: str) -> ObjectInfo:
+        variant = filepath.split("/")[1]
+
+        if variant not in variants:
+            raise ObjectNotFoundError(message=f"{variant} {filename} not found")
+
+        return variants[variant]
+
+    return AsyncMock(side_effect=stat)
+
+
+def create_metadata(
+    image_type: ImageType,
+    small: bool,
+    small_checked_at: datetime | None = None,
+) -> ImageMetadata:
+    """Create image metadata with an original and optionally a small variant.
+
+    Args:
+        image_type (ImageType): The type of the image.
+        small (bool): Whether a small variant is recorded.
+        small_checked_at (datetime | None): Last check for the small variant.
+
+    Returns:
+        ImageMetadata: The image metadata.
+    """
+    variants = {"original": StoredImageVariant.from_object_info(ORIGINAL_INFO)}
+
+    if small:
+        variants["small"] = StoredImageVariant.from_object_info(SMALL_INFO)
+
+    return ImageMetadata(
+        _id=f"{image_type.value}/{OBJECT_ID}",
+        variants=variants,
+        small_checked_at=small_checked_at,
+    )
 
 
 @pytest.mark.asyncio
 async def test_image_service_get_image_small_existing(
     dummy_coffee_images: DummyImages,
 ) -> None:
-    """Test coffee image service with existing small image.
+    """Test coffee image service with a recorded small image.
 
-    Test the ImagesService get_image method for retrieving a
-        coffee_drink image from the S3 bucket when the small image exists.
+    Test the ImagesService get_image method for retrieving a coffee_drink
+    image from the S3 bucket when the small image is recorded, which is read
+    without probing S3.
 
     Args:
         dummy_coffee_images (DummyImages): An instance providing dummy
             image data.
 
     """
-    object_image_crud = MagicMock()
+    object_image_crud = AsyncMock()
     object_image_crud.read.return_value = (
         dummy_coffee_images.image_1_bytes,
         "jpg",
     )
+    image_metadata_crud = create_image_metadata_crud(
+        create_metadata(ImageType.COFFEE_DRINK, small=True)
+    )
 
-    coffe_uuid = UUID("123e4567-e19b-12d3-a456-426655440000")
-
-    test_image_service = ImageService(object_crud=object_image_crud)
-
-    result = test_image_service.get_image(
-        object_id=coffe_uuid, image_type=ImageType.COFFEE_DRINK
+    test_image_service = ImageService(
+        object_crud=object_image_crud, image_metadata_crud=image_metadata_crud
     )
 
-    assert object_image_crud.read.call_count == 1
+    result = await test_image_service.get_image(
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_DRINK,
+    )
 
     object_image_crud.read.assert_called_once_with(
         filepath="coffee_drink/small",
         filename="123e4567-e19b-12d3-a456-426655440000",
     )
+    object_image_crud.stat.assert_not_called()
+    image_metadata_crud.update_variants.assert_not_called()
 
     assert result == (dummy_coffee_images.image_1_bytes, "jpg")
 
 
 @pytest.mark.asyncio
-async def test_image_service_get_image_small_not_existing(
+async def test_image_service_get_image_without_metadata(
     dummy_coffee_images: DummyImages,
 ) -> None:
-    """Test image service with small image not existing.
+    """Test image service with an image uploaded before metadata was recorded.
 
-    Test the ImagesService get_image method for retrieving a coffee_bean image
-    from the S3 bucket when the small image not exists, but the original.
+    The variants are probed once and recorded, only the original is read.
 
     Args:
         dummy_coffee_images (DummyImages): An instance providing dummy
             image data.
 
     """
-    object_image_crud = MagicMock()
-
-    object_image_crud.read.side_effect = [
+    object_image_crud = AsyncMock()
+    object_image_crud.stat.side_effect = [
         ObjectNotFoundError(message="Object not found"),
-        (dummy_coffee_images.image_1_bytes, "jpg"),
+        ORIGINAL_INFO,
     ]
+    object_image_crud.read.return_value = (
+        dummy_coffee_images.image_1_bytes,
+        "jpg",
+    )
+    image_metadata_crud = create_image_metadata_crud()
+    db_session = MagicMock()
 
-    coffe_uuid = UUID("123e4567-e19b-12d3-a456-426655440000")
-
-    test_coffee_service = ImageService(object_crud=object_image_crud)
+    test_image_service = ImageService(
+        object_crud=object_image_crud, image_metadata_crud=image_metadata_crud
+    )
 
-    result = test_coffee_service.get_image(
-        object_id=coffe_uuid, image_type=ImageType.COFFEE_BEAN
+    result = await test_image_service.get_image(
+        db_session=db_session,
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
     )
 
-    object_image_crud.read.assert_has_calls(
+    object_image_crud.stat.assert_has_calls(
         [
             call(
                 filepath="coffee_bean/small",
@@ -89,40 +170,552 @@ async def test_image_service_get_image_small_not_existing(
             ),
         ]
     )
+    object_image_crud.read.assert_called_once_with(
+        filepath="coffee_bean/original",
+        filename="123e4567-e19b-12d3-a456-426655440000",
+    )
 
-    assert object_image_crud.read.call_count == 2
+    update_call = image_metadata_crud.update_variants.call_args
+    assert update_call.kwargs["db_session"] is db_session
+    assert update_call.kwargs["key"] == f"coffee_bean/{OBJECT_ID}"
+    assert update_call.kwargs["variants"] == {
+        "original": StoredImageVariant.from_object_info(ORIGINAL_INFO)
+    }
 
     assert result == (dummy_coffee_images.image_1_bytes, "jpg")
 
 
 @pytest.mark.asyncio
-async def test_image_service_get_image_object_not_found(
-    dummy_coffee_images: DummyImages,
-) -> None:
+async def test_image_service_get_image_object_not_found() -> None:
     """Test the ImagesService get_image method when the object is not found.
 
-    Args:
-        dummy_coffee_images (DummyImages): An instance providing dummy
-        image data.
-
     Raises:
         pytest.raises(HTTPException): An HTTPException should be raised when
         the requested coffee image is not found in the S3 bucket.
 
     """
 
-    object_image_crud = MagicMock()
-    object_image_crud.read.side_effect = ObjectNotFoundError(
+    object_image_crud = AsyncMock()
+    object_image_crud.stat.side_effect = ObjectNotFoundError(
+        message="Object not found"
+    )
+    image_metadata_crud = create_image_metadata_crud()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud, image_metadata_crud=image_metadata_crud
+    )
+
+    with pytest.raises(HTTPException) as exception:
+        await test_image_service.get_image(
+            db_session=MagicMock(),
+            object_id=OBJECT_ID,
+            image_type=ImageType.COFFEE_DRINK,
+        )
+
+    assert exception.value.status_code == 404
+    assert object_image_crud.stat.call_count == 2
+    object_image_crud.read.assert_not_called()
+    image_metadata_crud.update_variants.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_image_service_stream_image_recently_checked_original() -> None:
+    """Test that an image only recorded as original is streamed without
+    probing S3 within the recheck interval."""
+
+    object_image_crud = AsyncMock()
+    object_stream = MagicMock()
+    object_image_crud.stream.return_value = object_stream
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=create_image_metadata_crud(
+            create_metadata(
+                ImageType.COFFEE_BEAN,
+                small=False,
+                small_checked_at=datetime.now(timezone.utc),
+            )
+        ),
+        small_recheck_interval=60,
+    )
+
+    result = await test_image_service.stream_image(
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+    )
+
+    object_image_crud.stream.assert_called_once_with(
+        filepath="coffee_bean/original",
+        filename="123e4567-e19b-12d3-a456-426655440000",
+        byte_range=None,
+        if_range=None,
+    )
+    object_image_crud.stat.assert_not_called()
+
+    assert result is object_stream
+
+
+@pytest.mark.asyncio
+async def test_image_service_stream_image_rechecks_small() -> None:
+    """Test that S3 is checked again for a small image once the recheck
+    interval passed and a found small image is recorded and streamed."""
+
+    object_image_crud = AsyncMock()
+    object_image_crud.stat = stat_variants(small=SMALL_INFO)
+    image_metadata_crud = create_image_metadata_crud(
+        create_metadata(
+            ImageType.COFFEE_BEAN,
+            small=False,
+            small_checked_at=datetime.now(timezone.utc) - timedelta(minutes=2),
+        )
+    )
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        small_recheck_interval=60,
+    )
+
+    await test_image_service.stream_image(
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+    )
+
+    assert object_image_crud.stat.call_args_list == [
+        call(filepath=f"coffee_bean/{variant}", filename=str(OBJECT_ID))
+        for variant in ["small", "small_webp", "small_avif"]
+    ]
+    object_image_crud.stream.assert_called_once_with(
+        filepath="coffee_bean/small",
+        filename="123e4567-e19b-12d3-a456-426655440000",
+        byte_range=None,
+        if_range=None,
+    )
+    assert image_metadata_crud.update_variants.call_args.kwargs["variants"] == {
+        "small": StoredImageVariant.from_object_info(SMALL_INFO)
+    }
+
+
+@pytest.mark.asyncio
+async def test_image_service_stream_image_rechecks_small_formats() -> None:
+    """Test that the alternative formats of a small image found in S3 are
+    recorded with it and the smallest accepted one is streamed."""
+    small_webp_info = ObjectInfo(
+        size=6,
+        etag="small-webp-etag",
+        last_modified=SMALL_INFO.last_modified,
+        file_type="webp",
+    )
+    outdated_small_avif_info = ObjectInfo(
+        size=4,
+        etag="small-avif-etag",
+        last_modified=datetime(2024, 4, 1, tzinfo=timezone.utc),
+        file_type="avif",
+    )
+
+    object_image_crud = AsyncMock()
+    object_image_crud.stat = stat_variants(
+        small=SMALL_INFO,
+        small_webp=small_webp_info,
+        small_avif=outdated_small_avif_info,
+    )
+    image_metadata_crud = create_image_metadata_crud(
+        create_metadata(ImageType.COFFEE_BEAN, small=False)
+    )
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+    )
+
+    await test_image_service.stream_image(
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        accepted_formats=("avif", "webp"),
+    )
+
+    object_image_crud.stream.assert_called_once_with(
+        filepath="coffee_bean/small_webp",
+        filename=str(OBJECT_ID),
+        byte_range=None,
+        if_range=None,
+    )
+    assert image_metadata_crud.update_variants.call_args.kwargs["variants"] == {
+        "small": StoredImageVariant.from_object_info(SMALL_INFO),
+        "small_webp": StoredImageVariant.from_object_info(small_webp_info),
+    }
+
+
+@pytest.mark.asyncio
+async def test_image_service_stream_image_ignores_outdated_small() -> None:
+    """Test that a small image older than the original is not served."""
+
+    object_image_crud = AsyncMock()
+    object_image_crud.stat.return_value = ObjectInfo(
+        size=10,
+        etag="outdated",
+        last_modified=datetime(2024, 4, 1, tzinfo=timezone.utc),
+        file_type="jpeg",
+    )
+    image_metadata_crud = create_image_metadata_crud(
+        create_metadata(ImageType.COFFEE_BEAN, small=False)
+    )
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud, image_metadata_crud=image_metadata_crud
+    )
+
+    await test_image_service.stream_image(
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+    )
+
+    object_image_crud.stream.assert_called_once_with(
+        filepath="coffee_bean/original",
+        filename="123e4567-e19b-12d3-a456-426655440000",
+        byte_range=None,
+        if_range=None,
+    )
+    assert (
+        image_metadata_crud.update_variants.call_args.kwargs["variants"] == {}
+    )
+
+
+@pytest.mark.asyncio
+async def test_image_service_stream_image_recorded_small_gone() -> None:
+    """Test that only the record of a small variant missing in S3 is removed
+    and the original is served instead."""
+
+    object_image_crud = AsyncMock()
+    object_image_crud.stream.side_effect = [
+        ObjectNotFoundError(message="Object not found"),
+        create_object_stream(b"original", "jpeg"),
+    ]
+    image_metadata_crud = AsyncMock()
+    image_metadata_crud.read.side_effect = [
+        create_metadata(ImageType.COFFEE_BEAN, small=True),
+        create_metadata(
+            ImageType.COFFEE_BEAN,
+            small=False,
+            small_checked_at=datetime.now(timezone.utc),
+        ),
+    ]
+    db_session = MagicMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud, image_metadata_crud=image_metadata_crud
+    )
+
+    await test_image_service.stream_image(
+        db_session=db_session,
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+    )
+
+    image_metadata_crud.remove_variant.assert_called_once_with(
+        db_session=db_session, key=f"coffee_bean/{OBJECT_ID}", variant="small"
+    )
+    image_metadata_crud.delete.assert_not_called()
+    assert object_image_crud.stream.call_args.kwargs["filepath"] == (
+        "coffee_bean/original"
+    )
+
+
+@pytest.mark.asyncio
+async def test_image_service_stream_image_recorded_image_gone() -> None:
+    """Test that the records of variants missing in S3 are removed one by
+    one and the image is answered with 404 once the original is gone."""
+
+    object_image_crud = AsyncMock()
+    object_image_crud.stream.side_effect = ObjectNotFoundError(
         message="Object not found"
     )
+    image_metadata_crud = AsyncMock()
+    image_metadata_crud.read.side_effect = [
+        create_metadata(ImageType.COFFEE_BEAN, small=True),
+        create_metadata(
+            ImageType.COFFEE_BEAN,
+            small=False,
+            small_checked_at=datetime.now(timezone.utc),
+        ),
+    ]
+    db_session = MagicMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud, image_metadata_crud=image_metadata_crud
+    )
+
+    with pytest.raises(HTTPException) as exception:
+        await test_image_service.stream_image(
+            db_session=db_session,
+            object_id=OBJECT_ID,
+            image_type=ImageType.COFFEE_BEAN,
+        )
+
+    assert exception.value.status_code == 404
+    image_metadata_crud.remove_variant.assert_has_calls(
+        [
+            call(
+                db_session=db_session,
+                key=f"coffee_bean/{OBJECT_ID}",
+                variant="small",
+            ),
+            call(
+                db_session=db_session,
+                key=f"coffee_bean/{OBJECT_ID}",
+                variant="original",
+            ),
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_image_service_stream_image_range_not_satisfiable() -> None:
+    """Test that an unsatisfiable byte range is answered with HTTP 416."""
+
+    object_image_crud = AsyncMock()
+    object_image_crud.stream.side_effect = RangeNotSatisfiableError(
+        message="Requested range not satisfiable"
+    )
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=create_image_metadata_crud(
+            create_metadata(ImageType.COFFEE_BEAN, small=True)
+        ),
+    )
+
+    with pytest.raises(HTTPException) as exception:
+        await test_image_service.stream_image(
+            db_session=MagicMock(),
+            object_id=OBJECT_ID,
+            image_type=ImageType.COFFEE_BEAN,
+            byte_range=ByteRange(start=100, end=None),
+        )
+
+    assert exception.value.status_code == 416
+
+    object_image_crud.stream.assert_called_once_with(
+        filepath="coffee_bean/small",
+        filename="123e4567-e19b-12d3-a456-426655440000",
+        byte_range=ByteRange(start=100, end=None),
+        if_range=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_image_service_stat_image_from_metadata() -> None:
+    """Test that stat_image answers from the recorded variant of the image
+    stream_image serves, without a request to S3."""
+
+    object_image_crud = AsyncMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=create_image_metadata_crud(
+            create_metadata(ImageType.COFFEE_DRINK, small=True)
+        ),
+    )
+
+    result = await test_image_service.stat_image(
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_DRINK,
+    )
+
+    object_image_crud.stat.assert_not_called()
+
+    assert result == SMALL_INFO
+
+
+@pytest.mark.parametrize(
+    "accepted_formats, expected_filepath",
+    [
+        ((), "coffee_bean/small"),
+        (("webp",), "coffee_bean/small_webp"),
+        (("avif", "webp"), "coffee_bean/small_avif"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_image_service_stream_image_negotiates_format(
+    accepted_formats: tuple[str, ...], expected_filepath: str
+) -> None:
+    """Test that the smallest recorded small variant in a format accepted by
+    the client is streamed."""
+
+    metadata = create_metadata(ImageType.COFFEE_BEAN, small=True)
+
+    for name, size in [("small_webp", 6), ("small_avif", 4)]:
+        metadata.variants[name] = StoredImageVariant(
+            size=size, etag=f"{name}-etag", file_type=name.split("_")[1]
+        )
+
+    object_image_crud = AsyncMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=create_image_metadata_crud(metadata),
+    )
+
+    await test_image_service.stream_image(
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        accepted_formats=accepted_formats,
+    )
+
+    object_image_crud.stream.assert_called_once_with(
+        filepath=expected_filepath,
+        filename="123e4567-e19b-12d3-a456-426655440000",
+        byte_range=None,
+        if_range=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_image_service_stream_image_accepted_format_not_recorded() -> (
+    None
+):
+    """Test that the small variant is served if no accepted alternative
+    format was created."""
+
+    object_image_crud = AsyncMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=create_image_metadata_crud(
+            create_metadata(ImageType.COFFEE_BEAN, small=True)
+        ),
+    )
+
+    info = await test_image_service.stat_image(
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        accepted_formats=("avif",),
+    )
+
+    assert info == SMALL_INFO
+
+
+@pytest.mark.asyncio
+async def test_image_service_list_image_variants() -> None:
+    """Test that the variants of several images are read with one query."""
+
+    other_id = UUID("123e4567-e19b-12d3-a456-426655440001")
+    image_metadata_crud = AsyncMock()
+    image_metadata_crud.read_many.return_value = [
+        create_metadata(ImageType.COFFEE_BEAN, small=True)
+    ]
+    db_session = MagicMock()
+
+    test_image_service = ImageService(
+        object_crud=AsyncMock(), image_metadata_crud=image_metadata_crud
+    )
+
+    result = await test_image_service.list_image_variants(
+        db_session=db_session,
+        object_ids=[OBJECT_ID, other_id],
+        image_type=ImageType.COFFEE_BEAN,
+    )
+
+    image_metadata_crud.read_many.assert_called_once_with(
+        db_session=db_session,
+        keys=[f"coffee_bean/{OBJECT_ID}", f"coffee_bean/{other_id}"],
+    )
+
+    assert list(result) == [OBJECT_ID]
+    assert list(result[OBJECT_ID]) == ["original", "small"]
+
+
+@pytest.mark.asyncio
+async def test_image_service_stream_image_populates_cache(
+    tmp_path: Path,
+) -> None:
+    """Test that a completely streamed image is added to the image cache and
+    served from it afterwards."""
+
+    object_image_crud = AsyncMock()
+    object_image_crud.stream.return_value = create_object_stream(
+        b"0123456789", "jpeg"
+    )
+
+    image_cache = ImageCache(metric=MagicMock(), directory=str(tmp_path))
+    image_cache.clear()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=create_image_metadata_crud(
+            create_metadata(ImageType.COFFEE_BEAN, small=True)
+        ),
+        image_cache=image_cache,
+    )
+
+    assert (
+        test_image_service.get_cached_image(OBJECT_ID, ImageType.COFFEE_BEAN)
+        is None
+    )
+
+    image = await test_image_service.stream_image(
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+    )
 
-    coffe_uuid = UUID("123e4567-e19b-12d3-a456-426655440000")
+    assert (
+        test_image_service.get_cached_image(OBJECT_ID, ImageType.COFFEE_BEAN)
+        is None
+    )
+
+    assert b"".join([chunk async for chunk in image.chunks]) == b"0123456789"
+
+    cached = test_image_service.get_cached_image(
+        OBJECT_ID, ImageType.COFFEE_BEAN
+    )
 
-    test_coffee_service = ImageService(object_crud=object_image_crud)
+    assert cached is not None
+    assert cached.data == b"0123456789"
+    assert cached.info.etag == "etag"
+    image_cache.metric.record_origin_bytes.assert_called()  # type: ignore
 
-    with pytest.raises(HTTPException):
-        test_coffee_service.get_image(
-            object_id=coffe_uuid, image_type=ImageType.COFFEE_DRINK
+    assert (
+        test_image_service.get_cached_image(
+            OBJECT_ID, ImageType.COFFEE_BEAN, accepted_formats=("webp",)
         )
+        is None
+    )
+
 
-    assert object_image_crud.read.call_count == 2
+@pytest.mark.asyncio
+async def test_image_service_presign_image() -> None:
+    """Test that the resolved variant of an image is presigned for the
+    redirect URL ttl."""
+
+    object_image_crud = AsyncMock()
+    object_image_crud.presign.return_value = "presigned-url"
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=create_image_metadata_crud(
+            create_metadata(ImageType.COFFEE_BEAN, small=True)
+        ),
+        redirect_url_ttl=300,
+    )
+
+    result = await test_image_service.presign_image(
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+    )
+
+    assert result == "presigned-url"
+    object_image_crud.presign.assert_called_once_with(
+        filepath="coffee_bean/small",
+        filename="123e4567-e19b-12d3-a456-426655440000",
+        expires=300,
+    )
+    object_image_crud.stat.assert_not_called()
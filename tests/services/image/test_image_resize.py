@@ -0,0 +1,309 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+
+from coffee_backend.exceptions.exceptions import ObjectNotFoundError
+from coffee_backend.s3.types.object_info import ObjectInfo
+from coffee_backend.schemas import ImageMetadata, ImageType, StoredImageVariant
+from coffee_backend.services.image_service import ImageService
+from coffee_backend.services.thumbnail import Thumbnail
+from tests.conftest import create_db_session, create_image_metadata_crud
+
+OBJECT_ID = UUID("123e4567-e19b-12d3-a456-426655440000")
+
+ORIGINAL_INFO = ObjectInfo(
+    size=100, etag="original-etag", last_modified=None, file_type="jpeg"
+)
+
+RESIZED_INFO = ObjectInfo(
+    size=20, etag="resized-etag", last_modified=None, file_type="jpeg"
+)
+
+
+def create_metadata(**variants: ObjectInfo) -> ImageMetadata:
+    """Create the metadata of a coffee bean image with the given variants."""
+    return ImageMetadata(
+        _id=f"coffee_bean/{OBJECT_ID}",
+        variants={
+            name: StoredImageVariant.from_object_info(info)
+            for name, info in variants.items()
+        },
+    )
+
+
+def create_thumbnail_generator() -> MagicMock:
+    """Create a thumbnail generator mock resizing to a fixed thumbnail."""
+    thumbnail_generator = MagicMock()
+    thumbnail_generator.generate = AsyncMock(
+        return_value=Thumbnail(data=b"resized", file_type="jpeg")
+    )
+    return thumbnail_generator
+
+
+@pytest.mark.asyncio
+async def test_image_service_stream_image_resizes_on_first_request() -> None:
+    """Test that a missing resized variant is created from the original,
+    stored under its derived key, recorded and streamed."""
+
+    object_image_crud = AsyncMock()
+    object_image_crud.read.return_value = (b"original", "jpeg")
+    object_image_crud.stat.return_value = RESIZED_INFO
+    image_metadata_crud = create_image_metadata_crud(
+        create_metadata(original=ORIGINAL_INFO)
+    )
+    thumbnail_generator = create_thumbnail_generator()
+    db_session = create_db_session()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        thumbnail_generator=thumbnail_generator,
+        resize_widths=(320, 640),
+    )
+
+    await test_image_service.stream_image(
+        db_session=db_session,
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        width=320,
+    )
+
+    object_image_crud.read.assert_called_once_with(
+        filepath="coffee_bean/original", filename=str(OBJECT_ID)
+    )
+    thumbnail_generator.generate.assert_awaited_once_with(
+        b"original", width=320
+    )
+
+    create_call = object_image_crud.create.call_args
+    assert create_call.kwargs["filepath"] == "coffee_bean/w320"
+    assert create_call.kwargs["file"].read() == b"resized"
+
+    image_metadata_crud.update_variants.assert_called_once_with(
+        db_session=db_session.client.start_session.return_value,
+        key=f"coffee_bean/{OBJECT_ID}",
+        variants={"w320": StoredImageVariant.from_object_info(RESIZED_INFO)},
+        original_etag="original-etag",
+    )
+    object_image_crud.stream.assert_called_once_with(
+        filepath="coffee_bean/w320",
+        filename=str(OBJECT_ID),
+        byte_range=None,
+        if_range=None,
+    )
+    thumbnail_generator.metric.record_job.assert_called_once_with("resized")
+    assert not test_image_service.resizing
+
+
+@pytest.mark.asyncio
+async def test_image_service_stat_image_recorded_resized_variant() -> None:
+    """Test that a recorded resized variant is served without resizing."""
+
+    object_image_crud = AsyncMock()
+    thumbnail_generator = create_thumbnail_generator()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=create_image_metadata_crud(
+            create_metadata(original=ORIGINAL_INFO, w320=RESIZED_INFO)
+        ),
+        thumbnail_generator=thumbnail_generator,
+        resize_widths=(320,),
+    )
+
+    info = await test_image_service.stat_image(
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        width=320,
+    )
+
+    assert info == RESIZED_INFO
+    thumbnail_generator.generate.assert_not_called()
+    object_image_crud.stat.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_image_service_concurrent_requests_resize_once() -> None:
+    """Test that concurrent requests of a missing width share one resize."""
+
+    object_image_crud = AsyncMock()
+    object_image_crud.read.return_value = (b"original", "jpeg")
+    object_image_crud.stat.return_value = RESIZED_INFO
+    thumbnail_generator = create_thumbnail_generator()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=create_image_metadata_crud(
+            create_metadata(original=ORIGINAL_INFO)
+        ),
+        thumbnail_generator=thumbnail_generator,
+        resize_widths=(320,),
+    )
+
+    results = await asyncio.gather(
+        *[
+            test_image_service.stat_image(
+                db_session=create_db_session(),
+                object_id=OBJECT_ID,
+                image_type=ImageType.COFFEE_BEAN,
+                width=320,
+            )
+            for _ in range(3)
+        ]
+    )
+
+    assert results == [RESIZED_INFO] * 3
+    thumbnail_generator.generate.assert_awaited_once()
+    object_image_crud.create.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_image_service_resize_outlives_cancelled_first_request() -> None:
+    """Test that a resize started by a cancelled request is finished for the
+    other requests waiting for it and recorded in a session of its own
+    instead of the ended session of the cancelled request."""
+
+    resizing = asyncio.Event()
+    release = asyncio.Event()
+
+    async def generate(  # pylint: disable=unused-argument
+        data: bytes, width: int
+    ) -> Thumbnail:
+        resizing.set()
+        await release.wait()
+        return Thumbnail(data=b"resized", file_type="jpeg")
+
+    object_image_crud = AsyncMock()
+    object_image_crud.read.return_value = (b"original", "jpeg")
+    object_image_crud.stat.return_value = RESIZED_INFO
+    image_metadata_crud = create_image_metadata_crud(
+        create_metadata(original=ORIGINAL_INFO)
+    )
+    thumbnail_generator = create_thumbnail_generator()
+    thumbnail_generator.generate = AsyncMock(side_effect=generate)
+    first_session = create_db_session()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        thumbnail_generator=thumbnail_generator,
+        resize_widths=(320,),
+    )
+
+    first_request = asyncio.create_task(
+        test_image_service.stat_image(
+            db_session=first_session,
+            object_id=OBJECT_ID,
+            image_type=ImageType.COFFEE_BEAN,
+            width=320,
+        )
+    )
+    await resizing.wait()
+
+    second_request = asyncio.create_task(
+        test_image_service.stat_image(
+            db_session=create_db_session(),
+            object_id=OBJECT_ID,
+            image_type=ImageType.COFFEE_BEAN,
+            width=320,
+        )
+    )
+    await asyncio.sleep(0)
+
+    first_request.cancel()
+    release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await first_request
+
+    assert await second_request == RESIZED_INFO
+    assert image_metadata_crud.update_variants.call_args.kwargs[
+        "db_session"
+    ] is (first_session.client.start_session.return_value)
+
+
+@pytest.mark.asyncio
+async def test_image_service_width_not_allowed() -> None:
+    """Test that widths outside of the allowed sizes are rejected."""
+
+    object_image_crud = AsyncMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=AsyncMock(),
+        thumbnail_generator=create_thumbnail_generator(),
+        resize_widths=(320, 640),
+    )
+
+    with pytest.raises(HTTPException) as exception:
+        await test_image_service.stream_image(
+            db_session=MagicMock(),
+            object_id=OBJECT_ID,
+            image_type=ImageType.COFFEE_BEAN,
+            width=321,
+        )
+
+    assert exception.value.status_code == 400
+    assert exception.value.detail == "Width must be one of 320, 640"
+    object_image_crud.stream.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_image_service_resize_original_not_found() -> None:
+    """Test that resizing an image without original is answered with 404."""
+
+    object_image_crud = AsyncMock()
+    object_image_crud.read.side_effect = ObjectNotFoundError("not found")
+    image_metadata_crud = create_image_metadata_crud()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        thumbnail_generator=create_thumbnail_generator(),
+        resize_widths=(320,),
+    )
+
+    with pytest.raises(HTTPException) as exception:
+        await test_image_service.stream_image(
+            db_session=MagicMock(),
+            object_id=OBJECT_ID,
+            image_type=ImageType.COFFEE_BEAN,
+            width=320,
+        )
+
+    assert exception.value.status_code == 404
+    object_image_crud.create.assert_not_called()
+    image_metadata_crud.update_variants.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_image_service_width_without_thumbnail_generator() -> None:
+    """Test that the regular variant is served if images are not resized."""
+
+    object_image_crud = AsyncMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=create_image_metadata_crud(
+            create_metadata(original=ORIGINAL_INFO, small=RESIZED_INFO)
+        ),
+        resize_widths=(320,),
+    )
+
+    await test_image_service.stream_image(
+        db_session=MagicMock(),
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+        width=320,
+    )
+
+    object_image_crud.stream.assert_called_once_with(
+        filepath="coffee_bean/small",
+        filename=str(OBJECT_ID),
+        byte_range=None,
+        if_range=None,
+    )
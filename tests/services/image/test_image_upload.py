@@ -0,0 +1,182 @@
+from unittest.mock import AsyncMock, MagicMock, call
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+
+from coffee_backend.exceptions.exceptions import ObjectNotFoundError
+from coffee_backend.s3.types.byte_range import ByteRange
+from coffee_backend.s3.types.object_info import ObjectInfo
+from coffee_backend.schemas import ImageType, ImageUpload, StoredImageVariant
+from coffee_backend.services.image_service import ImageService
+from tests.conftest import create_object_stream
+
+OBJECT_ID = UUID("123e4567-e19b-12d3-a456-426655440000")
+
+UPLOAD_INFO = ObjectInfo(
+    size=100, etag="upload-etag", last_modified=None, file_type="jpeg"
+)
+
+PNG_HEAD = b"\x89PNG\r\n\x1a\n" + bytes(24)
+
+ORIGINAL_INFO = ObjectInfo(
+    size=100, etag="original-etag", last_modified=None, file_type="png"
+)
+
+
+@pytest.mark.asyncio
+async def test_image_service_create_upload() -> None:
+    """Test that uploads are presigned for the staging object with the
+    configured ttl and maximal size."""
+
+    object_image_crud = AsyncMock()
+    object_image_crud.presign_upload.return_value = (
+        "http://minio:9000/coffee-images",
+        {"key": f"upload/coffee_bean/{OBJECT_ID}", "policy": "policy"},
+    )
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=AsyncMock(),
+        upload_url_ttl=60,
+        upload_max_size=1000,
+    )
+
+    upload = await test_image_service.create_upload(
+        object_id=OBJECT_ID, image_type=ImageType.COFFEE_BEAN
+    )
+
+    assert upload == ImageUpload(
+        url="http://minio:9000/coffee-images",
+        fields={"key": f"upload/coffee_bean/{OBJECT_ID}", "policy": "policy"},
+        max_size=1000,
+    )
+    object_image_crud.presign_upload.assert_called_once_with(
+        filepath="upload/coffee_bean",
+        filename=str(OBJECT_ID),
+        expires=60,
+        max_size=1000,
+    )
+
+
+@pytest.mark.asyncio
+async def test_image_service_complete_upload() -> None:
+    """Test that a completed upload is copied to the original within S3 with
+    the file type detected from its first bytes, removed from staging and
+    recorded as the only variant."""
+
+    object_image_crud = AsyncMock()
+    object_image_crud.stat.side_effect = [UPLOAD_INFO, ORIGINAL_INFO]
+    object_image_crud.stream.return_value = create_object_stream(
+        PNG_HEAD, "jpeg"
+    )
+    image_metadata_crud = AsyncMock()
+    image_cache = MagicMock()
+    db_session = MagicMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        image_cache=image_cache,
+    )
+
+    await test_image_service.complete_upload(
+        db_session=db_session,
+        object_id=OBJECT_ID,
+        image_type=ImageType.COFFEE_BEAN,
+    )
+
+    object_image_crud.stream.assert_called_once_with(
+        filepath="upload/coffee_bean",
+        filename=str(OBJECT_ID),
+        byte_range=ByteRange(start=0, end=31),
+    )
+    object_image_crud.copy.assert_called_once_with(
+        source_filepath="upload/coffee_bean",
+        filepath="coffee_bean/original",
+        filename=str(OBJECT_ID),
+        file_type="png",
+    )
+    object_image_crud.delete.assert_called_once_with(
+        filepath="upload/coffee_bean", filename=str(OBJECT_ID)
+    )
+    object_image_crud.stat.assert_has_calls(
+        [
+            call(filepath="upload/coffee_bean", filename=str(OBJECT_ID)),
+            call(filepath="coffee_bean/original", filename=str(OBJECT_ID)),
+        ]
+    )
+    object_image_crud.create.assert_not_called()
+
+    metadata = image_metadata_crud.replace.call_args.kwargs["metadata"]
+    assert metadata.variants == {
+        "original": StoredImageVariant.from_object_info(ORIGINAL_INFO)
+    }
+    image_cache.invalidate.assert_called_once_with(
+        f"coffee_bean/{OBJECT_ID}", prefix=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_image_service_complete_upload_not_found() -> None:
+    """Test that completing a missing upload is answered with 404."""
+
+    object_image_crud = AsyncMock()
+    object_image_crud.stat.side_effect = ObjectNotFoundError("not found")
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud, image_metadata_crud=AsyncMock()
+    )
+
+    with pytest.raises(HTTPException) as exception:
+        await test_image_service.complete_upload(
+            db_session=MagicMock(),
+            object_id=OBJECT_ID,
+            image_type=ImageType.COFFEE_BEAN,
+        )
+
+    assert exception.value.status_code == 404
+    object_image_crud.copy.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "size, head",
+    [
+        (1001, PNG_HEAD),
+        (0, b""),
+        (10, b"<html></html>"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_image_service_complete_upload_invalid(
+    size: int, head: bytes
+) -> None:
+    """Test that uploads exceeding the maximal size or without supported
+    image format are rejected and removed."""
+
+    object_image_crud = AsyncMock()
+    object_image_crud.stat.return_value = ObjectInfo(
+        size=size, etag="etag", last_modified=None, file_type="png"
+    )
+    object_image_crud.stream.return_value = create_object_stream(head, "png")
+    image_metadata_crud = AsyncMock()
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        upload_max_size=1000,
+    )
+
+    with pytest.raises(HTTPException) as exception:
+        await test_image_service.complete_upload(
+            db_session=MagicMock(),
+            object_id=OBJECT_ID,
+            image_type=ImageType.COFFEE_BEAN,
+        )
+
+    assert exception.value.status_code == 400
+    object_image_crud.delete.assert_called_once_with(
+        filepath="upload/coffee_bean", filename=str(OBJECT_ID)
+    )
+    object_image_crud.copy.assert_not_called()
+    image_metadata_crud.replace.assert_not_called()
@@ -0,0 +1,365 @@
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID
+
+import pytest
+
+from coffee_backend.mongo.image_metadata import ImageMetadataCRUD
+from coffee_backend.s3.types.object_info import ObjectInfo
+from coffee_backend.schemas import (
+    CoffeeDrinkImage,
+    ImageType,
+    StoredImageVariant,
+    image_key,
+)
+from coffee_backend.services.image_service import ImageService
+from coffee_backend.services.thumbnail import (
+    Thumbnail,
+    ThumbnailGenerator,
+    create_thumbnail,
+)
+from coffee_backend.settings import settings
+from tests.conftest import (
+    DummyImages,
+    TestDBSessions,
+    create_db_session,
+    create_upload_stream,
+)
+
+OBJECT_ID = UUID("123e4567-e19b-12d3-a456-426655440000")
+
+ORIGINAL_INFO = ObjectInfo(
+    size=100, etag="original-etag", last_modified=None, file_type="jpeg"
+)
+
+SMALL_INFO = ObjectInfo(
+    size=5, etag="small-etag", last_modified=None, file_type="jpeg"
+)
+
+SMALL_WEBP_INFO = ObjectInfo(
+    size=3, etag="small-webp-etag", last_modified=None, file_type="webp"
+)
+
+
+def create_image(image_format: str, mode: str, size: tuple[int, int]) -> bytes:
+    """Encode a blank image of the given format, mode and size."""
+    image_module = pytest.importorskip("PIL.Image")
+
+    output = io.BytesIO()
+    image_module.new(mode, size).save(output, format=image_format)
+
+    return output.getvalue()
+
+
+@pytest.mark.parametrize(
+    "image_format, mode, expected_file_type",
+    [
+        ("JPEG", "RGB", "jpeg"),
+        ("PNG", "RGBA", "png"),
+        ("GIF", "P", "jpeg"),
+    ],
+)
+def test_create_thumbnail(
+    image_format: str, mode: str, expected_file_type: str
+) -> None:
+    """Test that images are downscaled to the maximal size keeping their
+    aspect ratio and that stage durations are measured."""
+    image_module = pytest.importorskip("PIL.Image")
+
+    thumbnail = create_thumbnail(
+        create_image(image_format, mode, (1200, 600)),
+        max_size=400,
+        quality=80,
+        submitted_at=0,
+    )
+
+    assert thumbnail.file_type == expected_file_type
+    assert image_module.open(io.BytesIO(thumbnail.data)).size == (400, 200)
+    assert set(thumbnail.stage_durations) == {
+        "queue",
+        "decode",
+        "resize",
+        "encode",
+    }
+
+
+@pytest.mark.parametrize(
+    "size, expected_size",
+    [
+        ((1200, 600), (320, 160)),
+        ((600, 1200), (320, 640)),
+        ((200, 100), (200, 100)),
+    ],
+)
+def test_create_thumbnail_width(
+    size: tuple[int, int], expected_size: tuple[int, int]
+) -> None:
+    """Test that images are resized to a width regardless of their height
+    and are not upscaled."""
+    image_module = pytest.importorskip("PIL.Image")
+
+    thumbnail = create_thumbnail(
+        create_image("JPEG", "RGB", size),
+        max_size=100,
+        quality=80,
+        submitted_at=0,
+        width=320,
+    )
+
+    assert image_module.open(io.BytesIO(thumbnail.data)).size == expected_size
+
+
+def test_create_thumbnail_alternative_formats() -> None:
+    """Test that thumbnails are additionally encoded in the requested formats
+    unless the thumbnail already has that format."""
+    image_module = pytest.importorskip("PIL.Image")
+
+    thumbnail = create_thumbnail(
+        create_image("PNG", "RGBA", (1200, 600)),
+        max_size=400,
+        quality=80,
+        submitted_at=0,
+        formats=("webp", "png"),
+    )
+
+    assert thumbnail.file_type == "png"
+    assert list(thumbnail.alternatives) == ["webp"]
+
+    with image_module.open(io.BytesIO(thumbnail.alternatives["webp"])) as image:
+        assert image.format == "WEBP"
+        assert image.size == (400, 200)
+
+    assert "encode_webp" in thumbnail.stage_durations
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_generator_generate_records_stages() -> None:
+    """Test that thumbnails are created in the executor and their stage
+    durations are recorded."""
+    data = create_image("JPEG", "RGB", (800, 800))
+    metric = MagicMock()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        thumbnail_generator = ThumbnailGenerator(
+            executor=executor, metric=metric, max_size=100
+        )
+        thumbnail = await thumbnail_generator.generate(data)
+
+    assert thumbnail.file_type == "jpeg"
+    assert {call.args[0] for call in metric.observe_stage.call_args_list} == {
+        "queue",
+        "decode",
+        "resize",
+        "encode",
+    }
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_generator_bounds_pending_jobs() -> None:
+    """Test that jobs exceeding the maximal queue depth are rejected and
+    that stop waits for pending jobs."""
+    metric = MagicMock()
+    release = asyncio.Event()
+    finished = []
+
+    async def job() -> None:
+        await release.wait()
+        finished.append(True)
+
+    thumbnail_generator = ThumbnailGenerator(
+        executor=MagicMock(), metric=metric, max_pending=2
+    )
+
+    assert thumbnail_generator.submit(job()) is True
+    assert thumbnail_generator.submit(job()) is True
+    assert thumbnail_generator.submit(job()) is False
+
+    metric.record_job.assert_called_once_with("rejected")
+    metric.set_queue_depth.assert_called_with(2)
+
+    release.set()
+    await thumbnail_generator.stop()
+
+    assert len(finished) == 2
+    assert not thumbnail_generator.tasks
+    metric.set_queue_depth.assert_called_with(0)
+
+
+@pytest.mark.asyncio
+async def test_image_service_add_image_creates_small_variant(
+    dummy_coffee_images: DummyImages,
+) -> None:
+    """Test that uploading an image stores and records a small variant and
+    its alternative formats derived from the original read from S3. The
+    variants are recorded in a session of the job, as the session of the
+    upload request has ended by then."""
+    object_image_crud = AsyncMock()
+    object_image_crud.read.return_value = (
+        dummy_coffee_images.image_1_bytes,
+        "jpeg",
+    )
+    object_image_crud.stat.side_effect = [
+        ORIGINAL_INFO,
+        SMALL_INFO,
+        SMALL_WEBP_INFO,
+    ]
+    image_metadata_crud = AsyncMock()
+    image_cache = MagicMock()
+    db_session = create_db_session()
+
+    jobs: list[Coroutine[Any, Any, None]] = []
+    thumbnail_generator = MagicMock()
+    thumbnail_generator.submit.side_effect = jobs.append
+    thumbnail_generator.generate = AsyncMock(
+        return_value=Thumbnail(
+            data=b"small",
+            file_type="jpeg",
+            alternatives={"webp": b"small-webp"},
+        )
+    )
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        image_cache=image_cache,
+        thumbnail_generator=thumbnail_generator,
+    )
+
+    await test_image_service.add_image(
+        db_session=db_session,
+        s3_object=CoffeeDrinkImage(
+            key=OBJECT_ID,
+            file=create_upload_stream(dummy_coffee_images.image_1_bytes),
+        ),
+    )
+
+    assert len(jobs) == 1
+
+    await jobs[0]
+
+    thumbnail_generator.generate.assert_awaited_once_with(
+        dummy_coffee_images.image_1_bytes
+    )
+
+    object_image_crud.read.assert_called_once_with(
+        filepath="coffee_drink/original", filename=str(OBJECT_ID)
+    )
+
+    small_create = object_image_crud.create.call_args_list[0]
+    assert small_create.kwargs["filepath"] == "coffee_drink/small"
+    assert small_create.kwargs["filename"] == str(OBJECT_ID)
+    assert small_create.kwargs["file"].read() == b"small"
+
+    webp_create = object_image_crud.create.call_args_list[1]
+    assert webp_create.kwargs["filepath"] == "coffee_drink/small_webp"
+    assert webp_create.kwargs["file_type"] == "webp"
+    assert webp_create.kwargs["file"].read() == b"small-webp"
+
+    job_session = db_session.client.start_session.return_value
+    update_call = image_metadata_crud.update_variants.call_args
+    assert update_call.kwargs["db_session"] is job_session
+    job_session.__aexit__.assert_awaited_once()
+    assert update_call.kwargs["variants"] == {
+        "small": StoredImageVariant.from_object_info(SMALL_INFO),
+        "small_webp": StoredImageVariant.from_object_info(SMALL_WEBP_INFO),
+    }
+    assert update_call.kwargs["original_etag"] == "original-etag"
+
+    assert image_cache.invalidate.call_count == 2
+    thumbnail_generator.metric.record_job.assert_called_once_with("created")
+
+
+@pytest.mark.asyncio
+async def test_image_service_small_variant_failure(
+    dummy_coffee_images: DummyImages,
+) -> None:
+    """Test that a failing thumbnail job is counted and leaves the original
+    as only recorded variant."""
+    object_image_crud = AsyncMock()
+    object_image_crud.read.return_value = (
+        dummy_coffee_images.image_1_bytes,
+        "jpeg",
+    )
+    object_image_crud.stat.return_value = ORIGINAL_INFO
+    image_metadata_crud = AsyncMock()
+
+    jobs: list[Coroutine[Any, Any, None]] = []
+    thumbnail_generator = MagicMock()
+    thumbnail_generator.submit.side_effect = jobs.append
+    thumbnail_generator.generate = AsyncMock(side_effect=OSError("broken"))
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        thumbnail_generator=thumbnail_generator,
+    )
+
+    await test_image_service.add_image(
+        db_session=create_db_session(),
+        s3_object=CoffeeDrinkImage(
+            key=OBJECT_ID,
+            file=create_upload_stream(dummy_coffee_images.image_1_bytes),
+        ),
+    )
+
+    await jobs[0]
+
+    object_image_crud.create.assert_not_called()
+    image_metadata_crud.update_variants.assert_not_called()
+    thumbnail_generator.metric.record_job.assert_called_once_with("failed")
+
+
+@pytest.mark.asyncio
+async def test_image_service_small_variant_after_request_session_ended(
+    init_mongo: TestDBSessions,
+    dummy_coffee_images: DummyImages,
+) -> None:
+    """Test that the small variant created in the background is recorded
+    after the session of the upload request ended."""
+    object_image_crud = AsyncMock()
+    object_image_crud.read.return_value = (
+        dummy_coffee_images.image_1_bytes,
+        "jpeg",
+    )
+    object_image_crud.stat.side_effect = [ORIGINAL_INFO, SMALL_INFO]
+    image_metadata_crud = ImageMetadataCRUD(
+        database=settings.mongodb_database,
+        image_metadata_collection=settings.mongodb_image_metadata_collection,
+    )
+
+    metric = MagicMock()
+    thumbnail_generator = ThumbnailGenerator(
+        executor=ThreadPoolExecutor(max_workers=1), metric=metric
+    )
+
+    test_image_service = ImageService(
+        object_crud=object_image_crud,
+        image_metadata_crud=image_metadata_crud,
+        thumbnail_generator=thumbnail_generator,
+    )
+
+    async with await init_mongo.asncy_session.start_session() as db_session:
+        await test_image_service.add_image(
+            db_session=db_session,
+            s3_object=CoffeeDrinkImage(
+                key=OBJECT_ID,
+                file=create_upload_stream(dummy_coffee_images.image_1_bytes),
+            ),
+        )
+
+    await thumbnail_generator.stop()
+    thumbnail_generator.executor.shutdown(wait=True)
+
+    async with await init_mongo.asncy_session.start_session() as db_session:
+        metadata = await image_metadata_crud.read(
+            db_session=db_session,
+            key=image_key(OBJECT_ID, ImageType.COFFEE_DRINK),
+        )
+
+    assert metadata.variants["small"] == StoredImageVariant.from_object_info(
+        SMALL_INFO
+    )
+    metric.record_job.assert_called_once_with("created")
@@ -0,0 +1,77 @@
+from uuid_extensions.uuid7 import uuid7
+
+from coffee_backend.services.drink import DRINKS_WITH_COFFEE_BEAN
+from coffee_backend.services.query_plan import Lookup, QueryPlan
+
+PLAN = QueryPlan(
+    sort={"_id": -1},
+    lookups=[
+        Lookup(
+            from_collection="coffee",
+            local_field="coffee_bean_id",
+            foreign_field="_id",
+            as_field="coffee",
+            fields=["name"],
+        )
+    ],
+    add_fields={"coffee_name": {"$arrayElemAt": ["$coffee.name", 0]}},
+    project=["_id", "coffee_name"],
+)
+
+
+def test_query_plan_stage_order() -> None:
+    """Test that the pipeline matches and paginates before joining."""
+    user_id = uuid7()
+
+    pipeline = PLAN.build(match={"user_id": user_id}, limit=6, skip=10)
+
+    assert pipeline == [
+        {"$match": {"user_id": user_id}},
+        {"$sort": {"_id": -1}},
+        {"$skip": 10},
+        {"$limit": 6},
+        {
+            "$lookup": {
+                "from": "coffee",
+                "localField": "coffee_bean_id",
+                "foreignField": "_id",
+                "as": "coffee",
+                "pipeline": [{"$project": {"name": 1}}],
+            }
+        },
+        {"$addFields": {"coffee_name": {"$arrayElemAt": ["$coffee.name", 0]}}},
+        {"$project": {"_id": 1, "coffee_name": 1}},
+    ]
+
+
+def test_query_plan_without_match_and_skip() -> None:
+    """Test that empty conditions and no skip do not add stages."""
+    pipeline = QueryPlan(sort={"_id": -1}).build(match={}, limit=3)
+
+    assert pipeline == [{"$sort": {"_id": -1}}, {"$limit": 3}]
+
+
+def test_query_plan_reuses_template() -> None:
+    """Test that the stages after the pagination are built once."""
+    first = PLAN.build(match={}, limit=1)
+    second = PLAN.build(match={}, limit=2)
+
+    assert first[-3:] == second[-3:]
+    assert all(a is b for a, b in zip(first[-3:], second[-3:]))
+
+
+def test_drinks_with_coffee_bean_plan() -> None:
+    """Test that drinks are joined with name and roasting company of their
+    coffee after the pagination."""
+    pipeline = DRINKS_WITH_COFFEE_BEAN.build(match={}, limit=6)
+
+    assert [next(iter(stage)) for stage in pipeline] == [
+        "$sort",
+        "$limit",
+        "$lookup",
+        "$addFields",
+        "$project",
+    ]
+    assert pipeline[2]["$lookup"]["pipeline"] == [
+        {"$project": {"name": 1, "roasting_company": 1}}
+    ]
@@ -0,0 +1,193 @@
+from typing import Any, Dict, Iterator, List, Tuple
+from unittest.mock import AsyncMock
+from uuid import UUID
+
+import pytest
+
+from coffee_backend.mongo.indexes import INDEXES, ensure_indexes
+from coffee_backend.services.coffee import LIST_SORT, SEARCH_SORT, CoffeeService
+from coffee_backend.services.drink import DrinkService
+from coffee_backend.settings import settings
+from tests.conftest import TestDBSessions
+
+COFFEE_ID = UUID("0664ddeb-3b5d-73ba-8000-df8bd19c35bf")
+USER_ID = UUID("06635e3d-7741-755d-8000-64c83f422732")
+OWNER_ID = UUID("06635e42-a674-783c-8000-5647733a6497")
+
+
+def find_values(document: Any, key: str) -> Iterator[Any]:
+    """Yield all values of a key in a nested explain document."""
+    if isinstance(document, dict):
+        for name, value in document.items():
+            if name == key:
+                yield value
+            yield from find_values(value, key)
+    elif isinstance(document, list):
+        for value in document:
+            yield from find_values(value, key)
+
+
+def query_explain(explain: Dict[str, Any]) -> Tuple[List[str], int, int]:
+    """Extract the plan stages, examined and returned documents of the query
+    reading the listed collection.
+
+    Pipelines pushed down to the query engine completely are explained
+    without separate stages, joined documents are then included in the
+    examined documents.
+    """
+    if "stages" in explain:
+        explain = explain["stages"][0]["$cursor"]
+
+    stages = list(find_values(explain["queryPlanner"]["winningPlan"], "stage"))
+    stats = explain["executionStats"]
+
+    return stages, stats["totalDocsExamined"], stats["nReturned"]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"coffee_bean_id": COFFEE_ID},
+        {"user_id": USER_ID},
+        {"user_id": USER_ID, "first_id": UUID(int=2**128 - 1)},
+    ],
+)
+@pytest.mark.asyncio
+async def test_drink_pipeline_explain(
+    insert_coffees_with_matching_drinks: None,
+    init_mongo: TestDBSessions,
+    filters: Dict[str, Any],
+) -> None:
+    """Test that listing drinks scans an index and examines no more drinks
+    and coffees than it returns."""
+    database = settings.mongodb_database
+
+    await ensure_indexes(init_mongo.asncy_session[database], INDEXES)
+
+    # pylint: disable=W0212
+    pipeline = DrinkService(
+        drink_crud=AsyncMock(), coffee_crud=AsyncMock()
+    )._create_pipeline(page_size=2, **filters)
+    # pylint: enable=W0212
+
+    explain = init_mongo.sync_probe_session[database].command(
+        "explain",
+        {
+            "aggregate": settings.mongodb_drink_collection,
+            "pipeline": pipeline,
+            "cursor": {},
+        },
+        verbosity="executionStats",
+    )
+
+    stages, examined, returned = query_explain(explain)
+
+    assert "IXSCAN" in stages
+    assert "COLLSCAN" not in stages
+    assert set(find_values(explain, "strategy")) <= {"IndexedLoopJoin"}
+    assert 0 < returned <= 3
+    assert examined <= 2 * returned
+
+
+@pytest.mark.parametrize("filters", [{}, {"owner_id": OWNER_ID}])
+@pytest.mark.asyncio
+async def test_coffee_query_explain(
+    insert_coffees_with_matching_drinks: None,
+    init_mongo: TestDBSessions,
+    filters: Dict[str, Any],
+) -> None:
+    """Test that listing coffees scans an index and examines no more coffees
+    than it returns."""
+    database = settings.mongodb_database
+
+    await ensure_indexes(init_mongo.asncy_session[database], INDEXES)
+
+    # pylint: disable=W0212
+    query = CoffeeService(coffee_crud=AsyncMock())._create_query(**filters)
+    # pylint: enable=W0212
+
+    explain = (
+        init_mongo.sync_probe_session[database][
+            settings.mongodb_coffee_collection
+        ]
+        .find(query)
+        .sort("_id", -1)
+        .limit(3)
+        .explain()
+    )
+
+    stages, examined, returned = query_explain(explain)
+
+    assert "IXSCAN" in stages
+    assert "COLLSCAN" not in stages
+    assert 0 < returned <= 3
+    assert examined <= returned
+
+
+@pytest.mark.asyncio
+async def test_coffee_search_explain(
+    insert_coffees_with_matching_drinks: None,
+    init_mongo: TestDBSessions,
+) -> None:
+    """Test that searching coffees is served by the text index instead of
+    scanning the collection."""
+    database = settings.mongodb_database
+
+    await ensure_indexes(init_mongo.asncy_session[database], INDEXES)
+
+    # pylint: disable=W0212
+    query = CoffeeService(coffee_crud=AsyncMock())._create_query(
+        search_query="martermuhle coff"
+    )
+    # pylint: enable=W0212
+
+    cursor = (
+        init_mongo.sync_probe_session[database][
+            settings.mongodb_coffee_collection
+        ]
+        .find(query)
+        .sort(SEARCH_SORT)
+        .limit(3)
+    )
+
+    stages, _, returned = query_explain(cursor.explain())
+
+    assert "TEXT_MATCH" in stages
+    assert "IXSCAN" in stages
+    assert "COLLSCAN" not in stages
+    assert returned == 3
+
+
+@pytest.mark.asyncio
+async def test_coffee_search_prefix_explain(
+    insert_coffees_with_matching_drinks: None,
+    init_mongo: TestDBSessions,
+) -> None:
+    """Test that searching coffees by a partial word scans the search terms
+    index and examines no more coffees than it returns."""
+    database = settings.mongodb_database
+
+    await ensure_indexes(init_mongo.asncy_session[database], INDEXES)
+
+    # pylint: disable=W0212
+    query = CoffeeService(coffee_crud=AsyncMock())._create_query(
+        search_query="Marter"
+    )
+    # pylint: enable=W0212
+
+    cursor = (
+        init_mongo.sync_probe_session[database][
+            settings.mongodb_coffee_collection
+        ]
+        .find(query)
+        .sort(LIST_SORT)
+        .limit(10)
+    )
+
+    stages, examined, returned = query_explain(cursor.explain())
+
+    assert "IXSCAN" in stages
+    assert "COLLSCAN" not in stages
+    assert returned == 3
+    assert examined == returned